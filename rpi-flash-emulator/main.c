@@ -31,6 +31,7 @@ void setup_pio0_sm0_program(PIO pio) {
     sm_config_set_in_shift(&c, false, false, 0);
     sm_config_set_out_shift(&c, true, false, 0);
 
+    // jmp pin, gpio10 R/W (gpio11 ADDR_HI_SAME is read with mov osr, pins)
     sm_config_set_jmp_pin(&c, 10);
 
     // full speed
@@ -98,8 +99,15 @@ void setup_pio0_sm0_program(PIO pio) {
         &pio0_hw->rxf[0],
         1, false);
 
+    // mux pins are always outputs
+    pio_sm_set_consistent_pindirs(pio, 0, 8, 2, true);
+
+    // y = RAM base shifted left by 8, the PIO keeps the high address byte below it
+    pio_sm_put(pio, 0, (((uint32_t)&rom_bin) >> 16) << 8);
+    pio_sm_exec(pio, 0, pio_encode_pull(false, true));
+    pio_sm_exec(pio, 0, pio_encode_mov(pio_y, pio_osr));
+
     pio_sm_set_enabled(pio, 0, true);
-    pio_sm_put_blocking(pio, 0, ((uint32_t)&rom_bin) >> 16);
 }
 
 
@@ -1,4 +1,7 @@
 module bus_multiplexer (
+    input i_phi2,
+    input i_reset_n,
+
     input [1:0] i_sel,
 
     // CPU bus lines
@@ -7,7 +10,11 @@ module bus_multiplexer (
 
     // mux
     output reg [7:0] o_mux_data,
-    output reg o_mux_data_oe
+    output reg o_mux_data_oe,
+
+    // High address byte unchanged since the previous bus cycle: the
+    // external controller may skip MUX_ADDRESS_HI and reuse its last one
+    output o_addr_hi_same
 );
 
 localparam MUX_ADDRESS_LO = 0;
@@ -15,6 +22,24 @@ localparam MUX_ADDRESS_HI = 1;
 localparam MUX_DATA_IN = 2;
 localparam MUX_DATA_OUT = 3;
 
+// High byte of the previous cycle's address, latched at posedge PHI2 after
+// the controller has sampled this cycle's address phases. Cleared by reset
+// so the first cycle always sends both bytes.
+reg [7:0] prev_addr_hi;
+reg prev_addr_valid;
+
+always @(posedge i_phi2 or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        prev_addr_hi <= 8'h00;
+        prev_addr_valid <= 0;
+    end else begin
+        prev_addr_hi <= i_cpu_addr[15:8];
+        prev_addr_valid <= 1;
+    end
+end
+
+assign o_addr_hi_same = prev_addr_valid && i_cpu_addr[15:8] == prev_addr_hi;
+
 always_comb begin
     case (i_sel)
     MUX_ADDRESS_LO: begin
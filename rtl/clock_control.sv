@@ -1,7 +1,15 @@
 // This manages CPU clock, peripherals have their own dividers for now and no other clock
 // selection.
+//
+// With CLOCK_ENABLE=0 the CPU runs on a clock divided from i_clk in logic.
+// With CLOCK_ENABLE=1 it runs on i_clk itself and o_cpu_ce is high one
+// i_clk cycle in CPU_DIV + 1: the MCU holds the CPU and the bus with RDY
+// in the others, so the whole design is in one clock domain. o_cpu_ce
+// changes on the falling edge, where the CPU's cycles end, and is stable
+// through the rising edge where reads are sampled.
 module clock_control #(
-    parameter CPU_DIV_DEFAULT = 8'h00
+    parameter CPU_DIV_DEFAULT = 8'h00,
+    parameter CLOCK_ENABLE = 0
 ) (
     input i_clk,
     input i_reset_n,
@@ -14,8 +22,10 @@ module clock_control #(
     input i_en,
     output reg [7:0] o_data,
 
-    // Divided clock output (CPU only)
-    output o_cpu_clk
+    // Divided clock output (CPU only), i_clk with CLOCK_ENABLE
+    output o_cpu_clk,
+    // CPU cycle enable, always high without CLOCK_ENABLE
+    output o_cpu_ce
 );
 
 // Register Map:
@@ -25,36 +35,55 @@ module clock_control #(
 // 0xA033: Reserved
 
 reg [7:0] cpu_div;
-reg [7:0] cpu_div_prev;
 reg [7:0] cpu_counter;
-reg cpu_clk_divided;
 
 wire cpu_locked;
 assign cpu_locked = 1'b1;
 
-always_ff @(posedge i_clk or negedge i_reset_n) begin
-    if (!i_reset_n) begin
-        cpu_counter <= 8'h00;
-        cpu_clk_divided <= 1'b0;
-        cpu_div_prev <= 8'h00;
-    end else begin
-        cpu_div_prev <= cpu_div;
-
-        if (cpu_div != cpu_div_prev) begin
-            cpu_counter <= 8'h00;
-            cpu_clk_divided <= 1'b0;
-        end else begin
-            if (cpu_counter >= cpu_div) begin
+generate
+    if (CLOCK_ENABLE) begin : clock_enable
+        always_ff @(negedge i_clk or negedge i_reset_n) begin
+            if (!i_reset_n) begin
+                cpu_counter <= 8'h00;
+            end else if (cpu_counter >= cpu_div) begin
                 cpu_counter <= 8'h00;
             end else begin
                 cpu_counter <= cpu_counter + 8'h01;
             end
-            cpu_clk_divided <= (cpu_counter < ((cpu_div + 8'h01) >> 1));
         end
-    end
-end
 
-assign o_cpu_clk = (cpu_div == 8'h00) ? i_clk : cpu_clk_divided;
+        assign o_cpu_clk = i_clk;
+        assign o_cpu_ce = cpu_counter >= cpu_div;
+    end else begin : clock_divider
+        reg [7:0] cpu_div_prev;
+        reg cpu_clk_divided;
+
+        always_ff @(posedge i_clk or negedge i_reset_n) begin
+            if (!i_reset_n) begin
+                cpu_counter <= 8'h00;
+                cpu_clk_divided <= 1'b0;
+                cpu_div_prev <= 8'h00;
+            end else begin
+                cpu_div_prev <= cpu_div;
+
+                if (cpu_div != cpu_div_prev) begin
+                    cpu_counter <= 8'h00;
+                    cpu_clk_divided <= 1'b0;
+                end else begin
+                    if (cpu_counter >= cpu_div) begin
+                        cpu_counter <= 8'h00;
+                    end else begin
+                        cpu_counter <= cpu_counter + 8'h01;
+                    end
+                    cpu_clk_divided <= (cpu_counter < ((cpu_div + 8'h01) >> 1));
+                end
+            end
+        end
+
+        assign o_cpu_clk = (cpu_div == 8'h00) ? i_clk : cpu_clk_divided;
+        assign o_cpu_ce = 1'b1;
+    end
+endgenerate
 
 always_ff @(posedge i_phi2 or negedge i_reset_n) begin
     if (!i_reset_n) begin
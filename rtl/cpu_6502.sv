@@ -2,7 +2,10 @@
 
 module cpu_6502 #(
     START_PC_ENABLED = 0,
-    START_PC = 0
+    START_PC = 0,
+    IR_DECODER_ROM = 0, // 1: generated opcode ROM (cpu_6502_ir_decoder_rom.sv) instead of the casez decoder
+    ENABLE_65C02 = 0,   // 1: also decode the 65C02 opcodes in cpu_6502_instructions.vh
+    TURBO = 0           // 1: skip the NMOS dummy cycles, fewer cycles per instruction but not cycle-accurate
 ) (
     input i_clk,
     output o_phi1,
@@ -16,6 +19,7 @@ module cpu_6502 #(
     input i_so_n,
 
     output reg o_sync,
+    output o_irq_vector,        // taking an IRQ (not BRK or NMI), qualifies its vector fetch
 
     // bus
     input [7:0] i_bus_data,
@@ -80,6 +84,8 @@ operand_type_t addressing_mode;
 
 reg handle_irq, handle_nmi;
 
+assign o_irq_vector = handle_irq && !handle_nmi;
+
 reg first_microinstruction;
 microinstruction_t current_microinstruction, prev_mi;
 reg [7:0] current_instruction;
@@ -87,15 +93,37 @@ always_comb begin
     current_instruction = first_microinstruction ? i_bus_data : opcode;
 end
 
-cpu_6502_ir_decoder cpu_6502_ir_decoder (
-    .i_opcode(current_instruction),
-    .o_operand_type(addressing_mode)
-);
+// Opcode the execute logic decodes. TURBO runs MICRO_EXECUTE of single-byte
+// instructions, and the write of pushes, in the opcode fetch cycle, before
+// opcode is loaded.
+wire [7:0] execute_opcode;
+assign execute_opcode = TURBO ? current_instruction : opcode;
+
+generate
+    if (IR_DECODER_ROM) begin : ir_decoder_gen_rom
+        cpu_6502_ir_decoder_rom #(
+            .ENABLE_65C02(ENABLE_65C02)
+        ) cpu_6502_ir_decoder (
+            .i_opcode(current_instruction),
+            .o_operand_type(addressing_mode)
+        );
+    end else begin : ir_decoder_gen_casez
+        cpu_6502_ir_decoder #(
+            .ENABLE_65C02(ENABLE_65C02)
+        ) cpu_6502_ir_decoder (
+            .i_opcode(current_instruction),
+            .o_operand_type(addressing_mode)
+        );
+    end
+endgenerate
 
 microinstruction_t next_microinstruction, next2_microinstruction;
 microinstruction_t active_microinstruction, next_active_microinstruction;
 
-cpu_6502_microcode microcode_next (
+cpu_6502_microcode #(
+    .ENABLE_65C02(ENABLE_65C02),
+    .TURBO(TURBO)
+) microcode_next (
     .i_current_instruction(current_instruction),
     .i_current_microinstruction(current_microinstruction),
     .i_handle_irq(handle_irq),
@@ -103,7 +131,10 @@ cpu_6502_microcode microcode_next (
     .o_next_microinstruction(next_microinstruction)
 );
 
-cpu_6502_microcode microcode_next2 (
+cpu_6502_microcode #(
+    .ENABLE_65C02(ENABLE_65C02),
+    .TURBO(TURBO)
+) microcode_next2 (
     .i_current_instruction(current_instruction),
     .i_current_microinstruction(next_microinstruction),
     .i_handle_irq(handle_irq),
@@ -121,9 +152,14 @@ always_comb begin
     end
 end
 
+// BBR/BBS test the zero page byte as it arrives, then the copy kept in
+// effective_address
+wire [7:0] branch_operand;
+assign branch_operand = operation == OP_LOAD_ZP ? i_bus_data : effective_address_lo;
+
 reg branch_taken;
 always_comb begin
-    case (current_instruction)
+    casez (current_instruction)
     OPCODE_BCC: branch_taken = !status_carry;
     OPCODE_BCS: branch_taken = status_carry;
     OPCODE_BEQ: branch_taken = status_zero;
@@ -132,11 +168,31 @@ always_comb begin
     OPCODE_BMI: branch_taken = status_negative;
     OPCODE_BVS: branch_taken = status_overflow;
     OPCODE_BVC: branch_taken = !status_overflow;
+    OPCODE_BRA: branch_taken = ENABLE_65C02 != 0;
+    OPCODE_TYPE_BBR: branch_taken = ENABLE_65C02 != 0 && !branch_operand[current_instruction[6:4]];
+    OPCODE_TYPE_BBS: branch_taken = ENABLE_65C02 != 0 && branch_operand[current_instruction[6:4]];
     default:
         branch_taken = 0;
     endcase
 end
 
+// The offset moves the target to another page
+wire branch_page_cross;
+assign branch_page_cross = (alu_carry_out && !i_bus_data[7]) || (!alu_carry_out && i_bus_data[7]);
+
+// TURBO ends a branch in the cycle that knows its target, without the
+// MICRO_EXECUTE cycle that only reads the next opcode
+wire branch_done;
+assign branch_done = TURBO && active_microinstruction == MAYBE_BRANCH &&
+    (first_microinstruction || (ENABLE_65C02 && operation == OP_LOAD_ZP) ? !branch_taken :
+     operation == OP_BRANCH_PAGE_CROSS || !branch_taken || !branch_page_cross);
+
+// The zero page operand is indexed this cycle. TURBO adds the index as the
+// operand arrives instead of after the NMOS dummy read.
+wire index_zp;
+assign index_zp = operation == OP_LOAD_ZP_INDEXED || (TURBO && operation == OP_LOAD_ZP &&
+    (addressing_mode == INDEX_X_INDIRECT || addressing_mode == ZP_X || addressing_mode == ZP_Y));
+
 always @(posedge i_clk) begin
     o_bus_data <= bus_data_write;
 end
@@ -207,7 +263,7 @@ always @(negedge i_clk or negedge i_reset_n) begin
                     bus_data_write <= active_microinstruction == PUSH_PCL ? program_counter[7:0] : program_counter[15:8];
             end
             else begin
-                priority casez (opcode)
+                priority casez (execute_opcode)
                 OPCODE_TYPE_STA, OPCODE_PHA: bus_data_write <= register_acc;
                 OPCODE_PHP: bus_data_write <= {status_negative, status_overflow, 1'b1, 1'b1, status_decimal,
                                 status_interrupt, status_zero, status_carry};
@@ -225,10 +281,22 @@ always @(negedge i_clk or negedge i_reset_n) begin
                 end
                 default: bus_data_write <= 0;
                 endcase
+
+                // 65C02 opcodes override the NMOS decode
+                if (ENABLE_65C02) begin
+                    priority casez (execute_opcode)
+                    OPCODE_STA_ZP_IND: bus_data_write <= register_acc;
+                    OPCODE_STZ_ZP, OPCODE_STZ_ZP_X, OPCODE_STZ_ABS, OPCODE_STZ_ABS_X: bus_data_write <= 0;
+                    OPCODE_PHX: bus_data_write <= register_x;
+                    OPCODE_PHY: bus_data_write <= register_y;
+                    default: ;
+                    endcase
+                end
             end
 
             case (active_microinstruction)
             PUSH_PCH, PUSH_PCL, WRITE_SR, ALU_MODIFY, WRITE: o_rw <= 0;
+            PUSH_STACK: o_rw <= !TURBO;     // TURBO writes without the WRITE cycle
             default: o_rw <= 1;
             endcase
 
@@ -238,7 +306,7 @@ always @(negedge i_clk or negedge i_reset_n) begin
                 o_bus_addr <= program_counter;
                 first_microinstruction <= 1;
             end
-            else if (next_active_microinstruction == START) begin
+            else if (next_active_microinstruction == START || branch_done) begin
                 first_microinstruction <= 1;
                 o_bus_addr <= program_counter;
                 program_counter <= program_counter;
@@ -281,6 +349,12 @@ always @(negedge i_clk or negedge i_reset_n) begin
                     active_microinstruction == PULL_REGISTER || active_microinstruction == WRITE) begin
                 current_microinstruction <= next_active_microinstruction;
             end
+            else if (active_microinstruction == WAIT) begin
+                // WAI: hold until an interrupt is requested, taken or not.
+                // STP: hold until reset.
+                if ((!i_irq_n || pending_nmi) && !(ENABLE_65C02 && opcode == OPCODE_STP))
+                    current_microinstruction <= next_active_microinstruction;
+            end
             else if (active_microinstruction == READ_ADL) begin
                 program_counter <= program_counter + 2;
                 current_microinstruction <= next_active_microinstruction;
@@ -330,10 +404,18 @@ always @(negedge i_clk or negedge i_reset_n) begin
                 o_bus_addr <= program_counter + 1;
                 program_counter <= program_counter + 1;
                 current_microinstruction <= next_active_microinstruction;
+
+                // JMP (abs,X) indexes the pointer, the carry goes to its high byte
+                if (ENABLE_65C02 && opcode == OPCODE_JMP_IND_X) begin
+                    effective_address <= {8'b0, alu_result};
+                    effective_address_lo_carry <= alu_carry_out;
+                end
             end
             else if (active_microinstruction == LOAD_PC_EFFECTIVE_LO) begin
                 current_microinstruction <= next_active_microinstruction;
                 o_bus_addr <= {i_bus_data, effective_address_lo};
+                if (ENABLE_65C02 && opcode == OPCODE_JMP_IND_X)
+                    o_bus_addr <= {alu_result, effective_address_lo};
             end
             else if (active_microinstruction == LOAD_PC_EFFECTIVE_HI || active_microinstruction == READ_VECTOR_HI) begin
                 current_microinstruction <= next_active_microinstruction;
@@ -351,11 +433,23 @@ always @(negedge i_clk or negedge i_reset_n) begin
                         operation <= OP_CALCULATE_BRANCH_OFFSET;
                     end else begin
                         current_microinstruction <= next_active_microinstruction;
+                        if (TURBO)
+                            o_bus_addr <= program_counter + 2;
                     end
                 end
+                else if (ENABLE_65C02 && operation == OP_LOAD_ZP) begin
+                    // BBR/BBS: the zero page byte is on the bus, read the offset next
+                    program_counter <= program_counter + 1;
+                    o_bus_addr <= TURBO && !branch_taken ? program_counter + 1 : program_counter;
+                    effective_address <= {8'b0, i_bus_data};
+                    if (branch_taken)
+                        operation <= OP_CALCULATE_BRANCH_OFFSET;
+                    else
+                        current_microinstruction <= next_active_microinstruction;
+                end
                 else if (operation == OP_CALCULATE_BRANCH_OFFSET) begin
                     if (branch_taken) begin
-                        if ((alu_carry_out && !i_bus_data[7]) || (!alu_carry_out && i_bus_data[7]))
+                        if (branch_page_cross)
                             operation <= OP_BRANCH_PAGE_CROSS;
                         else begin
                             program_counter <= {program_counter[15:8], alu_result};
@@ -382,7 +476,7 @@ always @(negedge i_clk or negedge i_reset_n) begin
                     program_counter <= {i_bus_data, program_counter[7:0]};
                 end
                 else begin
-                    priority casez (opcode)
+                    priority casez (execute_opcode)
                     OPCODE_JMP_ABS: begin
                         program_counter <= {i_bus_data, effective_address_lo};
                         o_bus_addr <= {i_bus_data, effective_address_lo};
@@ -404,6 +498,12 @@ always @(negedge i_clk or negedge i_reset_n) begin
                     end
                     default: ;
                     endcase
+
+                    // 65C02 opcodes override the NMOS decode
+                    if (ENABLE_65C02 && execute_opcode == OPCODE_JMP_IND_X) begin
+                        program_counter <= {i_bus_data, program_counter[7:0]};
+                        o_bus_addr <= {i_bus_data, program_counter[7:0]};
+                    end
                 end
 
                 current_microinstruction <= next_active_microinstruction;
@@ -415,7 +515,8 @@ always @(negedge i_clk or negedge i_reset_n) begin
                     case (addressing_mode)
                         IMMEDIATE: current_microinstruction <= next_active_microinstruction;
                         ABSOLUTE, ABSOLUTE_X, ABSOLUTE_Y, INDIRECT: operation <= OP_ABSOLUTE_LO;
-                        INDEX_X_INDIRECT, INDEX_Y_INDIRECT, ZP, ZP_X, ZP_Y: operation <= OP_LOAD_ZP;
+                        INDEX_X_INDIRECT, INDEX_Y_INDIRECT, ZP_INDIRECT, ZP, ZP_X, ZP_Y, ZP_RELATIVE:
+                            operation <= OP_LOAD_ZP;
 
                         // invalid opcode, continue
                         default: begin
@@ -424,16 +525,16 @@ always @(negedge i_clk or negedge i_reset_n) begin
                     endcase
                 end
                 else begin
-                    if (operation == OP_LOAD_ZP) begin
+                    if (operation == OP_LOAD_ZP && !index_zp) begin
                         case (addressing_mode)
-                            ZP: begin
+                            ZP, ZP_RELATIVE: begin
                                 current_microinstruction <= next_active_microinstruction;
                                 effective_address <= {8'b0, i_bus_data};
                                 o_bus_addr <= {8'b0, i_bus_data};
                                 if (active_microinstruction == STORE)
                                     o_rw <= 0;
                             end
-                            INDEX_Y_INDIRECT: begin
+                            INDEX_Y_INDIRECT, ZP_INDIRECT: begin
                                 o_bus_addr <= {8'b0, i_bus_data};
                                 operation <= OP_ABSOLUTE_LO;
                             end
@@ -444,7 +545,7 @@ always @(negedge i_clk or negedge i_reset_n) begin
                             end
                         endcase
                     end
-                    else if (operation == OP_LOAD_ZP_INDEXED) begin
+                    else if (index_zp) begin
                         o_bus_addr <= {8'b0, alu_result};
                         if (addressing_mode == INDEX_X_INDIRECT) begin
                             operation <= OP_ABSOLUTE_LO;
@@ -474,13 +575,22 @@ always @(negedge i_clk or negedge i_reset_n) begin
                         if (opcode == OPCODE_JMP_IND) begin
                             operation <= OP_LOAD_INDIRECT_LO;
                         end
-                        else if (alu_carry_out || (active_microinstruction == STORE && addressing_mode != ABSOLUTE))
+                        // Indexed stores always take the page cross cycle, (zp,X) and (zp) do not,
+                        // and with TURBO only when the index carries
+                        else if (alu_carry_out || (!TURBO && active_microinstruction == STORE &&
+                                addressing_mode != ABSOLUTE && addressing_mode != INDEX_X_INDIRECT &&
+                                addressing_mode != ZP_INDIRECT))
                             operation <= OP_ABSOLUTE_PAGE_CROSS;
                         else begin
                             priority casez (opcode)
                             OPCODE_TYPE_INC, OPCODE_TYPE_DEC, OPCODE_TYPE_ROR, OPCODE_TYPE_ROL, OPCODE_TYPE_ASL,
-                            OPCODE_TYPE_LSR:
-                                operation <= OP_ABSOLUTE_PAGE_CROSS;
+                            OPCODE_TYPE_LSR: begin
+                                // Read-modify-write absolute,X always takes the page cross cycle
+                                if (addressing_mode == ABSOLUTE_X && !TURBO)
+                                    operation <= OP_ABSOLUTE_PAGE_CROSS;
+                                else
+                                    current_microinstruction <= next_active_microinstruction;
+                            end
                             default: begin
                                 current_microinstruction <= next_active_microinstruction;
                                 if (active_microinstruction == STORE)
@@ -533,6 +643,10 @@ always @(negedge i_clk or negedge i_reset_n) begin
                 bus_data_write <= alu_result;
             end
 
+            // The next cycle fetches an opcode
+            if (branch_done)
+                current_microinstruction <= START;
+
             case (prev_mi)
                 PULL_PCL: program_counter <= {8'b0, i_bus_data};
                 PULL_PCH: begin
@@ -541,11 +655,13 @@ always @(negedge i_clk or negedge i_reset_n) begin
                 default: ;
             endcase
 
-            if (next_active_microinstruction == START && !i_irq_n && !status_interrupt && !handle_irq && !handle_nmi) begin
+            if ((next_active_microinstruction == START || branch_done) && !i_irq_n && !status_interrupt &&
+                    !handle_irq && !handle_nmi) begin
                 handle_irq <= 1;
                 o_bus_addr <= {8'b1, register_sp};
             end
-            else if (next_active_microinstruction == START && pending_nmi && !handle_irq && !handle_nmi && !init) begin
+            else if ((next_active_microinstruction == START || branch_done) && pending_nmi && !handle_irq &&
+                    !handle_nmi && !init) begin
                 handle_irq <= 1;
                 handle_nmi <= 1;
                 pending_nmi <= 0;
@@ -576,9 +692,17 @@ always @(negedge i_clk or negedge i_reset_n) begin
                     end
                     default: ;
                     endcase
+
+                    if (ENABLE_65C02) begin
+                        priority casez (opcode)
+                        OPCODE_PLX: register_x <= i_bus_data;
+                        OPCODE_PLY: register_y <= i_bus_data;
+                        default: ;
+                        endcase
+                    end
                 end
                 MICRO_EXECUTE: begin
-                    priority casez (opcode)
+                    priority casez (execute_opcode)
                     OPCODE_PLP, OPCODE_PLA: begin
                         // no updates
                     end
@@ -594,7 +718,9 @@ always @(negedge i_clk or negedge i_reset_n) begin
                     OPCODE_INX, OPCODE_DEX: register_x <= alu_result;
                     OPCODE_INY, OPCODE_DEY: register_y <= alu_result;
                     OPCODE_ASL_ACC, OPCODE_LSR_ACC, OPCODE_ROL_ACC, OPCODE_ROR_ACC: register_acc <= alu_result;
+                    OPCODE_CLV: ;  // shares the LDY pattern
                     OPCODE_TYPE_LDA: register_acc <= i_bus_data;
+                    OPCODE_LDA_ZP_IND: if (!ENABLE_65C02) register_x <= i_bus_data;  // shares the LDX pattern
                     OPCODE_TYPE_LDX: register_x <= i_bus_data;
                     OPCODE_TYPE_LDY: register_y <= i_bus_data;
                     OPCODE_TYPE_ADC, OPCODE_TYPE_AND, OPCODE_TYPE_ORA,
@@ -602,6 +728,18 @@ always @(negedge i_clk or negedge i_reset_n) begin
                         register_acc <= alu_result;
                     default: ;
                     endcase
+
+                    // 65C02 opcodes override the NMOS decode
+                    if (ENABLE_65C02) begin
+                        priority casez (execute_opcode)
+                        OPCODE_INC_ACC, OPCODE_DEC_ACC: register_acc <= alu_result;
+                        OPCODE_LDA_ZP_IND: register_acc <= i_bus_data;
+                        OPCODE_ADC_ZP_IND, OPCODE_AND_ZP_IND, OPCODE_ORA_ZP_IND,
+                        OPCODE_EOR_ZP_IND, OPCODE_SBC_ZP_IND:
+                            register_acc <= alu_result;
+                        default: ;
+                        endcase
+                    end
                 end
                 default: ;
             endcase
@@ -640,10 +778,14 @@ always @(negedge i_clk or negedge i_reset_n) begin
             endcase
         end
         if (active_microinstruction == MICRO_EXECUTE && i_rdy) begin
-            if (handle_irq)
+            // The 65C02 leaves decimal mode on an interrupt or BRK
+            if (handle_irq) begin
                 status_interrupt <= 1;
+                if (ENABLE_65C02)
+                    status_decimal <= 0;
+            end
 
-            priority casez (opcode)
+            priority casez (execute_opcode)
             OPCODE_TYPE_BRANCH: begin
             end
             OPCODE_PLP, OPCODE_JSR: begin
@@ -686,6 +828,12 @@ always @(negedge i_clk or negedge i_reset_n) begin
                 status_overflow <= i_bus_data[6];
                 status_zero <= alu_result == 0;
             end
+            OPCODE_NOP_ZP_X_D4, OPCODE_NOP_ABS_DC, OPCODE_NOP_ZP_X_F4, OPCODE_NOP_ABS_FC:
+                if (!ENABLE_65C02) begin  // share the CPY and CPX patterns
+                    status_negative <= alu_result[7];
+                    status_zero <= alu_result == 0;
+                    status_carry <= alu_carry_out;
+                end
             OPCODE_TYPE_CMP, OPCODE_TYPE_CPX, OPCODE_TYPE_CPY: begin
                 status_negative <= alu_result[7];
                 status_zero <= alu_result == 0;
@@ -713,6 +861,43 @@ always @(negedge i_clk or negedge i_reset_n) begin
             default: begin
             end
             endcase
+
+            // 65C02 opcodes override the NMOS decode
+            if (ENABLE_65C02) begin
+                priority casez (execute_opcode)
+                OPCODE_PLX: begin
+                    status_negative <= register_x[7];
+                    status_zero <= register_x == 0;
+                end
+                OPCODE_PLY: begin
+                    status_negative <= register_y[7];
+                    status_zero <= register_y == 0;
+                end
+                OPCODE_INC_ACC, OPCODE_DEC_ACC,
+                OPCODE_AND_ZP_IND, OPCODE_EOR_ZP_IND, OPCODE_ORA_ZP_IND: begin
+                    status_negative <= alu_result[7];
+                    status_zero <= alu_result == 0;
+                end
+                OPCODE_CMP_ZP_IND: begin
+                    status_negative <= alu_result[7];
+                    status_zero <= alu_result == 0;
+                    status_carry <= alu_carry_out;
+                end
+                OPCODE_LDA_ZP_IND: begin
+                    status_negative <= i_bus_data[7];
+                    status_zero <= i_bus_data == 0;
+                end
+                OPCODE_ADC_ZP_IND, OPCODE_SBC_ZP_IND: begin
+                    status_negative <= alu_result[7];
+                    status_zero <= alu_result == 0;
+                    status_carry <= alu_carry_out;
+                    status_overflow <= alu_overflow;
+                end
+                OPCODE_BIT_IMM: status_zero <= alu_result == 0;
+                OPCODE_BRK: status_decimal <= 0;
+                default: ;
+                endcase
+            end
         end
         else if (active_microinstruction == ALU_MODIFY && i_rdy) begin
             priority casez (opcode)
@@ -727,6 +912,15 @@ always @(negedge i_clk or negedge i_reset_n) begin
             end
             default: ;
             endcase
+
+            // TSB/TRB set Z from A AND the memory operand, like BIT
+            if (ENABLE_65C02) begin
+                priority casez (opcode)
+                OPCODE_TSB_ZP, OPCODE_TSB_ABS, OPCODE_TRB_ZP, OPCODE_TRB_ABS:
+                    status_zero <= (register_acc & i_bus_data) == 0;
+                default: ;
+                endcase
+            end
         end
 
         if (trigger_overflow)
@@ -743,7 +937,7 @@ always_comb begin
     alu_decimal = 0;
     load_or_store = active_microinstruction == LOAD || active_microinstruction == STORE; 
 
-    if (load_or_store && operation == OP_LOAD_ZP_INDEXED) begin
+    if (load_or_store && index_zp) begin
         alu_lhs = i_bus_data;
         alu_rhs = (addressing_mode == ZP_X || addressing_mode == INDEX_X_INDIRECT) ? register_x : register_y;
     end
@@ -762,6 +956,12 @@ always_comb begin
         alu_lhs = program_counter[7:0];
         alu_rhs = i_bus_data;
     end
+    else if (ENABLE_65C02 && (active_microinstruction == READ_EFFECTIVE_HI ||
+            active_microinstruction == LOAD_PC_EFFECTIVE_LO)) begin
+        // JMP (abs,X): X plus the pointer's low byte, then the carry plus its high byte
+        alu_lhs = i_bus_data;
+        alu_rhs = active_microinstruction == READ_EFFECTIVE_HI ? register_x : {7'b0, effective_address_lo_carry};
+    end
     else if (active_microinstruction == STORE) begin
         alu_lhs = i_bus_data;
         priority casez (opcode)
@@ -774,7 +974,7 @@ always_comb begin
         alu_lhs = register_acc;
         alu_rhs = i_bus_data;
         alu_carry_in = status_carry;
-        priority casez (opcode)
+        priority casez (execute_opcode)
         OPCODE_DEY: begin
             alu_lhs = register_y;
             alu_rhs = 8'hff;
@@ -839,7 +1039,7 @@ always_comb begin
             alu_operation = ALU_SBC;
         end
         OPCODE_TYPE_ROR: begin
-            if (opcode == OPCODE_ROR_ACC)
+            if (execute_opcode == OPCODE_ROR_ACC)
                 alu_lhs = register_acc;
             else
                 alu_lhs = i_bus_data;
@@ -848,7 +1048,7 @@ always_comb begin
             alu_operation = ALU_ROR;
         end
         OPCODE_TYPE_ROL: begin
-            if (opcode == OPCODE_ROL_ACC)
+            if (execute_opcode == OPCODE_ROL_ACC)
                 alu_lhs = register_acc;
             else
                 alu_lhs = i_bus_data;
@@ -857,7 +1057,7 @@ always_comb begin
             alu_operation = ALU_ROL;
         end
         OPCODE_TYPE_ASL: begin
-            if (opcode == OPCODE_ASL_ACC)
+            if (execute_opcode == OPCODE_ASL_ACC)
                 alu_lhs = register_acc;
             else
                 alu_lhs = i_bus_data;
@@ -867,7 +1067,7 @@ always_comb begin
             alu_operation = ALU_ASL;
         end
         OPCODE_TYPE_LSR: begin
-            if (opcode == OPCODE_LSR_ACC)
+            if (execute_opcode == OPCODE_LSR_ACC)
                 alu_lhs = register_acc;
             else
                 alu_lhs = i_bus_data;
@@ -878,6 +1078,53 @@ always_comb begin
         end
         default: ;
         endcase
+
+        // 65C02 opcodes override the NMOS decode; (zp) operates like the
+        // cc=01 group above
+        if (ENABLE_65C02) begin
+            priority casez (execute_opcode)
+            OPCODE_INC_ACC, OPCODE_DEC_ACC: begin
+                alu_lhs = register_acc;
+                alu_rhs = execute_opcode == OPCODE_INC_ACC ? 8'h01 : 8'hff;
+                alu_carry_in = 0;
+                alu_operation = ALU_ADC;
+            end
+            OPCODE_CMP_ZP_IND: begin
+                alu_lhs = register_acc;
+                alu_rhs = ~i_bus_data;
+                alu_carry_in = 1;
+                alu_operation = ALU_ADC;
+            end
+            OPCODE_AND_ZP_IND, OPCODE_ORA_ZP_IND, OPCODE_EOR_ZP_IND: begin
+                alu_lhs = register_acc;
+                alu_rhs = i_bus_data;
+                alu_carry_in = 0;
+                alu_operation = execute_opcode == OPCODE_AND_ZP_IND ? ALU_AND :
+                                execute_opcode == OPCODE_ORA_ZP_IND ? ALU_ORA : ALU_EOR;
+            end
+            OPCODE_ADC_ZP_IND: begin
+                alu_lhs = register_acc;
+                alu_rhs = i_bus_data;
+                alu_carry_in = status_carry;
+                alu_decimal = status_decimal;
+                alu_operation = ALU_ADC;
+            end
+            OPCODE_SBC_ZP_IND: begin
+                alu_lhs = register_acc;
+                alu_rhs = ~i_bus_data;
+                alu_carry_in = status_carry;
+                alu_decimal = status_decimal;
+                alu_operation = ALU_SBC;
+            end
+            OPCODE_BIT_IMM: begin
+                alu_lhs = register_acc;
+                alu_rhs = i_bus_data;
+                alu_carry_in = 0;
+                alu_operation = ALU_AND;
+            end
+            default: ;
+            endcase
+        end
     end
     else if (active_microinstruction == ALU_MODIFY) begin
         alu_lhs = i_bus_data;
@@ -908,6 +1155,28 @@ always_comb begin
         end
         default: ;
         endcase
+
+        if (ENABLE_65C02) begin
+            priority casez (opcode)
+            OPCODE_TSB_ZP, OPCODE_TSB_ABS: begin
+                alu_rhs = register_acc;
+                alu_operation = ALU_ORA;
+            end
+            OPCODE_TRB_ZP, OPCODE_TRB_ABS: begin
+                alu_rhs = ~register_acc;
+                alu_operation = ALU_AND;
+            end
+            OPCODE_TYPE_RMB: begin
+                alu_rhs = ~(8'b1 << opcode[6:4]);
+                alu_operation = ALU_AND;
+            end
+            OPCODE_TYPE_SMB: begin
+                alu_rhs = 8'b1 << opcode[6:4];
+                alu_operation = ALU_ORA;
+            end
+            default: ;
+            endcase
+        end
     end
 end
 
@@ -937,4 +1206,32 @@ always_comb begin
     endcase
 end
 
+`ifndef SYNTHESIS
+// Simulation-only snapshot of the architectural state so testbenches can read
+// every register with a single access instead of one lookup per signal.
+//
+//  [69:64] active_microinstruction
+//  [63:56] opcode
+//  [55:48] status register, NV1BDIZC (B reads as 0)
+//  [47:32] program_counter
+//  [31:24] register_sp
+//  [23:16] register_y
+//  [15:8]  register_x
+//  [7:0]   register_acc
+/* verilator lint_off UNUSEDSIGNAL */
+wire [69:0] sim_arch_state;
+/* verilator lint_on UNUSEDSIGNAL */
+assign sim_arch_state = {
+    active_microinstruction,
+    opcode,
+    {status_negative, status_overflow, 1'b1, 1'b0, status_decimal,
+     status_interrupt, status_zero, status_carry},
+    program_counter,
+    register_sp,
+    register_y,
+    register_x,
+    register_acc
+};
+`endif
+
 endmodule
@@ -67,8 +67,13 @@ end
 assign o_result = result[7:0];
 assign o_carry = i_bcd ? bcd_carry_hi : result[8];
 
-assign o_overflow = (i_lhs[7] == i_rhs[7] && 
-    result[7] != i_lhs[7]);
+// In decimal mode the NMOS 6502 takes V from the sum before the high digit
+// is adjusted, which is bit 3 of the unadjusted high nibble
+wire overflow_msb;
+assign overflow_msb = i_bcd ? result_hi[3] : result[7];
+
+assign o_overflow = (i_lhs[7] == i_rhs[7] &&
+    overflow_msb != i_lhs[7]);
 
 endmodule
 
@@ -14,7 +14,8 @@ typedef enum logic [3:0] {
     IMMEDIATE, ZP, ZP_X, ZP_Y, IMPLIED,
     INDIRECT, INDEX_X_INDIRECT,
     INDEX_Y_INDIRECT, RELATIVE, ABSOLUTE,
-    ABSOLUTE_X, ABSOLUTE_Y, ACCUMULATOR
+    ABSOLUTE_X, ABSOLUTE_Y, ACCUMULATOR,
+    ZP_INDIRECT, ABSOLUTE_X_INDIRECT, ZP_RELATIVE
 } operand_type_t;
 
 // ============================================================
@@ -301,6 +302,113 @@ localparam OPCODE_TSX = 8'hBA;  // 8'b101_110_10
 localparam OPCODE_DEX = 8'hCA;  // 8'b110_010_10
 localparam OPCODE_NOP = 8'hEA;  // 8'b111_010_10
 
+// ============================================================
+// 65C02 opcodes
+//
+// Decoded only when cpu_6502 is built with ENABLE_65C02. They
+// reuse opcodes that are undocumented on the NMOS 6502, which
+// keep their NMOS behavior otherwise. The tools read the
+// localparams below this banner as the 65C02 set.
+// ============================================================
+
+// (zp) — 8'baaa_100_10, the cc=01 ALU group operation aaa
+localparam OPCODE_TYPE_ZP_IND = 8'b???10010;
+localparam OPCODE_ORA_ZP_IND  = 8'h12;  // 8'b000_100_10
+localparam OPCODE_AND_ZP_IND  = 8'h32;  // 8'b001_100_10
+localparam OPCODE_EOR_ZP_IND  = 8'h52;  // 8'b010_100_10
+localparam OPCODE_ADC_ZP_IND  = 8'h72;  // 8'b011_100_10
+localparam OPCODE_STA_ZP_IND  = 8'h92;  // 8'b100_100_10
+localparam OPCODE_LDA_ZP_IND  = 8'hB2;  // 8'b101_100_10
+localparam OPCODE_CMP_ZP_IND  = 8'hD2;  // 8'b110_100_10
+localparam OPCODE_SBC_ZP_IND  = 8'hF2;  // 8'b111_100_10
+
+// STZ — store zero
+localparam OPCODE_STZ_ZP    = 8'h64;  // 8'b011_001_00
+localparam OPCODE_STZ_ZP_X  = 8'h74;  // 8'b011_101_00
+localparam OPCODE_STZ_ABS   = 8'h9C;  // 8'b100_111_00
+localparam OPCODE_STZ_ABS_X = 8'h9E;  // 8'b100_111_10
+
+// TSB/TRB — test and set/reset bits in memory with A
+localparam OPCODE_TSB_ZP    = 8'h04;  // 8'b000_001_00
+localparam OPCODE_TSB_ABS   = 8'h0C;  // 8'b000_011_00
+localparam OPCODE_TRB_ZP    = 8'h14;  // 8'b000_101_00
+localparam OPCODE_TRB_ABS   = 8'h1C;  // 8'b000_111_00
+
+// Implied
+localparam OPCODE_BRA     = 8'h80;  // 8'b100_000_00  always taken
+localparam OPCODE_INC_ACC = 8'h1A;  // 8'b000_110_10
+localparam OPCODE_DEC_ACC = 8'h3A;  // 8'b001_110_10
+localparam OPCODE_PHY     = 8'h5A;  // 8'b010_110_10
+localparam OPCODE_PLY     = 8'h7A;  // 8'b011_110_10
+localparam OPCODE_PHX     = 8'hDA;  // 8'b110_110_10
+localparam OPCODE_PLX     = 8'hFA;  // 8'b111_110_10
+localparam OPCODE_WAI     = 8'hCB;  // 8'b110_010_11  wait for an interrupt
+localparam OPCODE_STP     = 8'hDB;  // 8'b110_110_11  stop until reset
+
+// BIT — the modes the NMOS 6502 lacks; #imm only sets Z
+localparam OPCODE_BIT_IMM   = 8'h89;  // 8'b100_010_01
+localparam OPCODE_BIT_ZP_X  = 8'h34;  // 8'b001_101_00
+localparam OPCODE_BIT_ABS_X = 8'h3C;  // 8'b001_111_00
+
+localparam OPCODE_JMP_IND_X = 8'h7C;  // 8'b011_111_00  JMP (abs,X)
+
+// RMB/SMB — reset/set bit aaa of a zero page byte
+localparam OPCODE_TYPE_RMB = 8'b0???0111;
+localparam OPCODE_TYPE_SMB = 8'b1???0111;
+localparam OPCODE_RMB0 = 8'h07;
+localparam OPCODE_RMB1 = 8'h17;
+localparam OPCODE_RMB2 = 8'h27;
+localparam OPCODE_RMB3 = 8'h37;
+localparam OPCODE_RMB4 = 8'h47;
+localparam OPCODE_RMB5 = 8'h57;
+localparam OPCODE_RMB6 = 8'h67;
+localparam OPCODE_RMB7 = 8'h77;
+localparam OPCODE_SMB0 = 8'h87;
+localparam OPCODE_SMB1 = 8'h97;
+localparam OPCODE_SMB2 = 8'hA7;
+localparam OPCODE_SMB3 = 8'hB7;
+localparam OPCODE_SMB4 = 8'hC7;
+localparam OPCODE_SMB5 = 8'hD7;
+localparam OPCODE_SMB6 = 8'hE7;
+localparam OPCODE_SMB7 = 8'hF7;
+
+// BBR/BBS — branch if bit aaa of a zero page byte is reset/set
+localparam OPCODE_TYPE_BBR = 8'b0???1111;
+localparam OPCODE_TYPE_BBS = 8'b1???1111;
+localparam OPCODE_BBR0 = 8'h0F;
+localparam OPCODE_BBR1 = 8'h1F;
+localparam OPCODE_BBR2 = 8'h2F;
+localparam OPCODE_BBR3 = 8'h3F;
+localparam OPCODE_BBR4 = 8'h4F;
+localparam OPCODE_BBR5 = 8'h5F;
+localparam OPCODE_BBR6 = 8'h6F;
+localparam OPCODE_BBR7 = 8'h7F;
+localparam OPCODE_BBS0 = 8'h8F;
+localparam OPCODE_BBS1 = 8'h9F;
+localparam OPCODE_BBS2 = 8'hAF;
+localparam OPCODE_BBS3 = 8'hBF;
+localparam OPCODE_BBS4 = 8'hCF;
+localparam OPCODE_BBS5 = 8'hDF;
+localparam OPCODE_BBS6 = 8'hEF;
+localparam OPCODE_BBS7 = 8'hFF;
+
+// NOPs that skip an operand. The other unused opcodes, x3 and xB, are
+// 1-byte NOPs as on the NMOS core.
+localparam OPCODE_NOP_IMM_02   = 8'h02;  // 8'b000_000_10
+localparam OPCODE_NOP_IMM_22   = 8'h22;  // 8'b001_000_10
+localparam OPCODE_NOP_IMM_42   = 8'h42;  // 8'b010_000_10
+localparam OPCODE_NOP_IMM_62   = 8'h62;  // 8'b011_000_10
+localparam OPCODE_NOP_IMM_82   = 8'h82;  // 8'b100_000_10
+localparam OPCODE_NOP_IMM_C2   = 8'hC2;  // 8'b110_000_10
+localparam OPCODE_NOP_IMM_E2   = 8'hE2;  // 8'b111_000_10
+localparam OPCODE_NOP_ZP_44    = 8'h44;  // 8'b010_001_00
+localparam OPCODE_NOP_ZP_X_54  = 8'h54;  // 8'b010_101_00
+localparam OPCODE_NOP_ZP_X_D4  = 8'hD4;  // 8'b110_101_00  shares the CPY pattern
+localparam OPCODE_NOP_ZP_X_F4  = 8'hF4;  // 8'b111_101_00  shares the CPX pattern
+localparam OPCODE_NOP_ABS_5C   = 8'h5C;  // 8'b010_111_00
+localparam OPCODE_NOP_ABS_DC   = 8'hDC;  // 8'b110_111_00  shares the CPY pattern
+localparam OPCODE_NOP_ABS_FC   = 8'hFC;  // 8'b111_111_00  shares the CPX pattern
+
 
 typedef enum logic [3:0] {
     ALU_ADC = 0, ALU_AND = 1, ALU_ORA = 2, ALU_EOR = 3,
@@ -314,7 +422,7 @@ typedef enum logic [5:0] {
     READ_ADL = 15, BUFFER_ADL = 16, PUSH_PCH = 17, PUSH_PCL = 18, READ_ADH = 19, PC_INC = 20,
     READ_PCL = 21, READ_PCH = 22, LOAD_PC_EFFECTIVE_LO = 23, LOAD_PC_EFFECTIVE_HI = 24,
     READ_EFFECTIVE_LO = 25, READ_EFFECTIVE_HI = 26, PULL_REGISTER = 27, WRITE_SR = 28,
-    READ_VECTOR_HI = 29, PULL_PCH = 30, PULL_PCL = 31, LOAD_VECTOR = 32
+    READ_VECTOR_HI = 29, PULL_PCH = 30, PULL_PCL = 31, LOAD_VECTOR = 32, WAIT = 33
 } microinstruction_t;
 
 /* verilator lint_on UNUSEDPARAM */
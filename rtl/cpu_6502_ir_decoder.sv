@@ -1,5 +1,7 @@
 `include "cpu_6502_instructions.vh"
-module cpu_6502_ir_decoder (
+module cpu_6502_ir_decoder #(
+    parameter ENABLE_65C02 = 0
+) (
     input [7:0] i_opcode,
     output operand_type_t o_operand_type
 );
@@ -121,5 +123,37 @@ always_comb begin
     default:
         o_operand_type = IMPLIED;
     endcase
+
+    // 65C02 opcodes override the NMOS decode
+    if (ENABLE_65C02) begin
+        priority casez (i_opcode)
+        OPCODE_TYPE_ZP_IND:
+            o_operand_type = ZP_INDIRECT;
+        OPCODE_BIT_IMM, OPCODE_NOP_IMM_02, OPCODE_NOP_IMM_22, OPCODE_NOP_IMM_42,
+        OPCODE_NOP_IMM_62, OPCODE_NOP_IMM_82, OPCODE_NOP_IMM_C2, OPCODE_NOP_IMM_E2:
+            o_operand_type = IMMEDIATE;
+        OPCODE_STZ_ZP, OPCODE_TSB_ZP, OPCODE_TRB_ZP, OPCODE_TYPE_RMB, OPCODE_TYPE_SMB,
+        OPCODE_NOP_ZP_44:
+            o_operand_type = ZP;
+        OPCODE_STZ_ZP_X, OPCODE_BIT_ZP_X, OPCODE_NOP_ZP_X_54, OPCODE_NOP_ZP_X_D4,
+        OPCODE_NOP_ZP_X_F4:
+            o_operand_type = ZP_X;
+        OPCODE_STZ_ABS, OPCODE_TSB_ABS, OPCODE_TRB_ABS, OPCODE_NOP_ABS_5C,
+        OPCODE_NOP_ABS_DC, OPCODE_NOP_ABS_FC:
+            o_operand_type = ABSOLUTE;
+        OPCODE_STZ_ABS_X, OPCODE_BIT_ABS_X:
+            o_operand_type = ABSOLUTE_X;
+        OPCODE_JMP_IND_X:
+            o_operand_type = ABSOLUTE_X_INDIRECT;
+        OPCODE_TYPE_BBR, OPCODE_TYPE_BBS:
+            o_operand_type = ZP_RELATIVE;
+        OPCODE_BRA:
+            o_operand_type = RELATIVE;
+        OPCODE_INC_ACC, OPCODE_DEC_ACC, OPCODE_PHX, OPCODE_PLX,
+        OPCODE_PHY, OPCODE_PLY, OPCODE_WAI, OPCODE_STP:
+            o_operand_type = IMPLIED;
+        default: ;
+        endcase
+    end
 end
 endmodule
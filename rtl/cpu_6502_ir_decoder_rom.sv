@@ -0,0 +1,359 @@
+`include "cpu_6502_instructions.vh"
+
+// Generated by tools/ir_decoder.py from the opcode tables in
+// cpu_6502_instructions.vh. Do not edit by hand: run `make ir-decoder-rom`.
+//
+// Drop-in replacement for cpu_6502_ir_decoder, selected with the
+// IR_DECODER_ROM parameter of cpu_6502.
+module cpu_6502_ir_decoder_rom #(
+    parameter ENABLE_65C02 = 0
+) (
+    input [7:0] i_opcode,
+    output operand_type_t o_operand_type
+);
+
+// Operand type ROM indexed by opcode. Combinational read: the opcode is
+// decoded off the bus in the fetch cycle, so this is built from LUTs
+// rather than EBR/block RAM.
+reg [3:0] rom [0:255];
+
+initial begin
+    rom[8'h00] = IMPLIED;             // BRK
+    rom[8'h01] = INDEX_X_INDIRECT;    // ORA_IZX
+    rom[8'h02] = IMPLIED;
+    rom[8'h03] = IMPLIED;
+    rom[8'h04] = IMPLIED;
+    rom[8'h05] = ZP;                  // ORA_ZP
+    rom[8'h06] = ZP;                  // ASL_ZP
+    rom[8'h07] = IMPLIED;
+    rom[8'h08] = IMPLIED;             // PHP
+    rom[8'h09] = IMMEDIATE;           // ORA_IMM
+    rom[8'h0A] = ACCUMULATOR;         // ASL_ACC
+    rom[8'h0B] = IMPLIED;
+    rom[8'h0C] = IMPLIED;
+    rom[8'h0D] = ABSOLUTE;            // ORA_ABS
+    rom[8'h0E] = ABSOLUTE;            // ASL_ABS
+    rom[8'h0F] = IMPLIED;
+    rom[8'h10] = RELATIVE;            // BPL
+    rom[8'h11] = INDEX_Y_INDIRECT;    // ORA_IZY
+    rom[8'h12] = IMPLIED;
+    rom[8'h13] = IMPLIED;
+    rom[8'h14] = IMPLIED;
+    rom[8'h15] = ZP_X;                // ORA_ZP_X
+    rom[8'h16] = ZP_X;                // ASL_ZP_X
+    rom[8'h17] = IMPLIED;
+    rom[8'h18] = IMPLIED;             // CLC
+    rom[8'h19] = ABSOLUTE_Y;          // ORA_ABS_Y
+    rom[8'h1A] = IMPLIED;
+    rom[8'h1B] = IMPLIED;
+    rom[8'h1C] = IMPLIED;
+    rom[8'h1D] = ABSOLUTE_X;          // ORA_ABS_X
+    rom[8'h1E] = ABSOLUTE_X;          // ASL_ABS_X
+    rom[8'h1F] = IMPLIED;
+    rom[8'h20] = ABSOLUTE;            // JSR
+    rom[8'h21] = INDEX_X_INDIRECT;    // AND_IZX
+    rom[8'h22] = IMPLIED;
+    rom[8'h23] = IMPLIED;
+    rom[8'h24] = ZP;                  // BIT_ZP
+    rom[8'h25] = ZP;                  // AND_ZP
+    rom[8'h26] = ZP;                  // ROL_ZP
+    rom[8'h27] = IMPLIED;
+    rom[8'h28] = IMPLIED;             // PLP
+    rom[8'h29] = IMMEDIATE;           // AND_IMM
+    rom[8'h2A] = ACCUMULATOR;         // ROL_ACC
+    rom[8'h2B] = IMPLIED;
+    rom[8'h2C] = ABSOLUTE;            // BIT_ABS
+    rom[8'h2D] = ABSOLUTE;            // AND_ABS
+    rom[8'h2E] = ABSOLUTE;            // ROL_ABS
+    rom[8'h2F] = IMPLIED;
+    rom[8'h30] = RELATIVE;            // BMI
+    rom[8'h31] = INDEX_Y_INDIRECT;    // AND_IZY
+    rom[8'h32] = IMPLIED;
+    rom[8'h33] = IMPLIED;
+    rom[8'h34] = IMPLIED;
+    rom[8'h35] = ZP_X;                // AND_ZP_X
+    rom[8'h36] = ZP_X;                // ROL_ZP_X
+    rom[8'h37] = IMPLIED;
+    rom[8'h38] = IMPLIED;             // SEC
+    rom[8'h39] = ABSOLUTE_Y;          // AND_ABS_Y
+    rom[8'h3A] = IMPLIED;
+    rom[8'h3B] = IMPLIED;
+    rom[8'h3C] = IMPLIED;
+    rom[8'h3D] = ABSOLUTE_X;          // AND_ABS_X
+    rom[8'h3E] = ABSOLUTE_X;          // ROL_ABS_X
+    rom[8'h3F] = IMPLIED;
+    rom[8'h40] = IMPLIED;             // RTI
+    rom[8'h41] = INDEX_X_INDIRECT;    // EOR_IZX
+    rom[8'h42] = IMPLIED;
+    rom[8'h43] = IMPLIED;
+    rom[8'h44] = IMPLIED;
+    rom[8'h45] = ZP;                  // EOR_ZP
+    rom[8'h46] = ZP;                  // LSR_ZP
+    rom[8'h47] = IMPLIED;
+    rom[8'h48] = IMPLIED;             // PHA
+    rom[8'h49] = IMMEDIATE;           // EOR_IMM
+    rom[8'h4A] = ACCUMULATOR;         // LSR_ACC
+    rom[8'h4B] = IMPLIED;
+    rom[8'h4C] = ABSOLUTE;            // JMP_ABS
+    rom[8'h4D] = ABSOLUTE;            // EOR_ABS
+    rom[8'h4E] = ABSOLUTE;            // LSR_ABS
+    rom[8'h4F] = IMPLIED;
+    rom[8'h50] = RELATIVE;            // BVC
+    rom[8'h51] = INDEX_Y_INDIRECT;    // EOR_IZY
+    rom[8'h52] = IMPLIED;
+    rom[8'h53] = IMPLIED;
+    rom[8'h54] = IMPLIED;
+    rom[8'h55] = ZP_X;                // EOR_ZP_X
+    rom[8'h56] = ZP_X;                // LSR_ZP_X
+    rom[8'h57] = IMPLIED;
+    rom[8'h58] = IMPLIED;             // CLI
+    rom[8'h59] = ABSOLUTE_Y;          // EOR_ABS_Y
+    rom[8'h5A] = IMPLIED;
+    rom[8'h5B] = IMPLIED;
+    rom[8'h5C] = IMPLIED;
+    rom[8'h5D] = ABSOLUTE_X;          // EOR_ABS_X
+    rom[8'h5E] = ABSOLUTE_X;          // LSR_ABS_X
+    rom[8'h5F] = IMPLIED;
+    rom[8'h60] = IMPLIED;             // RTS
+    rom[8'h61] = INDEX_X_INDIRECT;    // ADC_IZX
+    rom[8'h62] = IMPLIED;
+    rom[8'h63] = IMPLIED;
+    rom[8'h64] = IMPLIED;
+    rom[8'h65] = ZP;                  // ADC_ZP
+    rom[8'h66] = ZP;                  // ROR_ZP
+    rom[8'h67] = IMPLIED;
+    rom[8'h68] = IMPLIED;             // PLA
+    rom[8'h69] = IMMEDIATE;           // ADC_IMM
+    rom[8'h6A] = ACCUMULATOR;         // ROR_ACC
+    rom[8'h6B] = IMPLIED;
+    rom[8'h6C] = INDIRECT;            // JMP_IND
+    rom[8'h6D] = ABSOLUTE;            // ADC_ABS
+    rom[8'h6E] = ABSOLUTE;            // ROR_ABS
+    rom[8'h6F] = IMPLIED;
+    rom[8'h70] = RELATIVE;            // BVS
+    rom[8'h71] = INDEX_Y_INDIRECT;    // ADC_IZY
+    rom[8'h72] = IMPLIED;
+    rom[8'h73] = IMPLIED;
+    rom[8'h74] = IMPLIED;
+    rom[8'h75] = ZP_X;                // ADC_ZP_X
+    rom[8'h76] = ZP_X;                // ROR_ZP_X
+    rom[8'h77] = IMPLIED;
+    rom[8'h78] = IMPLIED;             // SEI
+    rom[8'h79] = ABSOLUTE_Y;          // ADC_ABS_Y
+    rom[8'h7A] = IMPLIED;
+    rom[8'h7B] = IMPLIED;
+    rom[8'h7C] = IMPLIED;
+    rom[8'h7D] = ABSOLUTE_X;          // ADC_ABS_X
+    rom[8'h7E] = ABSOLUTE_X;          // ROR_ABS_X
+    rom[8'h7F] = IMPLIED;
+    rom[8'h80] = IMPLIED;
+    rom[8'h81] = INDEX_X_INDIRECT;    // STA_IZX
+    rom[8'h82] = IMPLIED;
+    rom[8'h83] = IMPLIED;
+    rom[8'h84] = ZP;                  // STY_ZP
+    rom[8'h85] = ZP;                  // STA_ZP
+    rom[8'h86] = ZP;                  // STX_ZP
+    rom[8'h87] = IMPLIED;
+    rom[8'h88] = IMPLIED;             // DEY
+    rom[8'h89] = IMMEDIATE;
+    rom[8'h8A] = IMPLIED;             // TXA
+    rom[8'h8B] = IMPLIED;
+    rom[8'h8C] = ABSOLUTE;            // STY_ABS
+    rom[8'h8D] = ABSOLUTE;            // STA_ABS
+    rom[8'h8E] = ABSOLUTE;            // STX_ABS
+    rom[8'h8F] = IMPLIED;
+    rom[8'h90] = RELATIVE;            // BCC
+    rom[8'h91] = INDEX_Y_INDIRECT;    // STA_IZY
+    rom[8'h92] = IMPLIED;
+    rom[8'h93] = IMPLIED;
+    rom[8'h94] = ZP_X;                // STY_ZP_X
+    rom[8'h95] = ZP_X;                // STA_ZP_X
+    rom[8'h96] = ZP_Y;                // STX_ZP_Y
+    rom[8'h97] = IMPLIED;
+    rom[8'h98] = IMPLIED;             // TYA
+    rom[8'h99] = ABSOLUTE_Y;          // STA_ABS_Y
+    rom[8'h9A] = IMPLIED;             // TXS
+    rom[8'h9B] = IMPLIED;
+    rom[8'h9C] = IMPLIED;
+    rom[8'h9D] = ABSOLUTE_X;          // STA_ABS_X
+    rom[8'h9E] = IMPLIED;
+    rom[8'h9F] = IMPLIED;
+    rom[8'hA0] = IMMEDIATE;           // LDY_IMM
+    rom[8'hA1] = INDEX_X_INDIRECT;    // LDA_IZX
+    rom[8'hA2] = IMMEDIATE;           // LDX_IMM
+    rom[8'hA3] = IMPLIED;
+    rom[8'hA4] = ZP;                  // LDY_ZP
+    rom[8'hA5] = ZP;                  // LDA_ZP
+    rom[8'hA6] = ZP;                  // LDX_ZP
+    rom[8'hA7] = IMPLIED;
+    rom[8'hA8] = IMPLIED;             // TAY
+    rom[8'hA9] = IMMEDIATE;           // LDA_IMM
+    rom[8'hAA] = IMPLIED;             // TAX
+    rom[8'hAB] = IMPLIED;
+    rom[8'hAC] = ABSOLUTE;            // LDY_ABS
+    rom[8'hAD] = ABSOLUTE;            // LDA_ABS
+    rom[8'hAE] = ABSOLUTE;            // LDX_ABS
+    rom[8'hAF] = IMPLIED;
+    rom[8'hB0] = RELATIVE;            // BCS
+    rom[8'hB1] = INDEX_Y_INDIRECT;    // LDA_IZY
+    rom[8'hB2] = IMPLIED;
+    rom[8'hB3] = IMPLIED;
+    rom[8'hB4] = ZP_X;                // LDY_ZP_X
+    rom[8'hB5] = ZP_X;                // LDA_ZP_X
+    rom[8'hB6] = ZP_Y;                // LDX_ZP_Y
+    rom[8'hB7] = IMPLIED;
+    rom[8'hB8] = IMPLIED;             // CLV
+    rom[8'hB9] = ABSOLUTE_Y;          // LDA_ABS_Y
+    rom[8'hBA] = IMPLIED;             // TSX
+    rom[8'hBB] = IMPLIED;
+    rom[8'hBC] = ABSOLUTE_X;          // LDY_ABS_X
+    rom[8'hBD] = ABSOLUTE_X;          // LDA_ABS_X
+    rom[8'hBE] = ABSOLUTE_Y;          // LDX_ABS_Y
+    rom[8'hBF] = IMPLIED;
+    rom[8'hC0] = IMMEDIATE;           // CPY_IMM
+    rom[8'hC1] = INDEX_X_INDIRECT;    // CMP_IZX
+    rom[8'hC2] = IMPLIED;
+    rom[8'hC3] = IMPLIED;
+    rom[8'hC4] = ZP;                  // CPY_ZP
+    rom[8'hC5] = ZP;                  // CMP_ZP
+    rom[8'hC6] = ZP;                  // DEC_ZP
+    rom[8'hC7] = IMPLIED;
+    rom[8'hC8] = IMPLIED;             // INY
+    rom[8'hC9] = IMMEDIATE;           // CMP_IMM
+    rom[8'hCA] = IMPLIED;             // DEX
+    rom[8'hCB] = IMPLIED;
+    rom[8'hCC] = ABSOLUTE;            // CPY_ABS
+    rom[8'hCD] = ABSOLUTE;            // CMP_ABS
+    rom[8'hCE] = ABSOLUTE;            // DEC_ABS
+    rom[8'hCF] = IMPLIED;
+    rom[8'hD0] = RELATIVE;            // BNE
+    rom[8'hD1] = INDEX_Y_INDIRECT;    // CMP_IZY
+    rom[8'hD2] = IMPLIED;
+    rom[8'hD3] = IMPLIED;
+    rom[8'hD4] = IMPLIED;
+    rom[8'hD5] = ZP_X;                // CMP_ZP_X
+    rom[8'hD6] = ZP_X;                // DEC_ZP_X
+    rom[8'hD7] = IMPLIED;
+    rom[8'hD8] = IMPLIED;             // CLD
+    rom[8'hD9] = ABSOLUTE_Y;          // CMP_ABS_Y
+    rom[8'hDA] = IMPLIED;
+    rom[8'hDB] = IMPLIED;
+    rom[8'hDC] = IMPLIED;
+    rom[8'hDD] = ABSOLUTE_X;          // CMP_ABS_X
+    rom[8'hDE] = ABSOLUTE_X;          // DEC_ABS_X
+    rom[8'hDF] = IMPLIED;
+    rom[8'hE0] = IMMEDIATE;           // CPX_IMM
+    rom[8'hE1] = INDEX_X_INDIRECT;    // SBC_IZX
+    rom[8'hE2] = IMPLIED;
+    rom[8'hE3] = IMPLIED;
+    rom[8'hE4] = ZP;                  // CPX_ZP
+    rom[8'hE5] = ZP;                  // SBC_ZP
+    rom[8'hE6] = ZP;                  // INC_ZP
+    rom[8'hE7] = IMPLIED;
+    rom[8'hE8] = IMPLIED;             // INX
+    rom[8'hE9] = IMMEDIATE;           // SBC_IMM
+    rom[8'hEA] = IMPLIED;             // NOP
+    rom[8'hEB] = IMPLIED;
+    rom[8'hEC] = ABSOLUTE;            // CPX_ABS
+    rom[8'hED] = ABSOLUTE;            // SBC_ABS
+    rom[8'hEE] = ABSOLUTE;            // INC_ABS
+    rom[8'hEF] = IMPLIED;
+    rom[8'hF0] = RELATIVE;            // BEQ
+    rom[8'hF1] = INDEX_Y_INDIRECT;    // SBC_IZY
+    rom[8'hF2] = IMPLIED;
+    rom[8'hF3] = IMPLIED;
+    rom[8'hF4] = IMPLIED;
+    rom[8'hF5] = ZP_X;                // SBC_ZP_X
+    rom[8'hF6] = ZP_X;                // INC_ZP_X
+    rom[8'hF7] = IMPLIED;
+    rom[8'hF8] = IMPLIED;             // SED
+    rom[8'hF9] = ABSOLUTE_Y;          // SBC_ABS_Y
+    rom[8'hFA] = IMPLIED;
+    rom[8'hFB] = IMPLIED;
+    rom[8'hFC] = IMPLIED;
+    rom[8'hFD] = ABSOLUTE_X;          // SBC_ABS_X
+    rom[8'hFE] = ABSOLUTE_X;          // INC_ABS_X
+    rom[8'hFF] = IMPLIED;
+
+    if (ENABLE_65C02) begin
+        rom[8'h02] = IMMEDIATE;           // NOP_IMM_02
+        rom[8'h04] = ZP;                  // TSB_ZP
+        rom[8'h07] = ZP;                  // RMB0
+        rom[8'h0C] = ABSOLUTE;            // TSB_ABS
+        rom[8'h0F] = ZP_RELATIVE;         // BBR0
+        rom[8'h12] = ZP_INDIRECT;         // ORA_ZP_IND
+        rom[8'h14] = ZP;                  // TRB_ZP
+        rom[8'h17] = ZP;                  // RMB1
+        rom[8'h1A] = IMPLIED;             // INC_ACC
+        rom[8'h1C] = ABSOLUTE;            // TRB_ABS
+        rom[8'h1F] = ZP_RELATIVE;         // BBR1
+        rom[8'h22] = IMMEDIATE;           // NOP_IMM_22
+        rom[8'h27] = ZP;                  // RMB2
+        rom[8'h2F] = ZP_RELATIVE;         // BBR2
+        rom[8'h32] = ZP_INDIRECT;         // AND_ZP_IND
+        rom[8'h34] = ZP_X;                // BIT_ZP_X
+        rom[8'h37] = ZP;                  // RMB3
+        rom[8'h3A] = IMPLIED;             // DEC_ACC
+        rom[8'h3C] = ABSOLUTE_X;          // BIT_ABS_X
+        rom[8'h3F] = ZP_RELATIVE;         // BBR3
+        rom[8'h42] = IMMEDIATE;           // NOP_IMM_42
+        rom[8'h44] = ZP;                  // NOP_ZP_44
+        rom[8'h47] = ZP;                  // RMB4
+        rom[8'h4F] = ZP_RELATIVE;         // BBR4
+        rom[8'h52] = ZP_INDIRECT;         // EOR_ZP_IND
+        rom[8'h54] = ZP_X;                // NOP_ZP_X_54
+        rom[8'h57] = ZP;                  // RMB5
+        rom[8'h5A] = IMPLIED;             // PHY
+        rom[8'h5C] = ABSOLUTE;            // NOP_ABS_5C
+        rom[8'h5F] = ZP_RELATIVE;         // BBR5
+        rom[8'h62] = IMMEDIATE;           // NOP_IMM_62
+        rom[8'h64] = ZP;                  // STZ_ZP
+        rom[8'h67] = ZP;                  // RMB6
+        rom[8'h6F] = ZP_RELATIVE;         // BBR6
+        rom[8'h72] = ZP_INDIRECT;         // ADC_ZP_IND
+        rom[8'h74] = ZP_X;                // STZ_ZP_X
+        rom[8'h77] = ZP;                  // RMB7
+        rom[8'h7A] = IMPLIED;             // PLY
+        rom[8'h7C] = ABSOLUTE_X_INDIRECT; // JMP_IND_X
+        rom[8'h7F] = ZP_RELATIVE;         // BBR7
+        rom[8'h80] = RELATIVE;            // BRA
+        rom[8'h82] = IMMEDIATE;           // NOP_IMM_82
+        rom[8'h87] = ZP;                  // SMB0
+        rom[8'h89] = IMMEDIATE;           // BIT_IMM
+        rom[8'h8F] = ZP_RELATIVE;         // BBS0
+        rom[8'h92] = ZP_INDIRECT;         // STA_ZP_IND
+        rom[8'h97] = ZP;                  // SMB1
+        rom[8'h9C] = ABSOLUTE;            // STZ_ABS
+        rom[8'h9E] = ABSOLUTE_X;          // STZ_ABS_X
+        rom[8'h9F] = ZP_RELATIVE;         // BBS1
+        rom[8'hA7] = ZP;                  // SMB2
+        rom[8'hAF] = ZP_RELATIVE;         // BBS2
+        rom[8'hB2] = ZP_INDIRECT;         // LDA_ZP_IND
+        rom[8'hB7] = ZP;                  // SMB3
+        rom[8'hBF] = ZP_RELATIVE;         // BBS3
+        rom[8'hC2] = IMMEDIATE;           // NOP_IMM_C2
+        rom[8'hC7] = ZP;                  // SMB4
+        rom[8'hCB] = IMPLIED;             // WAI
+        rom[8'hCF] = ZP_RELATIVE;         // BBS4
+        rom[8'hD2] = ZP_INDIRECT;         // CMP_ZP_IND
+        rom[8'hD4] = ZP_X;                // NOP_ZP_X_D4
+        rom[8'hD7] = ZP;                  // SMB5
+        rom[8'hDA] = IMPLIED;             // PHX
+        rom[8'hDB] = IMPLIED;             // STP
+        rom[8'hDC] = ABSOLUTE;            // NOP_ABS_DC
+        rom[8'hDF] = ZP_RELATIVE;         // BBS5
+        rom[8'hE2] = IMMEDIATE;           // NOP_IMM_E2
+        rom[8'hE7] = ZP;                  // SMB6
+        rom[8'hEF] = ZP_RELATIVE;         // BBS6
+        rom[8'hF2] = ZP_INDIRECT;         // SBC_ZP_IND
+        rom[8'hF4] = ZP_X;                // NOP_ZP_X_F4
+        rom[8'hF7] = ZP;                  // SMB7
+        rom[8'hFA] = IMPLIED;             // PLX
+        rom[8'hFC] = ABSOLUTE;            // NOP_ABS_FC
+        rom[8'hFF] = ZP_RELATIVE;         // BBS7
+    end
+end
+
+assign o_operand_type = operand_type_t'(rom[i_opcode]);
+
+endmodule
@@ -1,8 +1,14 @@
 `include "cpu_6502_instructions.vh"
 
+// Generated by tools/microcode.py from its microcode table.
+// Do not edit by hand: change the table and run `make microcode`.
+//
 // Highly vertical microcode to save space. If the Microcode ROM was external it'd be better
 // to make it more horizontal, but for space savings this is chosen for now.
-module cpu_6502_microcode (
+module cpu_6502_microcode #(
+    parameter ENABLE_65C02 = 0,
+    parameter TURBO = 0
+) (
     input [7:0] i_current_instruction,
     input i_init,
     input i_handle_irq,
@@ -32,7 +38,7 @@ always_comb begin
         OPCODE_INX, OPCODE_INY, OPCODE_DEY, OPCODE_DEX, OPCODE_CLD,
         OPCODE_CLV, OPCODE_NOP, OPCODE_SED: begin
             case (i_current_microinstruction)
-            START: o_next_microinstruction = NOP;
+            START: o_next_microinstruction = TURBO ? MICRO_EXECUTE : NOP;
             NOP: o_next_microinstruction = MICRO_EXECUTE;
             MICRO_EXECUTE: o_next_microinstruction = START;
             default: ;
@@ -42,7 +48,7 @@ always_comb begin
             case (i_current_microinstruction)
             START: o_next_microinstruction = POP_STACK;
             POP_STACK: o_next_microinstruction = PULL_REGISTER;
-            PULL_REGISTER: o_next_microinstruction = STALL;
+            PULL_REGISTER: o_next_microinstruction = TURBO ? MICRO_EXECUTE : STALL;
             STALL: o_next_microinstruction = MICRO_EXECUTE;
             MICRO_EXECUTE: o_next_microinstruction = START;
             default: ;
@@ -51,7 +57,7 @@ always_comb begin
         OPCODE_PHA, OPCODE_PHP: begin
             case (i_current_microinstruction)
             START: o_next_microinstruction = PUSH_STACK;
-            PUSH_STACK: o_next_microinstruction = WRITE;
+            PUSH_STACK: o_next_microinstruction = TURBO ? MICRO_EXECUTE : WRITE;
             WRITE: o_next_microinstruction = MICRO_EXECUTE;
             MICRO_EXECUTE: o_next_microinstruction = START;
             default: ;
@@ -59,7 +65,7 @@ always_comb begin
         end
         OPCODE_ROL_ACC, OPCODE_ROR_ACC, OPCODE_ASL_ACC, OPCODE_LSR_ACC: begin
             case (i_current_microinstruction)
-            START: o_next_microinstruction = STALL;
+            START: o_next_microinstruction = TURBO ? MICRO_EXECUTE : STALL;
             STALL: o_next_microinstruction = MICRO_EXECUTE;
             MICRO_EXECUTE: o_next_microinstruction = START;
             default: ;
@@ -116,7 +122,7 @@ always_comb begin
             POP_STACK: o_next_microinstruction = RESTORE_STACK;
             RESTORE_STACK: o_next_microinstruction = RESTORE_STACK2;
             RESTORE_STACK2: o_next_microinstruction = PC_INC;
-            PC_INC: o_next_microinstruction = STALL;
+            PC_INC: o_next_microinstruction = TURBO ? MICRO_EXECUTE : STALL;
             STALL: o_next_microinstruction = MICRO_EXECUTE;
             MICRO_EXECUTE: o_next_microinstruction = START;
             default: ;
@@ -153,11 +159,12 @@ always_comb begin
             default: ;
             endcase
         end
-        OPCODE_TYPE_INC, OPCODE_TYPE_DEC, OPCODE_TYPE_ASL, OPCODE_TYPE_LSR, OPCODE_TYPE_ROR, OPCODE_TYPE_ROL: begin
+        OPCODE_TYPE_INC, OPCODE_TYPE_DEC, OPCODE_TYPE_ASL,
+        OPCODE_TYPE_LSR, OPCODE_TYPE_ROR, OPCODE_TYPE_ROL: begin
             case (i_current_microinstruction)
             START: o_next_microinstruction = LOAD;
             LOAD: o_next_microinstruction = ALU_MODIFY;
-            ALU_MODIFY: o_next_microinstruction = STALL;
+            ALU_MODIFY: o_next_microinstruction = TURBO ? MICRO_EXECUTE : STALL;
             STALL: o_next_microinstruction = MICRO_EXECUTE;
             MICRO_EXECUTE: o_next_microinstruction = START;
             default: ;
@@ -173,13 +180,119 @@ always_comb begin
         end
         default: begin
             case (i_current_microinstruction)
-            START: o_next_microinstruction = NOP;
+            START: o_next_microinstruction = TURBO ? MICRO_EXECUTE : NOP;
             NOP: o_next_microinstruction = MICRO_EXECUTE;
             MICRO_EXECUTE: o_next_microinstruction = START;
             default: ;
             endcase
         end
         endcase
+
+        // 65C02 opcodes override the NMOS decode
+        if (ENABLE_65C02) begin
+            priority casez (i_current_instruction)
+            OPCODE_INC_ACC, OPCODE_DEC_ACC: begin
+                case (i_current_microinstruction)
+                START: o_next_microinstruction = TURBO ? MICRO_EXECUTE : STALL;
+                STALL: o_next_microinstruction = MICRO_EXECUTE;
+                MICRO_EXECUTE: o_next_microinstruction = START;
+                default: o_next_microinstruction = NOP;
+                endcase
+            end
+            OPCODE_PLX, OPCODE_PLY: begin
+                case (i_current_microinstruction)
+                START: o_next_microinstruction = POP_STACK;
+                POP_STACK: o_next_microinstruction = PULL_REGISTER;
+                PULL_REGISTER: o_next_microinstruction = TURBO ? MICRO_EXECUTE : STALL;
+                STALL: o_next_microinstruction = MICRO_EXECUTE;
+                MICRO_EXECUTE: o_next_microinstruction = START;
+                default: o_next_microinstruction = NOP;
+                endcase
+            end
+            OPCODE_PHX, OPCODE_PHY: begin
+                case (i_current_microinstruction)
+                START: o_next_microinstruction = PUSH_STACK;
+                PUSH_STACK: o_next_microinstruction = TURBO ? MICRO_EXECUTE : WRITE;
+                WRITE: o_next_microinstruction = MICRO_EXECUTE;
+                MICRO_EXECUTE: o_next_microinstruction = START;
+                default: o_next_microinstruction = NOP;
+                endcase
+            end
+            OPCODE_BRA: begin
+                case (i_current_microinstruction)
+                START: o_next_microinstruction = MAYBE_BRANCH;
+                MAYBE_BRANCH: o_next_microinstruction = MICRO_EXECUTE;
+                MICRO_EXECUTE: o_next_microinstruction = START;
+                default: o_next_microinstruction = NOP;
+                endcase
+            end
+            OPCODE_WAI, OPCODE_STP: begin
+                case (i_current_microinstruction)
+                START: o_next_microinstruction = STALL;
+                STALL: o_next_microinstruction = WAIT;
+                WAIT: o_next_microinstruction = MICRO_EXECUTE;
+                MICRO_EXECUTE: o_next_microinstruction = START;
+                default: o_next_microinstruction = NOP;
+                endcase
+            end
+            OPCODE_STA_ZP_IND, OPCODE_STZ_ZP, OPCODE_STZ_ZP_X,
+            OPCODE_STZ_ABS, OPCODE_STZ_ABS_X: begin
+                case (i_current_microinstruction)
+                START: o_next_microinstruction = STORE;
+                STORE: o_next_microinstruction = MICRO_EXECUTE;
+                MICRO_EXECUTE: o_next_microinstruction = START;
+                default: o_next_microinstruction = NOP;
+                endcase
+            end
+            OPCODE_TYPE_ZP_IND, OPCODE_BIT_IMM, OPCODE_NOP_IMM_02,
+            OPCODE_NOP_IMM_22, OPCODE_NOP_IMM_42, OPCODE_NOP_IMM_62,
+            OPCODE_NOP_IMM_82, OPCODE_NOP_IMM_C2, OPCODE_NOP_IMM_E2,
+            OPCODE_NOP_ZP_44, OPCODE_NOP_ZP_X_54, OPCODE_NOP_ZP_X_D4,
+            OPCODE_NOP_ZP_X_F4, OPCODE_NOP_ABS_5C, OPCODE_NOP_ABS_DC,
+            OPCODE_NOP_ABS_FC: begin
+                case (i_current_microinstruction)
+                START: o_next_microinstruction = LOAD;
+                LOAD: o_next_microinstruction = MICRO_EXECUTE;
+                MICRO_EXECUTE: o_next_microinstruction = START;
+                default: o_next_microinstruction = NOP;
+                endcase
+            end
+            OPCODE_TSB_ZP, OPCODE_TSB_ABS, OPCODE_TRB_ZP,
+            OPCODE_TRB_ABS, OPCODE_TYPE_RMB, OPCODE_TYPE_SMB: begin
+                case (i_current_microinstruction)
+                START: o_next_microinstruction = LOAD;
+                LOAD: o_next_microinstruction = ALU_MODIFY;
+                ALU_MODIFY: o_next_microinstruction = TURBO ? MICRO_EXECUTE : STALL;
+                STALL: o_next_microinstruction = MICRO_EXECUTE;
+                MICRO_EXECUTE: o_next_microinstruction = START;
+                default: o_next_microinstruction = NOP;
+                endcase
+            end
+            OPCODE_TYPE_BBR, OPCODE_TYPE_BBS: begin
+                case (i_current_microinstruction)
+                START: o_next_microinstruction = LOAD;
+                LOAD: o_next_microinstruction = TURBO ? MAYBE_BRANCH : STALL;
+                STALL: o_next_microinstruction = MAYBE_BRANCH;
+                MAYBE_BRANCH: o_next_microinstruction = MICRO_EXECUTE;
+                MICRO_EXECUTE: o_next_microinstruction = START;
+                default: o_next_microinstruction = NOP;
+                endcase
+            end
+            OPCODE_JMP_IND_X: begin
+                case (i_current_microinstruction)
+                START: o_next_microinstruction = READ_EFFECTIVE_LO;
+                READ_EFFECTIVE_LO: o_next_microinstruction = READ_EFFECTIVE_HI;
+                READ_EFFECTIVE_HI: o_next_microinstruction = TURBO ? LOAD_PC_EFFECTIVE_LO : STALL;
+                STALL: o_next_microinstruction = LOAD_PC_EFFECTIVE_LO;
+                LOAD_PC_EFFECTIVE_LO: o_next_microinstruction = LOAD_PC_EFFECTIVE_HI;
+                LOAD_PC_EFFECTIVE_HI: o_next_microinstruction = MICRO_EXECUTE;
+                MICRO_EXECUTE: o_next_microinstruction = START;
+                default: o_next_microinstruction = NOP;
+                endcase
+            end
+            default: ;
+            endcase
+        end
     end
 end
 
@@ -1,10 +1,41 @@
+`include "mcu_memory_map.vh"
+
 module mcu #(
     parameter START_PC = 16'h0400,
     parameter START_PC_ENABLED = 0,
     parameter LED_DEFAULT_CLOCK_DIV = 2,
     parameter CPU_CLOCK_DIV_DEFAULT = 8'h00,
+    // Run the CPU on i_clk with a clock enable instead of a divided clock,
+    // see clock_control.sv. PHI2 is then i_clk, so memory on the bus must
+    // hold its data through the cycles the CPU is not enabled.
+    parameter CPU_CLOCK_ENABLE = 0,
     parameter UART_FIFO_DEPTH = 8,
-    parameter ENABLE_SK6812 = 1
+    parameter ENABLE_SK6812 = 1,
+    parameter ENABLE_SK6812_STRIP = 0,
+    parameter IR_DECODER_ROM = 0,
+    parameter ENABLE_65C02 = 0,
+    parameter TURBO = 0,
+    // Wait-state controller, see wait_states.sv. WAIT_STATES holds the reset
+    // wait count of each 4 KB block, 4 bits per block from 0x0000 up.
+    parameter ENABLE_WAIT_STATES = 0,
+    parameter [63:0] WAIT_STATES = 64'h0,
+    parameter [3:0] IO_WAIT_STATES = 4'h0,
+    // Read cache for memory outside the MCU, 0 lines = no cache. Hits skip
+    // the wait states, see read_cache.sv.
+    parameter CACHE_LINES = 0,
+    parameter CACHE_WAYS = 1,
+    parameter ENABLE_DMA = 0,
+    parameter ENABLE_IRQ_CONTROLLER = 0,
+    parameter ENABLE_PERF_COUNTERS = 0,
+    // PC trace buffer, see trace_buffer.sv. TRACE_DEPTH is in entries.
+    parameter ENABLE_TRACE = 0,
+    parameter TRACE_DEPTH = 256,
+    // PC profiler, see pc_profiler.sv
+    parameter ENABLE_PROFILER = 0,
+    parameter PROFILER_BUCKETS = 256,
+    parameter ENABLE_MATH = 0,
+    // TIMER0 compare/capture channels, routed to pins by the GPIO pin modes
+    parameter ENABLE_TIMER_CHANNELS = 0
 ) (
     input i_clk,
     input i_reset_n,
@@ -35,60 +66,107 @@ module mcu #(
 
 wire cpu_phi1;
 wire cpu_phi2;
-wire cpu_rw;
-wire [15:0] bus_addr;
+wire cpu_rw, bus_rw;
+wire [15:0] cpu_addr, bus_addr;
 wire [7:0] gpioa_read_data, led_read_data, clkctrl_read_data, timer_read_data, uart_read_data;
-wire [7:0] bus_write_data;
+wire [7:0] cache_read_data, cache_reg_data, wait_read_data;
+wire [7:0] dma_read_data, intc_read_data, perf_read_data, trace_read_data, prof_read_data, math_read_data;
+wire [7:0] cpu_write_data, bus_write_data;
 reg [7:0] bus_read_data;
-reg gpioa_en, led_en, clkctrl_en, timer_en, uart_en;
+reg gpioa_en, clkctrl_en, timer_en, uart_en;
+// Enables of the optional peripherals, not read when they are not built
+/* verilator lint_off UNUSEDSIGNAL */
+reg led_en, cache_en, wait_en, dma_en, intc_en, perf_en, trace_en, prof_en, math_en;
+/* verilator lint_on UNUSEDSIGNAL */
+
+// The access on the bus completes when bus_rdy is high. It is the CPU's
+// unless the LED strip engine or the DMA owns the bus, which holds the CPU.
+// The strip engine has priority: the DMA gives it the bus between bytes.
+// With CPU_CLOCK_ENABLE, cycles without the clock enable are held the same
+// way, so peripherals see one access per CPU cycle.
+wire bus_rdy, cpu_rdy, wait_rdy, cpu_ce;
+// A cache hit skips the wait states, so only the wait-state controller reads it
+/* verilator lint_off UNUSEDSIGNAL */
+wire cache_hit;
+/* verilator lint_on UNUSEDSIGNAL */
+wire led_bus, dma_bus;
+// The strip engine's bus request, only read by the DMA, which yields to it
+/* verilator lint_off UNUSEDSIGNAL */
+wire led_bus_req;
+/* verilator lint_on UNUSEDSIGNAL */
+wire [15:0] led_addr, dma_addr;
+wire [7:0] dma_write_data;
+wire dma_rw;
+assign bus_rdy = i_rdy & wait_rdy & cpu_ce;
+assign cpu_rdy = bus_rdy & !led_bus & !dma_bus;
+
+assign bus_addr = led_bus ? led_addr : dma_bus ? dma_addr : cpu_addr;
+assign bus_write_data = dma_bus ? dma_write_data : cpu_write_data;
+assign bus_rw = led_bus ? 1'b1 : dma_bus ? dma_rw : cpu_rw;
 
 wire cpu_clk;
 
-wire timer_irq;
+wire timer_irq, dma_irq, led_irq;
+wire [1:0] timer_compare;
+wire timer_capture;
 
 wire uart_tx, uart_rx;
 wire uart_tx_irq, uart_rx_irq;
 
 wire sk6812_data;
 
-// Any peripheral IRQ active (high) pulls CPU IRQ low
-// Combine external IRQ input with peripheral IRQs
-wire cpu_irq_n;
-assign cpu_irq_n = i_irq_n_ext & !(timer_irq | uart_tx_irq | uart_rx_irq);
+// Peripheral ready flags, only read by the DMA for pacing
+/* verilator lint_off UNUSEDSIGNAL */
+wire uart_tx_ready, sk6812_ready;
+/* verilator lint_on UNUSEDSIGNAL */
+
+// IRQ sources, by interrupt controller source number. Without the
+// controller any active source pulls CPU IRQ low.
+wire [7:0] irq_sources;
+assign irq_sources = {2'b00, !i_irq_n_ext, led_irq, dma_irq, uart_rx_irq, uart_tx_irq, timer_irq};
+wire cpu_irq_n, cpu_irq_vector;
+wire intc_vector;
+wire [7:0] intc_vector_data;
 
 assign o_bus_addr = bus_addr;
 assign o_bus_data = bus_write_data;
-assign o_bus_rw = cpu_rw;
+assign o_bus_rw = bus_rw;
 assign o_phi1 = cpu_phi1;
 assign o_phi2 = cpu_phi2;
 
 cpu_6502 #(
     .START_PC(START_PC),
-    .START_PC_ENABLED(START_PC_ENABLED)
+    .START_PC_ENABLED(START_PC_ENABLED),
+    .IR_DECODER_ROM(IR_DECODER_ROM),
+    .ENABLE_65C02(ENABLE_65C02),
+    .TURBO(TURBO)
 ) cpu_6502 (
     .i_clk(cpu_clk),
     .o_phi1(cpu_phi1),
     .o_phi2(cpu_phi2),
     .i_reset_n(i_reset_n),
-    .i_rdy(i_rdy),
+    .i_rdy(cpu_rdy),
     .i_nmi_n(i_nmi_n),
     .i_irq_n(cpu_irq_n),
     .i_so_n(i_so_n),
     .o_sync(o_sync),
+    .o_irq_vector(cpu_irq_vector),
     .i_bus_data(bus_read_data),
-    .o_bus_data(bus_write_data),
-    .o_bus_addr(bus_addr),
+    .o_bus_data(cpu_write_data),
+    .o_bus_addr(cpu_addr),
     .o_rw(cpu_rw),
     .i_debug_sel(i_debug_sel),
     .o_debug_data(o_debug_data)
 );
 
-gpio gpioa (
+gpio #(
+    .ENABLE_TIMER_MODES(ENABLE_TIMER_CHANNELS)
+) gpioa (
     .i_phi2(cpu_phi2),
     .i_reset_n(i_reset_n),
     .i_addr(bus_addr[3:0]),
     .i_data(bus_write_data),
-    .i_rw(cpu_rw),
+    .i_rw(bus_rw),
     .o_data(gpioa_read_data),
     .i_pins(i_gpioa_input),
     .o_pins(o_gpioa_output),
@@ -96,109 +174,386 @@ gpio gpioa (
     .i_en(gpioa_en),
     .i_uart0_tx(uart_tx),
     .o_uart0_rx(uart_rx),
-    .i_sk6812_data(sk6812_data)
+    .i_sk6812_data(sk6812_data),
+    .i_timer_compare(timer_compare),
+    .o_timer_capture(timer_capture)
 );
 
 generate
     if (ENABLE_SK6812) begin : sk6812_gen_on
+        wire strip_irq, strip_bus_req, strip_bus;
+
         sk6812rgbw_peripheral #(
-            .CLOCK_DIV_DEFAULT(LED_DEFAULT_CLOCK_DIV)
+            .CLOCK_DIV_DEFAULT(LED_DEFAULT_CLOCK_DIV),
+            .ENABLE_STRIP(ENABLE_SK6812_STRIP),
+            .SAME_CLOCK(CPU_CLOCK_ENABLE)
         ) sk6812 (
             .i_clk(i_clk),
             .i_phi2(cpu_phi2),
             .i_reset_n(i_reset_n),
-            .i_addr(bus_addr[2:0]),
+            .i_addr(bus_addr[3:0]),
             .i_data(bus_write_data),
-            .i_rw(cpu_rw),
+            .i_rw(bus_rw),
             .o_data(led_read_data),
             .i_en(led_en),
-            .o_led_data(sk6812_data)
+            .o_led_data(sk6812_data),
+            .o_ready(sk6812_ready),
+            .o_irq(strip_irq),
+            .o_bus_req(strip_bus_req),
+            .i_grant(!dma_bus),
+            .o_bus(strip_bus),
+            .o_bus_addr(led_addr),
+            .i_bus_data(bus_read_data),
+            .i_rdy(bus_rdy)
         );
+
+        // Constant without the strip engine, so the bus mux folds away
+        assign led_irq = ENABLE_SK6812_STRIP ? strip_irq : 1'b0;
+        assign led_bus_req = ENABLE_SK6812_STRIP ? strip_bus_req : 1'b0;
+        assign led_bus = ENABLE_SK6812_STRIP ? strip_bus : 1'b0;
     end else begin : sk6812_gen_off
         assign led_read_data = 8'h00;
         assign sk6812_data = 1'b0;
+        assign sk6812_ready = 1'b1;
+        assign led_irq = 1'b0;
+        assign led_bus_req = 1'b0;
+        assign led_bus = 1'b0;
+        assign led_addr = 16'h0000;
     end
 endgenerate
 
 clock_control #(
-    .CPU_DIV_DEFAULT(CPU_CLOCK_DIV_DEFAULT)
+    .CPU_DIV_DEFAULT(CPU_CLOCK_DIV_DEFAULT),
+    .CLOCK_ENABLE(CPU_CLOCK_ENABLE)
 ) clkctrl (
     .i_clk(i_clk),
     .i_reset_n(i_reset_n),
     .i_phi2(cpu_phi2),
     .i_addr(bus_addr[1:0]),
     .i_data(bus_write_data),
-    .i_rw(cpu_rw),
+    .i_rw(bus_rw),
     .o_data(clkctrl_read_data),
     .i_en(clkctrl_en),
-    .o_cpu_clk(cpu_clk)
+    .o_cpu_clk(cpu_clk),
+    .o_cpu_ce(cpu_ce)
 );
 
-timer timer0 (
+timer #(
+    .ENABLE_CHANNELS(ENABLE_TIMER_CHANNELS),
+    .SAME_CLOCK(CPU_CLOCK_ENABLE)
+) timer0 (
     .i_clk(i_clk),
     .i_phi2(cpu_phi2),
     .i_reset_n(i_reset_n),
-    .i_addr(bus_addr[2:0]),
+    .i_addr(bus_addr[3:0]),
     .i_data(bus_write_data),
-    .i_rw(cpu_rw),
+    .i_rw(bus_rw),
     .i_en(timer_en),
     .o_data(timer_read_data),
-    .o_irq(timer_irq)
+    .o_irq(timer_irq),
+    .i_capture(timer_capture),
+    .o_compare(timer_compare)
 );
 
 uart #(
-    .FIFO_DEPTH(UART_FIFO_DEPTH)
+    .FIFO_DEPTH(UART_FIFO_DEPTH),
+    .SAME_CLOCK(CPU_CLOCK_ENABLE)
 ) uart0 (
     .i_clk(i_clk),
     .i_phi2(cpu_phi2),
     .i_reset_n(i_reset_n),
     .i_addr(bus_addr[2:0]),
     .i_data(bus_write_data),
-    .i_rw(cpu_rw),
+    .i_rw(bus_rw),
     .i_en(uart_en),
     .o_data(uart_read_data),
     .i_rx(uart_rx),
     .o_tx(uart_tx),
     .o_tx_irq(uart_tx_irq),
-    .o_rx_irq(uart_rx_irq)
+    .o_rx_irq(uart_rx_irq),
+    .o_tx_ready(uart_tx_ready)
 );
 
-`define GPIOA_BASE   16'hA000
-`define GPIOA_SIZE   12
-`define LED_BASE     16'hA010
-`define LED_SIZE     8
-`define TIMER_BASE   16'hA020
-`define TIMER_SIZE   8
-`define CLKCTRL_BASE 16'hA030
-`define CLKCTRL_SIZE 4
-`define UART_BASE    16'hA040
-`define UART_SIZE    8
+generate
+    if (ENABLE_DMA) begin : dma_gen_on
+        dma dma0 (
+            .i_phi2(cpu_phi2),
+            .i_reset_n(i_reset_n),
+            .i_addr(bus_addr[2:0]),
+            .i_data(bus_write_data),
+            .i_rw(bus_rw),
+            .i_en(dma_en),
+            .o_data(dma_read_data),
+            .o_irq(dma_irq),
+            .i_uart_tx_ready(uart_tx_ready),
+            .i_led_ready(sk6812_ready),
+            .o_bus(dma_bus),
+            .o_bus_addr(dma_addr),
+            .o_bus_data(dma_write_data),
+            .o_bus_rw(dma_rw),
+            .i_bus_data(bus_read_data),
+            .i_rdy(bus_rdy),
+            .i_hold(led_bus_req)
+        );
+    end else begin : dma_gen_off
+        assign dma_read_data = 8'h00;
+        assign dma_irq = 1'b0;
+        assign dma_bus = 1'b0;
+        assign dma_addr = 16'h0000;
+        assign dma_write_data = 8'h00;
+        assign dma_rw = 1'b1;
+    end
+endgenerate
+
+generate
+    if (ENABLE_IRQ_CONTROLLER) begin : intc_gen_on
+        wire intc_irq;
+
+        irq_controller intc (
+            .i_phi2(cpu_phi2),
+            .i_reset_n(i_reset_n),
+            .i_addr(bus_addr[2:0]),
+            .i_data(bus_write_data),
+            .i_rw(bus_rw),
+            .i_en(intc_en),
+            .o_data(intc_read_data),
+            .i_sources(irq_sources),
+            .o_irq(intc_irq),
+            .i_vector_hi(bus_addr[0]),
+            .o_vector(intc_vector),
+            .o_vector_data(intc_vector_data)
+        );
+
+        assign cpu_irq_n = !intc_irq;
+    end else begin : intc_gen_off
+        assign intc_read_data = 8'h00;
+        assign intc_vector = 1'b0;
+        assign intc_vector_data = 8'h00;
+        assign cpu_irq_n = irq_sources == 8'h00;
+    end
+endgenerate
+
+generate
+    if (ENABLE_PERF_COUNTERS) begin : perf_gen_on
+        perf_counters perf (
+            .i_phi2(cpu_phi2),
+            .i_reset_n(i_reset_n),
+            .i_addr(bus_addr[2:0]),
+            .i_data(bus_write_data),
+            .i_rw(bus_rw),
+            .i_en(perf_en),
+            .o_data(perf_read_data),
+            .i_sync(o_sync),
+            .i_rdy(cpu_rdy),
+            .i_ce(cpu_ce),
+            .i_irq_n(cpu_irq_n),
+            .i_irq_vector(cpu_irq_vector)
+        );
+    end else begin : perf_gen_off
+        assign perf_read_data = 8'h00;
+    end
+endgenerate
+
+generate
+    if (ENABLE_TRACE) begin : trace_gen_on
+        trace_buffer #(
+            .DEPTH(TRACE_DEPTH)
+        ) trace (
+            .i_phi2(cpu_phi2),
+            .i_reset_n(i_reset_n),
+            .i_addr(bus_addr[2:0]),
+            .i_data(bus_write_data),
+            .i_rw(bus_rw),
+            .i_en(trace_en),
+            .o_data(trace_read_data),
+            .i_sync(o_sync),
+            .i_rdy(cpu_rdy),
+            .i_cpu_addr(cpu_addr),
+            .i_cpu_data(bus_read_data),
+            .i_irq_vector(cpu_irq_vector)
+        );
+    end else begin : trace_gen_off
+        assign trace_read_data = 8'h00;
+    end
+endgenerate
+
+generate
+    if (ENABLE_PROFILER) begin : prof_gen_on
+        pc_profiler #(
+            .BUCKETS(PROFILER_BUCKETS)
+        ) prof (
+            .i_phi2(cpu_phi2),
+            .i_reset_n(i_reset_n),
+            .i_addr(bus_addr[2:0]),
+            .i_data(bus_write_data),
+            .i_rw(bus_rw),
+            .i_en(prof_en),
+            .o_data(prof_read_data),
+            .i_sync(o_sync),
+            .i_rdy(cpu_rdy),
+            .i_ce(cpu_ce),
+            .i_cpu_addr(cpu_addr)
+        );
+    end else begin : prof_gen_off
+        assign prof_read_data = 8'h00;
+    end
+endgenerate
+
+generate
+    if (ENABLE_MATH) begin : math_gen_on
+        math_unit math (
+            .i_phi2(cpu_phi2),
+            .i_reset_n(i_reset_n),
+            .i_addr(bus_addr[3:0]),
+            .i_data(bus_write_data),
+            .i_rw(bus_rw),
+            .i_en(math_en),
+            .o_data(math_read_data)
+        );
+    end else begin : math_gen_off
+        assign math_read_data = 8'h00;
+    end
+endgenerate
+
+// The CPU's IRQ vector fetch, which the interrupt controller may answer
+wire vector_fetch;
+assign vector_fetch = cpu_irq_vector && !led_bus && !dma_bus && bus_rw && bus_addr[15:1] == 15'h7fff;
+
+// Page/slot decoder, see tools/memory_map.py: the high address byte selects
+// the I/O page and bits 7:4 a 16-byte slot, so no full 16-bit compares sit
+// in front of the read mux.
+wire io_page;
+wire [3:0] io_slot;
+assign io_page = bus_addr[15:8] == `MCU_IO_PAGE;
+assign io_slot = bus_addr[7:4];
+
+generate
+    if (ENABLE_WAIT_STATES) begin : wait_gen_on
+        wait_states #(
+            .BLOCK_WAITS(WAIT_STATES),
+            .IO_WAITS(IO_WAIT_STATES)
+        ) wait_ctrl (
+            .i_phi2(cpu_phi2),
+            .i_reset_n(i_reset_n),
+            .i_addr(bus_addr),
+            .i_data(bus_write_data),
+            .i_rw(bus_rw),
+            .i_io(io_page),
+            .i_skip(cache_hit),
+            .i_rdy(i_rdy),
+            .i_ce(cpu_ce),
+            .o_rdy(wait_rdy),
+            .i_en(wait_en),
+            .o_data(wait_read_data)
+        );
+    end else begin : wait_gen_off
+        assign wait_read_data = 8'h00;
+        assign wait_rdy = 1'b1;
+    end
+
+    if (CACHE_LINES > 0) begin : cache_gen_on
+        read_cache #(
+            .LINES(CACHE_LINES),
+            .WAYS(CACHE_WAYS)
+        ) cache (
+            .i_phi2(cpu_phi2),
+            .i_reset_n(i_reset_n),
+            .i_addr(bus_addr),
+            .i_data(bus_write_data),
+            .i_rw(bus_rw),
+            .i_cacheable(!io_page),
+            .i_bus_data(i_bus_data),
+            .o_read_data(cache_read_data),
+            .i_rdy(bus_rdy),
+            .o_hit(cache_hit),
+            .i_en(cache_en),
+            .o_data(cache_reg_data)
+        );
+    end else begin : cache_gen_off
+        assign cache_read_data = i_bus_data;
+        assign cache_reg_data = 8'h00;
+        assign cache_hit = 1'b0;
+    end
+endgenerate
 
+// Peripherals are enabled only in the cycle that completes an access, so a
+// stalled access reads or writes a register once. The slots of the optional
+// peripherals from the read cache on go to the external bus, like unassigned
+// slots, when the peripheral is not built. SK6812 reads 0 when not built.
 always_comb begin
     gpioa_en = 0;
     led_en = 0;
     timer_en = 0;
     clkctrl_en = 0;
     uart_en = 0;
-    bus_read_data = 8'h00;
-
-    if (bus_addr >= `GPIOA_BASE && bus_addr < (`GPIOA_BASE + `GPIOA_SIZE)) begin
-        gpioa_en = 1;
-        bus_read_data = gpioa_read_data;
-    end else if (bus_addr >= `LED_BASE && bus_addr < (`LED_BASE + `LED_SIZE)) begin
-        led_en = 1;
-        bus_read_data = led_read_data;
-    end else if (bus_addr >= `TIMER_BASE && bus_addr < (`TIMER_BASE + `TIMER_SIZE)) begin
-        timer_en = 1;
-        bus_read_data = timer_read_data;
-    end else if (bus_addr >= `CLKCTRL_BASE && bus_addr < (`CLKCTRL_BASE + `CLKCTRL_SIZE)) begin
-        clkctrl_en = 1;
-        bus_read_data = clkctrl_read_data;
-    end else if (bus_addr >= `UART_BASE && bus_addr < (`UART_BASE + `UART_SIZE)) begin
-        uart_en = 1;
-        bus_read_data = uart_read_data;
-    end else begin
-        bus_read_data = i_bus_data;
+    cache_en = 0;
+    wait_en = 0;
+    dma_en = 0;
+    intc_en = 0;
+    perf_en = 0;
+    trace_en = 0;
+    prof_en = 0;
+    math_en = 0;
+    bus_read_data = cache_read_data;
+
+    if (vector_fetch && intc_vector) begin
+        bus_read_data = intc_vector_data;
+    end else if (io_page) begin
+        case (io_slot)
+            `MCU_SLOT_GPIOA: begin
+                gpioa_en = bus_rdy;
+                bus_read_data = gpioa_read_data;
+            end
+            `MCU_SLOT_LED: begin
+                led_en = bus_rdy;
+                bus_read_data = led_read_data;
+            end
+            `MCU_SLOT_TIMER: begin
+                timer_en = bus_rdy;
+                bus_read_data = timer_read_data;
+            end
+            `MCU_SLOT_CLKCTRL: begin
+                clkctrl_en = bus_rdy;
+                bus_read_data = clkctrl_read_data;
+            end
+            `MCU_SLOT_UART: begin
+                uart_en = bus_rdy;
+                bus_read_data = uart_read_data;
+            end
+            `MCU_SLOT_CACHE: if (CACHE_LINES > 0) begin
+                cache_en = bus_rdy;
+                bus_read_data = cache_reg_data;
+            end
+            `MCU_SLOT_WAIT: if (ENABLE_WAIT_STATES) begin
+                wait_en = bus_rdy;
+                bus_read_data = wait_read_data;
+            end
+            `MCU_SLOT_DMA: if (ENABLE_DMA) begin
+                dma_en = bus_rdy;
+                bus_read_data = dma_read_data;
+            end
+            `MCU_SLOT_INTC: if (ENABLE_IRQ_CONTROLLER) begin
+                intc_en = bus_rdy;
+                bus_read_data = intc_read_data;
+            end
+            `MCU_SLOT_PERF: if (ENABLE_PERF_COUNTERS) begin
+                perf_en = bus_rdy;
+                bus_read_data = perf_read_data;
+            end
+            `MCU_SLOT_TRACE: if (ENABLE_TRACE) begin
+                trace_en = bus_rdy;
+                bus_read_data = trace_read_data;
+            end
+            `MCU_SLOT_PROF: if (ENABLE_PROFILER) begin
+                prof_en = bus_rdy;
+                bus_read_data = prof_read_data;
+            end
+            `MCU_SLOT_MATH: if (ENABLE_MATH) begin
+                math_en = bus_rdy;
+                bus_read_data = math_read_data;
+            end
+            default: ;
+        endcase
     end
 end
 
@@ -0,0 +1,25 @@
+`ifndef MCU_MEMORY_MAP_VH
+`define MCU_MEMORY_MAP_VH
+
+// Generated by tools/memory_map.py. Do not edit by hand: run `make memory-map`.
+//
+// I/O page 0xA000-0xA0FF, selected by address bits 15:8. Each
+// peripheral owns a 16-byte slot selected by address bits 7:4.
+
+`define MCU_IO_PAGE           8'hA0
+
+`define MCU_SLOT_GPIOA        4'h0    // 0xA000 GPIO A
+`define MCU_SLOT_LED          4'h1    // 0xA010 SK6812
+`define MCU_SLOT_TIMER        4'h2    // 0xA020 TIMER0
+`define MCU_SLOT_CLKCTRL      4'h3    // 0xA030 Clock Control
+`define MCU_SLOT_UART         4'h4    // 0xA040 UART0
+`define MCU_SLOT_CACHE        4'h5    // 0xA050 Read Cache
+`define MCU_SLOT_WAIT         4'h6    // 0xA060 Wait States
+`define MCU_SLOT_DMA          4'h7    // 0xA070 DMA
+`define MCU_SLOT_INTC         4'h8    // 0xA080 Interrupt Controller
+`define MCU_SLOT_PERF         4'h9    // 0xA090 Performance Counters
+`define MCU_SLOT_TRACE        4'hA    // 0xA0A0 Trace Buffer
+`define MCU_SLOT_PROF         4'hB    // 0xA0B0 PC Profiler
+`define MCU_SLOT_MATH         4'hC    // 0xA0C0 Math Unit
+
+`endif
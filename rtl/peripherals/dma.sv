@@ -0,0 +1,207 @@
+// DMA controller: copies LEN bytes from SRC to DST as a bus master.
+//
+// While it transfers, the DMA owns the MCU bus (o_bus) and the CPU is held
+// with RDY, so it can move data between any two addresses: BRAM, external
+// memory or peripheral registers. It only takes the bus when the access on
+// it completes (i_rdy), and accesses it makes are stretched by wait states
+// like the CPU's.
+//
+// Each byte is a read cycle and a write cycle, so a copy runs at two bus
+// cycles per byte. The MCU bus carries one address and one direction per
+// cycle, so the read of the next byte cannot overlap the write of the last
+// one. In FILL mode the source is read once and its byte written LEN times,
+// one byte per cycle. Unpaced
+// transfers keep the bus until they finish. Paced transfers move a byte only
+// while the selected peripheral can take one, then give the bus back to the
+// CPU for PACE_GAP cycles so the peripheral's status catches up. A master
+// with priority (i_hold) gets the bus between two bytes.
+module dma (
+    input i_phi2,
+    input i_reset_n,
+
+    // Register interface
+    input [2:0] i_addr,
+    input [7:0] i_data,
+    input i_rw,
+    input i_en,
+    output reg [7:0] o_data,
+    output o_irq,
+
+    // Pacing requests
+    input i_uart_tx_ready,          // UART TX FIFO not full
+    input i_led_ready,              // SK6812 not busy
+
+    // Bus master
+    output reg o_bus,               // the DMA owns the bus
+    output [15:0] o_bus_addr,
+    output [7:0] o_bus_data,
+    output o_bus_rw,
+    input [7:0] i_bus_data,
+    input i_rdy,                    // the access on the bus completes this cycle
+    input i_hold                    // a master with priority wants the bus
+);
+
+// Register Map:
+// 0xA070: CTRL   - bit 0 START (reads BUSY), bits 2:1 SRC_MODE, bits 4:3 DST_MODE,
+//                  bits 6:5 PACE, bit 7 IRQ_EN
+// 0xA071: STATUS - bit 0 BUSY, bit 1 DONE (write 1 to clear)
+// 0xA072: SRC_LO, 0xA073: SRC_HI - source address, advances during the transfer
+// 0xA074: DST_LO, 0xA075: DST_HI - destination address, advances during the transfer
+// 0xA076: LEN_LO, 0xA077: LEN_HI - bytes left
+
+`define DMA_CTRL            3'h0
+`define DMA_STATUS          3'h1
+`define DMA_SRC_LO          3'h2
+`define DMA_SRC_HI          3'h3
+`define DMA_DST_LO          3'h4
+`define DMA_DST_HI          3'h5
+`define DMA_LEN_LO          3'h6
+`define DMA_LEN_HI          3'h7
+
+`define DMA_CTRL_START      0
+
+`define DMA_STATUS_DONE     1
+
+`define DMA_SRC_FIXED       2'h0
+`define DMA_SRC_INC         2'h1
+`define DMA_SRC_FILL        2'h2
+
+`define DMA_DST_FIXED       2'h0
+`define DMA_DST_INC         2'h1
+`define DMA_DST_WRAP4       2'h2    // DST, DST+1, DST+2, DST+3, DST, ...
+
+`define DMA_PACE_NONE       2'h0
+`define DMA_PACE_UART_TX    2'h1
+`define DMA_PACE_LED        2'h2
+
+localparam PACE_GAP = 4;
+
+reg busy, done, irq_en;
+reg [1:0] src_mode, dst_mode, pace;
+reg [15:0] src, dst, len;
+reg [1:0] dst_offset;
+reg [7:0] buffer;
+reg loaded;                         // FILL: buffer holds the source byte
+reg writing;                        // owned cycle is the write of buffer
+reg [2:0] gap;
+
+wire request;
+assign request = pace == `DMA_PACE_UART_TX ? i_uart_tx_ready :
+                 pace == `DMA_PACE_LED ? i_led_ready : 1'b1;
+
+wire [15:0] dst_addr;
+assign dst_addr = dst_mode == `DMA_DST_WRAP4 ? dst + 16'(dst_offset) : dst;
+
+assign o_bus_addr = writing ? dst_addr : src;
+assign o_bus_data = buffer;
+assign o_bus_rw = !writing;
+assign o_irq = done && irq_en;
+
+wire last;
+assign last = len == 16'h0001;
+
+always_ff @(negedge i_phi2 or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        busy <= 1'b0;
+        done <= 1'b0;
+        irq_en <= 1'b0;
+        src_mode <= `DMA_SRC_FIXED;
+        dst_mode <= `DMA_DST_FIXED;
+        pace <= `DMA_PACE_NONE;
+        src <= 16'h0000;
+        dst <= 16'h0000;
+        len <= 16'h0000;
+        dst_offset <= 2'h0;
+        buffer <= 8'h00;
+        loaded <= 1'b0;
+        writing <= 1'b0;
+        gap <= 3'h0;
+        o_bus <= 1'b0;
+    end else begin
+        if (gap != 3'h0 && !o_bus)
+            gap <= gap - 3'h1;
+
+        if (o_bus && i_rdy) begin
+            if (!writing) begin
+                buffer <= i_bus_data;
+                loaded <= src_mode == `DMA_SRC_FILL;
+                writing <= 1'b1;
+            end else begin
+                if (src_mode == `DMA_SRC_INC)
+                    src <= src + 16'h1;
+                if (dst_mode == `DMA_DST_INC)
+                    dst <= dst + 16'h1;
+                dst_offset <= dst_offset + 2'h1;
+                len <= len - 16'h1;
+
+                if (last) begin
+                    busy <= 1'b0;
+                    done <= 1'b1;
+                    o_bus <= 1'b0;
+                    writing <= 1'b0;
+                end else if (pace != `DMA_PACE_NONE) begin
+                    o_bus <= 1'b0;
+                    writing <= 1'b0;
+                    gap <= 3'(PACE_GAP);
+                end else if (i_hold) begin
+                    o_bus <= 1'b0;
+                    writing <= 1'b0;
+                end else begin
+                    writing <= loaded;
+                end
+            end
+        end else if (!o_bus && i_rdy && busy && gap == 3'h0 && request && !i_hold) begin
+            o_bus <= 1'b1;
+            writing <= loaded;
+        end
+
+        if (i_en && !i_rw) begin
+            case (i_addr)
+                `DMA_CTRL: begin
+                    {irq_en, pace, dst_mode, src_mode} <= i_data[7:1];
+                    if (i_data[`DMA_CTRL_START] && !busy) begin
+                        busy <= len != 16'h0000;
+                        done <= len == 16'h0000;
+                        dst_offset <= 2'h0;
+                        loaded <= 1'b0;
+                        writing <= 1'b0;
+                        gap <= 3'h0;
+                    end else if (!i_data[`DMA_CTRL_START]) begin
+                        busy <= 1'b0;
+                    end
+                end
+                `DMA_STATUS: begin
+                    if (i_data[`DMA_STATUS_DONE])
+                        done <= 1'b0;
+                end
+                `DMA_SRC_LO: src[7:0] <= i_data;
+                `DMA_SRC_HI: src[15:8] <= i_data;
+                `DMA_DST_LO: dst[7:0] <= i_data;
+                `DMA_DST_HI: dst[15:8] <= i_data;
+                `DMA_LEN_LO: len[7:0] <= i_data;
+                `DMA_LEN_HI: len[15:8] <= i_data;
+                default: ;
+            endcase
+        end
+    end
+end
+
+always_ff @(posedge i_phi2 or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        o_data <= 8'h00;
+    end else if (i_en && i_rw) begin
+        case (i_addr)
+            `DMA_CTRL:   o_data <= {irq_en, pace, dst_mode, src_mode, busy};
+            `DMA_STATUS: o_data <= {6'h00, done, busy};
+            `DMA_SRC_LO: o_data <= src[7:0];
+            `DMA_SRC_HI: o_data <= src[15:8];
+            `DMA_DST_LO: o_data <= dst[7:0];
+            `DMA_DST_HI: o_data <= dst[15:8];
+            `DMA_LEN_LO: o_data <= len[7:0];
+            `DMA_LEN_HI: o_data <= len[15:8];
+            default:     o_data <= 8'h00;
+        endcase
+    end
+end
+
+endmodule
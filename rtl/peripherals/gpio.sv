@@ -1,4 +1,6 @@
-module gpio (
+module gpio #(
+    parameter ENABLE_TIMER_MODES = 0    // TIMER0_* pin modes, else they act as GPIO
+) (
     input i_phi2,
     input i_reset_n,
     input [3:0] i_addr,
@@ -13,7 +15,9 @@ module gpio (
 
     input i_uart0_tx,
     output o_uart0_rx,
-    input i_sk6812_data
+    input i_sk6812_data,
+    input [1:0] i_timer_compare,
+    output o_timer_capture
 );
 
 `define GPIO_OUTPUT_ENABLE_REGISTER 0
@@ -35,6 +39,9 @@ localparam MODE_GPIO     = 8'h00;
 localparam MODE_UART0_TX = 8'h01;
 localparam MODE_UART0_RX = 8'h02;
 localparam MODE_SK6812_DATA = 8'h03;
+localparam MODE_TIMER0_CH0 = 8'h04;
+localparam MODE_TIMER0_CH1 = 8'h05;
+localparam MODE_TIMER0_CAPTURE = 8'h06;
 
 reg [7:0] gpio_pins_oe;
 reg [7:0] gpio_pins;
@@ -113,22 +120,45 @@ generate
                     o_pins_oe[i] = gpio_pins_oe[i];
                 end
             endcase
+            if (ENABLE_TIMER_MODES) begin
+                case (mode_pin[i])
+                    MODE_TIMER0_CH0: begin
+                        o_pins[i] = i_timer_compare[0];
+                        o_pins_oe[i] = 1'b1;
+                    end
+                    MODE_TIMER0_CH1: begin
+                        o_pins[i] = i_timer_compare[1];
+                        o_pins_oe[i] = 1'b1;
+                    end
+                    MODE_TIMER0_CAPTURE: begin
+                        o_pins[i] = 1'b1;
+                        o_pins_oe[i] = 1'b0;
+                    end
+                    default: ;
+                endcase
+            end
         end
     end
 endgenerate
 
 // lowest pin # takes priority
 reg [7:0] uart_rx_select;
+reg [7:0] timer_capture_select;
 integer j;
 always_comb begin
     uart_rx_select = 8'b0;
+    timer_capture_select = 8'b0;
     for (j = 0; j < 8; j = j + 1) begin
         if (mode_pin[j] == MODE_UART0_RX && uart_rx_select == 8'b0) begin
             uart_rx_select = 8'b1 << j;
         end
+        if (ENABLE_TIMER_MODES && mode_pin[j] == MODE_TIMER0_CAPTURE && timer_capture_select == 8'b0) begin
+            timer_capture_select = 8'b1 << j;
+        end
     end
 end
 
 assign o_uart0_rx = |(i_pins & uart_rx_select);
+assign o_timer_capture = |(i_pins & timer_capture_select);
 
 endmodule
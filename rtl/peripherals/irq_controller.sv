@@ -0,0 +1,112 @@
+// Interrupt controller: per-source enable and priority, and the highest
+// pending source in one register, so an ISR need not poll each peripheral.
+//
+// Sources are the peripherals' IRQ lines and the external IRQ input. They
+// are level sensitive: a source stays pending until it is cleared in its
+// peripheral. The CPU's IRQ is any enabled, pending source. With VECTOR set,
+// the CPU's IRQ vector fetch reads {VECTOR_PAGE, SOURCE << 4} instead of
+// $FFFE/$FFFF, so each source enters its own 16-byte handler slot. BRK and
+// NMI still read their vectors from memory.
+module irq_controller (
+    input i_phi2,
+    input i_reset_n,
+
+    // Register interface
+    input [2:0] i_addr,
+    input [7:0] i_data,
+    input i_rw,
+    input i_en,
+    output reg [7:0] o_data,
+
+    input [7:0] i_sources,          // request lines, active high
+    output o_irq,                   // an enabled source is pending
+
+    // IRQ vector fetch
+    input i_vector_hi,              // reading $FFFF, else $FFFE
+    output o_vector,                // replace the vector byte with o_vector_data
+    output [7:0] o_vector_data
+);
+
+// Register Map:
+// 0xA080: ENABLE      - bit per source, reset 0xFF
+// 0xA081: PENDING     - bit per source, request lines before ENABLE (read-only)
+// 0xA082: SOURCE      - highest-priority enabled pending source, bit 7 NONE (read-only)
+// 0xA083: CTRL        - bit 0 VECTOR
+// 0xA084: PRIO_LO     - 2-bit priority of sources 0-3, source 0 in bits 1:0
+// 0xA085: PRIO_HI     - 2-bit priority of sources 4-7
+// 0xA086: VECTOR_PAGE - high byte of the vectored handlers
+
+`define INTC_ENABLE         3'h0
+`define INTC_PENDING        3'h1
+`define INTC_SOURCE         3'h2
+`define INTC_CTRL           3'h3
+`define INTC_PRIO_LO        3'h4
+`define INTC_PRIO_HI        3'h5
+`define INTC_VECTOR_PAGE    3'h6
+
+`define INTC_CTRL_VECTOR    0
+
+reg [7:0] enable;
+reg [15:0] priority_bits;
+reg vector_en;
+reg [7:0] vector_page;
+
+wire [7:0] active;
+assign active = i_sources & enable;
+
+// Highest priority wins, the lowest source number among equals
+reg [2:0] source;
+reg [1:0] source_priority;
+integer i;
+
+always_comb begin
+    source = 3'h0;
+    source_priority = 2'h0;
+    for (i = 7; i >= 0; i = i - 1) begin
+        if (active[i] && priority_bits[2*i +: 2] >= source_priority) begin
+            source = 3'(i);
+            source_priority = priority_bits[2*i +: 2];
+        end
+    end
+end
+
+assign o_irq = active != 8'h00;
+assign o_vector = vector_en && o_irq;
+assign o_vector_data = i_vector_hi ? vector_page : {1'b0, source, 4'h0};
+
+always_ff @(negedge i_phi2 or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        enable <= 8'hFF;
+        priority_bits <= 16'h0000;
+        vector_en <= 1'b0;
+        vector_page <= 8'h00;
+    end else if (i_en && !i_rw) begin
+        case (i_addr)
+            `INTC_ENABLE:      enable <= i_data;
+            `INTC_CTRL:        vector_en <= i_data[`INTC_CTRL_VECTOR];
+            `INTC_PRIO_LO:     priority_bits[7:0] <= i_data;
+            `INTC_PRIO_HI:     priority_bits[15:8] <= i_data;
+            `INTC_VECTOR_PAGE: vector_page <= i_data;
+            default: ;
+        endcase
+    end
+end
+
+always_ff @(posedge i_phi2 or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        o_data <= 8'h00;
+    end else if (i_en && i_rw) begin
+        case (i_addr)
+            `INTC_ENABLE:      o_data <= enable;
+            `INTC_PENDING:     o_data <= i_sources;
+            `INTC_SOURCE:      o_data <= {!o_irq, 4'h0, source};
+            `INTC_CTRL:        o_data <= {7'h00, vector_en};
+            `INTC_PRIO_LO:     o_data <= priority_bits[7:0];
+            `INTC_PRIO_HI:     o_data <= priority_bits[15:8];
+            `INTC_VECTOR_PAGE: o_data <= vector_page;
+            default:           o_data <= 8'h00;
+        endcase
+    end
+end
+
+endmodule
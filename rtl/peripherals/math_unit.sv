@@ -0,0 +1,142 @@
+// Math unit: 16x16 multiply and 16/16 divide for firmware, which would
+// otherwise spend hundreds of cycles in shift-and-add loops.
+//
+// The product of A and B is always available one cycle after an operand
+// write; yosys maps the multiplier to an SB_MAC16 (synth_ice40 -dsp) or
+// MULT18X18D on ECP5, so it costs no LUTs in the core's budget. Division
+// is sequential, one quotient bit per cycle: writing CTRL with DIV set
+// divides A by B and STATUS shows BUSY for 16 cycles.
+module math_unit (
+    input i_phi2,
+    input i_reset_n,
+
+    // Register interface
+    input [3:0] i_addr,
+    input [7:0] i_data,
+    input i_rw,
+    input i_en,
+    output reg [7:0] o_data
+);
+
+// Register Map:
+// 0xA0C0: A_LO     - operand A, multiplicand and dividend
+// 0xA0C1: A_HI
+// 0xA0C2: B_LO     - operand B, multiplier and divisor
+// 0xA0C3: B_HI
+// 0xA0C4: CTRL     - bit 0 DIV: start A / B (write-only, read 0)
+// 0xA0C5: STATUS   - bit 0 BUSY, bit 1 DIV_ZERO (read-only)
+// 0xA0C8: PROD_0   - A x B, bits 7:0 (read-only)
+// 0xA0C9: PROD_1   - bits 15:8
+// 0xA0CA: PROD_2   - bits 23:16
+// 0xA0CB: PROD_3   - bits 31:24
+// 0xA0CC: QUOT_LO  - quotient of the last DIV (read-only)
+// 0xA0CD: QUOT_HI
+// 0xA0CE: REM_LO   - remainder of the last DIV (read-only)
+// 0xA0CF: REM_HI
+
+`define MATH_A_LO           4'h0
+`define MATH_A_HI           4'h1
+`define MATH_B_LO           4'h2
+`define MATH_B_HI           4'h3
+`define MATH_CTRL           4'h4
+`define MATH_STATUS         4'h5
+`define MATH_PROD_0         4'h8
+`define MATH_PROD_1         4'h9
+`define MATH_PROD_2         4'hA
+`define MATH_PROD_3         4'hB
+`define MATH_QUOT_LO        4'hC
+`define MATH_QUOT_HI        4'hD
+`define MATH_REM_LO         4'hE
+`define MATH_REM_HI         4'hF
+
+`define MATH_CTRL_DIV       0
+
+reg [15:0] a, b;
+reg [31:0] product;
+
+always_ff @(negedge i_phi2) begin
+    product <= a * b;
+end
+
+// Restoring division: the dividend shifts out of the top of quotient as
+// the quotient bits shift in at the bottom
+reg [15:0] quotient, remainder, divisor;
+reg [4:0] steps;
+reg busy, div_zero;
+
+wire [16:0] shifted, difference;
+assign shifted = {remainder, quotient[15]};
+assign difference = shifted - {1'b0, divisor};
+
+always_ff @(negedge i_phi2 or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        a <= 16'h0;
+        b <= 16'h0;
+        quotient <= 16'h0;
+        remainder <= 16'h0;
+        divisor <= 16'h0;
+        steps <= 5'h0;
+        busy <= 1'b0;
+        div_zero <= 1'b0;
+    end else begin
+        if (busy) begin
+            if (!difference[16]) begin
+                remainder <= difference[15:0];
+                quotient <= {quotient[14:0], 1'b1};
+            end else begin
+                remainder <= shifted[15:0];
+                quotient <= {quotient[14:0], 1'b0};
+            end
+            steps <= steps - 5'h1;
+            if (steps == 5'h1)
+                busy <= 1'b0;
+        end
+
+        if (i_en && !i_rw) begin
+            case (i_addr)
+                `MATH_A_LO: a[7:0] <= i_data;
+                `MATH_A_HI: a[15:8] <= i_data;
+                `MATH_B_LO: b[7:0] <= i_data;
+                `MATH_B_HI: b[15:8] <= i_data;
+                `MATH_CTRL: begin
+                    if (i_data[`MATH_CTRL_DIV]) begin
+                        // Divide by zero: quotient 0xFFFF, remainder A, like
+                        // the restoring loop would give
+                        div_zero <= b == 16'h0;
+                        busy <= b != 16'h0;
+                        quotient <= b == 16'h0 ? 16'hFFFF : a;
+                        remainder <= b == 16'h0 ? a : 16'h0;
+                        divisor <= b;
+                        steps <= 5'd16;
+                    end
+                end
+                default: ;
+            endcase
+        end
+    end
+end
+
+always_ff @(posedge i_phi2 or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        o_data <= 8'h00;
+    end else if (i_en && i_rw) begin
+        case (i_addr)
+            `MATH_A_LO:    o_data <= a[7:0];
+            `MATH_A_HI:    o_data <= a[15:8];
+            `MATH_B_LO:    o_data <= b[7:0];
+            `MATH_B_HI:    o_data <= b[15:8];
+            `MATH_STATUS:  o_data <= {6'h00, div_zero, busy};
+            `MATH_PROD_0:  o_data <= product[7:0];
+            `MATH_PROD_1:  o_data <= product[15:8];
+            `MATH_PROD_2:  o_data <= product[23:16];
+            `MATH_PROD_3:  o_data <= product[31:24];
+            `MATH_QUOT_LO: o_data <= quotient[7:0];
+            `MATH_QUOT_HI: o_data <= quotient[15:8];
+            `MATH_REM_LO:  o_data <= remainder[7:0];
+            `MATH_REM_HI:  o_data <= remainder[15:8];
+            default:       o_data <= 8'h00;
+        endcase
+    end
+end
+
+endmodule
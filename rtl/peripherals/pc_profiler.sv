@@ -0,0 +1,183 @@
+// PC profiler: a histogram of where the CPU runs, in block RAM, so hot spots
+// in firmware can be found on the board at full clock.
+//
+// The address window starting at BASE is split into BUCKETS buckets of
+// 2^SHIFT bytes. Each instruction fetched in the window increments its
+// bucket's 32-bit counter; with CYCLES set, every CPU cycle increments the
+// bucket of the instruction it belongs to, stalls included. Counters
+// saturate. tools/profile_report.py maps the buckets to firmware symbols.
+//
+// A counter is read and written back in the same CPU cycle, at posedge and
+// negedge, so counting never holds the CPU. The block RAM read port is
+// shared with DATA, which reads the counters only while ENABLE is clear.
+module pc_profiler #(
+    parameter BUCKETS = 256             // a power of 2
+) (
+    input i_phi2,
+    input i_reset_n,
+
+    // Register interface
+    input [2:0] i_addr,
+    input [7:0] i_data,
+    input i_rw,
+    input i_en,
+    output [7:0] o_data,
+
+    // CPU bus
+    input i_sync,                       // opcode fetch
+    input i_rdy,                        // the CPU's cycle completes
+    input i_ce,                         // CPU clock enable, see clock_control.sv
+    input [15:0] i_cpu_addr
+);
+
+// Register Map:
+// 0xA0B0: CTRL     - bit 0 ENABLE, bit 1 CYCLES, bit 2 CLEAR (CLEAR reads 0)
+// 0xA0B1: STATUS   - bit 0 BUSY, clearing the counters (read-only)
+// 0xA0B2: SHIFT    - bits 3:0 log2 of the bucket size in bytes
+// 0xA0B3: BASE_LO  - window start
+// 0xA0B4: BASE_HI
+// 0xA0B5: INDEX_LO - bucket DATA reads, advances every 4 bytes
+// 0xA0B6: INDEX_HI
+// 0xA0B7: DATA     - next byte of the counter stream, low byte first (read-only)
+
+`define PROF_CTRL               3'h0
+`define PROF_STATUS             3'h1
+`define PROF_SHIFT              3'h2
+`define PROF_BASE_LO            3'h3
+`define PROF_BASE_HI            3'h4
+`define PROF_INDEX_LO           3'h5
+`define PROF_INDEX_HI           3'h6
+`define PROF_DATA               3'h7
+
+`define PROF_CTRL_ENABLE        0
+`define PROF_CTRL_CYCLES        1
+`define PROF_CTRL_CLEAR         2
+
+localparam INDEX_BITS = $clog2(BUCKETS);
+
+reg [31:0] counters [0:BUCKETS-1];
+
+reg enable, cycles;
+reg [3:0] shift;
+reg [15:0] base;
+reg [15:0] index;
+reg [1:0] read_byte;                    // byte of the counter at index DATA returns next
+reg clearing;                           // BUSY: zeroing the counters after reset or CLEAR
+reg [INDEX_BITS-1:0] clear_index;
+
+// The opcode fetch completes the cycle before o_sync, so the last completed
+// CPU cycle holds the instruction's address
+reg [15:0] last_addr;
+reg [15:0] instruction_addr;            // instruction the current cycle belongs to
+
+wire [15:0] profile_addr, offset, bucket;
+assign profile_addr = i_sync ? last_addr : instruction_addr;
+assign offset = profile_addr - base;
+assign bucket = offset >> shift;
+
+wire in_window, count;
+assign in_window = bucket < 16'(BUCKETS);
+assign count = enable && !clearing && in_window && ((cycles && i_ce) || (i_sync && i_rdy));
+
+wire data_read;
+assign data_read = i_en && i_rw && i_addr == `PROF_DATA;
+
+// Block RAM read, registered without reset: the bucket while counting, else
+// the one DATA streams
+reg [31:0] counter;
+always_ff @(posedge i_phi2) begin
+    counter <= counters[enable ? bucket[INDEX_BITS-1:0] : index[INDEX_BITS-1:0]];
+end
+
+always_ff @(negedge i_phi2) begin
+    if (clearing)
+        counters[clear_index] <= 32'h0;
+    else if (count && counter != 32'hFFFFFFFF)
+        counters[bucket[INDEX_BITS-1:0]] <= counter + 32'h1;
+end
+
+always_ff @(negedge i_phi2 or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        enable <= 1'b0;
+        cycles <= 1'b0;
+        shift <= 4'h0;
+        base <= 16'h0;
+        index <= 16'h0;
+        read_byte <= 2'h0;
+        clearing <= 1'b1;
+        clear_index <= {INDEX_BITS{1'b0}};
+        last_addr <= 16'h0;
+        instruction_addr <= 16'h0;
+    end else begin
+        if (i_rdy)
+            last_addr <= i_cpu_addr;
+        if (i_sync && i_rdy)
+            instruction_addr <= last_addr;
+
+        if (clearing) begin
+            clear_index <= clear_index + 1'b1;
+            if (clear_index == INDEX_BITS'(BUCKETS - 1))
+                clearing <= 1'b0;
+        end
+
+        if (data_read) begin
+            read_byte <= read_byte + 2'h1;
+            if (read_byte == 2'h3)
+                index <= index + 16'h1;
+        end
+
+        if (i_en && !i_rw) begin
+            case (i_addr)
+                `PROF_CTRL: begin
+                    enable <= i_data[`PROF_CTRL_ENABLE];
+                    cycles <= i_data[`PROF_CTRL_CYCLES];
+                    if (i_data[`PROF_CTRL_CLEAR]) begin
+                        clearing <= 1'b1;
+                        clear_index <= {INDEX_BITS{1'b0}};
+                    end
+                end
+                `PROF_SHIFT:    shift <= i_data[3:0];
+                `PROF_BASE_LO:  base[7:0] <= i_data;
+                `PROF_BASE_HI:  base[15:8] <= i_data;
+                `PROF_INDEX_LO: begin
+                    index[7:0] <= i_data;
+                    read_byte <= 2'h0;
+                end
+                `PROF_INDEX_HI: begin
+                    index[15:8] <= i_data;
+                    read_byte <= 2'h0;
+                end
+                default: ;
+            endcase
+        end
+    end
+end
+
+reg [7:0] reg_data;
+reg [1:0] data_byte;
+reg data_sel;
+
+always_ff @(posedge i_phi2 or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        reg_data <= 8'h00;
+        data_byte <= 2'h0;
+        data_sel <= 1'b0;
+    end else if (i_en && i_rw) begin
+        data_sel <= i_addr == `PROF_DATA;
+        data_byte <= read_byte;
+        case (i_addr)
+            `PROF_CTRL:     reg_data <= {6'h00, cycles, enable};
+            `PROF_STATUS:   reg_data <= {7'h00, clearing};
+            `PROF_SHIFT:    reg_data <= {4'h0, shift};
+            `PROF_BASE_LO:  reg_data <= base[7:0];
+            `PROF_BASE_HI:  reg_data <= base[15:8];
+            `PROF_INDEX_LO: reg_data <= index[7:0];
+            `PROF_INDEX_HI: reg_data <= index[15:8];
+            default:        reg_data <= 8'h00;
+        endcase
+    end
+end
+
+assign o_data = data_sel ? counter[8*data_byte +: 8] : reg_data;
+
+endmodule
@@ -0,0 +1,160 @@
+// Performance counters: CPU cycles, instructions, stall cycles, IRQs taken
+// and the latency of the last IRQ, so firmware can profile itself on the
+// board.
+//
+// The counters run freely in the CPU clock, counting the PHI2 cycles with
+// i_ce high. SNAPSHOT copies all of them at
+// once into snapshot registers, which SELECT and DATA_0..DATA_3 read a byte
+// at a time, so a multi-byte value and the ratio between two counters stay
+// consistent however long the reads take.
+module perf_counters (
+    input i_phi2,
+    input i_reset_n,
+
+    // Register interface
+    input [2:0] i_addr,
+    /* verilator lint_off UNUSEDSIGNAL */
+    input [7:0] i_data,             // CTRL bits 1:0 and SELECT bits 2:0
+    /* verilator lint_on UNUSEDSIGNAL */
+    input i_rw,
+    input i_en,
+    output reg [7:0] o_data,
+
+    // CPU events
+    input i_sync,                   // opcode fetch
+    input i_rdy,                    // the CPU's cycle completes
+    input i_ce,                     // CPU clock enable, see clock_control.sv
+    input i_irq_n,                  // CPU IRQ input
+    input i_irq_vector              // CPU is taking an IRQ
+);
+
+// Register Map:
+// 0xA090: CTRL   - bit 0 SNAPSHOT, bit 1 CLEAR (write-only, read 0)
+// 0xA091: SELECT - snapshot counter read through DATA_0..DATA_3
+// 0xA094: DATA_0 - selected snapshot, bits 7:0
+// 0xA095: DATA_1 - bits 15:8
+// 0xA096: DATA_2 - bits 23:16
+// 0xA097: DATA_3 - bits 31:24
+
+`define PERF_CTRL           3'h0
+`define PERF_SELECT         3'h1
+`define PERF_DATA_0         3'h4
+`define PERF_DATA_1         3'h5
+`define PERF_DATA_2         3'h6
+`define PERF_DATA_3         3'h7
+
+`define PERF_CTRL_SNAPSHOT  0
+`define PERF_CTRL_CLEAR     1
+
+`define PERF_CYCLES         3'h0
+`define PERF_INSTRUCTIONS   3'h1
+`define PERF_STALLS         3'h2
+`define PERF_IRQS           3'h3
+`define PERF_IRQ_LATENCY    3'h4
+
+reg [31:0] cycles, instructions, stalls, irqs;
+reg [15:0] irq_wait;                // cycles the current IRQ has waited, saturating
+reg [15:0] irq_latency;             // irq_wait when the last IRQ's handler started
+reg irq_served;                     // IRQ line still low from an IRQ already taken
+reg prev_irq_vector;
+
+reg [31:0] snap_cycles, snap_instructions, snap_stalls, snap_irqs;
+reg [15:0] snap_irq_latency;
+reg [2:0] select;
+
+wire snapshot, clear;
+assign snapshot = i_en && !i_rw && i_addr == `PERF_CTRL && i_data[`PERF_CTRL_SNAPSHOT];
+assign clear = i_en && !i_rw && i_addr == `PERF_CTRL && i_data[`PERF_CTRL_CLEAR];
+
+// The handler's first opcode fetch follows the end of the IRQ sequence
+wire irq_taken;
+assign irq_taken = prev_irq_vector && !i_irq_vector;
+
+always_ff @(negedge i_phi2 or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        cycles <= 32'h0;
+        instructions <= 32'h0;
+        stalls <= 32'h0;
+        irqs <= 32'h0;
+        irq_wait <= 16'h0;
+        irq_latency <= 16'h0;
+        irq_served <= 1'b0;
+        prev_irq_vector <= 1'b0;
+        snap_cycles <= 32'h0;
+        snap_instructions <= 32'h0;
+        snap_stalls <= 32'h0;
+        snap_irqs <= 32'h0;
+        snap_irq_latency <= 16'h0;
+        select <= `PERF_CYCLES;
+    end else begin
+        prev_irq_vector <= i_irq_vector;
+
+        if (clear) begin
+            cycles <= 32'h0;
+            instructions <= 32'h0;
+            stalls <= 32'h0;
+            irqs <= 32'h0;
+            irq_latency <= 16'h0;
+        end else begin
+            if (i_ce)
+                cycles <= cycles + 32'h1;
+            if (i_sync && i_rdy)
+                instructions <= instructions + 32'h1;
+            if (i_ce && !i_rdy)
+                stalls <= stalls + 32'h1;
+            if (irq_taken) begin
+                irqs <= irqs + 32'h1;
+                irq_latency <= irq_wait;
+            end
+        end
+
+        if (i_irq_n) begin
+            irq_wait <= 16'h0;
+            irq_served <= 1'b0;
+        end else if (irq_taken) begin
+            irq_served <= 1'b1;
+        end else if (i_ce && !irq_served && irq_wait != 16'hFFFF) begin
+            irq_wait <= irq_wait + 16'h1;
+        end
+
+        if (snapshot) begin
+            snap_cycles <= cycles;
+            snap_instructions <= instructions;
+            snap_stalls <= stalls;
+            snap_irqs <= irqs;
+            snap_irq_latency <= irq_latency;
+        end
+
+        if (i_en && !i_rw && i_addr == `PERF_SELECT)
+            select <= i_data[2:0];
+    end
+end
+
+reg [31:0] selected;
+always_comb begin
+    case (select)
+        `PERF_CYCLES:       selected = snap_cycles;
+        `PERF_INSTRUCTIONS: selected = snap_instructions;
+        `PERF_STALLS:       selected = snap_stalls;
+        `PERF_IRQS:         selected = snap_irqs;
+        `PERF_IRQ_LATENCY:  selected = {16'h0, snap_irq_latency};
+        default:            selected = 32'h0;
+    endcase
+end
+
+always_ff @(posedge i_phi2 or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        o_data <= 8'h00;
+    end else if (i_en && i_rw) begin
+        case (i_addr)
+            `PERF_SELECT: o_data <= {5'h00, select};
+            `PERF_DATA_0: o_data <= selected[7:0];
+            `PERF_DATA_1: o_data <= selected[15:8];
+            `PERF_DATA_2: o_data <= selected[23:16];
+            `PERF_DATA_3: o_data <= selected[31:24];
+            default:      o_data <= 8'h00;
+        endcase
+    end
+end
+
+endmodule
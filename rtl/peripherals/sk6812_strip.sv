@@ -0,0 +1,208 @@
+// SK6812 strip engine: streams a frame buffer in memory to the LED driver.
+//
+// A frame is COUNT pixels of four bytes (RED, GREEN, BLUE, WHITE) read from
+// buffer 0 or buffer 1, followed by the reset gap that latches the strip.
+// Pixels are fetched as a bus master, four bus cycles each, while the
+// previous pixel is shifted out, so the CPU only loses those cycles. In LOOP
+// mode frames repeat without the CPU; FLIP swaps the buffers at the start of
+// the next frame, so firmware can draw into one while the other is shown.
+module sk6812_strip (
+    input i_phi2,
+    input i_reset_n,
+
+    // Register interface
+    input [2:0] i_addr,
+    input [7:0] i_data,
+    input i_rw,
+    input i_en,
+    output reg [7:0] o_data,
+    output o_irq,
+
+    // LED driver
+    input i_busy,
+    output reg o_strb,
+    output reg o_reset_strb,
+    output [31:0] o_color,
+    output o_active,                // a frame is being sent
+
+    // Bus master, reads only
+    output o_bus_req,               // wants the bus
+    input i_grant,                  // may take the bus
+    output reg o_bus,               // owns the bus
+    output [15:0] o_bus_addr,
+    input [7:0] i_bus_data,
+    input i_rdy                     // the access on the bus completes this cycle
+);
+
+// Register Map (offsets within the SK6812 slot):
+// 0xA018: STRIP_CTRL   - bit 0 START (reads BUSY), bit 1 LOOP, bit 2 IRQ_EN,
+//                        bit 3 FLIP (reads FLIP pending)
+// 0xA019: STRIP_STATUS - bit 0 BUSY, bit 1 FRAME_DONE (write 1 to clear), bit 2 FRONT
+// 0xA01A: STRIP_COUNT  - pixels per frame, 0 = 256
+// 0xA01C: STRIP_BUF0_LO, 0xA01D: STRIP_BUF0_HI - buffer 0 address
+// 0xA01E: STRIP_BUF1_LO, 0xA01F: STRIP_BUF1_HI - buffer 1 address
+
+`define STRIP_CTRL          3'h0
+`define STRIP_STATUS        3'h1
+`define STRIP_COUNT         3'h2
+`define STRIP_BUF0_LO       3'h4
+`define STRIP_BUF0_HI       3'h5
+`define STRIP_BUF1_LO       3'h6
+`define STRIP_BUF1_HI       3'h7
+
+`define STRIP_CTRL_START    0
+`define STRIP_CTRL_LOOP     1
+`define STRIP_CTRL_IRQ_EN   2
+`define STRIP_CTRL_FLIP     3
+
+`define STRIP_STATUS_DONE   1
+
+reg active, loop, irq_en, stop;
+reg done, front, flip;
+reg [7:0] count;
+reg [15:0] buf0, buf1;
+
+reg [15:0] fetch_addr;
+reg [8:0] fetch_left;               // pixels still to fetch
+reg [1:0] fetch_byte;
+reg [31:0] pixel;                   // {GREEN, RED, BLUE, WHITE}, as the driver shifts it
+reg pixel_valid;
+reg wait_busy;                      // strobe sent, driver not busy yet
+reg resetting;                      // reset gap sent
+
+assign o_color = pixel;
+assign o_active = active;
+assign o_irq = done && irq_en;
+assign o_bus_req = active && fetch_left != 9'h0 && !pixel_valid && !wait_busy;
+assign o_bus_addr = fetch_addr;
+
+wire frame_end;
+assign frame_end = resetting && !wait_busy && !i_busy;
+
+wire start;
+assign start = i_en && !i_rw && i_addr == `STRIP_CTRL && i_data[`STRIP_CTRL_START];
+
+wire start_frame;
+assign start_frame = (!active && start) || (frame_end && loop && !stop);
+
+wire next_front;
+assign next_front = flip ? !front : front;
+
+always_ff @(negedge i_phi2 or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        active <= 1'b0;
+        loop <= 1'b0;
+        irq_en <= 1'b0;
+        stop <= 1'b0;
+        done <= 1'b0;
+        front <= 1'b0;
+        flip <= 1'b0;
+        count <= 8'h00;
+        buf0 <= 16'h0000;
+        buf1 <= 16'h0000;
+        fetch_addr <= 16'h0000;
+        fetch_left <= 9'h0;
+        fetch_byte <= 2'h0;
+        pixel <= 32'h0;
+        pixel_valid <= 1'b0;
+        wait_busy <= 1'b0;
+        resetting <= 1'b0;
+        o_strb <= 1'b0;
+        o_reset_strb <= 1'b0;
+        o_bus <= 1'b0;
+    end else begin
+        o_strb <= 1'b0;
+        o_reset_strb <= 1'b0;
+
+        // Fetch the next pixel, one byte per owned bus cycle
+        if (o_bus && i_rdy) begin
+            case (fetch_byte)
+                2'h0: pixel[23:16] <= i_bus_data;
+                2'h1: pixel[31:24] <= i_bus_data;
+                2'h2: pixel[15:8] <= i_bus_data;
+                2'h3: pixel[7:0] <= i_bus_data;
+            endcase
+            fetch_addr <= fetch_addr + 16'h1;
+            fetch_byte <= fetch_byte + 2'h1;
+            if (fetch_byte == 2'h3) begin
+                pixel_valid <= 1'b1;
+                fetch_left <= fetch_left - 9'h1;
+                o_bus <= 1'b0;
+            end
+        end else if (!o_bus && i_rdy && i_grant && o_bus_req) begin
+            o_bus <= 1'b1;
+        end
+
+        // Send it once the driver is idle, then the reset gap after the last
+        if (wait_busy) begin
+            if (i_busy)
+                wait_busy <= 1'b0;
+        end else if (pixel_valid && !i_busy) begin
+            o_strb <= 1'b1;
+            pixel_valid <= 1'b0;
+            wait_busy <= 1'b1;
+        end else if (active && !resetting && fetch_left == 9'h0 && !pixel_valid && !i_busy) begin
+            o_reset_strb <= 1'b1;
+            resetting <= 1'b1;
+            wait_busy <= 1'b1;
+        end
+
+        if (frame_end) begin
+            done <= 1'b1;
+            resetting <= 1'b0;
+            active <= 1'b0;
+        end
+
+        if (start_frame) begin
+            active <= 1'b1;
+            stop <= 1'b0;
+            front <= next_front;
+            flip <= 1'b0;
+            fetch_addr <= next_front ? buf1 : buf0;
+            fetch_left <= count == 8'h00 ? 9'h100 : {1'b0, count};
+            fetch_byte <= 2'h0;
+        end
+
+        if (i_en && !i_rw) begin
+            case (i_addr)
+                `STRIP_CTRL: begin
+                    loop <= i_data[`STRIP_CTRL_LOOP];
+                    irq_en <= i_data[`STRIP_CTRL_IRQ_EN];
+                    if (i_data[`STRIP_CTRL_FLIP])
+                        flip <= 1'b1;
+                    if (!i_data[`STRIP_CTRL_START] && active)
+                        stop <= 1'b1;
+                end
+                `STRIP_STATUS: begin
+                    if (i_data[`STRIP_STATUS_DONE])
+                        done <= 1'b0;
+                end
+                `STRIP_COUNT: count <= i_data;
+                `STRIP_BUF0_LO: buf0[7:0] <= i_data;
+                `STRIP_BUF0_HI: buf0[15:8] <= i_data;
+                `STRIP_BUF1_LO: buf1[7:0] <= i_data;
+                `STRIP_BUF1_HI: buf1[15:8] <= i_data;
+                default: ;
+            endcase
+        end
+    end
+end
+
+always_ff @(posedge i_phi2 or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        o_data <= 8'h00;
+    end else if (i_en && i_rw) begin
+        case (i_addr)
+            `STRIP_CTRL:    o_data <= {4'h0, flip, irq_en, loop, active};
+            `STRIP_STATUS:  o_data <= {5'h00, front, done, active};
+            `STRIP_COUNT:   o_data <= count;
+            `STRIP_BUF0_LO: o_data <= buf0[7:0];
+            `STRIP_BUF0_HI: o_data <= buf0[15:8];
+            `STRIP_BUF1_LO: o_data <= buf1[7:0];
+            `STRIP_BUF1_HI: o_data <= buf1[15:8];
+            default:        o_data <= 8'h00;
+        endcase
+    end
+end
+
+endmodule
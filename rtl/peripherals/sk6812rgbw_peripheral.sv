@@ -1,16 +1,36 @@
+// SAME_CLOCK=1 when i_phi2 is i_clk (the MCU's CPU_CLOCK_ENABLE): a write
+// that strobes the LED drives the LED's strobe directly, on the rising edge
+// of i_clk inside the write cycle, with the WHITE byte taken from the bus.
+// Otherwise the strobe is registered on the falling edge of PHI2.
 module sk6812rgbw_peripheral #(
-    parameter CLOCK_DIV_DEFAULT = 1
+    parameter CLOCK_DIV_DEFAULT = 1,
+    parameter ENABLE_STRIP = 0,     // strip engine at offsets 8-15, see sk6812_strip.sv
+    parameter SAME_CLOCK = 0
 ) (
     input i_clk,
     input i_phi2,
     input i_reset_n,
-    input [2:0] i_addr,
+    input [3:0] i_addr,
     input [7:0] i_data,
-    output reg [7:0] o_data,
+    output [7:0] o_data,
     input i_en,
     input i_rw,
 
-    output o_led_data
+    output o_led_data,
+    output o_ready,         // not busy, DMA pacing
+    output o_irq,           // strip frame done
+
+    // Strip engine bus master, the inputs are unused without the engine
+    output o_bus_req,
+    /* verilator lint_off UNUSEDSIGNAL */
+    input i_grant,
+    /* verilator lint_on UNUSEDSIGNAL */
+    output o_bus,
+    output [15:0] o_bus_addr,
+    /* verilator lint_off UNUSEDSIGNAL */
+    input [7:0] i_bus_data,
+    input i_rdy
+    /* verilator lint_on UNUSEDSIGNAL */
 );
 
 localparam REGISTER_CONTROL = 0;
@@ -21,38 +41,85 @@ localparam REGISTER_BLUE = 4;
 localparam REGISTER_WHITE = 5;
 localparam REGISTER_STATUS = 6;
 
+localparam CONTROL_STROBE = 0;
+localparam CONTROL_AUTO = 1;        // writing WHITE also strobes
+
 wire busy;
 reg [7:0] clk_div;
 reg [31:0] led_color;
-reg led_strb;
+reg auto_strb;
+
+// Offsets 8-15 mirror the registers unless the strip engine is built
+wire strip_sel, reg_en;
+assign strip_sel = ENABLE_STRIP != 0 && i_addr[3];
+assign reg_en = i_en && !strip_sel;
+
+wire strip_strb, strip_reset_strb, strip_active;
+wire [31:0] strip_color;
+wire [7:0] strip_data;
+reg [7:0] reg_data;
+reg read_strip;
+
+// CONTROL with STROBE, or WHITE with AUTO
+wire led_write;
+assign led_write = !i_rw && reg_en &&
+    (i_addr[2:0] == REGISTER_CONTROL ? i_data[CONTROL_STROBE] : i_addr[2:0] == REGISTER_WHITE && auto_strb);
+
+wire led_strb;
+wire [31:0] led_strb_color;
+
+generate
+    if (SAME_CLOCK) begin : same_clock
+        // The WHITE byte is still on the bus at the rising edge
+        assign led_strb = led_write;
+        assign led_strb_color = {led_color[31:8], led_write && i_addr[2:0] == REGISTER_WHITE ? i_data : led_color[7:0]};
+    end else begin : cross_clock
+        reg led_strb_reg;
+
+        always @(negedge i_phi2 or negedge i_reset_n) begin
+            if (!i_reset_n) begin
+                led_strb_reg <= 0;
+            end else begin
+                led_strb_reg <= led_write;
+            end
+        end
+
+        assign led_strb = led_strb_reg;
+        assign led_strb_color = led_color;
+    end
+endgenerate
+
+assign o_ready = !busy && !strip_active;
+assign o_data = read_strip ? strip_data : reg_data;
 
 always @(posedge i_phi2 or negedge i_reset_n) begin
     if (!i_reset_n) begin
-        o_data <= 0;
+        reg_data <= 0;
+        read_strip <= 0;
     end else if (i_rw && i_en) begin
-        case (i_addr)
-        REGISTER_CONTROL: o_data <= 8'b0;
-        REGISTER_CLKDIV: o_data <= clk_div;
-        REGISTER_RED: o_data <= led_color[23:16];
-        REGISTER_GREEN: o_data <= led_color[31:24];
-        REGISTER_BLUE: o_data <= led_color[15:8];
-        REGISTER_WHITE: o_data <= led_color[7:0];
-        REGISTER_STATUS: o_data <= {7'b0, busy};
-        default: o_data <= 0;
+        read_strip <= strip_sel;
+        case (i_addr[2:0])
+        REGISTER_CONTROL: reg_data <= {6'b0, auto_strb, 1'b0};
+        REGISTER_CLKDIV: reg_data <= clk_div;
+        REGISTER_RED: reg_data <= led_color[23:16];
+        REGISTER_GREEN: reg_data <= led_color[31:24];
+        REGISTER_BLUE: reg_data <= led_color[15:8];
+        REGISTER_WHITE: reg_data <= led_color[7:0];
+        REGISTER_STATUS: reg_data <= {7'b0, busy || strip_active};
+        default: reg_data <= 0;
         endcase
     end
 end
 
 always @(negedge i_phi2 or negedge i_reset_n) begin
     if (!i_reset_n) begin
-        led_strb <= 0;
+        auto_strb <= 0;
         clk_div <= CLOCK_DIV_DEFAULT;
         led_color <= 0;
     end else begin
-        led_strb <= 0;
-        if (!i_rw && i_en) begin
-            case (i_addr)
-            REGISTER_CONTROL: led_strb <= i_data[0];
+        if (!i_rw && reg_en) begin
+            case (i_addr[2:0])
+            REGISTER_CONTROL: auto_strb <= i_data[CONTROL_AUTO];
             REGISTER_CLKDIV: clk_div <= i_data;
             REGISTER_RED: led_color[23:16] <= i_data;
             REGISTER_GREEN: led_color[31:24] <= i_data;
@@ -63,13 +130,49 @@ always @(negedge i_phi2 or negedge i_reset_n) begin
     end
 end
 
+generate
+    if (ENABLE_STRIP) begin : strip_gen_on
+        sk6812_strip strip (
+            .i_phi2(i_phi2),
+            .i_reset_n(i_reset_n),
+            .i_addr(i_addr[2:0]),
+            .i_data(i_data),
+            .i_rw(i_rw),
+            .i_en(i_en && strip_sel),
+            .o_data(strip_data),
+            .o_irq(o_irq),
+            .i_busy(busy),
+            .o_strb(strip_strb),
+            .o_reset_strb(strip_reset_strb),
+            .o_color(strip_color),
+            .o_active(strip_active),
+            .o_bus_req(o_bus_req),
+            .i_grant(i_grant),
+            .o_bus(o_bus),
+            .o_bus_addr(o_bus_addr),
+            .i_bus_data(i_bus_data),
+            .i_rdy(i_rdy)
+        );
+    end else begin : strip_gen_off
+        assign strip_data = 8'h00;
+        assign o_irq = 1'b0;
+        assign strip_strb = 1'b0;
+        assign strip_reset_strb = 1'b0;
+        assign strip_color = 32'h0;
+        assign strip_active = 1'b0;
+        assign o_bus_req = 1'b0;
+        assign o_bus = 1'b0;
+        assign o_bus_addr = 16'h0000;
+    end
+endgenerate
+
 sk6812rgbw sk6812rgbw (
     .i_clk(i_clk),
     .i_clk_div(clk_div),
     .i_reset_n(i_reset_n),
-    .i_led_strb(led_strb),
-    .i_led_color(led_color),
-    .i_reset_strb(1'b0),
+    .i_led_strb((led_strb && !strip_active) || strip_strb),
+    .i_led_color(strip_active ? strip_color : led_strb_color),
+    .i_reset_strb(strip_reset_strb),
     .o_data(o_led_data),
     .o_busy(busy)
 );
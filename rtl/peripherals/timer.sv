@@ -1,22 +1,47 @@
-module timer (
+// Timer: a 16-bit up-counter with prescaler, auto-reload and an overflow IRQ.
+//
+// With ENABLE_CHANNELS, two compare/capture channels share the counter. A
+// channel in COMPARE mode drives o_compare high while the count is below its
+// compare value, an edge-aligned PWM with a period of 0x10000 - RELOAD ticks,
+// and flags the tick the count equals it. In a capture mode it latches the
+// count on a rising or falling edge of i_capture and flags that. The GPIO
+// pin mux routes o_compare to pins and a pin to i_capture.
+//
+// SAME_CLOCK=1 when i_phi2 is i_clk (the MCU's CPU_CLOCK_ENABLE): a STATUS
+// write clears the flags and a CTRL write with LOAD loads the count directly,
+// on the rising edge of i_clk inside the write cycle, and LOAD reads 0.
+// Otherwise both go through registers written on the falling edge of PHI2.
+module timer #(
+    parameter ENABLE_CHANNELS = 0,
+    parameter SAME_CLOCK = 0
+) (
     input i_clk,
     input i_phi2,
     input i_reset_n,
-    input [2:0] i_addr,
+    input [3:0] i_addr,
     input [7:0] i_data,
     input i_rw,
     input i_en,
     output reg [7:0] o_data,
-    output o_irq
+    output o_irq,
+
+    input i_capture,                // capture input, asynchronous
+    output reg [1:0] o_compare      // channel outputs in COMPARE mode
 );
 
-`define TIMER_CTRL       3'h0
-`define TIMER_STATUS     3'h1
-`define TIMER_COUNT_LO   3'h2
-`define TIMER_COUNT_HI   3'h3
-`define TIMER_RELOAD_LO  3'h4
-`define TIMER_RELOAD_HI  3'h5
-`define TIMER_PRESCALER  3'h6
+`define TIMER_CTRL       4'h0
+`define TIMER_STATUS     4'h1
+`define TIMER_COUNT_LO   4'h2
+`define TIMER_COUNT_HI   4'h3
+`define TIMER_RELOAD_LO  4'h4
+`define TIMER_RELOAD_HI  4'h5
+`define TIMER_PRESCALER  4'h6
+`define TIMER_CH0_CTRL   4'h8
+`define TIMER_CH0_LO     4'h9
+`define TIMER_CH0_HI     4'hA
+`define TIMER_CH1_CTRL   4'hC
+`define TIMER_CH1_LO     4'hD
+`define TIMER_CH1_HI     4'hE
 
 `define CTRL_ENABLE      0
 `define CTRL_AUTO_RELOAD 1
@@ -24,6 +49,13 @@ module timer (
 `define CTRL_LOAD        3
 
 `define STATUS_OVERFLOW  0
+`define STATUS_CH0       1          // channel 1 is bit 2
+
+`define CH_MODE_OFF      2'h0
+`define CH_MODE_COMPARE  2'h1
+`define CH_MODE_RISING   2'h2
+`define CH_MODE_FALLING  2'h3
+`define CH_IRQ_ENABLE    2
 
 // Registers
 reg [7:0] ctrl_reg;
@@ -35,12 +67,10 @@ reg [7:0] prescaler_reg;
 wire ctrl_enable;
 wire ctrl_auto_reload;
 wire ctrl_irq_enable;
-wire ctrl_load;
 
 assign ctrl_enable = ctrl_reg[`CTRL_ENABLE];
 assign ctrl_auto_reload = ctrl_reg[`CTRL_AUTO_RELOAD];
 assign ctrl_irq_enable = ctrl_reg[`CTRL_IRQ_ENABLE];
-assign ctrl_load = ctrl_reg[`CTRL_LOAD];
 
 wire overflow_flag;
 assign overflow_flag = status_reg[`STATUS_OVERFLOW];
@@ -54,7 +84,39 @@ assign reload_value = {reload_hi, reload_lo};
 wire prescale_tick;
 assign prescale_tick = (prescale_counter >= prescaler_reg);
 
-assign o_irq = overflow_flag && ctrl_irq_enable;
+// Channel registers, CPU side: CTRL and the compare value
+reg [2:0] ch_ctrl [0:1];
+reg [15:0] ch_compare [0:1];
+// Count latched by the last capture, i_clk side
+reg [15:0] ch_capture [0:1];
+
+wire [1:0] ch_mode [0:1];
+wire [1:0] ch_irq;
+assign ch_mode[0] = ENABLE_CHANNELS ? ch_ctrl[0][1:0] : `CH_MODE_OFF;
+assign ch_mode[1] = ENABLE_CHANNELS ? ch_ctrl[1][1:0] : `CH_MODE_OFF;
+assign ch_irq = {status_reg[`STATUS_CH0 + 1] && ch_ctrl[1][`CH_IRQ_ENABLE],
+                 status_reg[`STATUS_CH0] && ch_ctrl[0][`CH_IRQ_ENABLE]};
+
+// CHn_LO/HI read the capture in the capture modes, the compare value otherwise
+wire [15:0] ch_value [0:1];
+assign ch_value[0] = ch_mode[0][1] ? ch_capture[0] : ch_compare[0];
+assign ch_value[1] = ch_mode[1][1] ? ch_capture[1] : ch_compare[1];
+
+assign o_irq = (overflow_flag && ctrl_irq_enable) || (ENABLE_CHANNELS && ch_irq != 2'b00);
+
+// i_capture through a two-flop synchronizer, plus a third flop for edge detect
+reg [2:0] capture_sync;
+wire capture_rise, capture_fall;
+assign capture_rise = capture_sync[1] && !capture_sync[2];
+assign capture_fall = !capture_sync[1] && capture_sync[2];
+
+always_ff @(posedge i_clk or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        capture_sync <= 3'b000;
+    end else begin
+        capture_sync <= {capture_sync[1:0], i_capture};
+    end
+end
 
 always_ff @(posedge i_clk or negedge i_reset_n) begin
     if (!i_reset_n) begin
@@ -68,15 +130,68 @@ always_ff @(posedge i_clk or negedge i_reset_n) begin
     end
 end
 
-reg overflow_clear_req;
+wire status_write;
+assign status_write = i_en && !i_rw && i_addr == `TIMER_STATUS;
+
+// Write-1-to-clear STATUS bits, the channel bits only with the channels
+wire [2:0] status_clear_data;
+assign status_clear_data = ENABLE_CHANNELS ? i_data[2:0] : {2'b00, i_data[`STATUS_OVERFLOW]};
+
+// LOAD only works when timer is stopped (glitchless)
+wire count_load;
+wire [2:0] status_clear;
+
+generate
+    if (SAME_CLOCK) begin : same_clock
+        wire ctrl_write;
+        assign ctrl_write = i_en && !i_rw && i_addr == `TIMER_CTRL;
+
+        assign count_load = ctrl_write && i_data[`CTRL_LOAD] && !i_data[`CTRL_ENABLE];
+        assign status_clear = status_write ? status_clear_data : 3'b000;
+    end else begin : cross_clock
+        reg [2:0] status_clear_req;
+
+        always_ff @(negedge i_phi2 or negedge i_reset_n) begin
+            if (!i_reset_n) begin
+                status_clear_req <= 3'b000;
+            end else begin
+                status_clear_req <= status_write ? status_clear_data : 3'b000;
+            end
+        end
+
+        assign count_load = ctrl_reg[`CTRL_LOAD] && !ctrl_enable;
+        assign status_clear = status_clear_req;
+    end
+endgenerate
+
+integer ch;                         // channel, or STATUS bit when clearing
 
 always_ff @(posedge i_clk or negedge i_reset_n) begin
     if (!i_reset_n) begin
         timer_count <= 16'h0000;
         status_reg <= 8'h00;
+        o_compare <= 2'b00;
+        ch_capture[0] <= 16'h0000;
+        ch_capture[1] <= 16'h0000;
     end else begin
-        // LOAD only works when timer is stopped (glitchless)
-        if (ctrl_load && !ctrl_enable) begin
+        for (ch = 0; ch < 2; ch = ch + 1) begin
+            o_compare[ch] <= ch_mode[ch] == `CH_MODE_COMPARE && timer_count < ch_compare[ch];
+            case (ch_mode[ch])
+                `CH_MODE_COMPARE: begin
+                    if (ctrl_enable && prescale_tick && timer_count == ch_compare[ch])
+                        status_reg[`STATUS_CH0 + ch] <= 1'b1;
+                end
+                `CH_MODE_RISING, `CH_MODE_FALLING: begin
+                    if (ch_mode[ch] == `CH_MODE_RISING ? capture_rise : capture_fall) begin
+                        ch_capture[ch] <= timer_count;
+                        status_reg[`STATUS_CH0 + ch] <= 1'b1;
+                    end
+                end
+                default: ;
+            endcase
+        end
+
+        if (count_load) begin
             timer_count <= reload_value;
         end else if (ctrl_enable && prescale_tick) begin
             if (timer_count == 16'hFFFF) begin
@@ -91,8 +206,11 @@ always_ff @(posedge i_clk or negedge i_reset_n) begin
             end
         end
 
-        if (overflow_clear_req) begin
-            status_reg[`STATUS_OVERFLOW] <= 1'b0;
+        // Write-1-to-clear wins over a flag raised in the same cycle
+        for (ch = 0; ch < 3; ch = ch + 1) begin
+            if (status_clear[ch]) begin
+                status_reg[ch] <= 1'b0;
+            end
         end
     end
 end
@@ -109,6 +227,12 @@ always_ff @(posedge i_phi2 or negedge i_reset_n) begin
             `TIMER_RELOAD_LO:  o_data <= reload_lo;
             `TIMER_RELOAD_HI:  o_data <= reload_hi;
             `TIMER_PRESCALER:  o_data <= prescaler_reg;
+            `TIMER_CH0_CTRL:   o_data <= ENABLE_CHANNELS ? {5'b00000, ch_ctrl[0]} : 8'h00;
+            `TIMER_CH0_LO:     o_data <= ENABLE_CHANNELS ? ch_value[0][7:0] : 8'h00;
+            `TIMER_CH0_HI:     o_data <= ENABLE_CHANNELS ? ch_value[0][15:8] : 8'h00;
+            `TIMER_CH1_CTRL:   o_data <= ENABLE_CHANNELS ? {5'b00000, ch_ctrl[1]} : 8'h00;
+            `TIMER_CH1_LO:     o_data <= ENABLE_CHANNELS ? ch_value[1][7:0] : 8'h00;
+            `TIMER_CH1_HI:     o_data <= ENABLE_CHANNELS ? ch_value[1][15:8] : 8'h00;
             default:           o_data <= 8'h00;
         endcase
     end
@@ -121,11 +245,12 @@ always_ff @(negedge i_phi2 or negedge i_reset_n) begin
         reload_lo <= 8'h00;
         reload_hi <= 8'h00;
         prescaler_reg <= 8'h00;
-        overflow_clear_req <= 1'b0;
         load_prev <= 1'b0;
+        ch_ctrl[0] <= 3'b000;
+        ch_ctrl[1] <= 3'b000;
+        ch_compare[0] <= 16'h0000;
+        ch_compare[1] <= 16'h0000;
     end else begin
-        overflow_clear_req <= 1'b0;
-
         if (load_prev) begin
             ctrl_reg[`CTRL_LOAD] <= 1'b0;
         end
@@ -133,15 +258,21 @@ always_ff @(negedge i_phi2 or negedge i_reset_n) begin
 
         if (i_en && !i_rw) begin
             case (i_addr)
-                `TIMER_CTRL:       ctrl_reg <= i_data;
-                `TIMER_STATUS: begin
-                    if (i_data[`STATUS_OVERFLOW]) begin
-                        overflow_clear_req <= 1'b1;
-                    end
+                `TIMER_CTRL: begin
+                    ctrl_reg <= i_data;
+                    // With SAME_CLOCK the count is loaded in the write cycle
+                    if (SAME_CLOCK)
+                        ctrl_reg[`CTRL_LOAD] <= 1'b0;
                 end
                 `TIMER_RELOAD_LO:  reload_lo <= i_data;
                 `TIMER_RELOAD_HI:  reload_hi <= i_data;
                 `TIMER_PRESCALER:  prescaler_reg <= i_data;
+                `TIMER_CH0_CTRL:   ch_ctrl[0] <= i_data[2:0];
+                `TIMER_CH0_LO:     ch_compare[0][7:0] <= i_data;
+                `TIMER_CH0_HI:     ch_compare[0][15:8] <= i_data;
+                `TIMER_CH1_CTRL:   ch_ctrl[1] <= i_data[2:0];
+                `TIMER_CH1_LO:     ch_compare[1][7:0] <= i_data;
+                `TIMER_CH1_HI:     ch_compare[1][15:8] <= i_data;
                 default: ;
             endcase
         end
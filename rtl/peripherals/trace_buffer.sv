@@ -0,0 +1,265 @@
+// PC trace buffer: records where control flow leaves the sequential path
+// (taken branches, jumps, calls, returns and interrupt entries) into a ring
+// buffer in block RAM, so the path the CPU took at full clock can be read
+// back afterwards and rebuilt with tools/trace_decode.py.
+//
+// Each entry is {flags, from, to}: the instruction that jumped and the next
+// instruction fetched. Straight-line code in between is not stored, the
+// decoder walks it in the program image. Recording starts at the ENABLE
+// write or when the CPU fetches the instruction at TRIG, and stops at the
+// ENABLE=0 write or when it fetches TRIG. After REWIND, DATA streams the
+// entries five bytes at a time from the oldest, so a DMA transfer with a
+// fixed source can copy the buffer to UART0 without the CPU.
+module trace_buffer #(
+    parameter DEPTH = 256               // entries, a power of 2
+) (
+    input i_phi2,
+    input i_reset_n,
+
+    // Register interface
+    input [2:0] i_addr,
+    input [7:0] i_data,
+    input i_rw,
+    input i_en,
+    output [7:0] o_data,
+
+    // CPU bus
+    input i_sync,                       // opcode fetch
+    input i_rdy,                        // the CPU's cycle completes
+    input [15:0] i_cpu_addr,
+    input [7:0] i_cpu_data,             // read data
+    input i_irq_vector                  // CPU is taking an IRQ
+);
+
+// Register Map:
+// 0xA0A0: CTRL     - bit 0 ENABLE, bit 1 TRIG_START, bit 2 TRIG_STOP,
+//                    bit 3 CLEAR, bit 4 REWIND (CLEAR and REWIND read 0)
+// 0xA0A1: STATUS   - bit 0 RECORDING, bit 1 ARMED, bit 2 TRIGGERED, bit 3 WRAPPED (read-only)
+// 0xA0A2: COUNT_LO - entries stored, saturates at DEPTH (read-only)
+// 0xA0A3: COUNT_HI
+// 0xA0A4: TRIG_LO  - trigger instruction address
+// 0xA0A5: TRIG_HI
+// 0xA0A6: DATA     - next byte of the entry stream (read-only)
+//
+// Entry stream: flags, from low, from high, to low, to high per entry.
+// Flags: bit 0 IRQ, bit 1 START, bit 2 END.
+
+`define TRACE_CTRL              3'h0
+`define TRACE_STATUS            3'h1
+`define TRACE_COUNT_LO          3'h2
+`define TRACE_COUNT_HI          3'h3
+`define TRACE_TRIG_LO           3'h4
+`define TRACE_TRIG_HI           3'h5
+`define TRACE_DATA              3'h6
+
+`define TRACE_CTRL_ENABLE       0
+`define TRACE_CTRL_TRIG_START   1
+`define TRACE_CTRL_TRIG_STOP    2
+`define TRACE_CTRL_CLEAR        3
+`define TRACE_CTRL_REWIND       4
+
+localparam ADDR_BITS = $clog2(DEPTH);
+
+reg [34:0] buffer [0:DEPTH-1];
+reg [ADDR_BITS-1:0] write_ptr, read_ptr;
+reg [2:0] read_byte;                    // byte of the entry at read_ptr DATA returns next
+reg [15:0] count;
+reg wrapped;
+
+reg enable, trig_start, trig_stop;
+reg recording, triggered;
+reg [15:0] trig_addr;
+
+// The opcode fetch completes the cycle before o_sync, so the last completed
+// CPU cycle holds the instruction's address and opcode
+reg [15:0] last_addr;
+reg [7:0] last_data;
+reg [15:0] prev_fetch;                  // previous instruction
+reg [1:0] prev_length;
+reg irq_seen;                           // IRQ taken since prev_fetch
+
+wire fetch;
+wire [15:0] fetch_addr;
+assign fetch = i_sync && i_rdy;
+assign fetch_addr = last_addr;
+
+// Instruction length from the opcode, for the documented opcodes: absolute
+// modes and JSR are 3 bytes, implied and accumulator modes 1, the rest 2.
+// BRK, RTI and RTS always jump, so their length does not matter.
+reg [1:0] length;
+always_comb begin
+    if (last_data[3:2] == 2'b11 || last_data[4:0] == 5'b11001 || last_data == 8'h20)
+        length = 2'd3;
+    else if (last_data[3:0] == 4'h8 || last_data[3:0] == 4'hA)
+        length = 2'd1;
+    else
+        length = 2'd2;
+end
+
+wire ctrl_write, data_read;
+assign ctrl_write = i_en && !i_rw && i_addr == `TRACE_CTRL;
+assign data_read = i_en && i_rw && i_addr == `TRACE_DATA;
+
+wire [15:0] next_fetch;
+assign next_fetch = prev_fetch + 16'(prev_length);
+
+// START entries hold the first instruction recorded. END entries hold the
+// last one and the next, not recorded: TRIG, or for a write of ENABLE = 0
+// the instruction after that store.
+wire jump, trig_match, start, stop, halt, store;
+assign jump = fetch_addr != next_fetch || irq_seen;
+assign trig_match = fetch_addr == trig_addr;
+assign start = fetch && enable && !recording && (!trig_start || trig_match);
+assign stop = fetch && recording && trig_stop && trig_match;
+assign halt = ctrl_write && !i_data[`TRACE_CTRL_ENABLE] && recording;
+assign store = start || halt || (fetch && recording && (jump || stop));
+
+wire [34:0] entry;
+assign entry = start ? {3'b010, fetch_addr, fetch_addr} :
+               halt ? {3'b100, prev_fetch, next_fetch} :
+               {stop, 1'b0, irq_seen, prev_fetch, fetch_addr};
+
+wire [ADDR_BITS-1:0] oldest;
+assign oldest = wrapped ? write_ptr : {ADDR_BITS{1'b0}};
+
+always_ff @(negedge i_phi2) begin
+    if (store)
+        buffer[write_ptr] <= entry;
+end
+
+always_ff @(negedge i_phi2 or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        write_ptr <= {ADDR_BITS{1'b0}};
+        read_ptr <= {ADDR_BITS{1'b0}};
+        read_byte <= 3'h0;
+        count <= 16'h0;
+        wrapped <= 1'b0;
+        enable <= 1'b0;
+        trig_start <= 1'b0;
+        trig_stop <= 1'b0;
+        recording <= 1'b0;
+        triggered <= 1'b0;
+        trig_addr <= 16'h0;
+        last_addr <= 16'h0;
+        last_data <= 8'h00;
+        prev_fetch <= 16'h0;
+        prev_length <= 2'd0;
+        irq_seen <= 1'b0;
+    end else begin
+        if (i_rdy) begin
+            last_addr <= i_cpu_addr;
+            last_data <= i_cpu_data;
+        end
+
+        if (i_irq_vector)
+            irq_seen <= 1'b1;
+
+        if (fetch) begin
+            prev_fetch <= fetch_addr;
+            prev_length <= length;
+            irq_seen <= 1'b0;
+        end
+
+        if (start) begin
+            recording <= 1'b1;
+            if (trig_start)
+                triggered <= 1'b1;
+        end
+
+        if (stop) begin
+            recording <= 1'b0;
+            enable <= 1'b0;
+            triggered <= 1'b1;
+        end
+
+        if (store) begin
+            write_ptr <= write_ptr + 1'b1;
+            if (write_ptr == ADDR_BITS'(DEPTH - 1))
+                wrapped <= 1'b1;
+            if (count != 16'(DEPTH))
+                count <= count + 16'h1;
+        end
+
+        if (data_read) begin
+            if (read_byte == 3'h4) begin
+                read_byte <= 3'h0;
+                read_ptr <= read_ptr + 1'b1;
+            end else begin
+                read_byte <= read_byte + 3'h1;
+            end
+        end
+
+        if (i_en && !i_rw) begin
+            case (i_addr)
+                `TRACE_CTRL: begin
+                    enable <= i_data[`TRACE_CTRL_ENABLE];
+                    trig_start <= i_data[`TRACE_CTRL_TRIG_START];
+                    trig_stop <= i_data[`TRACE_CTRL_TRIG_STOP];
+                    if (!i_data[`TRACE_CTRL_ENABLE])
+                        recording <= 1'b0;
+                    if (i_data[`TRACE_CTRL_ENABLE] && !enable)
+                        triggered <= 1'b0;
+                end
+                `TRACE_TRIG_LO: trig_addr[7:0] <= i_data;
+                `TRACE_TRIG_HI: trig_addr[15:8] <= i_data;
+                default: ;
+            endcase
+        end
+
+        if (ctrl_write && i_data[`TRACE_CTRL_CLEAR]) begin
+            write_ptr <= {ADDR_BITS{1'b0}};
+            read_ptr <= {ADDR_BITS{1'b0}};
+            read_byte <= 3'h0;
+            count <= 16'h0;
+            wrapped <= 1'b0;
+        end else if (ctrl_write && i_data[`TRACE_CTRL_REWIND]) begin
+            read_ptr <= oldest;
+            read_byte <= 3'h0;
+        end
+    end
+end
+
+// Block RAM read, registered without reset
+reg [34:0] read_entry;
+always_ff @(posedge i_phi2) begin
+    read_entry <= buffer[read_ptr];
+end
+
+reg [7:0] reg_data;
+reg [2:0] data_byte;
+reg data_sel;
+
+always_ff @(posedge i_phi2 or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        reg_data <= 8'h00;
+        data_byte <= 3'h0;
+        data_sel <= 1'b0;
+    end else if (i_en && i_rw) begin
+        data_sel <= i_addr == `TRACE_DATA;
+        data_byte <= read_byte;
+        case (i_addr)
+            `TRACE_CTRL:     reg_data <= {5'h00, trig_stop, trig_start, enable};
+            `TRACE_STATUS:   reg_data <= {4'h0, wrapped, triggered, enable && !recording, recording};
+            `TRACE_COUNT_LO: reg_data <= count[7:0];
+            `TRACE_COUNT_HI: reg_data <= count[15:8];
+            `TRACE_TRIG_LO:  reg_data <= trig_addr[7:0];
+            `TRACE_TRIG_HI:  reg_data <= trig_addr[15:8];
+            default:         reg_data <= 8'h00;
+        endcase
+    end
+end
+
+reg [7:0] entry_data;
+always_comb begin
+    case (data_byte)
+        3'h0:    entry_data = {5'h00, read_entry[34:32]};
+        3'h1:    entry_data = read_entry[23:16];
+        3'h2:    entry_data = read_entry[31:24];
+        3'h3:    entry_data = read_entry[7:0];
+        default: entry_data = read_entry[15:8];
+    endcase
+end
+
+assign o_data = data_sel ? entry_data : reg_data;
+
+endmodule
@@ -1,5 +1,10 @@
+// SAME_CLOCK=1 when i_phi2 is i_clk (the MCU's CPU_CLOCK_ENABLE): a DATA
+// write or read drives the transmitter's write or the receiver's read
+// directly, on the rising edge of i_clk inside the access cycle. Otherwise
+// each access flips a toggle that is synchronized to i_clk.
 module uart #(
-    parameter FIFO_DEPTH = 8
+    parameter FIFO_DEPTH = 8,
+    parameter SAME_CLOCK = 0
 ) (
     input i_clk,
     input i_phi2,
@@ -15,7 +20,8 @@ module uart #(
     output o_tx,
 
     output o_tx_irq,
-    output o_rx_irq
+    output o_rx_irq,
+    output o_tx_ready       // TX FIFO not full, DMA pacing
 );
 
 localparam ADDR_CTRL    = 3'h0;
@@ -36,12 +42,13 @@ reg rx_irq_en;
 
 reg [15:0] baud_div;
 
-reg [7:0] tx_data;
-reg tx_write_toggle;
-reg rx_read_toggle;
+wire tx_write, rx_read;
+assign tx_write = i_en && !i_rw && i_addr == ADDR_DATA;
+assign rx_read = i_en && i_rw && i_addr == ADDR_DATA;
 
 wire tx_ready, tx_empty, tx_active;
 wire tx_write_pulse;
+wire [7:0] tx_write_data;
 
 wire rx_ready, rx_full, rx_error;
 wire [7:0] rx_data;
@@ -55,7 +62,7 @@ uart_tx #(
     .i_enable(tx_enable),
     .i_baud_div(baud_div),
     .i_write(tx_write_pulse),
-    .i_data(tx_data),
+    .i_data(tx_write_data),
     .o_ready(tx_ready),
     .o_empty(tx_empty),
     .o_active(tx_active),
@@ -79,31 +86,62 @@ uart_rx #(
 
 assign o_tx_irq = tx_irq_en && tx_ready;
 assign o_rx_irq = rx_irq_en && rx_ready;
+assign o_tx_ready = tx_ready;
+
+generate
+    if (SAME_CLOCK) begin : same_clock
+        // The write data is still on the bus at the rising edge
+        assign tx_write_pulse = tx_write;
+        assign tx_write_data = i_data;
+        assign rx_read_pulse = rx_read;
+    end else begin : cross_clock
+        reg [7:0] tx_data;
+        reg tx_write_toggle;
+        reg rx_read_toggle;
+        reg tx_toggle_sync1, tx_toggle_sync2;
+        reg rx_toggle_sync1, rx_toggle_sync2;
+
+        always @(negedge i_phi2 or negedge i_reset_n) begin
+            if (!i_reset_n) begin
+                tx_data <= 0;
+                tx_write_toggle <= 0;
+            end else if (tx_write) begin
+                tx_data <= i_data;
+                tx_write_toggle <= !tx_write_toggle;
+            end
+        end
 
-reg tx_toggle_sync1, tx_toggle_sync2;
-reg rx_toggle_sync1, rx_toggle_sync2;
+        always @(posedge i_phi2 or negedge i_reset_n) begin
+            if (!i_reset_n) begin
+                rx_read_toggle <= 0;
+            end else if (rx_read) begin
+                rx_read_toggle <= !rx_read_toggle;
+            end
+        end
 
-always @(posedge i_clk or negedge i_reset_n) begin
-    if (!i_reset_n) begin
-        tx_toggle_sync1 <= 0;
-        tx_toggle_sync2 <= 0;
-        rx_toggle_sync1 <= 0;
-        rx_toggle_sync2 <= 0;
-    end else begin
-        tx_toggle_sync1 <= tx_write_toggle;
-        tx_toggle_sync2 <= tx_toggle_sync1;
-        rx_toggle_sync1 <= rx_read_toggle;
-        rx_toggle_sync2 <= rx_toggle_sync1;
-    end
-end
+        always @(posedge i_clk or negedge i_reset_n) begin
+            if (!i_reset_n) begin
+                tx_toggle_sync1 <= 0;
+                tx_toggle_sync2 <= 0;
+                rx_toggle_sync1 <= 0;
+                rx_toggle_sync2 <= 0;
+            end else begin
+                tx_toggle_sync1 <= tx_write_toggle;
+                tx_toggle_sync2 <= tx_toggle_sync1;
+                rx_toggle_sync1 <= rx_read_toggle;
+                rx_toggle_sync2 <= rx_toggle_sync1;
+            end
+        end
 
-assign tx_write_pulse = tx_toggle_sync1 ^ tx_toggle_sync2;
-assign rx_read_pulse = rx_toggle_sync1 ^ rx_toggle_sync2;
+        assign tx_write_pulse = tx_toggle_sync1 ^ tx_toggle_sync2;
+        assign tx_write_data = tx_data;
+        assign rx_read_pulse = rx_toggle_sync1 ^ rx_toggle_sync2;
+    end
+endgenerate
 
 always @(posedge i_phi2 or negedge i_reset_n) begin
     if (!i_reset_n) begin
         o_data <= 0;
-        rx_read_toggle <= 0;
     end else if (i_rw && i_en) begin
         case (i_addr)
             ADDR_CTRL: begin
@@ -120,7 +158,6 @@ always @(posedge i_phi2 or negedge i_reset_n) begin
 
             ADDR_DATA: begin
                 o_data <= rx_data;
-                rx_read_toggle <= !rx_read_toggle;
             end
 
             ADDR_BAUD_LO: begin
@@ -143,8 +180,6 @@ always @(negedge i_phi2 or negedge i_reset_n) begin
         tx_irq_en <= 0;
         rx_irq_en <= 0;
         baud_div <= 0;
-        tx_data <= 0;
-        tx_write_toggle <= 0;
     end else begin
         if (!i_rw && i_en) begin
             case (i_addr)
@@ -155,11 +190,6 @@ always @(negedge i_phi2 or negedge i_reset_n) begin
                     rx_irq_en <= i_data[CTRL_RX_IRQ_EN];
                 end
 
-                ADDR_DATA: begin
-                    tx_data <= i_data;
-                    tx_write_toggle <= !tx_write_toggle;
-                end
-
                 ADDR_BAUD_LO: begin
                     baud_div[7:0] <= i_data;
                 end
@@ -0,0 +1,175 @@
+// Read cache between cpu_6502 and memory outside the MCU.
+//
+// For memory that the wait-state controller (wait_states.sv) stretches to
+// several CPU cycles per access, e.g. the multiplexed external bus with a
+// CPU clock faster than the external controller can follow. A read that
+// hits is served from the cache and o_hit lets it complete in one cycle; a
+// miss fills the line with the byte the CPU reads at the end of the access.
+// Stores always go to memory and update the line if it is cached
+// (write-through, no write allocate). Accesses with i_cacheable low (the
+// I/O page) are never cached.
+//
+// Lines are one byte. LINES / WAYS sets, direct-mapped (WAYS = 1) or 2-way
+// with one LRU bit per set. LINES / WAYS must be at least 2.
+module read_cache #(
+    parameter LINES = 16,
+    parameter WAYS = 1
+) (
+    input i_phi2,
+    input i_reset_n,
+
+    // CPU bus
+    input [15:0] i_addr,
+    input [7:0] i_data,
+    input i_rw,
+    input i_cacheable,
+    input [7:0] i_bus_data,         // read data from memory behind the cache
+    output [7:0] o_read_data,       // read data for the CPU
+    input i_rdy,                    // the CPU completes the access this cycle
+    output o_hit,                   // read served by the cache
+
+    // Register interface
+    input i_en,
+    output reg [7:0] o_data
+);
+
+// Register Map:
+// 0xA050: CTRL     - bit 0 ENABLE, write 1 to bit 1 FLUSH, bit 2 SNAPSHOT, bit 3 CLEAR
+// 0xA051: CONFIG   - bits 3:0 index bits, bit 4 two-way (read-only)
+// 0xA054: HITS     - 32-bit cacheable reads served by the cache, little endian
+// 0xA058: MISSES   - 32-bit cacheable reads that waited for memory
+// HITS and MISSES read a snapshot taken by writing SNAPSHOT to CTRL.
+
+`define CACHE_CTRL           4'h0
+`define CACHE_CONFIG         4'h1
+`define CACHE_HITS_0         4'h4
+`define CACHE_HITS_1         4'h5
+`define CACHE_HITS_2         4'h6
+`define CACHE_HITS_3         4'h7
+`define CACHE_MISSES_0       4'h8
+`define CACHE_MISSES_1       4'h9
+`define CACHE_MISSES_2       4'hA
+`define CACHE_MISSES_3       4'hB
+
+`define CACHE_CTRL_ENABLE    0
+`define CACHE_CTRL_FLUSH     1
+`define CACHE_CTRL_SNAPSHOT  2
+`define CACHE_CTRL_CLEAR     3
+
+localparam SETS = LINES / WAYS;
+localparam INDEX_BITS = $clog2(SETS);
+localparam TAG_BITS = 16 - INDEX_BITS;
+localparam LINE_BITS = $clog2(LINES);
+
+reg enable;
+
+reg [7:0] line_data [0:LINES-1];
+reg [TAG_BITS-1:0] line_tag [0:LINES-1];
+reg [LINES-1:0] line_valid;
+reg [SETS-1:0] lru;             // way to replace next, 2-way only
+
+reg [31:0] hits, misses;
+reg [31:0] hits_snapshot, misses_snapshot;
+
+wire [INDEX_BITS-1:0] index;
+wire [TAG_BITS-1:0] tag;
+assign index = i_addr[INDEX_BITS-1:0];
+assign tag = i_addr[15:INDEX_BITS];
+
+// Line of each way in the set, way w at w * SETS + index
+wire [LINE_BITS-1:0] line0, line1;
+assign line0 = LINE_BITS'(index);
+assign line1 = LINE_BITS'(SETS * (WAYS - 1)) | LINE_BITS'(index);
+
+wire hit0, hit1, hit;
+assign hit0 = line_valid[line0] && line_tag[line0] == tag;
+assign hit1 = WAYS == 2 && line_valid[line1] && line_tag[line1] == tag;
+assign hit = enable && (hit0 || hit1);
+
+wire [LINE_BITS-1:0] hit_line;
+assign hit_line = hit1 ? line1 : line0;
+
+// Invalid ways first, then the least recently used one
+wire [LINE_BITS-1:0] victim_line;
+assign victim_line = (WAYS == 1 || !line_valid[line0]) ? line0 :
+                     !line_valid[line1] ? line1 :
+                     lru[index] ? line1 : line0;
+
+wire cached_read;
+assign cached_read = i_cacheable && i_rw && hit;
+
+assign o_hit = cached_read;
+assign o_read_data = cached_read ? line_data[hit_line] : i_bus_data;
+
+// Line writes when the CPU completes an access: a read miss fills the
+// victim line, a store to a cached address updates its line.
+wire fill, update;
+assign fill = i_rdy && i_cacheable && enable && i_rw && !hit;
+assign update = i_rdy && i_cacheable && enable && !i_rw && hit;
+
+always_ff @(negedge i_phi2) begin
+    if (fill) begin
+        line_data[victim_line] <= i_bus_data;
+        line_tag[victim_line] <= tag;
+    end else if (update) begin
+        line_data[hit_line] <= i_data;
+    end
+end
+
+always_ff @(negedge i_phi2 or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        enable <= 1'b0;
+        line_valid <= '0;
+        lru <= '0;
+        hits <= 32'h0;
+        misses <= 32'h0;
+        hits_snapshot <= 32'h0;
+        misses_snapshot <= 32'h0;
+    end else begin
+        if (i_rdy && cached_read)
+            hits <= hits + 32'h1;
+        if (fill) begin
+            misses <= misses + 32'h1;
+            line_valid[victim_line] <= 1'b1;
+            lru[index] <= victim_line == line0;
+        end else if (i_rdy && i_cacheable && hit) begin
+            lru[index] <= !hit1;
+        end
+
+        if (i_en && !i_rw && i_addr[3:0] == `CACHE_CTRL) begin
+            enable <= i_data[`CACHE_CTRL_ENABLE];
+            if (i_data[`CACHE_CTRL_FLUSH])
+                line_valid <= '0;
+            if (i_data[`CACHE_CTRL_SNAPSHOT]) begin
+                hits_snapshot <= hits;
+                misses_snapshot <= misses;
+            end
+            if (i_data[`CACHE_CTRL_CLEAR]) begin
+                hits <= 32'h0;
+                misses <= 32'h0;
+            end
+        end
+    end
+end
+
+always_ff @(posedge i_phi2 or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        o_data <= 8'h00;
+    end else if (i_en && i_rw) begin
+        case (i_addr[3:0])
+            `CACHE_CTRL:     o_data <= {7'h00, enable};
+            `CACHE_CONFIG:   o_data <= {3'h0, WAYS == 2, 4'(INDEX_BITS)};
+            `CACHE_HITS_0:   o_data <= hits_snapshot[7:0];
+            `CACHE_HITS_1:   o_data <= hits_snapshot[15:8];
+            `CACHE_HITS_2:   o_data <= hits_snapshot[23:16];
+            `CACHE_HITS_3:   o_data <= hits_snapshot[31:24];
+            `CACHE_MISSES_0: o_data <= misses_snapshot[7:0];
+            `CACHE_MISSES_1: o_data <= misses_snapshot[15:8];
+            `CACHE_MISSES_2: o_data <= misses_snapshot[23:16];
+            `CACHE_MISSES_3: o_data <= misses_snapshot[31:24];
+            default:         o_data <= 8'h00;
+        endcase
+    end
+end
+
+endmodule
@@ -0,0 +1,95 @@
+// Wait-state controller: stretches CPU accesses to slow memory with RDY.
+//
+// The address space is split into sixteen 4 KB blocks (address bits 15:12),
+// each with its own wait count, and the I/O page, which has one of its own.
+// An access to a region with N waits holds o_rdy low for N CPU cycles, so it
+// takes 1 + N cycles with address, R/W and write data stable throughout.
+// Zero-wait regions (BRAM) run at the full CPU clock while slower ones, such
+// as the external bus, get the time they need.
+//
+// Wait counts reset to BLOCK_WAITS / IO_WAITS and can be changed at run
+// time, e.g. after raising the CPU clock with clock_control. Accesses with
+// i_skip high, reads served by the read cache, complete without waiting.
+// Waits are counted in CPU cycles, the PHI2 cycles with i_ce high.
+module wait_states #(
+    parameter [63:0] BLOCK_WAITS = 64'h0,   // 4 bits per block, block 0 (0x0000-0x0FFF) in bits 3:0
+    parameter [3:0] IO_WAITS = 4'h0
+) (
+    input i_phi2,
+    input i_reset_n,
+
+    // CPU bus. Bits 15:12 pick the block and bits 3:0 the register.
+    /* verilator lint_off UNUSEDSIGNAL */
+    input [15:0] i_addr,
+    /* verilator lint_on UNUSEDSIGNAL */
+    input [7:0] i_data,
+    input i_rw,
+    input i_io,                     // access to the I/O page
+    input i_skip,                   // access completes without waiting
+    input i_rdy,                    // the CPU advances when i_rdy and o_rdy are high
+    input i_ce,                     // CPU clock enable, see clock_control.sv
+    output o_rdy,
+
+    // Register interface
+    input i_en,
+    output reg [7:0] o_data
+);
+
+// Register Map:
+// 0xA060-0xA067: BLOCKS - wait counts of blocks 2n (bits 3:0) and 2n+1 (bits 7:4)
+// 0xA068: IO - bits 3:0 wait count of the I/O page
+
+`define WAIT_BLOCKS_7        4'h7
+`define WAIT_IO              4'h8
+
+reg [3:0] block_waits [0:15];
+reg [3:0] io_waits;
+reg [3:0] wait_count;
+
+wire [3:0] waits;
+assign waits = i_io ? io_waits : block_waits[i_addr[15:12]];
+
+wire waiting;
+assign waiting = !i_skip && wait_count != waits;
+
+assign o_rdy = !waiting;
+
+integer i;
+
+always_ff @(negedge i_phi2 or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        for (i = 0; i < 16; i = i + 1)
+            block_waits[i] <= BLOCK_WAITS[i * 4 +: 4];
+        io_waits <= IO_WAITS;
+        wait_count <= 4'h0;
+    end else begin
+        if (i_rdy && i_ce && !waiting)
+            wait_count <= 4'h0;
+        else if (waiting && i_ce)
+            wait_count <= wait_count + 4'h1;
+
+        if (i_en && !i_rw) begin
+            if (i_addr[3:0] <= `WAIT_BLOCKS_7) begin
+                block_waits[{i_addr[2:0], 1'b0}] <= i_data[3:0];
+                block_waits[{i_addr[2:0], 1'b1}] <= i_data[7:4];
+            end else if (i_addr[3:0] == `WAIT_IO) begin
+                io_waits <= i_data[3:0];
+            end
+        end
+    end
+end
+
+always_ff @(posedge i_phi2 or negedge i_reset_n) begin
+    if (!i_reset_n) begin
+        o_data <= 8'h00;
+    end else if (i_en && i_rw) begin
+        if (i_addr[3:0] <= `WAIT_BLOCKS_7)
+            o_data <= {block_waits[{i_addr[2:0], 1'b1}], block_waits[{i_addr[2:0], 1'b0}]};
+        else if (i_addr[3:0] == `WAIT_IO)
+            o_data <= {4'h0, io_waits};
+        else
+            o_data <= 8'h00;
+    end
+end
+
+endmodule
@@ -8,6 +8,7 @@ $(BUILDDIR)/$(DESIGN).asc: $(BUILDDIR)/$(DESIGN).json $(PCF)
 		--pre-pack clocks.py \
 		--pcf $(PCF) \
 		--json $(BUILDDIR)/$(DESIGN).json \
+		--report $(BUILDDIR)/$(DESIGN)-report.json \
 		--asc $@
 
 # Use icepack to convert the FPGA configuration into a "bitstream" loadable onto the FPGA.
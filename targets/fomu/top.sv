@@ -1,4 +1,9 @@
-module top (
+module top #(
+    parameter IR_DECODER_ROM = 0,
+    parameter ENABLE_65C02 = 0,
+    parameter TURBO = 0,
+    parameter CPU_CLOCK_ENABLE = 0
+) (
     input clki,
     output rgb0,
     output rgb1,
@@ -48,7 +53,11 @@ mcu #(
     .START_PC(16'h1000),
     .START_PC_ENABLED(1),
     .LED_DEFAULT_CLOCK_DIV(5),
-    .CPU_CLOCK_DIV_DEFAULT(8'd47)  // 48MHz / 48 = 1MHz
+    .CPU_CLOCK_DIV_DEFAULT(8'd47),  // 48MHz / 48 = 1MHz
+    .IR_DECODER_ROM(IR_DECODER_ROM),
+    .ENABLE_65C02(ENABLE_65C02),
+    .TURBO(TURBO),
+    .CPU_CLOCK_ENABLE(CPU_CLOCK_ENABLE)
 ) mcu (
     .i_clk(clki),
     .i_reset_n(reset_n),
@@ -1,4 +1,7 @@
-module top (
+module top #(
+    parameter ENABLE_65C02 = 0,
+    parameter TURBO = 0
+) (
     input clk_25mhz,
 
     // Active-low reset
@@ -22,6 +25,7 @@ module top (
     input gp8,
     output gp9,
     output gn9,
+    output gp10,  // bus mux: address high byte unchanged
 
     output gp26,  // UART TX
     input gn27,   // UART RX
@@ -131,7 +135,9 @@ assign gn9 = bus_rw;
 
 mcu #(
     .LED_DEFAULT_CLOCK_DIV(5),
-    .CPU_CLOCK_DIV_DEFAULT(8'd49)  // 50MHz / 50 = 1MHz
+    .CPU_CLOCK_DIV_DEFAULT(8'd49),  // 50MHz / 50 = 1MHz
+    .ENABLE_65C02(ENABLE_65C02),
+    .TURBO(TURBO)
 ) mcu (
     .i_clk(clk_50),
     .i_reset_n(reset_n),
@@ -203,11 +209,14 @@ EHXPLLL#(
 );
 
 bus_multiplexer external_bus (
+    .i_phi2(bus_phi2),
+    .i_reset_n(reset_n),
     .i_sel(bus_mux_sel),
     .i_cpu_data(bus_cpu_data),
     .i_cpu_addr(bus_addr),
     .o_mux_data(bus_mux_data_out),
-    .o_mux_data_oe(bus_mux_data_oe)
+    .o_mux_data_oe(bus_mux_data_oe),
+    .o_addr_hi_same(gp10)
 );
 
 
@@ -0,0 +1,159 @@
+"""NumPy model of the NMOS 6502 ALU for the exhaustive cpu_6502_alu test.
+
+Usage:
+    python alu_reference.py obj_dir_alu_exhaustive/alu_results.bin
+
+The input is written by tb_alu_exhaustive.cpp. Every combination is
+computed here in one vectorized pass and compared with the RTL output.
+
+The model follows the cpu_6502_alu interface rather than the instruction
+set: for ALU_SBC the CPU has already inverted the operand, so rhs is ~M.
+Decimal mode follows the NMOS behavior for all inputs, including invalid
+BCD digits, with V taken from the intermediate sum before the high digit
+is adjusted (ADC) or from the binary difference (SBC).
+
+Only the outputs the CPU consumes are compared:
+    ADC, SBC            result, carry, overflow (bcd 0 and 1)
+    AND, ORA, EOR       result (bcd 0)
+    ASL, LSR, ROL, ROR  result, carry (bcd 0)
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+ALU_ADC, ALU_AND, ALU_ORA, ALU_EOR = 0, 1, 2, 3
+ALU_ASL, ALU_LSR, ALU_ROL, ALU_ROR = 4, 5, 6, 7
+ALU_SBC = 8
+ALU_OPS = 9
+
+OP_NAMES = ["ADC", "AND", "ORA", "EOR", "ASL", "LSR", "ROL", "ROR", "SBC"]
+
+# Outputs compared for each operation and the bcd values the CPU drives
+CHECKS = {
+    ALU_ADC: (("result", "carry", "overflow"), (0, 1)),
+    ALU_AND: (("result",), (0,)),
+    ALU_ORA: (("result",), (0,)),
+    ALU_EOR: (("result",), (0,)),
+    ALU_ASL: (("result", "carry"), (0,)),
+    ALU_LSR: (("result", "carry"), (0,)),
+    ALU_ROL: (("result", "carry"), (0,)),
+    ALU_ROR: (("result", "carry"), (0,)),
+    ALU_SBC: (("result", "carry", "overflow"), (0, 1)),
+}
+
+MAX_EXAMPLES = 8
+
+
+def input_grid():
+    """Return (carry, lhs, rhs) broadcast to the [2][256][256] input space."""
+    carry, lhs, rhs = np.meshgrid(
+        np.arange(2), np.arange(256), np.arange(256), indexing="ij")
+    return carry.astype(np.int32), lhs.astype(np.int32), rhs.astype(np.int32)
+
+
+def overflow(lhs, rhs, value):
+    return ((~(lhs ^ rhs) & (lhs ^ value) & 0x80) != 0)
+
+
+def reference(op, bcd, carry, lhs, rhs):
+    """Return (result, carry, overflow) arrays for one operation."""
+    zeros = np.zeros_like(lhs, dtype=bool)
+
+    if op in (ALU_ADC, ALU_SBC):
+        binary = lhs + rhs + carry
+        v = overflow(lhs, rhs, binary)
+        if not bcd:
+            return binary & 0xFF, binary > 0xFF, v
+
+        if op == ALU_ADC:
+            lo = (lhs & 0x0F) + (rhs & 0x0F) + carry
+            lo = np.where(lo >= 0x0A, ((lo + 0x06) & 0x0F) + 0x10, lo)
+            value = (lhs & 0xF0) + (rhs & 0xF0) + lo
+            v = overflow(lhs, rhs, value)
+            value = np.where(value >= 0xA0, value + 0x60, value)
+            return value & 0xFF, value > 0xFF, v
+
+        # NMOS SBC: carry and V come from the binary subtraction
+        m = ~rhs & 0xFF
+        lo = (lhs & 0x0F) - (m & 0x0F) + carry - 1
+        lo = np.where(lo < 0, ((lo - 0x06) & 0x0F) - 0x10, lo)
+        value = (lhs & 0xF0) - (m & 0xF0) + lo
+        value = np.where(value < 0, value - 0x60, value)
+        return value & 0xFF, binary > 0xFF, v
+
+    if op == ALU_AND:
+        return lhs & rhs, zeros, zeros
+    if op == ALU_ORA:
+        return lhs | rhs, zeros, zeros
+    if op == ALU_EOR:
+        return lhs ^ rhs, zeros, zeros
+    if op == ALU_ASL:
+        return (lhs << 1) & 0xFF, (lhs & 0x80) != 0, zeros
+    if op == ALU_LSR:
+        return lhs >> 1, (lhs & 0x01) != 0, zeros
+    if op == ALU_ROL:
+        return ((lhs << 1) | carry) & 0xFF, (lhs & 0x80) != 0, zeros
+    if op == ALU_ROR:
+        return (lhs >> 1) | (carry << 7), (lhs & 0x01) != 0, zeros
+    raise ValueError(f"unknown ALU operation {op}")
+
+
+def load_results(path):
+    data = np.fromfile(path, dtype=np.uint8)
+    expected = ALU_OPS * 2 * 2 * 256 * 256 * 2
+    if data.size != expected:
+        raise ValueError(f"{path}: expected {expected} bytes, got {data.size}")
+    return data.reshape(ALU_OPS, 2, 2, 256, 256, 2)
+
+
+def check(results):
+    """Compare RTL results with the reference, return the number of mismatches."""
+    carry, lhs, rhs = input_grid()
+    failures = 0
+
+    for op, (fields, bcd_values) in CHECKS.items():
+        for bcd in bcd_values:
+            rtl = results[op, bcd]
+            actual = {
+                "result": rtl[..., 0].astype(np.int32),
+                "carry": (rtl[..., 1] & 1) != 0,
+                "overflow": (rtl[..., 1] & 2) != 0,
+            }
+            ref = dict(zip(("result", "carry", "overflow"),
+                           reference(op, bcd, carry, lhs, rhs)))
+
+            for field in fields:
+                bad = np.argwhere(actual[field] != ref[field])
+                name = f"{OP_NAMES[op]}{' (BCD)' if bcd else ''} {field}"
+                if len(bad) == 0:
+                    print(f"PASS: {name}")
+                    continue
+
+                failures += len(bad)
+                print(f"FAIL: {name}: {len(bad)} mismatches")
+                for c, l, r in bad[:MAX_EXAMPLES]:
+                    print(f"    lhs=${l:02X} rhs=${r:02X} carry={c}: "
+                          f"expected {int(ref[field][c, l, r]):#04x}, "
+                          f"got {int(actual[field][c, l, r]):#04x}")
+
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Check exhaustive cpu_6502_alu results against an NMOS model")
+    parser.add_argument("results", help="Binary file written by tb_alu_exhaustive")
+    args = parser.parse_args()
+
+    failures = check(load_results(args.results))
+    if failures:
+        print(f"ALU test FAILED: {failures} mismatches")
+        return 1
+    print("ALU test passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
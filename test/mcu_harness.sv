@@ -0,0 +1,92 @@
+`timescale 1ps/1ps
+
+// mcu and BRAM for the peripheral tests. test_runner.py sets the parameters
+// for each test; the defaults are mcu's. The external IRQ is driven by the
+// test.
+module mcu_harness #(
+    parameter CPU_CLOCK_ENABLE = 0,
+    parameter ENABLE_SK6812 = 1,
+    parameter ENABLE_SK6812_STRIP = 0,
+    parameter ENABLE_WAIT_STATES = 0,
+    parameter [63:0] WAIT_STATES = 64'h0,
+    parameter [3:0] IO_WAIT_STATES = 4'h0,
+    parameter CACHE_LINES = 0,
+    parameter CACHE_WAYS = 1,
+    parameter ENABLE_DMA = 0,
+    parameter ENABLE_IRQ_CONTROLLER = 0,
+    parameter ENABLE_PERF_COUNTERS = 0,
+    parameter ENABLE_TRACE = 0,
+    parameter TRACE_DEPTH = 256,
+    parameter ENABLE_PROFILER = 0,
+    parameter PROFILER_BUCKETS = 256,
+    parameter ENABLE_MATH = 0,
+    parameter ENABLE_TIMER_CHANNELS = 0
+) (
+    input i_clk
+);
+
+reg i_reset_n;
+reg i_irq_n_ext;
+reg [7:0] i_gpioa_input;
+wire [7:0] o_gpioa_output;
+wire [7:0] o_gpioa_oe;
+wire o_sync;
+
+wire [15:0] bus_addr;
+wire [7:0] bus_write_data;
+wire [7:0] bus_read_data;
+wire bus_rw;
+wire phi1, phi2;
+wire [7:0] debug_data;
+
+mcu #(
+    .START_PC_ENABLED(1),
+    .CPU_CLOCK_ENABLE(CPU_CLOCK_ENABLE),
+    .ENABLE_SK6812(ENABLE_SK6812),
+    .ENABLE_SK6812_STRIP(ENABLE_SK6812_STRIP),
+    .ENABLE_WAIT_STATES(ENABLE_WAIT_STATES),
+    .WAIT_STATES(WAIT_STATES),
+    .IO_WAIT_STATES(IO_WAIT_STATES),
+    .CACHE_LINES(CACHE_LINES),
+    .CACHE_WAYS(CACHE_WAYS),
+    .ENABLE_DMA(ENABLE_DMA),
+    .ENABLE_IRQ_CONTROLLER(ENABLE_IRQ_CONTROLLER),
+    .ENABLE_PERF_COUNTERS(ENABLE_PERF_COUNTERS),
+    .ENABLE_TRACE(ENABLE_TRACE),
+    .TRACE_DEPTH(TRACE_DEPTH),
+    .ENABLE_PROFILER(ENABLE_PROFILER),
+    .PROFILER_BUCKETS(PROFILER_BUCKETS),
+    .ENABLE_MATH(ENABLE_MATH),
+    .ENABLE_TIMER_CHANNELS(ENABLE_TIMER_CHANNELS)
+) mcu (
+    .i_clk(i_clk),
+    .i_reset_n(i_reset_n),
+    .i_bus_data(bus_read_data),
+    .o_bus_data(bus_write_data),
+    .o_bus_addr(bus_addr),
+    .o_bus_rw(bus_rw),
+    .o_phi1(phi1),
+    .o_phi2(phi2),
+    .i_gpioa_input(i_gpioa_input),
+    .o_gpioa_output(o_gpioa_output),
+    .o_gpioa_oe(o_gpioa_oe),
+    .o_sync(o_sync),
+    .i_rdy(1'b1),
+    .i_nmi_n(1'b1),
+    .i_irq_n_ext(i_irq_n_ext),
+    .i_so_n(1'b1),
+    .i_debug_sel(3'b000),
+    .o_debug_data(debug_data)
+);
+
+bram bram (
+    .i_clk(i_clk),
+    .i_phi2(phi2),
+    .i_addr(bus_addr),
+    .i_data(bus_write_data),
+    .i_rw(bus_rw),
+    .i_en(1'b1),
+    .o_data(bus_read_data)
+);
+
+endmodule
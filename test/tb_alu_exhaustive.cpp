@@ -0,0 +1,66 @@
+// Exhaustive C++ testbench for cpu_6502_alu
+// Run with: make -f Makefile.alu_exhaustive run
+//
+// Evaluates every (operation, bcd, carry, lhs, rhs) combination and writes
+// the outputs to a flat binary file that alu_reference.py checks against a
+// NumPy model of the NMOS 6502.
+//
+// File layout: uint8 array shaped [ALU_OPS][2 bcd][2 carry][256 lhs][256 rhs][2]
+// where the last axis is {o_result, o_carry | o_overflow << 1}.
+
+#include <verilated.h>
+#include "Vcpu_6502_alu.h"
+#include <chrono>
+#include <cstdio>
+#include <cstdint>
+#include <vector>
+
+#define ALU_OPS 9  // ALU_ADC .. ALU_SBC in cpu_6502_instructions.vh
+
+int main(int argc, char** argv) {
+    Verilated::commandArgs(argc, argv);
+
+    const char* out_path = argc > 1 ? argv[argc - 1] : "alu_results.bin";
+
+    Vcpu_6502_alu* alu = new Vcpu_6502_alu;
+    std::vector<uint8_t> results((size_t)ALU_OPS * 2 * 2 * 256 * 256 * 2);
+
+    auto start_time = std::chrono::steady_clock::now();
+
+    size_t i = 0;
+    for (int op = 0; op < ALU_OPS; op++) {
+        alu->i_operation = op;
+        for (int bcd = 0; bcd < 2; bcd++) {
+            alu->i_bcd = bcd;
+            for (int carry = 0; carry < 2; carry++) {
+                alu->i_carry = carry;
+                for (int lhs = 0; lhs < 256; lhs++) {
+                    alu->i_lhs = lhs;
+                    for (int rhs = 0; rhs < 256; rhs++) {
+                        alu->i_rhs = rhs;
+                        alu->eval();
+                        results[i++] = alu->o_result;
+                        results[i++] = alu->o_carry | (alu->o_overflow << 1);
+                    }
+                }
+            }
+        }
+    }
+
+    double seconds = std::chrono::duration<double>(
+        std::chrono::steady_clock::now() - start_time).count();
+    printf("Evaluated %zu ALU input combinations in %.2f s\n", i / 2, seconds);
+
+    FILE* f = fopen(out_path, "wb");
+    if (!f) {
+        perror(out_path);
+        delete alu;
+        return 1;
+    }
+    fwrite(results.data(), 1, results.size(), f);
+    fclose(f);
+    printf("Wrote %s\n", out_path);
+
+    delete alu;
+    return 0;
+}
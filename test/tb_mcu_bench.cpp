@@ -0,0 +1,53 @@
+// C++ testbench for the IPC benchmark: runs program.hex on the MCU for a
+// fixed number of CPU cycles and counts instructions by o_sync.
+// Run with: make -f Makefile.mcu_bench run PROGRAM=../examples/build/blinky.hex
+// Compare TURBO=0 and TURBO=1 over the example programs: python3 tools/ipc_bench.py
+
+#include <verilated.h>
+#include "Vtest_mcu_bench.h"
+#include <cstdio>
+#include <cstdint>
+#include <cstdlib>
+
+#define DEFAULT_CYCLES 1000000ULL
+
+int main(int argc, char** argv) {
+    Verilated::commandArgs(argc, argv);
+    uint64_t max_cycles = argc > 1 ? strtoull(argv[1], nullptr, 0) : DEFAULT_CYCLES;
+
+    Vtest_mcu_bench* top = new Vtest_mcu_bench;
+
+    top->i_clk = 0;
+    top->i_reset_n = 0;
+
+    // With CPU_DIV=0 every i_clk is a CPU cycle, counted on the falling
+    // edge like the Klaus testbench
+    auto cycle = [&]() {
+        top->i_clk = 1;
+        top->eval();
+        top->i_clk = 0;
+        top->eval();
+    };
+
+    for (int i = 0; i < 50; i++)
+        cycle();
+    top->i_reset_n = 1;
+
+    // Skip the reset sequence up to the first opcode fetch
+    for (int i = 0; i < 1000 && !top->o_sync; i++)
+        cycle();
+
+    uint64_t instructions = 0;
+    for (uint64_t cpu_cycles = 0; cpu_cycles < max_cycles; cpu_cycles++) {
+        cycle();
+        instructions += top->o_sync;
+    }
+
+    printf("Instructions: %llu\n", (unsigned long long)instructions);
+    printf("CPU cycles: %llu\n", (unsigned long long)max_cycles);
+    printf("IPC: %.4f\n", (double)instructions / max_cycles);
+
+    top->final();
+    delete top;
+    return instructions ? 0 : 1;
+}
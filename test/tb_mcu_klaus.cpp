@@ -8,10 +8,14 @@
 #endif
 #include "Vtest_mcu_klaus.h"
 #include "Vtest_mcu_klaus___024root.h"
+#include <chrono>
 #include <cstdio>
 #include <cstdint>
 #include <cstdlib>
+#include <cstring>
 
+// Address of the 6502 functional test's success trap. Another image
+// passes its own with +success_pc=<address>.
 #define SUCCESS_PC 0x3469
 #define MAX_CYCLES 100000000ULL  // 100M CPU cycles
 #define PROGRESS_INTERVAL 1000000ULL  // 1M cycles
@@ -20,11 +24,27 @@
 // i_clk = 50MHz = 20ns period = 10ns half-period
 // CPU runs at full speed (CPU_DIV=0, no division)
 
+static std::chrono::steady_clock::time_point start_time;
+
+// Wall-clock time and simulation rate, used to compare build profiles
+static void report_speed(uint64_t cpu_cycles) {
+    double seconds = std::chrono::duration<double>(
+        std::chrono::steady_clock::now() - start_time).count();
+    printf("Simulated %llu CPU cycles in %.2f s (%.2f MHz)\n",
+           (unsigned long long)cpu_cycles, seconds,
+           seconds > 0 ? cpu_cycles / seconds / 1e6 : 0.0);
+}
+
 int main(int argc, char** argv) {
     Verilated::commandArgs(argc, argv);
 
     Vtest_mcu_klaus* top = new Vtest_mcu_klaus;
 
+    uint16_t success_pc = SUCCESS_PC;
+    const char* success_arg = Verilated::commandArgsPlusMatch("success_pc=");
+    if (success_arg[0])
+        success_pc = strtoul(success_arg + strlen("+success_pc="), nullptr, 0);
+
 #if VM_TRACE
     Verilated::traceEverOn(true);
     VerilatedVcdC* tfp = new VerilatedVcdC;
@@ -71,7 +91,8 @@ int main(int argc, char** argv) {
         tick();
     }
 
-    printf("Starting Klaus 6502 functional test (MCU with BRAM)...\n");
+    printf("Starting Klaus test (MCU with BRAM)...\n");
+    start_time = std::chrono::steady_clock::now();
 
     uint64_t prev_cpu_cycles = 0;
 
@@ -99,9 +120,10 @@ int main(int argc, char** argv) {
             if (pc == prev_pc) {
                 same_pc_count++;
                 if (same_pc_count >= 2) {
-                    if (pc == SUCCESS_PC) {
+                    if (pc == success_pc) {
                         printf("SUCCESS: Test passed at PC=$%04X after %llu CPU cycles\n",
                                pc, (unsigned long long)cpu_cycles);
+                        report_speed(cpu_cycles);
 #if VM_TRACE
                         tfp->close();
 #endif
@@ -110,6 +132,7 @@ int main(int argc, char** argv) {
                     } else {
                         printf("TRAP: Test failed at PC=$%04X after %llu CPU cycles\n",
                                pc, (unsigned long long)cpu_cycles);
+                        report_speed(cpu_cycles);
 #if VM_TRACE
                         tfp->close();
 #endif
@@ -126,6 +149,7 @@ int main(int argc, char** argv) {
 
     printf("TIMEOUT: Test did not complete within %llu CPU cycles\n",
            (unsigned long long)MAX_CYCLES);
+    report_speed(cpu_cycles);
 #if VM_TRACE
     tfp->close();
 #endif
@@ -0,0 +1,64 @@
+`timescale 1ps/1ps
+
+// mcu with its bus behind a bus_multiplexer, as on the ULX3S. The shared
+// pins are modelled as a pad: the multiplexer drives it while its output is
+// enabled, the external controller (test_bus_multiplexer.py) otherwise.
+module test_bus_multiplexer (
+    input i_clk
+);
+
+reg i_reset_n;
+reg [1:0] i_mux_sel;
+reg [7:0] i_ext_data;
+
+wire [7:0] mux_data_out;
+wire mux_data_oe;
+wire [7:0] pad = mux_data_oe ? mux_data_out : i_ext_data;
+wire addr_hi_same;
+
+wire [15:0] bus_addr;
+wire [7:0] bus_write_data;
+wire bus_rw;
+wire phi1, phi2;
+wire [7:0] o_gpioa_output;
+wire [7:0] o_gpioa_oe;
+wire o_sync;
+wire [7:0] debug_data;
+
+mcu #(
+    .START_PC_ENABLED(1),
+    .CPU_CLOCK_DIV_DEFAULT(8'd9),
+    .ENABLE_SK6812(0)
+) mcu (
+    .i_clk(i_clk),
+    .i_reset_n(i_reset_n),
+    .i_bus_data(pad),
+    .o_bus_data(bus_write_data),
+    .o_bus_addr(bus_addr),
+    .o_bus_rw(bus_rw),
+    .o_phi1(phi1),
+    .o_phi2(phi2),
+    .i_gpioa_input(8'h00),
+    .o_gpioa_output(o_gpioa_output),
+    .o_gpioa_oe(o_gpioa_oe),
+    .o_sync(o_sync),
+    .i_rdy(1'b1),
+    .i_nmi_n(1'b1),
+    .i_irq_n_ext(1'b1),
+    .i_so_n(1'b1),
+    .i_debug_sel(3'b000),
+    .o_debug_data(debug_data)
+);
+
+bus_multiplexer bus_multiplexer (
+    .i_phi2(phi2),
+    .i_reset_n(i_reset_n),
+    .i_sel(i_mux_sel),
+    .i_cpu_data(bus_write_data),
+    .i_cpu_addr(bus_addr),
+    .o_mux_data(mux_data_out),
+    .o_mux_data_oe(mux_data_oe),
+    .o_addr_hi_same(addr_hi_same)
+);
+
+endmodule
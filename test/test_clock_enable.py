@@ -0,0 +1,173 @@
+from cocotb.clock import Clock
+from cocotb.triggers import FallingEdge, ReadOnly, RisingEdge
+import cocotb
+
+from utils import (
+    LDA_ABS, NOP, BNE, RESULT, lo, hi, store, copy, finish, run, wait_done,
+    PERF_CTRL, PERF_SNAPSHOT, PERF_CLEAR, PERF_CYCLES, PERF_INSTRUCTIONS, PERF_STALLS,
+    read_counter, read_result,
+)
+
+SLOW = 0x3000       # block 3, 3 waits in test_runner.py
+SLOW_WAITS = 3
+
+CPU_DIV = 0xA030
+UART_DATA = 0xA042
+
+TIMER_CTRL = 0xA020
+TIMER_STATUS = 0xA021
+TIMER_RELOAD_LO = 0xA024
+TIMER_RELOAD_HI = 0xA025
+TIMER_ENABLE = 0x01
+TIMER_LOAD = 0x08
+
+LED_CONTROL = 0xA010
+LED_RED = 0xA012
+LED_GREEN = 0xA013
+LED_BLUE = 0xA014
+LED_WHITE = 0xA015
+LED_STATUS = 0xA016
+LED_AUTO = 0x02
+
+
+async def write_cycle(dut, addr):
+    """Wait for the start of a write cycle to addr.
+
+    CPU_DIV is 0, so each i_clk cycle is a CPU cycle, from falling edge to
+    falling edge.
+    """
+    while True:
+        await FallingEdge(dut.i_clk)
+        await ReadOnly()
+        if int(dut.bus_addr.value) == addr and dut.bus_rw.value == 0:
+            return
+
+
+@cocotb.test()
+async def test_enable_rate(dut):
+    """PHI2 is i_clk and the clock enable is high one i_clk cycle in CPU_DIV + 1."""
+    Clock(dut.i_clk, 20, unit="ns").start()
+    await run(dut, finish([]))
+
+    for div in (0, 1, 3, 7):
+        await FallingEdge(dut.i_clk)
+        dut.mcu.clkctrl.cpu_div.value = div
+        for _ in range(2 * (div + 1)):
+            await FallingEdge(dut.i_clk)
+
+        enabled = 0
+        for _ in range(8 * (div + 1)):
+            await RisingEdge(dut.i_clk)
+            await ReadOnly()
+            assert dut.phi2.value == 1
+            enabled += int(dut.mcu.cpu_ce.value)
+            await FallingEdge(dut.i_clk)
+            await ReadOnly()
+            assert dut.phi2.value == 0
+        dut._log.info(f"CPU_DIV={div}: {enabled} CPU cycles in {8 * (div + 1)} i_clk cycles")
+        assert enabled == 8
+
+
+@cocotb.test()
+async def test_counts_divided(dut):
+    """Wait states and performance counters count CPU cycles, not i_clk cycles."""
+    div, nops, reads = 3, 10, 4
+    program = store(div, CPU_DIV) + store(PERF_CLEAR, PERF_CTRL)
+    program += [NOP] * nops + [LDA_ABS, lo(SLOW), hi(SLOW)] * reads
+    program += store(PERF_SNAPSHOT, PERF_CTRL)
+    for i, counter in enumerate((PERF_CYCLES, PERF_INSTRUCTIONS, PERF_STALLS)):
+        program += read_counter(counter, RESULT + 4 * i)
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    await run(dut, finish(program))
+
+    perf = dut.mcu.perf_gen_on.perf
+    await RisingEdge(perf.clear)
+    elapsed = 0
+    while not perf.snapshot.value:
+        await FallingEdge(dut.i_clk)
+        await ReadOnly()
+        elapsed += 1
+    await wait_done(dut)
+
+    cycles, instructions, stalls = (read_result(dut, i) for i in range(3))
+    dut._log.info(f"cycles {cycles}, instructions {instructions}, stalls {stalls}, {elapsed} i_clk cycles")
+    # As in test_perf_counters.test_counts, at a quarter of the clock
+    assert instructions == nops + reads + 2
+    assert stalls == reads * SLOW_WAITS
+    assert cycles == 2 * nops + (4 + SLOW_WAITS) * reads + 2 + 3
+    # SNAPSHOT copies the count before its own cycle
+    assert elapsed == (cycles + 1) * (div + 1)
+
+
+@cocotb.test()
+async def test_uart_write_same_clock(dut):
+    """A write to the UART DATA register reaches the TX FIFO inside the write cycle."""
+    program = store(0x55, UART_DATA)
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    await run(dut, finish(program))
+
+    uart = dut.mcu.uart0
+    await write_cycle(dut, UART_DATA)
+    assert uart.tx_empty.value == 1
+    await FallingEdge(dut.i_clk)
+    await ReadOnly()
+    assert uart.tx_empty.value == 0, "TX FIFO should take the byte in the write cycle"
+    assert int(uart.uart_tx_inst.fifo_data.value) == 0x55
+
+
+@cocotb.test()
+async def test_timer_same_clock(dut):
+    """LOAD and a STATUS clear act inside the write cycle, the registers read back."""
+    program = store(0xFE, TIMER_RELOAD_LO) + store(0xFF, TIMER_RELOAD_HI)
+    program += store(TIMER_LOAD, TIMER_CTRL) + copy(TIMER_CTRL, RESULT) + copy(TIMER_RELOAD_LO, RESULT + 1)
+    # The count overflows two cycles after the enable
+    program += store(TIMER_ENABLE, TIMER_CTRL) + copy(TIMER_STATUS, RESULT + 2)
+    program += store(0x01, TIMER_STATUS) + copy(TIMER_STATUS, RESULT + 3)
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    await run(dut, finish(program))
+
+    timer = dut.mcu.timer0
+    await write_cycle(dut, TIMER_CTRL)
+    assert int(timer.timer_count.value) == 0
+    await FallingEdge(dut.i_clk)
+    await ReadOnly()
+    assert int(timer.timer_count.value) == 0xFFFE, "LOAD should load the count in the write cycle"
+
+    await write_cycle(dut, TIMER_STATUS)
+    assert timer.overflow_flag.value == 1
+    await FallingEdge(dut.i_clk)
+    await ReadOnly()
+    assert timer.overflow_flag.value == 0, "STATUS write should clear the flag in the write cycle"
+
+    await wait_done(dut)
+    results = [int(dut.bram.memory[RESULT + i].value) for i in range(4)]
+    # LOAD reads 0, the flag is set after the enable and clear after the STATUS write
+    assert results == [0x00, 0xFE, 0x01, 0x00]
+
+
+@cocotb.test()
+async def test_sk6812_same_clock(dut):
+    """An AUTO write to WHITE starts the LED inside the write cycle, the registers read back."""
+    # Wait for the LED's reset period
+    program = [LDA_ABS, lo(LED_STATUS), hi(LED_STATUS), BNE, 0xFB]
+    program += store(0x11, LED_RED) + store(0x22, LED_GREEN) + store(0x33, LED_BLUE)
+    program += store(LED_AUTO, LED_CONTROL) + store(0x44, LED_WHITE)
+    program += copy(LED_WHITE, RESULT) + copy(LED_CONTROL, RESULT + 1) + copy(LED_STATUS, RESULT + 2)
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    await run(dut, finish(program))
+
+    led = dut.mcu.sk6812_gen_on.sk6812.sk6812rgbw
+    await write_cycle(dut, LED_WHITE)
+    assert led.o_busy.value == 0
+    await FallingEdge(dut.i_clk)
+    await ReadOnly()
+    assert led.o_busy.value == 1, "WHITE write should start the LED in the write cycle"
+    assert int(led.color.value) == 0x22113344
+
+    await wait_done(dut)
+    results = [int(dut.bram.memory[RESULT + i].value) for i in range(3)]
+    assert results == [0x44, LED_AUTO, 0x01]
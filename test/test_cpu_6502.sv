@@ -1,6 +1,11 @@
 `timescale 1ps/1ps
 
-module test_cpu_6502 (
+// cpu_6502 and bus_ram. test_runner.py sets ENABLE_65C02 or TURBO for the
+// 65C02 and TURBO core tests.
+module test_cpu_6502 #(
+    parameter ENABLE_65C02 = 0,
+    parameter TURBO = 0
+) (
     input i_clk
 );
 
@@ -16,11 +21,14 @@ wire bus_rw;
 wire cpu_phi1;
 wire cpu_phi2;
 wire cpu_sync;
+wire cpu_irq_vector;
 wire [7:0] debug_data;
 
 cpu_6502 #(
     .START_PC(16'h400),
-    .START_PC_ENABLED(1)
+    .START_PC_ENABLED(1),
+    .ENABLE_65C02(ENABLE_65C02),
+    .TURBO(TURBO)
 ) cpu_6502 (
     .i_clk(i_clk),
     .o_phi1(cpu_phi1),
@@ -31,6 +39,7 @@ cpu_6502 #(
     .i_irq_n(i_irq_n),
     .i_so_n(1'b1),
     .o_sync(cpu_sync),
+    .o_irq_vector(cpu_irq_vector),
     .i_bus_data(ram_read_data),
     .o_bus_data(bus_write_data),
     .o_bus_addr(bus_addr),
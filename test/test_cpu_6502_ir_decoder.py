@@ -0,0 +1,41 @@
+from cocotb.triggers import Timer
+import cocotb
+
+
+async def compare(dut, casez, rom):
+    mismatches = []
+    for opcode in range(256):
+        dut.i_opcode.value = opcode
+        await Timer(1, "ns")
+        expected = int(casez.value)
+        actual = int(rom.value)
+        if actual != expected:
+            mismatches.append(f"${opcode:02X}: rom {actual}, casez {expected}")
+    return mismatches
+
+
+@cocotb.test()
+async def test_rom_matches_casez(dut):
+    """The generated decoder ROM agrees with the casez decoder on every opcode."""
+    mismatches = await compare(dut, dut.o_casez_operand_type, dut.o_rom_operand_type)
+    assert not mismatches, "Decoder ROM differs from casez decoder:\n" + "\n".join(mismatches)
+
+
+@cocotb.test()
+async def test_rom_matches_casez_65c02(dut):
+    """With ENABLE_65C02 both decoders agree too, and differ from the NMOS decode only on 65C02 opcodes."""
+    mismatches = await compare(dut, dut.o_casez_65c02_operand_type, dut.o_rom_65c02_operand_type)
+    assert not mismatches, "65C02 decoder ROM differs from casez decoder:\n" + "\n".join(mismatches)
+
+    cmos = {0x04, 0x0C, 0x14, 0x1C, 0x64, 0x74, 0x9C, 0x9E, 0x80, 0x1A, 0x3A, 0x5A, 0x7A, 0xDA, 0xFA, 0xCB}
+    cmos |= {0x12 + 0x20 * i for i in range(8)}
+    cmos |= {0x07 + 0x10 * i for i in range(16)} | {0x0F + 0x10 * i for i in range(16)}
+    cmos |= {0x34, 0x3C, 0x7C, 0x89, 0xDB, 0x02, 0x22, 0x42, 0x62, 0x82, 0xC2, 0xE2,
+             0x44, 0x54, 0xD4, 0xF4, 0x5C, 0xDC, 0xFC}
+    changed = []
+    for opcode in range(256):
+        dut.i_opcode.value = opcode
+        await Timer(1, "ns")
+        if int(dut.o_casez_65c02_operand_type.value) != int(dut.o_casez_operand_type.value):
+            changed.append(opcode)
+    assert set(changed) <= cmos, f"non-65C02 opcodes changed: {sorted(set(changed) - cmos)}"
@@ -0,0 +1,36 @@
+`timescale 1ps/1ps
+`include "cpu_6502_instructions.vh"
+
+module test_cpu_6502_ir_decoder (
+    input [7:0] i_opcode,
+    output operand_type_t o_casez_operand_type,
+    output operand_type_t o_rom_operand_type,
+    output operand_type_t o_casez_65c02_operand_type,
+    output operand_type_t o_rom_65c02_operand_type
+);
+
+cpu_6502_ir_decoder casez_decoder (
+    .i_opcode(i_opcode),
+    .o_operand_type(o_casez_operand_type)
+);
+
+cpu_6502_ir_decoder_rom rom_decoder (
+    .i_opcode(i_opcode),
+    .o_operand_type(o_rom_operand_type)
+);
+
+cpu_6502_ir_decoder #(
+    .ENABLE_65C02(1)
+) casez_65c02_decoder (
+    .i_opcode(i_opcode),
+    .o_operand_type(o_casez_65c02_operand_type)
+);
+
+cpu_6502_ir_decoder_rom #(
+    .ENABLE_65C02(1)
+) rom_65c02_decoder (
+    .i_opcode(i_opcode),
+    .o_operand_type(o_rom_65c02_operand_type)
+);
+
+endmodule
@@ -1,6 +1,7 @@
 from cocotb.clock import Clock
 from cocotb.triggers import ClockCycles, RisingEdge, FallingEdge
 import cocotb
+import utils
 
 # Reset vector location
 RESET_VECTOR_LO = 0xFFFC
@@ -29,29 +30,26 @@ def lo(addr):
 def hi(addr):
     return (addr >> 8) & 0xFF
 
+def get_state(dut):
+    return utils.read_arch_state(dut.cpu_6502)
+
 def get_acc(dut):
-    return int(dut.cpu_6502.register_acc.value)
+    return get_state(dut).acc
 
 def get_x(dut):
-    return int(dut.cpu_6502.register_x.value)
+    return get_state(dut).x
 
 def get_y(dut):
-    return int(dut.cpu_6502.register_y.value)
+    return get_state(dut).y
 
 def get_sp(dut):
-    return int(dut.cpu_6502.register_sp.value)
+    return get_state(dut).sp
 
 def get_pc(dut):
-    return int(dut.cpu_6502.program_counter.value)
+    return get_state(dut).pc
 
 def get_sr(dut):
-    n = int(dut.cpu_6502.status_negative.value)
-    v = int(dut.cpu_6502.status_overflow.value)
-    d = int(dut.cpu_6502.status_decimal.value)
-    i = int(dut.cpu_6502.status_interrupt.value)
-    z = int(dut.cpu_6502.status_zero.value)
-    c = int(dut.cpu_6502.status_carry.value)
-    return (n << 7) | (v << 6) | (1 << 5) | (0 << 4) | (d << 3) | (i << 2) | (z << 1) | c
+    return get_state(dut).sr
 
 def assert_acc(dut, expected):
     actual = get_acc(dut)
@@ -17,6 +17,7 @@ wire bus_rw;
 wire cpu_phi1;
 wire cpu_phi2;
 wire cpu_sync;
+wire cpu_irq_vector;
 wire [7:0] debug_data;
 
 cpu_6502 #(
@@ -31,6 +32,7 @@ cpu_6502 #(
     .i_irq_n(i_irq_n),
     .i_so_n(i_so_n),
     .o_sync(cpu_sync),
+    .o_irq_vector(cpu_irq_vector),
     .i_bus_data(ram_read_data),
     .o_bus_data(bus_write_data),
     .o_bus_addr(bus_addr),
@@ -0,0 +1,494 @@
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles
+import cocotb
+
+from test_cpu_6502 import (
+    START_PC, SR_C, SR_D, SR_I, SR_N, SR_V, SR_Z,
+    LDA_IMM, LDX_IMM, LDY_IMM, TXS, SEC, CLC, SED, SEI, CLI, NOP, BRK, JMP_IND,
+    lo, hi, assert_acc, assert_x, assert_y, assert_sp, assert_pc, assert_flag, assert_nz,
+    read_mem, setup_and_run,
+)
+
+# Tests for the ENABLE_65C02 opcodes. Cycle counts are the WDC 65C02's.
+
+# --- 65C02 opcodes ---
+STZ_ZP  = 0x64
+STZ_ZPX = 0x74
+STZ_ABS = 0x9C
+STZ_ABX = 0x9E
+
+ORA_IZP = 0x12
+AND_IZP = 0x32
+EOR_IZP = 0x52
+ADC_IZP = 0x72
+STA_IZP = 0x92
+LDA_IZP = 0xB2
+CMP_IZP = 0xD2
+SBC_IZP = 0xF2
+
+TSB_ZP  = 0x04
+TSB_ABS = 0x0C
+TRB_ZP  = 0x14
+TRB_ABS = 0x1C
+
+BRA = 0x80
+INC_A = 0x1A
+DEC_A = 0x3A
+PHX = 0xDA
+PLX = 0xFA
+PHY = 0x5A
+PLY = 0x7A
+WAI = 0xCB
+STP = 0xDB
+
+BIT_IMM = 0x89
+BIT_ZPX = 0x34
+BIT_ABX = 0x3C
+JMP_IAX = 0x7C
+
+RMB0 = 0x07                     # RMBn = RMB0 + n * $10
+SMB0 = 0x87
+BBR0 = 0x0F                     # BBRn = BBR0 + n * $10
+BBS0 = 0x8F
+
+
+# ============================================================
+# STZ - Store Zero
+# ============================================================
+
+@cocotb.test()
+async def test_stz(dut):
+    """STZ zp, zp,X, abs and abs,X store 0 without touching A or the flags."""
+    prog = [
+        LDX_IMM, 0x02,              # 2 cycles
+        LDA_IMM, 0x80,              # 2 cycles
+        STZ_ZP, 0x10,               # 3 cycles
+        STZ_ZPX, 0x10,              # 4 cycles
+        STZ_ABS, 0x00, 0x03,        # 4 cycles
+        STZ_ABX, 0x00, 0x03,        # 5 cycles
+    ]
+    data = {0x10: 0x11, 0x12: 0x22, 0x0300: 0x33, 0x0302: 0x44}
+    await setup_and_run(dut, prog, data=data, cycles=20)
+    assert_pc(dut, START_PC + len(prog))
+    for addr in data:
+        assert await read_mem(dut, addr) == 0, f"${addr:04X}"
+    assert_acc(dut, 0x80)
+    assert_flag(dut, SR_N, 1, "N")
+    assert_flag(dut, SR_Z, 0, "Z")
+
+
+# ============================================================
+# (zp) - Zero Page Indirect
+# ============================================================
+
+@cocotb.test()
+async def test_lda_sta_izp(dut):
+    """LDA (zp) and STA (zp) go through the pointer without indexing, 5 cycles each."""
+    prog = [
+        LDY_IMM, 0x05,              # 2 cycles, (zp) must ignore Y
+        LDA_IZP, 0x20,              # 5 cycles
+        STA_IZP, 0x22,              # 5 cycles
+    ]
+    data = {0x20: 0x00, 0x21: 0x03, 0x22: 0xFF, 0x23: 0x04, 0x0300: 0x9A, 0x0305: 0x01}
+    await setup_and_run(dut, prog, data=data, cycles=12)
+    assert_pc(dut, START_PC + len(prog))
+    assert_acc(dut, 0x9A)
+    assert_nz(dut, 0x9A)
+    assert await read_mem(dut, 0x04FF) == 0x9A
+    assert_y(dut, 0x05)
+
+
+@cocotb.test()
+async def test_alu_izp(dut):
+    """ORA, AND, EOR, ADC, CMP and SBC (zp) operate like their cc=01 forms."""
+    data = {0x20: 0x00, 0x21: 0x03, 0x0300: 0x0F}
+    cases = [
+        (ORA_IZP, 0xF0, 0xFF, {SR_N: 1, SR_Z: 0}),
+        (AND_IZP, 0xF0, 0x00, {SR_N: 0, SR_Z: 1}),
+        (EOR_IZP, 0xFF, 0xF0, {SR_N: 1, SR_Z: 0}),
+        (ADC_IZP, 0x7F, 0x8E, {SR_N: 1, SR_Z: 0, SR_C: 0, SR_V: 1}),
+        (SBC_IZP, 0x0F, 0x00, {SR_N: 0, SR_Z: 1, SR_C: 1, SR_V: 0}),
+        (CMP_IZP, 0x0E, 0x0E, {SR_N: 1, SR_Z: 0, SR_C: 0}),
+    ]
+    for opcode, acc, result, flags in cases:
+        prog = [
+            SEC if opcode == SBC_IZP else CLC,  # 2 cycles
+            LDA_IMM, acc,                       # 2 cycles
+            opcode, 0x20,                       # 5 cycles
+        ]
+        await setup_and_run(dut, prog, data=data, cycles=9)
+        assert_pc(dut, START_PC + len(prog))
+        assert_acc(dut, result)
+        for bit, value in flags.items():
+            assert_flag(dut, bit, value, f"${opcode:02X}")
+
+
+# ============================================================
+# TSB / TRB - Test and Set/Reset Bits
+# ============================================================
+
+@cocotb.test()
+async def test_tsb_trb(dut):
+    """TSB/TRB set or clear A's bits in memory, Z from A AND memory; zp 5 cycles, abs 6."""
+    prog = [
+        LDA_IMM, 0x0F,              # 2 cycles
+        TSB_ZP, 0x10,               # 5 cycles: $30 -> $3F, A & $30 = 0
+        TRB_ABS, 0x00, 0x03,        # 6 cycles: $FF -> $F0
+    ]
+    data = {0x10: 0x30, 0x0300: 0xFF}
+    await setup_and_run(dut, prog, data=data, cycles=13)
+    assert_pc(dut, START_PC + len(prog))
+    assert await read_mem(dut, 0x10) == 0x3F
+    assert await read_mem(dut, 0x0300) == 0xF0
+    assert_flag(dut, SR_Z, 0, "Z")
+    assert_acc(dut, 0x0F)
+
+    prog = [
+        LDA_IMM, 0x0F,              # 2 cycles
+        TRB_ZP, 0x10,               # 5 cycles: $F0 -> $F0, A & $F0 = 0
+        TSB_ABS, 0x00, 0x03,        # 6 cycles
+    ]
+    data = {0x10: 0xF0, 0x0300: 0x00}
+    await setup_and_run(dut, prog, data=data, cycles=13)
+    assert_pc(dut, START_PC + len(prog))
+    assert await read_mem(dut, 0x10) == 0xF0
+    assert await read_mem(dut, 0x0300) == 0x0F
+    assert_flag(dut, SR_Z, 1, "Z")
+
+
+# ============================================================
+# BRA - Branch Always
+# ============================================================
+
+@cocotb.test()
+async def test_bra(dut):
+    """BRA always branches: 3 cycles, 4 across a page."""
+    prog = [
+        BRA, 0x02,                  # 3 cycles, skips the LDA
+        LDA_IMM, 0x11,
+        LDX_IMM, 0x22,              # 2 cycles
+    ]
+    await setup_and_run(dut, prog, cycles=5)
+    assert_pc(dut, START_PC + len(prog))
+    assert_acc(dut, 0x00)
+    assert_x(dut, 0x22)
+
+    prog = [BRA, 0x80]             # 4 cycles, back to $0382
+    await setup_and_run(dut, prog, data={0x0382: LDA_IMM, 0x0383: 0x33}, cycles=6)
+    assert_pc(dut, 0x0384)
+    assert_acc(dut, 0x33)
+
+
+# ============================================================
+# INC A / DEC A
+# ============================================================
+
+@cocotb.test()
+async def test_inc_dec_a(dut):
+    """INC A and DEC A take 2 cycles and set N and Z but not C."""
+    prog = [
+        SEC,                        # 2 cycles
+        LDA_IMM, 0xFF,              # 2 cycles
+        INC_A,                      # 2 cycles
+    ]
+    await setup_and_run(dut, prog, cycles=6)
+    assert_pc(dut, START_PC + len(prog))
+    assert_acc(dut, 0x00)
+    assert_nz(dut, 0x00)
+    assert_flag(dut, SR_C, 1, "C")
+
+    prog = [
+        LDA_IMM, 0x00,              # 2 cycles
+        DEC_A,                      # 2 cycles
+        DEC_A,                      # 2 cycles
+    ]
+    await setup_and_run(dut, prog, cycles=6)
+    assert_pc(dut, START_PC + len(prog))
+    assert_acc(dut, 0xFE)
+    assert_nz(dut, 0xFE)
+    assert_flag(dut, SR_C, 0, "C")
+
+
+# ============================================================
+# PHX / PLX / PHY / PLY
+# ============================================================
+
+@cocotb.test()
+async def test_push_pull_xy(dut):
+    """PHX/PHY take 3 cycles and PLX/PLY 4; the pulls set N and Z."""
+    prog = [
+        LDX_IMM, 0xFF,              # 2 cycles
+        TXS,                        # 2 cycles
+        LDX_IMM, 0x80,              # 2 cycles
+        LDY_IMM, 0x00,              # 2 cycles
+        PHX,                        # 3 cycles
+        PHY,                        # 3 cycles
+        PLX,                        # 4 cycles: X = $00
+        PLY,                        # 4 cycles: Y = $80
+    ]
+    await setup_and_run(dut, prog, cycles=22)
+    assert_pc(dut, START_PC + len(prog))
+    assert await read_mem(dut, 0x01FF) == 0x80
+    assert await read_mem(dut, 0x01FE) == 0x00
+    assert_x(dut, 0x00)
+    assert_y(dut, 0x80)
+    assert_sp(dut, 0xFF)
+    assert_nz(dut, 0x80)
+
+    prog = prog[:-1]
+    await setup_and_run(dut, prog, cycles=18)
+    assert_pc(dut, START_PC + len(prog))
+    assert_nz(dut, 0x00)
+
+
+# ============================================================
+# WAI - Wait for Interrupt
+# ============================================================
+
+async def run_wai(dut, prog, data):
+    Clock(dut.i_clk, 100, "ns").start()
+    dut.i_reset_n.value = 0
+    dut.i_rdy.value = 1
+    dut.i_nmi_n.value = 1
+    dut.i_irq_n.value = 1
+    await ClockCycles(dut.i_clk, 2)
+    for i, b in enumerate(prog):
+        dut.ram.mem[START_PC + i].value = b
+    for addr, val in data.items():
+        dut.ram.mem[addr].value = val
+    dut.i_reset_n.value = 1
+    await ClockCycles(dut.i_clk, 8)
+
+
+@cocotb.test()
+async def test_wai_irq_masked(dut):
+    """With I set, WAI holds until IRQ and then continues with the next instruction."""
+    prog = [
+        LDX_IMM, 0xFF,              # 2 cycles  $0400
+        TXS,                        # 2 cycles  $0402
+        SEI,                        # 2 cycles  $0403
+        WAI,                        #           $0404
+        LDA_IMM, 0x42,              # 2 cycles  $0405
+    ]
+    await run_wai(dut, prog, {0xFFFE: 0x00, 0xFFFF: 0x05, 0x0500: LDA_IMM, 0x0501: 0x99})
+
+    await ClockCycles(dut.i_clk, 6 + 50)
+    assert_pc(dut, 0x0405)
+    assert_acc(dut, 0x00)
+
+    # The wait cycle that sees IRQ, WAI's last cycle, then LDA
+    dut.i_irq_n.value = 0
+    await ClockCycles(dut.i_clk, 1 + 1 + 2)
+    assert_pc(dut, START_PC + len(prog))
+    assert_acc(dut, 0x42)
+    assert_sp(dut, 0xFF)
+
+
+@cocotb.test()
+async def test_wai_irq(dut):
+    """With I clear, WAI holds until IRQ, which is taken with WAI's successor as return address."""
+    prog = [
+        LDX_IMM, 0xFF,              # 2 cycles  $0400
+        TXS,                        # 2 cycles  $0402
+        CLI,                        # 2 cycles  $0403
+        WAI,                        #           $0404
+        NOP,                        #           $0405
+    ]
+    await run_wai(dut, prog, {0xFFFE: 0x00, 0xFFFF: 0x05, 0x0500: LDA_IMM, 0x0501: 0x99})
+
+    await ClockCycles(dut.i_clk, 6 + 50)
+    assert_pc(dut, 0x0405)
+    assert_sp(dut, 0xFF)
+
+    # The wait cycle that sees IRQ, WAI's last cycle, the 7-cycle interrupt
+    # sequence, then the handler's LDA
+    dut.i_irq_n.value = 0
+    await ClockCycles(dut.i_clk, 1 + 1 + 7 + 2)
+    assert_acc(dut, 0x99)
+    assert_flag(dut, SR_I, 1, "I")
+    assert_sp(dut, 0xFC)
+    assert await read_mem(dut, 0x01FF) == hi(0x0405)
+    assert await read_mem(dut, 0x01FE) == lo(0x0405)
+
+
+# ============================================================
+# STP - Stop
+# ============================================================
+
+@cocotb.test()
+async def test_stp(dut):
+    """STP holds until reset, an IRQ does not end it."""
+    prog = [
+        LDX_IMM, 0xFF,              # 2 cycles  $0400
+        TXS,                        # 2 cycles  $0402
+        CLI,                        # 2 cycles  $0403
+        STP,                        #           $0404
+        LDA_IMM, 0x42,              #           $0405
+    ]
+    await run_wai(dut, prog, {0xFFFE: 0x00, 0xFFFF: 0x05, 0x0500: LDA_IMM, 0x0501: 0x99})
+
+    await ClockCycles(dut.i_clk, 6 + 50)
+    assert_pc(dut, 0x0405)
+
+    dut.i_irq_n.value = 0
+    await ClockCycles(dut.i_clk, 50)
+    assert_pc(dut, 0x0405)
+    assert_acc(dut, 0x00)
+    assert_sp(dut, 0xFF)
+
+
+# ============================================================
+# BIT #imm / zp,X / abs,X
+# ============================================================
+
+@cocotb.test()
+async def test_bit_65c02(dut):
+    """BIT #imm sets only Z; zp,X and abs,X set N, V and Z like zp and abs."""
+    prog = [
+        LDA_IMM, 0xFF,              # 2 cycles: N = 1
+        BIT_IMM, 0x00,              # 2 cycles: Z = 1, N kept
+    ]
+    await setup_and_run(dut, prog, cycles=4)
+    assert_pc(dut, START_PC + len(prog))
+    assert_flag(dut, SR_Z, 1, "Z")
+    assert_flag(dut, SR_N, 1, "N")
+    assert_flag(dut, SR_V, 0, "V")
+
+    data = {0x12: 0xC0, 0x0301: 0x41}
+    prog = [
+        LDX_IMM, 0x02,              # 2 cycles
+        LDA_IMM, 0x01,              # 2 cycles
+        BIT_ZPX, 0x10,              # 4 cycles: $C0
+    ]
+    await setup_and_run(dut, prog, data=data, cycles=8)
+    assert_pc(dut, START_PC + len(prog))
+    assert_flag(dut, SR_N, 1, "N")
+    assert_flag(dut, SR_V, 1, "V")
+    assert_flag(dut, SR_Z, 1, "Z")
+
+    prog = [
+        LDX_IMM, 0x02,              # 2 cycles
+        LDA_IMM, 0x01,              # 2 cycles
+        BIT_ABX, 0xFF, 0x02,        # 5 cycles, page cross: $41
+    ]
+    await setup_and_run(dut, prog, data=data, cycles=9)
+    assert_pc(dut, START_PC + len(prog))
+    assert_flag(dut, SR_N, 0, "N")
+    assert_flag(dut, SR_V, 1, "V")
+    assert_flag(dut, SR_Z, 0, "Z")
+    assert_acc(dut, 0x01)
+
+
+# ============================================================
+# JMP (abs,X) and JMP (abs)
+# ============================================================
+
+@cocotb.test()
+async def test_jmp_ind_x(dut):
+    """JMP (abs,X) adds X to the pointer, carrying into its high byte, in 6 cycles."""
+    prog = [
+        LDX_IMM, 0x04,              # 2 cycles
+        JMP_IAX, 0xFE, 0x02,        # 6 cycles, pointer at $0302
+    ]
+    data = {0x0302: 0x00, 0x0303: 0x05, 0x0500: LDA_IMM, 0x0501: 0x77}
+    await setup_and_run(dut, prog, data=data, cycles=10)
+    assert_pc(dut, 0x0502)
+    assert_acc(dut, 0x77)
+    assert_x(dut, 0x04)
+
+
+@cocotb.test()
+async def test_jmp_ind_page(dut):
+    """JMP ($xxFF) reads the high byte from the next page, as on the 65C02, in the NMOS 5 cycles."""
+    prog = [JMP_IND, 0xFF, 0x04]    # 5 cycles
+    data = {0x04FF: 0x00, 0x0500: 0x06, 0x0600: LDA_IMM, 0x0601: 0x55}
+    await setup_and_run(dut, prog, data=data, cycles=7)
+    assert_pc(dut, 0x0602)
+    assert_acc(dut, 0x55)
+
+
+# ============================================================
+# RMB / SMB - Reset/Set Memory Bit
+# ============================================================
+
+@cocotb.test()
+async def test_rmb_smb(dut):
+    """RMBn and SMBn clear and set bit n of a zero page byte in 5 cycles, flags untouched."""
+    for bit in range(8):
+        prog = [
+            LDA_IMM, 0x00,          # 2 cycles: Z = 1
+            RMB0 + bit * 0x10, 0x10,  # 5 cycles
+            SMB0 + bit * 0x10, 0x11,  # 5 cycles
+        ]
+        await setup_and_run(dut, prog, data={0x10: 0xFF, 0x11: 0x00}, cycles=12)
+        assert_pc(dut, START_PC + len(prog))
+        assert await read_mem(dut, 0x10) == 0xFF & ~(1 << bit), f"RMB{bit}"
+        assert await read_mem(dut, 0x11) == 1 << bit, f"SMB{bit}"
+        assert_flag(dut, SR_Z, 1, "Z")
+        assert_flag(dut, SR_N, 0, "N")
+
+
+# ============================================================
+# BBR / BBS - Branch on Bit Reset/Set
+# ============================================================
+
+@cocotb.test()
+async def test_bbr_bbs(dut):
+    """BBRn/BBSn test bit n of a zero page byte: 5 cycles, 6 taken, 7 to another page."""
+    for bit in range(8):
+        prog = [
+            BBR0 + bit * 0x10, 0x10, 0x02,  # 5 cycles, not taken
+            BBS0 + bit * 0x10, 0x10, 0x02,  # 6 cycles, skips the LDA
+            LDA_IMM, 0x11,
+            LDX_IMM, 0x22,                  # 2 cycles
+        ]
+        await setup_and_run(dut, prog, data={0x10: 1 << bit}, cycles=13)
+        assert_pc(dut, START_PC + len(prog))
+        assert_acc(dut, 0x00)
+        assert_x(dut, 0x22)
+
+    prog = [BBR0 + 7 * 0x10, 0x10, 0x80]   # 7 cycles, back to $0383
+    await setup_and_run(dut, prog, data={0x10: 0x7F, 0x0383: LDA_IMM, 0x0384: 0x33}, cycles=9)
+    assert_pc(dut, 0x0385)
+    assert_acc(dut, 0x33)
+
+
+# ============================================================
+# NOPs and BRK
+# ============================================================
+
+@cocotb.test()
+async def test_nop_65c02(dut):
+    """The unused opcodes are NOPs that skip their operand and leave the flags alone."""
+    prog = [
+        SEC,                        # 2 cycles
+        LDA_IMM, 0x80,              # 2 cycles
+        0x02, 0xFF,                 # 2 cycles, #imm
+        0x44, 0x10,                 # 3 cycles, zp
+        0xD4, 0x10,                 # 4 cycles, zp,X on the CPY pattern
+        0xFC, 0x00, 0x03,           # 4 cycles, abs on the CPX pattern
+        0x03,                       # 2 cycles, 1 on the WDC part
+    ]
+    await setup_and_run(dut, prog, data={0x10: 0x01, 0x0300: 0x01}, cycles=19)
+    assert_pc(dut, START_PC + len(prog))
+    assert_acc(dut, 0x80)
+    assert_flag(dut, SR_N, 1, "N")
+    assert_flag(dut, SR_Z, 0, "Z")
+    assert_flag(dut, SR_C, 1, "C")
+    assert await read_mem(dut, 0x10) == 0x01
+
+
+@cocotb.test()
+async def test_brk_clears_decimal(dut):
+    """BRK pushes D set and clears it for the handler."""
+    prog = [
+        LDX_IMM, 0xFF,              # 2 cycles
+        TXS,                        # 2 cycles
+        SED,                        # 2 cycles
+        BRK, 0x00,                  # 7 cycles
+    ]
+    data = {0xFFFE: 0x00, 0xFFFF: 0x05, 0x0500: NOP}
+    await setup_and_run(dut, prog, data=data, cycles=13)
+    assert_pc(dut, 0x0500)
+    assert_flag(dut, SR_D, 0, "D")
+    assert await read_mem(dut, 0x01FD) & (1 << SR_D)
@@ -0,0 +1,137 @@
+import sys
+from pathlib import Path
+
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles, RisingEdge
+import cocotb
+
+from test_cpu_6502 import (
+    START_PC, LDA_IMM, LDX_IMM, TXS, CLI, NOP, INX, BEQ, BNE, PHA, PLA,
+    get_acc, get_x, assert_acc, assert_x, assert_sp, read_mem, setup_and_run,
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+import cycle_table  # noqa: E402
+import opcodes  # noqa: E402
+
+# Tests for the TURBO core: the same results as the NMOS core in fewer
+# cycles. Instruction lengths are measured between o_sync pulses and must
+# match tools/cycle_table.py --turbo.
+
+OPERAND_BYTES = {
+    "IMPLIED": 0, "ACCUMULATOR": 0,
+    "IMMEDIATE": 1, "ZP": 1, "ZP_X": 1, "ZP_Y": 1,
+    "INDEX_X_INDIRECT": 1, "INDEX_Y_INDIRECT": 1, "RELATIVE": 1,
+    "ABSOLUTE": 2, "ABSOLUTE_X": 2, "ABSOLUTE_Y": 2, "INDIRECT": 2,
+}
+
+# Instructions that leave straight-line code, timed by their own tests
+CONTROL_FLOW = {"BRK", "JMP", "JMP_IND", "JSR", "RTS", "RTI"}
+
+
+async def sync_cycles(dut, program, data=None, cycles=20):
+    """Run the program and return the cycle numbers on which o_sync was high."""
+    Clock(dut.i_clk, 100, "ns").start()
+    dut.i_reset_n.value = 0
+    dut.i_rdy.value = 1
+    dut.i_nmi_n.value = 1
+    dut.i_irq_n.value = 1
+    await ClockCycles(dut.i_clk, 2)
+
+    for i, b in enumerate(program):
+        dut.ram.mem[START_PC + i].value = b
+    for addr, val in (data or {}).items():
+        dut.ram.mem[addr].value = val
+
+    dut.i_reset_n.value = 1
+    syncs = []
+    for cycle in range(cycles):
+        await RisingEdge(dut.i_clk)
+        if int(dut.cpu_sync.value):
+            syncs.append(cycle)
+    return syncs
+
+
+@cocotb.test()
+async def test_cycle_table(dut):
+    """Every straight-line opcode takes the cycles cycle_table.py --turbo gives it."""
+    opcode_patterns = opcodes.load_opcodes()
+    reference = cycle_table.reference_timings()
+    # Operands point at $0300 with X = Y = 0, so nothing crosses a page
+    data = {0x20: 0x00, 0x21: 0x03}
+
+    mismatches = []
+    for opcode, name, mode, cycles in cycle_table.cycle_table(turbo=True):
+        if opcode not in reference or mode == "RELATIVE" or name in CONTROL_FLOW:
+            continue
+        operands = {0: [], 1: [0x20], 2: [0x00, 0x03]}[OPERAND_BYTES[mode]]
+        program = [opcode] + operands + [NOP] * 4
+        syncs = await sync_cycles(dut, program, data)
+        measured = syncs[1] - syncs[0]
+        expected = cycle_table.opcode_cycles(opcode, opcode_patterns, turbo=True).base
+        if measured != expected:
+            mismatches.append(f"{name} ({opcode:02X}): {measured} cycles, expected {expected}")
+
+    assert not mismatches, "\n".join(mismatches)
+
+
+@cocotb.test()
+async def test_branch_cycles(dut):
+    """Branches take 1 cycle not taken, 2 taken and 3 taken across a page."""
+    prog = [
+        LDA_IMM, 0x01,       # $0400
+        BEQ, 0x02,           # $0402: not taken
+        BNE, 0x00,           # $0404: taken to $0406
+        BNE, 0xF0,           # $0406: taken to $03F8
+    ]
+    data = {0x03F8 + i: NOP for i in range(4)}
+
+    syncs = await sync_cycles(dut, prog, data)
+    assert [b - a for a, b in zip(syncs, syncs[1:4])] == [2, 1, 2]
+    assert syncs[4] - syncs[3] == 3
+
+
+@cocotb.test()
+async def test_irq_single_cycle(dut):
+    """An IRQ between 1-cycle instructions returns to the next one without losing or repeating any."""
+    prog = [LDX_IMM, 0xFF, TXS, LDX_IMM, 0x00, CLI] + [INX] * 16
+    end = START_PC + len(prog)
+    prog += [0x4C, end & 0xFF, end >> 8]   # JMP to itself
+    data = {
+        0xFFFE: 0x00,        # IRQ vector: $0500
+        0xFFFF: 0x05,
+        0x0500: LDA_IMM,     # handler: LDA #$99, RTI
+        0x0501: 0x99,
+        0x0502: 0x40,
+    }
+
+    cocotb.start_soon(setup_and_run(dut, prog, data=data, cycles=0))
+    await ClockCycles(dut.i_clk, 8 + 12)
+    dut.i_irq_n.value = 0
+    while get_acc(dut) != 0x99:
+        await RisingEdge(dut.i_clk)
+    assert 0 < get_x(dut) < 16, "IRQ was not taken inside the INX run"
+    dut.i_irq_n.value = 1
+    await ClockCycles(dut.i_clk, 40)
+
+    assert_acc(dut, 0x99)
+    assert_x(dut, 16)
+    assert_sp(dut, 0xFF)
+
+
+@cocotb.test()
+async def test_push_pull(dut):
+    """PHA and PLA keep their results with the dummy cycles dropped."""
+    prog = [
+        LDX_IMM, 0xFF, TXS,
+        LDA_IMM, 0x5A, PHA,
+        LDA_IMM, 0xC3, PHA,
+        LDA_IMM, 0x00,
+        PLA, PLA,
+    ]
+    await setup_and_run(dut, prog, cycles=20)
+
+    assert_acc(dut, 0x5A)
+    assert_sp(dut, 0xFF)
+    assert await read_mem(dut, 0x01FF) == 0x5A
+    assert await read_mem(dut, 0x01FE) == 0xC3
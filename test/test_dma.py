@@ -0,0 +1,197 @@
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles, FallingEdge, RisingEdge, Timer
+import cocotb
+
+from utils import (
+    LDA_IMM, LDA_ABS, LDA_ABS_X, LDX_IMM, STA_ABS, STA_ABS_X, AND_IMM, INC_ABS,
+    INX, CPX_IMM, BNE, CLI, RTI, JMP_ABS,
+    START_PC, COUNTER, DONE, lo, hi, run, finish, count_until_done,
+)
+
+LED_CONTROL = 0xA010
+LED_RED = 0xA012
+
+UART_CTRL = 0xA040
+UART_DATA = 0xA042
+UART_BAUD_LO = 0xA043
+
+# DMA registers at $A070
+DMA_CTRL = 0xA070
+DMA_STATUS = 0xA071
+DMA_SRC_LO = 0xA072
+
+CTRL_START = 0x01
+SRC_INC = 0x01 << 1
+SRC_FILL = 0x02 << 1
+DST_INC = 0x01 << 3
+DST_WRAP4 = 0x02 << 3
+PACE_UART_TX = 0x01 << 5
+PACE_LED = 0x02 << 5
+CTRL_IRQ_EN = 0x80
+
+STATUS_BUSY = 0x01
+STATUS_DONE = 0x02
+
+IRQ_HANDLER = 0x0500
+SRC = 0x0600
+DST = 0x0700
+
+UART_BIT_CLOCKS = 16    # BAUD = 0
+
+
+def setup(src, dst, length, ctrl):
+    """Load SRC, DST and LEN, then write CTRL."""
+    program = []
+    for offset, value in enumerate((lo(src), hi(src), lo(dst), hi(dst), lo(length), hi(length))):
+        program += [LDA_IMM, value, STA_ABS, lo(DMA_SRC_LO + offset), hi(DMA_SRC_LO + offset)]
+    return program + [LDA_IMM, ctrl, STA_ABS, lo(DMA_CTRL), hi(DMA_CTRL)]
+
+
+def wait_idle():
+    """Count in COUNTER until the DMA is idle."""
+    return [
+        INC_ABS, lo(COUNTER), hi(COUNTER),          # loop:
+        LDA_ABS, lo(DMA_STATUS), hi(DMA_STATUS),
+        AND_IMM, STATUS_BUSY,
+        BNE, 0xF6,                                  # -> loop
+    ]
+
+
+async def uart_receive(dut, count):
+    """Receive count bytes from the UART TX line."""
+    received = []
+    while len(received) < count:
+        await FallingEdge(dut.mcu.uart_tx)
+        await Timer(20 * UART_BIT_CLOCKS * 3 // 2, unit="ns")
+        byte = 0
+        for bit in range(8):
+            byte |= int(dut.mcu.uart_tx.value) << bit
+            await Timer(20 * UART_BIT_CLOCKS, unit="ns")
+        assert int(dut.mcu.uart_tx.value) == 1, "missing stop bit"
+        received.append(byte)
+    return received
+
+
+async def count_dma_accesses(dut, accesses):
+    """Count the DMA's read and write bus cycles."""
+    while True:
+        await RisingEdge(dut.phi2)
+        if dut.mcu.dma_bus.value:
+            accesses['read' if dut.bus_rw.value else 'write'] += 1
+
+
+@cocotb.test()
+async def test_dma_copy(dut):
+    """A memory copy takes two bus cycles per byte, against 16 for an LDA/STA loop."""
+    Clock(dut.i_clk, 20, unit="ns").start()
+    length = 64
+    data = {SRC + i: (i * 7 + 3) & 0xFF for i in range(length)}
+
+    # LDX #0 / loop: LDA SRC,X / STA DST,X / INX / CPX #length / BNE loop
+    cpu_copy = [
+        LDX_IMM, 0x00,
+        LDA_ABS_X, lo(SRC), hi(SRC),
+        STA_ABS_X, lo(DST), hi(DST),
+        INX,
+        CPX_IMM, length,
+        BNE, 0xF5,
+    ]
+    await run(dut, finish(cpu_copy), data)
+    cpu_cycles, _ = await count_until_done(dut, dut.mcu.dma_bus, limit=100000)
+
+    await run(dut, finish(setup(SRC, DST + 0x80, length, CTRL_START | SRC_INC | DST_INC)), data)
+    accesses = {'read': 0, 'write': 0}
+    monitor = cocotb.start_soon(count_dma_accesses(dut, accesses))
+    cycles, dma_cycles = await count_until_done(dut, dut.mcu.dma_bus, limit=100000)
+    monitor.cancel()
+
+    dut._log.info(f"copy {length} bytes: CPU loop {cpu_cycles} cycles, DMA {cycles} cycles "
+                  f"({dma_cycles} on the bus)")
+    for i in range(length):
+        assert int(dut.bram.memory[DST + i].value) == data[SRC + i]
+        assert int(dut.bram.memory[DST + 0x80 + i].value) == data[SRC + i]
+    # One read and one write per byte, the bus carries one access per cycle
+    assert accesses == {'read': length, 'write': length}
+    assert dma_cycles == 2 * length
+    # LDA abs,X 4 + STA abs,X 5 + INX 2 + CPX 2 + BNE 3 cycles per byte
+    assert cpu_cycles >= 16 * length
+
+
+@cocotb.test()
+async def test_dma_fill_irq(dut):
+    """FILL writes one byte per cycle and raises the completion IRQ."""
+    length = 32
+    program = [CLI] + setup(SRC, DST, length, CTRL_START | SRC_FILL | DST_INC | CTRL_IRQ_EN)
+    program += [JMP_ABS, lo(START_PC + len(program)), hi(START_PC + len(program))]
+    # IRQ handler: clear DONE, store $AA to DONE
+    handler = [
+        LDA_IMM, STATUS_DONE,
+        STA_ABS, lo(DMA_STATUS), hi(DMA_STATUS),
+        LDA_IMM, 0xAA,
+        STA_ABS, lo(DONE), hi(DONE),
+        RTI,
+    ]
+    memory = {SRC: 0x5A, DST + length: 0x00, 0xFFFE: lo(IRQ_HANDLER), 0xFFFF: hi(IRQ_HANDLER)}
+    memory.update({IRQ_HANDLER + i: byte for i, byte in enumerate(handler)})
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    await run(dut, program, memory)
+    _, dma_cycles = await count_until_done(dut, dut.mcu.dma_bus, limit=100000)
+    await ClockCycles(dut.phi2, 4)
+
+    assert dma_cycles == length + 1
+    for i in range(length):
+        assert int(dut.bram.memory[DST + i].value) == 0x5A
+    assert int(dut.bram.memory[DST + length].value) == 0x00, "wrote past LEN"
+    assert int(dut.mcu.dma_irq.value) == 0, "IRQ not cleared"
+
+
+@cocotb.test()
+async def test_dma_uart_paced(dut):
+    """Bytes paced by UART TX ready all arrive while the CPU keeps running."""
+    message = b"Hello, DMA!\n"
+    program = [
+        LDA_IMM, 0x00,
+        STA_ABS, lo(UART_BAUD_LO), hi(UART_BAUD_LO),
+        LDA_IMM, 0x01,
+        STA_ABS, lo(UART_CTRL), hi(UART_CTRL),
+    ]
+    program += setup(SRC, UART_DATA, len(message), CTRL_START | SRC_INC | PACE_UART_TX)
+    program += wait_idle()
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    await run(dut, finish(program), {SRC + i: byte for i, byte in enumerate(message)})
+    receiver = cocotb.start_soon(uart_receive(dut, len(message)))
+    await count_until_done(dut, dut.mcu.dma_bus, limit=100000)
+    received = await receiver
+
+    assert bytes(received) == message
+    assert int(dut.bram.memory[COUNTER].value) > 0, "CPU did not run during the transfer"
+
+
+@cocotb.test()
+async def test_dma_sk6812_paced(dut):
+    """Colors through RED..WHITE with AUTO strobe each reach the LED driver."""
+    colors = [(0x11, 0x22, 0x33, 0x44), (0x55, 0x66, 0x77, 0x88), (0x99, 0xAA, 0xBB, 0xCC)]
+    data = [byte for color in colors for byte in color]
+    program = [LDA_IMM, 0x02, STA_ABS, lo(LED_CONTROL), hi(LED_CONTROL)]
+    program += setup(SRC, LED_RED, len(data), CTRL_START | SRC_INC | DST_WRAP4 | PACE_LED)
+    program += wait_idle()
+
+    driver = dut.mcu.sk6812_gen_on.sk6812.sk6812rgbw
+    sent = []
+
+    async def monitor():
+        while True:
+            await RisingEdge(driver.o_busy)
+            await RisingEdge(dut.i_clk)
+            sent.append(int(driver.color.value))
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    await run(dut, finish(program), {SRC + i: byte for i, byte in enumerate(data)})
+    cocotb.start_soon(monitor())
+    await count_until_done(dut, dut.mcu.dma_bus, limit=200000)
+    await ClockCycles(dut.i_clk, 10)
+
+    # led_color is GREEN, RED, BLUE, WHITE from bit 31 down
+    assert sent == [g << 24 | r << 16 | b << 8 | w for r, g, b, w in colors]
@@ -20,6 +20,9 @@ GPIO_MODE_PIN7 = 0xB
 MODE_GPIO     = 0x00
 MODE_UART0_TX = 0x01
 MODE_UART0_RX = 0x02
+MODE_TIMER0_CH0 = 0x04
+MODE_TIMER0_CH1 = 0x05
+MODE_TIMER0_CAPTURE = 0x06
 
 
 async def write_register(dut, addr, value):
@@ -63,6 +66,7 @@ async def init_gpio(dut):
     dut.i_en.value = 0
     dut.i_pins.value = 0
     dut.i_uart0_tx.value = 1  # UART idle high
+    dut.i_timer_compare.value = 0
     await ClockCycles(dut.i_clk, 5)
     dut.i_reset_n.value = 1
     await ClockCycles(dut.i_clk, 2)
@@ -211,6 +215,40 @@ async def test_multiple_rx_pins(dut):
     assert dut.o_uart0_rx.value == 1, "UART RX should be high (pin 1 is high)"
 
 
+@cocotb.test()
+async def test_timer_modes(dut):
+    """Test that the timer channel modes drive pins and the capture mode routes a pin."""
+    await init_gpio(dut)
+
+    # Pin 0 on channel 0, pin 4 on channel 1, pins 2 and 7 capture
+    await write_register(dut, GPIO_MODE_PIN0, MODE_TIMER0_CH0)
+    await write_register(dut, GPIO_MODE_PIN4, MODE_TIMER0_CH1)
+    await write_register(dut, GPIO_MODE_PIN2, MODE_TIMER0_CAPTURE)
+    await write_register(dut, GPIO_MODE_PIN7, MODE_TIMER0_CAPTURE)
+
+    await ClockCycles(dut.i_clk, 2)
+
+    oe = dut.o_pins_oe.value.integer
+    assert oe & 0x11 == 0x11, "Channel pins should be outputs"
+    assert not (oe & 0x84), "Capture pins should be inputs"
+
+    for compare in range(4):
+        dut.i_timer_compare.value = compare
+        await ClockCycles(dut.i_clk, 2)
+        pins = dut.o_pins.value.integer
+        assert (pins & 0x01) == (compare & 1), "Pin 0 should follow channel 0"
+        assert bool(pins & 0x10) == bool(compare & 2), "Pin 4 should follow channel 1"
+
+    # Only pin 2 (lowest) should drive the capture input
+    dut.i_pins.value = 0x04
+    await ClockCycles(dut.i_clk, 2)
+    assert dut.o_timer_capture.value == 1, "Capture should be high (from pin 2)"
+
+    dut.i_pins.value = 0x80
+    await ClockCycles(dut.i_clk, 2)
+    assert dut.o_timer_capture.value == 0, "Capture should be low (pin 2 is low, pin 7 ignored)"
+
+
 @cocotb.test()
 async def test_multiple_tx_pins(dut):
     """Test that multiple pins can be TX and all drive the same signal."""
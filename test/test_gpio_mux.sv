@@ -18,11 +18,15 @@ wire [7:0] o_pins_oe;
 reg i_uart0_tx;
 wire o_uart0_rx;
 reg i_sk6812_data;
+reg [1:0] i_timer_compare;
+wire o_timer_capture;
 
 wire [7:0] o_data;
 
 // Instantiate GPIO module
-gpio gpio_inst (
+gpio #(
+    .ENABLE_TIMER_MODES(1)
+) gpio_inst (
     .i_phi2(i_phi2),
     .i_reset_n(i_reset_n),
     .i_addr(i_addr),
@@ -35,7 +39,9 @@ gpio gpio_inst (
     .o_pins_oe(o_pins_oe),
     .i_uart0_tx(i_uart0_tx),
     .o_uart0_rx(o_uart0_rx),
-    .i_sk6812_data(i_sk6812_data)
+    .i_sk6812_data(i_sk6812_data),
+    .i_timer_compare(i_timer_compare),
+    .o_timer_capture(o_timer_capture)
 );
 
 endmodule
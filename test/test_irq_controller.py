@@ -0,0 +1,119 @@
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles, RisingEdge
+import cocotb
+
+from utils import (
+    LDA_ABS, STA_ABS, INC_ABS, SEI, CLI, BRK, RTI, JMP_ABS,
+    START_PC, RESULT, COUNTER, DONE, lo, hi, store, finish, run, wait_done,
+)
+
+UART_CTRL = 0xA040
+UART_TX_IRQ_EN = 0x04
+
+# Interrupt controller registers at $A080
+INTC_ENABLE = 0xA080
+INTC_PENDING = 0xA081
+INTC_SOURCE = 0xA082
+INTC_CTRL = 0xA083
+INTC_PRIO_HI = 0xA085
+INTC_VECTOR_PAGE = 0xA086
+
+CTRL_VECTOR = 0x01
+SOURCE_NONE = 0x80
+
+SOURCE_UART_TX = 1
+SOURCE_EXT = 5
+
+IRQ_HANDLER = 0x0500    # $FFFE/$FFFF
+VECTOR_PAGE = 0x06
+
+# The IRQ sequence takes 7 cycles after the current instruction, which in
+# the main loop is at most 6 (INC abs)
+MAX_DISPATCH = 7 + 6
+
+
+def handler_addr(source):
+    """Vectored handler of source: {VECTOR_PAGE, source << 4}."""
+    return VECTOR_PAGE << 8 | source << 4
+
+
+async def dispatch_latency(dut, handler):
+    """Assert the external IRQ and return the cycles until the CPU reads the handler's first opcode."""
+    dut.i_irq_n_ext.value = 0
+    cycles = 0
+    while int(dut.bus_addr.value) != handler:
+        await RisingEdge(dut.phi2)
+        cycles += 1
+        assert cycles < 100, "handler not entered"
+    dut.i_irq_n_ext.value = 1
+    return cycles
+
+
+@cocotb.test()
+async def test_source_priority(dut):
+    """SOURCE is the highest-priority enabled pending source, the lowest number among equals."""
+    # External IRQ (source 5) and UART TX FIFO not full (source 1) pending, interrupts masked
+    program = [SEI] + store(UART_TX_IRQ_EN, UART_CTRL)
+    for i, reg in enumerate((INTC_PENDING, INTC_SOURCE)):
+        program += [LDA_ABS, lo(reg), hi(reg), STA_ABS, lo(RESULT + i), hi(RESULT + i)]
+    program += store(0x3 << 2, INTC_PRIO_HI)          # source 5 priority 3
+    program += [LDA_ABS, lo(INTC_SOURCE), hi(INTC_SOURCE), STA_ABS, lo(RESULT + 2), hi(RESULT + 2)]
+    program += store(0xFF & ~(1 << SOURCE_EXT), INTC_ENABLE)
+    program += [LDA_ABS, lo(INTC_SOURCE), hi(INTC_SOURCE), STA_ABS, lo(RESULT + 3), hi(RESULT + 3)]
+    program += store(0x00, INTC_ENABLE)
+    program += [LDA_ABS, lo(INTC_SOURCE), hi(INTC_SOURCE), STA_ABS, lo(RESULT + 4), hi(RESULT + 4)]
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    await run(dut, finish(program))
+    dut.i_irq_n_ext.value = 0
+    await wait_done(dut)
+
+    results = [int(dut.bram.memory[RESULT + i].value) for i in range(5)]
+    assert results == [
+        1 << SOURCE_EXT | 1 << SOURCE_UART_TX,  # PENDING
+        SOURCE_UART_TX,                         # equal priorities
+        SOURCE_EXT,                             # source 5 raised
+        SOURCE_UART_TX,                         # source 5 disabled
+        SOURCE_NONE,                            # all disabled
+    ]
+    assert int(dut.mcu.cpu_irq_n.value) == 1, "disabled sources must not interrupt the CPU"
+
+
+@cocotb.test()
+async def test_vectored_dispatch(dut):
+    """With VECTOR set, each IRQ enters its source's handler within a fixed number of cycles."""
+    program = store(VECTOR_PAGE, INTC_VECTOR_PAGE) + store(CTRL_VECTOR, INTC_CTRL) + [CLI]
+    loop = START_PC + len(program)
+    program += [INC_ABS, lo(COUNTER), hi(COUNTER), JMP_ABS, lo(loop), hi(loop)]
+    handler = handler_addr(SOURCE_EXT)
+    memory = {handler: RTI, IRQ_HANDLER: JMP_ABS, IRQ_HANDLER + 1: lo(IRQ_HANDLER),
+              IRQ_HANDLER + 2: hi(IRQ_HANDLER), 0xFFFE: lo(IRQ_HANDLER), 0xFFFF: hi(IRQ_HANDLER)}
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    await run(dut, program, memory)
+    await ClockCycles(dut.phi2, 100)
+
+    latencies = []
+    for delay in range(1, 10):
+        await ClockCycles(dut.phi2, 20 + delay)
+        latencies.append(await dispatch_latency(dut, handler))
+
+    dut._log.info(f"IRQ to handler: {min(latencies)}-{max(latencies)} cycles")
+    assert max(latencies) <= MAX_DISPATCH
+    assert int(dut.bram.memory[COUNTER].value) > 0, "main loop did not resume"
+
+
+@cocotb.test()
+async def test_brk_memory_vector(dut):
+    """BRK reads $FFFE/$FFFF from memory while a vectored source is pending."""
+    program = [SEI] + store(VECTOR_PAGE, INTC_VECTOR_PAGE) + store(CTRL_VECTOR, INTC_CTRL) + [BRK, 0x00]
+    memory = {0xFFFE: lo(IRQ_HANDLER), 0xFFFF: hi(IRQ_HANDLER)}
+    memory.update({IRQ_HANDLER + i: byte for i, byte in enumerate(store(0x55, DONE))})
+    memory.update({handler_addr(SOURCE_EXT) + i: byte for i, byte in enumerate(store(0xEE, DONE))})
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    await run(dut, program, memory)
+    dut.i_irq_n_ext.value = 0
+    await wait_done(dut)
+
+    assert int(dut.bram.memory[DONE].value) == 0x55
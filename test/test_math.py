@@ -0,0 +1,106 @@
+from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge
+import cocotb
+
+from utils import (
+    LDA_ABS, LSR_A, BCS,
+    lo, hi, store, copy, finish, run, wait_done,
+)
+
+# Math unit registers at $A0C0
+MATH_A_LO = 0xA0C0
+MATH_B_LO = 0xA0C2
+MATH_CTRL = 0xA0C4
+MATH_STATUS = 0xA0C5
+MATH_PROD_0 = 0xA0C8
+MATH_QUOT_LO = 0xA0CC
+
+CTRL_DIV = 0x01
+STATUS_BUSY = 0x01
+STATUS_DIV_ZERO = 0x02
+
+RESULTS = 0x0600
+
+
+def operands(a, b):
+    program = store(lo(a), MATH_A_LO) + store(hi(a), MATH_A_LO + 1)
+    return program + store(lo(b), MATH_B_LO) + store(hi(b), MATH_B_LO + 1)
+
+
+def multiply(pairs):
+    """Multiply each pair, copying PROD_0..3 to RESULTS right after the last operand write."""
+    program = []
+    for i, (a, b) in enumerate(pairs):
+        program += operands(a, b)
+        for byte in range(4):
+            program += copy(MATH_PROD_0 + byte, RESULTS + 4 * i + byte)
+    return program
+
+
+def divide(pairs):
+    """Divide each pair, polling BUSY, then copy QUOT, REM and STATUS to RESULTS."""
+    program = []
+    for i, (a, b) in enumerate(pairs):
+        program += operands(a, b) + store(CTRL_DIV, MATH_CTRL)
+        program += [LDA_ABS, lo(MATH_STATUS), hi(MATH_STATUS), LSR_A, BCS, 0xFA]
+        for byte in range(4):
+            program += copy(MATH_QUOT_LO + byte, RESULTS + 5 * i + byte)
+        program += copy(MATH_STATUS, RESULTS + 5 * i + 4)
+    return program
+
+
+async def compute(dut, program, results):
+    """Run the program until it stores DONE and return the RESULTS bytes."""
+    await run(dut, finish(program))
+    await wait_done(dut)
+    return bytes(int(dut.bram.memory[RESULTS + i].value) for i in range(results))
+
+
+@cocotb.test()
+async def test_multiply(dut):
+    """PROD holds the 32-bit product of A and B as soon as the next instruction can read it."""
+    pairs = [(0, 0), (3, 5), (0xFF, 0xFF), (0x1234, 0x5678), (0xFFFF, 0xFFFF), (0x8000, 2), (1, 0xBEEF)]
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    data = await compute(dut, multiply(pairs), 4 * len(pairs))
+
+    for i, (a, b) in enumerate(pairs):
+        assert int.from_bytes(data[4 * i:4 * i + 4], "little") == a * b, f"{a:#x} * {b:#x}"
+
+
+@cocotb.test()
+async def test_divide(dut):
+    """DIV gives quotient and remainder; divide by zero sets DIV_ZERO, quotient $FFFF and remainder A."""
+    pairs = [(100, 7), (0xFFFF, 1), (0xFFFF, 0xFFFF), (5, 9), (0x1234, 0x12), (0xABCD, 0x100),
+             (0x8000, 0x7FFF), (42, 0)]
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    data = await compute(dut, divide(pairs), 5 * len(pairs))
+
+    for i, (a, b) in enumerate(pairs):
+        quotient = int.from_bytes(data[5 * i:5 * i + 2], "little")
+        remainder = int.from_bytes(data[5 * i + 2:5 * i + 4], "little")
+        status = data[5 * i + 4]
+        if b:
+            assert (quotient, remainder, status) == (a // b, a % b, 0), f"{a:#x} / {b:#x}"
+        else:
+            assert (quotient, remainder, status) == (0xFFFF, a, STATUS_DIV_ZERO)
+
+
+@cocotb.test()
+async def test_busy_cycles(dut):
+    """BUSY is set for the 16 CPU cycles after the CTRL write, one per quotient bit."""
+    Clock(dut.i_clk, 20, unit="ns").start()
+    done = cocotb.start_soon(compute(dut, divide([(1000, 3)]), 5))
+
+    math = dut.mcu.math_gen_on.math
+    await RisingEdge(math.busy)
+    cycles = 0
+    await RisingEdge(dut.phi2)
+    while int(math.busy.value):
+        cycles += 1
+        await RisingEdge(dut.phi2)
+    assert cycles == 16
+
+    data = await done
+    assert data == bytes([333 & 0xFF, 333 >> 8, 1, 0, 0])
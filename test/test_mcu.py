@@ -23,6 +23,11 @@ LED_BLUE    = 0xA014
 LED_WHITE   = 0xA015
 LED_STATUS  = 0xA016  # Bit 0 = busy
 
+# Last slot of the I/O page, unassigned and routed to external memory
+IO_UNUSED = 0xA0F0
+# DMA slot, not built in test_mcu, so also routed to external memory
+IO_UNBUILT = 0xA070
+
 # SK6812 reset takes 800 cycles
 SK6812_RESET_CYCLES = 800
 
@@ -281,3 +286,65 @@ async def test_led_status_busy(dut):
     assert busy_during_reset == 0x01, f"Status during reset: expected 0x01 (busy), got {hex(busy_during_reset)}"
     assert idle_after_reset == 0x00, f"Status after reset: expected 0x00 (idle), got {hex(idle_after_reset)}"
     assert busy_after_strobe == 0x01, f"Status after strobe: expected 0x01 (busy), got {hex(busy_after_strobe)}"
+
+
+@cocotb.test()
+async def test_io_slot_mirror(dut):
+    """Peripheral registers repeat within their 16-byte slot."""
+    # Program:
+    #   LDA #$5A       ; 2 cycles
+    #   STA $A01A      ; 4 cycles - LED_RED (0xA012) seen through its slot mirror
+    program = [
+        LDA_IMM, 0x5A,
+        STA_ABS, lo(LED_RED + 8), hi(LED_RED + 8),
+        JMP_ABS, 0x05, 0x04,
+    ]
+
+    await init_and_reset(dut)
+    await load_program(dut, program)
+    await release_reset(dut)
+
+    await ClockCycles(dut.phi2, CPU_INIT_CYCLES + 12)
+
+    led_color = int(dut.mcu.sk6812_gen_on.sk6812.led_color.value)
+    red = (led_color >> 16) & 0xFF
+    assert red == 0x5A, f"LED RED: expected 0x5A, got {hex(red)}"
+
+
+async def check_external_slot(dut, addr):
+    """A store and a load at addr reach external memory."""
+    # Program:
+    #   LDA #$C3       ; 2 cycles
+    #   STA addr       ; 4 cycles - goes to memory
+    #   LDA #$00       ; 2 cycles
+    #   LDA addr       ; 4 cycles - read back from memory
+    #   STA $0300      ; 4 cycles
+    program = [
+        LDA_IMM, 0xC3,
+        STA_ABS, lo(addr), hi(addr),
+        LDA_IMM, 0x00,
+        LDA_ABS, lo(addr), hi(addr),
+        STA_ABS, 0x00, 0x03,
+        JMP_ABS, 0x0F, 0x04,
+    ]
+
+    await init_and_reset(dut)
+    await load_program(dut, program)
+    await release_reset(dut)
+
+    await ClockCycles(dut.phi2, CPU_INIT_CYCLES + 24)
+
+    assert int(dut.bram.memory[addr].value) == 0xC3, f"write to ${addr:04X} did not reach memory"
+    assert int(dut.bram.memory[0x0300].value) == 0xC3, f"read from ${addr:04X} did not come from memory"
+
+
+@cocotb.test()
+async def test_io_unused_slot_external(dut):
+    """Unassigned I/O slots read and write external memory."""
+    await check_external_slot(dut, IO_UNUSED)
+
+
+@cocotb.test()
+async def test_io_unbuilt_slot_external(dut):
+    """Slots of peripherals that are not built read and write external memory."""
+    await check_external_slot(dut, IO_UNBUILT)
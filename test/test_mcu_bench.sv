@@ -0,0 +1,66 @@
+`timescale 1ps/1ps
+
+// MCU with BRAM running a firmware image for the IPC benchmark
+// (tb_mcu_bench.cpp, tools/ipc_bench.py). The image is copied to
+// program.hex in the build directory before each run.
+module test_mcu_bench #(
+    parameter START_PC = 16'h0400,
+    parameter START_PC_ENABLED = 0,
+    parameter BRAM_SIZE = 64*1024,
+    parameter TURBO = 0,
+    parameter CPU_CLOCK_ENABLE = 0
+) (
+    input i_clk,
+    input i_reset_n,
+    output o_sync
+);
+
+wire [15:0] bus_addr;
+wire [7:0] bus_write_data;
+wire [7:0] bus_read_data;
+wire bus_rw;
+wire phi1, phi2;
+wire [7:0] gpioa_output;
+wire [7:0] gpioa_oe;
+wire [7:0] debug_data;
+
+mcu #(
+    .START_PC(START_PC),
+    .START_PC_ENABLED(START_PC_ENABLED),
+    .TURBO(TURBO),
+    .CPU_CLOCK_ENABLE(CPU_CLOCK_ENABLE)
+) mcu (
+    .i_clk(i_clk),
+    .i_reset_n(i_reset_n),
+    .i_bus_data(bus_read_data),
+    .o_bus_data(bus_write_data),
+    .o_bus_addr(bus_addr),
+    .o_bus_rw(bus_rw),
+    .o_phi1(phi1),
+    .o_phi2(phi2),
+    .i_gpioa_input(8'h00),
+    .o_gpioa_output(gpioa_output),
+    .o_gpioa_oe(gpioa_oe),
+    .o_sync(o_sync),
+    .i_rdy(1'b1),
+    .i_nmi_n(1'b1),
+    .i_irq_n_ext(1'b1),
+    .i_so_n(1'b1),
+    .i_debug_sel(3'b000),
+    .o_debug_data(debug_data)
+);
+
+bram #(
+    .INIT_FILE("program.hex"),
+    .SIZE(BRAM_SIZE)
+) bram (
+    .i_clk(i_clk),
+    .i_phi2(phi2),
+    .i_addr(bus_addr),
+    .i_data(bus_write_data),
+    .i_rw(bus_rw),
+    .i_en(1'b1),
+    .o_data(bus_read_data)
+);
+
+endmodule
@@ -1,12 +1,18 @@
 `timescale 1ps/1ps
 
-module test_mcu_klaus (
+module test_mcu_klaus #(
+    parameter IR_DECODER_ROM = 0,
+    parameter ENABLE_65C02 = 0,
+    parameter TURBO = 0,
+    parameter INIT_FILE = "../6502_functional_test.hex"
+) (
     input i_clk
 );
 
 reg i_reset_n;
 
 wire cpu_sync;
+wire cpu_irq_vector;
 wire cpu_phi1;
 wire cpu_phi2;
 wire cpu_rw;
@@ -17,7 +23,10 @@ wire [7:0] debug_data;
 
 cpu_6502 #(
     .START_PC(16'h0400),
-    .START_PC_ENABLED(1)
+    .START_PC_ENABLED(1),
+    .IR_DECODER_ROM(IR_DECODER_ROM),
+    .ENABLE_65C02(ENABLE_65C02),
+    .TURBO(TURBO)
 ) cpu_6502 (
     .i_clk(i_clk),
     .o_phi1(cpu_phi1),
@@ -28,6 +37,7 @@ cpu_6502 #(
     .i_irq_n(1'b1),
     .i_so_n(1'b1),
     .o_sync(cpu_sync),
+    .o_irq_vector(cpu_irq_vector),
     .i_bus_data(bus_read_data),
     .o_bus_data(bus_write_data),
     .o_bus_addr(bus_addr),
@@ -37,7 +47,7 @@ cpu_6502 #(
 );
 
 bram #(
-    .INIT_FILE("../6502_functional_test.hex")
+    .INIT_FILE(INIT_FILE)
 ) bram (
     .i_clk(i_clk),
     .i_phi2(cpu_phi2),
@@ -0,0 +1,126 @@
+import sys
+from pathlib import Path
+
+from cocotb.clock import Clock
+import cocotb
+
+from utils import (
+    LDA_ABS, LDX_IMM, DEX, BNE,
+    START_PC, lo, hi, store, finish, run, wait_done,
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+import profile_report  # noqa: E402
+
+# PC profiler registers at $A0B0
+PROF_CTRL = 0xA0B0
+PROF_STATUS = 0xA0B1
+PROF_SHIFT = 0xA0B2
+PROF_BASE_LO = 0xA0B3
+PROF_BASE_HI = 0xA0B4
+PROF_INDEX_LO = 0xA0B5
+PROF_INDEX_HI = 0xA0B6
+PROF_DATA = 0xA0B7
+
+CTRL_ENABLE = 0x01
+CTRL_CYCLES = 0x02
+
+BUCKETS = 64        # PROFILER_BUCKETS in test_runner.py
+
+# DMA registers at $A070
+DMA_CTRL = 0xA070
+DMA_SRC_LO = 0xA072
+DMA_DST_LO = 0xA074
+DMA_LEN_LO = 0xA076
+DMA_COPY_FROM_FIXED = 0x09  # START, SRC fixed, DST increment
+
+DUMP = 0x0600
+
+
+def profile(base, shift, ctrl, iterations=10):
+    """Wait for the power-on clear, profile a DEX/BNE loop, then DMA the counters to DUMP.
+
+    Returns the program and the addresses of its instructions by name.
+    """
+    program = [LDA_ABS, lo(PROF_STATUS), hi(PROF_STATUS), BNE, 0xFB]
+    program += store(lo(base), PROF_BASE_LO) + store(hi(base), PROF_BASE_HI) + store(shift, PROF_SHIFT)
+    program += store(ctrl, PROF_CTRL)
+    addresses = {"enable": START_PC + len(program) - 3, "ldx": START_PC + len(program)}
+    program += [LDX_IMM, iterations]
+    addresses.update({"dex": START_PC + len(program), "bne": START_PC + len(program) + 1})
+    program += [DEX, BNE, 0xFD]
+    addresses.update({"lda": START_PC + len(program), "disable": START_PC + len(program) + 2})
+    program += store(0x00, PROF_CTRL)
+
+    program += store(0x00, PROF_INDEX_LO) + store(0x00, PROF_INDEX_HI)
+    program += store(lo(PROF_DATA), DMA_SRC_LO) + store(hi(PROF_DATA), DMA_SRC_LO + 1)
+    program += store(lo(DUMP), DMA_DST_LO) + store(hi(DUMP), DMA_DST_LO + 1)
+    length = BUCKETS * profile_report.COUNTER_BYTES
+    program += store(lo(length), DMA_LEN_LO) + store(hi(length), DMA_LEN_LO + 1)
+    program += store(DMA_COPY_FROM_FIXED, DMA_CTRL)
+
+    return finish(program), addresses
+
+
+async def read_profile(dut, program):
+    """Run the program until it stores DONE and return the counters."""
+    await run(dut, program)
+    await wait_done(dut)
+
+    data = bytes(int(dut.bram.memory[DUMP + i].value) for i in range(BUCKETS * profile_report.COUNTER_BYTES))
+    return profile_report.parse_counters(data)
+
+
+def histogram(addresses, counts, base=START_PC, shift=0):
+    """Expected counters from {name: count}."""
+    expected = [0] * BUCKETS
+    for name, count in counts.items():
+        expected[(addresses[name] - base) >> shift] += count
+    return expected
+
+
+@cocotb.test()
+async def test_instruction_counts(dut):
+    """Each instruction fetched while enabled counts once in its bucket."""
+    program, addresses = profile(START_PC, 0, CTRL_ENABLE)
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    counters = await read_profile(dut, program)
+
+    assert counters == histogram(addresses, {"ldx": 1, "dex": 10, "bne": 10, "lda": 1, "disable": 1})
+
+
+@cocotb.test()
+async def test_cycle_counts(dut):
+    """With CYCLES, each cycle counts for the instruction it belongs to, from its o_sync cycle."""
+    program, addresses = profile(START_PC, 0, CTRL_ENABLE | CTRL_CYCLES)
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    counters = await read_profile(dut, program)
+
+    # The enabling store's last cycle is the fetch of LDX. BNE takes 3
+    # cycles when taken; the disabling store counts up to its write.
+    assert counters == histogram(addresses, {"enable": 1, "ldx": 2, "dex": 2 * 10, "bne": 3 * 9 + 2,
+                                             "lda": 2, "disable": 3})
+
+
+@cocotb.test()
+async def test_window_report(dut):
+    """BASE and SHIFT select the window and bucket size, and the report ranks the buckets by symbol."""
+    base, shift = START_PC + 0x1B, 2
+    program, addresses = profile(base, shift, CTRL_ENABLE)
+    assert addresses["dex"] == base
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    counters = await read_profile(dut, program)
+
+    # LDX is below the window
+    assert counters == histogram(addresses, {"dex": 10, "bne": 10, "lda": 1, "disable": 1}, base, shift)
+
+    symbols = [(START_PC, "main"), (addresses["dex"], "loop"), (addresses["lda"], "stop")]
+    lines = profile_report.report(counters, base, shift, symbols)
+    dut._log.info("\n".join(lines))
+    assert lines[0].startswith(f"22 counts in 2 of {BUCKETS} buckets")
+    # The LDA after the loop shares the loop's 4-byte bucket
+    assert lines[3].split() == ["21", "95.5%", "loop"]
+    assert lines[4].split() == ["1", "4.5%", "stop"]
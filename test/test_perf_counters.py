@@ -0,0 +1,69 @@
+from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge
+import cocotb
+
+from utils import (
+    LDA_ABS, NOP, SEI, CLI, JMP_ABS,
+    START_PC, RESULT, lo, hi, store, finish, run, wait_done,
+    PERF_CTRL, PERF_SNAPSHOT, PERF_CLEAR, PERF_CYCLES, PERF_INSTRUCTIONS, PERF_STALLS,
+    PERF_IRQS, PERF_IRQ_LATENCY, read_counter, read_result,
+)
+
+SLOW = 0x3000       # block 3, 3 waits in test_runner.py
+SLOW_WAITS = 3
+
+IRQ_HANDLER = 0x0500
+
+
+@cocotb.test()
+async def test_counts(dut):
+    """Cycles, instructions and stalls between CLEAR and SNAPSHOT match the code in between."""
+    nops, reads = 10, 4
+    program = store(PERF_CLEAR, PERF_CTRL)
+    program += [NOP] * nops + [LDA_ABS, lo(SLOW), hi(SLOW)] * reads
+    program += store(PERF_SNAPSHOT, PERF_CTRL)
+    for i, counter in enumerate((PERF_CYCLES, PERF_INSTRUCTIONS, PERF_STALLS)):
+        program += read_counter(counter, RESULT + 4 * i)
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    await run(dut, finish(program))
+    await wait_done(dut)
+
+    cycles, instructions, stalls = (read_result(dut, i) for i in range(3))
+    dut._log.info(f"cycles {cycles}, instructions {instructions}, stalls {stalls}")
+    # Counted from the cycle after CLEAR's write up to SNAPSHOT's write: the
+    # NOPs, the reads, and LDA #/STA up to its last cycle
+    assert instructions == nops + reads + 2
+    assert stalls == reads * SLOW_WAITS
+    assert cycles == 2 * nops + (4 + SLOW_WAITS) * reads + 2 + 3
+
+
+@cocotb.test()
+async def test_irq_latency(dut):
+    """IRQ latency counts from the IRQ input to the handler, including time masked by SEI."""
+    masked = 20
+    program = [SEI] + store(PERF_CLEAR, PERF_CTRL) + [NOP] * masked + [CLI]
+    program += [JMP_ABS, lo(START_PC + len(program)), hi(START_PC + len(program))]
+    handler = store(PERF_SNAPSHOT, PERF_CTRL)
+    handler += read_counter(PERF_IRQS, RESULT) + read_counter(PERF_IRQ_LATENCY, RESULT + 4)
+    handler = finish(handler, IRQ_HANDLER)
+    memory = {IRQ_HANDLER + i: byte for i, byte in enumerate(handler)}
+    memory.update({0xFFFE: lo(IRQ_HANDLER), 0xFFFF: hi(IRQ_HANDLER)})
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    await run(dut, program, memory)
+    for _ in range(20):
+        await RisingEdge(dut.phi2)
+
+    dut.i_irq_n_ext.value = 0
+    measured = 0
+    while int(dut.bus_addr.value) != IRQ_HANDLER:
+        await RisingEdge(dut.phi2)
+        measured += 1
+    await wait_done(dut)
+
+    irqs, latency = read_result(dut, 0), read_result(dut, 1)
+    dut._log.info(f"IRQ latency {latency} cycles, measured {measured}")
+    assert irqs == 1
+    assert latency == measured
+    assert latency > 2 * masked
@@ -0,0 +1,184 @@
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles
+import cocotb
+
+from utils import (
+    LDA_IMM, LDA_ABS, LDA_ABS_X, LDX_IMM, LDY_IMM, STA_ABS, STA_ABS_X, AND_IMM,
+    CPX_IMM, INX, DEX, DEY, BNE, BEQ, BPL, JMP_ABS,
+    RESULT, DONE, lo, hi, run, wait_done,
+)
+
+GPIO_IN = 0xA002
+
+LED_CONTROL = 0xA010
+LED_RED = 0xA012
+LED_GREEN = 0xA013
+LED_BLUE = 0xA014
+LED_WHITE = 0xA015
+LED_STATUS = 0xA016
+
+# Read cache registers at $A050
+CACHE_CTRL = 0xA050
+CACHE_CONFIG = 0xA051
+CACHE_HITS_0 = 0xA054
+
+CTRL_ENABLE = 0x01
+CTRL_FLUSH = 0x02
+CTRL_SNAPSHOT = 0x04
+
+# Wait-state controller, blocks 0x0000-0x1FFF
+WAIT_BLOCKS_01 = 0xA060
+
+WAIT_STATES = 3     # every block, test_runner.py
+INDEX_BITS = 6      # 128 lines, 2-way
+
+COLORS = 0x0480
+NUM_LEDS = 30
+FRAMES = 8
+
+
+def read_counters(dut):
+    """Return the HITS and MISSES snapshot at RESULT."""
+    def word(addr):
+        return sum(int(dut.bram.memory[addr + i].value) << (8 * i) for i in range(4))
+    return word(RESULT), word(RESULT + 4)
+
+
+def frame_program(ctrl):
+    """pacman_timer.s send_loop: FRAMES frames of NUM_LEDS colors to the SK6812.
+
+    Ends by snapshotting the cache counters to RESULT and storing $AA to DONE.
+    """
+    return [
+        LDA_IMM, ctrl,                                  # $0400
+        STA_ABS, lo(CACHE_CTRL), hi(CACHE_CTRL),        # $0402
+        LDY_IMM, FRAMES,                                # $0405
+        LDX_IMM, 0x00,                                  # $0407 frame:
+        LDA_ABS_X, lo(COLORS), hi(COLORS),              # $0409 send:
+        STA_ABS, lo(LED_RED), hi(LED_RED),              # $040C
+        LDA_IMM, 0x00,                                  # $040F
+        STA_ABS, lo(LED_GREEN), hi(LED_GREEN),          # $0411
+        STA_ABS, lo(LED_BLUE), hi(LED_BLUE),            # $0414
+        STA_ABS, lo(LED_WHITE), hi(LED_WHITE),          # $0417
+        LDA_ABS, lo(LED_STATUS), hi(LED_STATUS),        # $041A wait:
+        AND_IMM, 0x01,                                  # $041D
+        BNE, 0xF9,                                      # $041F -> wait
+        LDA_IMM, 0x01,                                  # $0421
+        STA_ABS, lo(LED_CONTROL), hi(LED_CONTROL),      # $0423
+        INX,                                            # $0426
+        CPX_IMM, NUM_LEDS,                              # $0427
+        BNE, 0xDE,                                      # $0429 -> send
+        DEY,                                            # $042B
+        BNE, 0xD9,                                      # $042C -> frame
+        LDA_IMM, ctrl | CTRL_SNAPSHOT,                  # $042E
+        STA_ABS, lo(CACHE_CTRL), hi(CACHE_CTRL),        # $0430
+        LDX_IMM, 0x07,                                  # $0433
+        LDA_ABS_X, lo(CACHE_HITS_0), hi(CACHE_HITS_0),  # $0435 copy:
+        STA_ABS_X, lo(RESULT), hi(RESULT),              # $0438
+        DEX,                                            # $043B
+        BPL, 0xF7,                                      # $043C -> copy
+        LDA_IMM, 0xAA,                                  # $043E
+        STA_ABS, lo(DONE), hi(DONE),                    # $0440
+        JMP_ABS, 0x43, 0x04,                            # $0443
+    ]
+
+
+@cocotb.test()
+async def test_cache_frame_benchmark(dut):
+    """The LED frame loop runs several times faster from the cache than from slow memory."""
+    Clock(dut.i_clk, 20, unit="ns").start()
+    colors = {COLORS + i: (0x40 << (i % 3)) & 0xFF for i in range(NUM_LEDS)}
+
+    await run(dut, frame_program(0x00), colors)
+    uncached = await wait_done(dut, limit=200000)
+    assert read_counters(dut) == (0, 0), "counters must not count while the cache is disabled"
+
+    await run(dut, frame_program(CTRL_ENABLE), colors)
+    cached = await wait_done(dut, limit=200000)
+    hits, misses = read_counters(dut)
+
+    hit_rate = hits / (hits + misses)
+    speedup = uncached / cached
+    dut._log.info(f"{WAIT_STATES} wait states: {uncached} cycles uncached, {cached} cycles cached, "
+                  f"hit rate {100 * hit_rate:.1f}% ({hits} hits, {misses} misses), "
+                  f"effective clock x{speedup:.2f}")
+    assert hit_rate > 0.95
+    assert speedup > 2.5
+
+
+@cocotb.test()
+async def test_cache_write_through(dut):
+    """Stores reach memory and update the cached line."""
+    # Program:
+    #   LDA #$01 / STA CACHE_CTRL   ; enable
+    #   LDA $0320                   ; miss, fills the line
+    #   LDA #$5A / STA $0320        ; write-through
+    #   LDA #$00
+    #   LDA $0320                   ; hit, must be the stored value
+    #   STA $0321
+    #   LDA CACHE_CONFIG / STA $0322
+    #   LDA WAIT_BLOCKS_01 / STA $0323
+    #   LDA #$AA / STA DONE
+    program = [
+        LDA_IMM, CTRL_ENABLE,
+        STA_ABS, lo(CACHE_CTRL), hi(CACHE_CTRL),
+        LDA_ABS, 0x20, 0x03,
+        LDA_IMM, 0x5A,
+        STA_ABS, 0x20, 0x03,
+        LDA_IMM, 0x00,
+        LDA_ABS, 0x20, 0x03,
+        STA_ABS, 0x21, 0x03,
+        LDA_ABS, lo(CACHE_CONFIG), hi(CACHE_CONFIG),
+        STA_ABS, 0x22, 0x03,
+        LDA_ABS, lo(WAIT_BLOCKS_01), hi(WAIT_BLOCKS_01),
+        STA_ABS, 0x23, 0x03,
+        LDA_IMM, 0xAA,
+        STA_ABS, lo(DONE), hi(DONE),
+        JMP_ABS, 0x26, 0x04,
+    ]
+    Clock(dut.i_clk, 20, unit="ns").start()
+    await run(dut, program, {0x0320: 0x11, 0x0321: 0x00})
+    await wait_done(dut)
+
+    assert int(dut.bram.memory[0x0320].value) == 0x5A, "store did not reach memory"
+    assert int(dut.bram.memory[0x0321].value) == 0x5A, "cached line was not updated by the store"
+    assert int(dut.bram.memory[0x0322].value) == 0x10 | INDEX_BITS
+    assert int(dut.bram.memory[0x0323].value) == WAIT_STATES << 4 | WAIT_STATES
+
+
+@cocotb.test()
+async def test_cache_flush(dut):
+    """A cached line goes stale when memory changes behind the cache, until a flush."""
+    # Program:
+    #   LDA #$01 / STA CACHE_CTRL   ; enable
+    #   LDA $0330                   ; cache $11
+    #   wait: LDA GPIO_IN / BEQ wait ; testbench changes $0330 to $22
+    #   LDA $0330 / STA $0331       ; stale $11
+    #   LDA #$03 / STA CACHE_CTRL   ; flush
+    #   LDA $0330 / STA $0332       ; $22
+    #   LDA #$AA / STA DONE
+    program = [
+        LDA_IMM, CTRL_ENABLE,
+        STA_ABS, lo(CACHE_CTRL), hi(CACHE_CTRL),
+        LDA_ABS, 0x30, 0x03,
+        LDA_ABS, lo(GPIO_IN), hi(GPIO_IN),
+        BEQ, 0xFB,
+        LDA_ABS, 0x30, 0x03,
+        STA_ABS, 0x31, 0x03,
+        LDA_IMM, CTRL_ENABLE | CTRL_FLUSH,
+        STA_ABS, lo(CACHE_CTRL), hi(CACHE_CTRL),
+        LDA_ABS, 0x30, 0x03,
+        STA_ABS, 0x32, 0x03,
+        LDA_IMM, 0xAA,
+        STA_ABS, lo(DONE), hi(DONE),
+        JMP_ABS, 0x25, 0x04,
+    ]
+    Clock(dut.i_clk, 20, unit="ns").start()
+    await run(dut, program, {0x0330: 0x11})
+    await ClockCycles(dut.phi2, 100)
+    dut.bram.memory[0x0330].value = 0x22
+    dut.i_gpioa_input.value = 0x01
+    await wait_done(dut)
+
+    assert int(dut.bram.memory[0x0331].value) == 0x11, "read after the memory change should hit the old line"
+    assert int(dut.bram.memory[0x0332].value) == 0x22, "read after the flush should see memory"
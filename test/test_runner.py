@@ -3,20 +3,39 @@ from pathlib import Path
 import pytest
 from cocotb_tools.runner import get_runner
 
-TESTS = ['test_mcu', 'test_mcu_no_led', 'test_cpu_6502', 'test_cpu_6502_reset', 'test_bram', 'test_clock_control', 'test_timer', 'test_gpio_mux', 'test_uart']
+TESTS = ['test_mcu', 'test_mcu_no_led', 'test_cpu_6502', 'test_cpu_65c02', 'test_cpu_turbo', 'test_cpu_6502_reset', 'test_cpu_6502_ir_decoder', 'test_bram', 'test_clock_control', 'test_clock_enable', 'test_timer', 'test_timer_channels', 'test_gpio_mux', 'test_uart', 'test_bus_multiplexer', 'test_read_cache', 'test_wait_states', 'test_dma', 'test_sk6812_strip', 'test_irq_controller', 'test_perf_counters', 'test_trace_buffer', 'test_pc_profiler', 'test_math']
+
+# Tests that share a harness: test -> (hdl_toplevel, parameters)
+HARNESSES = {
+    'test_read_cache': ('mcu_harness', {'ENABLE_SK6812': 0, 'ENABLE_WAIT_STATES': 1, 'WAIT_STATES': "64'h3333333333333333", 'CACHE_LINES': 128, 'CACHE_WAYS': 2}),
+    'test_wait_states': ('mcu_harness', {'ENABLE_SK6812': 0, 'ENABLE_WAIT_STATES': 1, 'WAIT_STATES': "64'h3000", 'IO_WAIT_STATES': "4'h2"}),
+    'test_dma': ('mcu_harness', {'ENABLE_DMA': 1}),
+    'test_sk6812_strip': ('mcu_harness', {'ENABLE_SK6812_STRIP': 1, 'ENABLE_DMA': 1}),
+    'test_irq_controller': ('mcu_harness', {'ENABLE_IRQ_CONTROLLER': 1}),
+    'test_perf_counters': ('mcu_harness', {'ENABLE_WAIT_STATES': 1, 'WAIT_STATES': "64'h3000", 'ENABLE_PERF_COUNTERS': 1}),
+    'test_trace_buffer': ('mcu_harness', {'ENABLE_DMA': 1, 'ENABLE_TRACE': 1, 'TRACE_DEPTH': 16}),
+    'test_pc_profiler': ('mcu_harness', {'ENABLE_DMA': 1, 'ENABLE_PROFILER': 1, 'PROFILER_BUCKETS': 64}),
+    'test_math': ('mcu_harness', {'ENABLE_MATH': 1}),
+    'test_cpu_65c02': ('test_cpu_6502', {'ENABLE_65C02': 1}),
+    'test_cpu_turbo': ('test_cpu_6502', {'TURBO': 1}),
+    'test_clock_enable': ('mcu_harness', {'CPU_CLOCK_ENABLE': 1, 'ENABLE_WAIT_STATES': 1, 'WAIT_STATES': "64'h3000", 'ENABLE_PERF_COUNTERS': 1}),
+    'test_timer_channels': ('mcu_harness', {'ENABLE_TIMER_CHANNELS': 1}),
+}
 
 @pytest.mark.parametrize("test", TESTS)
 def test_runner(test):
     sim = os.getenv("SIM", "verilator")
     waves = os.getenv("WAVES", "0") == "1"
 
+    toplevel, parameters = HARNESSES.get(test, (test, {}))
+
     proj_path = Path(__file__).resolve().parent
     sources = []
-    sources.append(proj_path / f"{test}.sv")
+    sources.append(proj_path / f"{toplevel}.sv")
     sources.extend(proj_path.glob('../rtl/**/*.sv'))
 
     # Add bus_ram for cpu tests
-    if test in ["test_cpu_6502", "test_cpu_6502_reset", "test_mcu", "test_mcu_no_led"]:
+    if toplevel in ["test_cpu_6502", "test_cpu_6502_reset", "test_mcu", "test_mcu_no_led"]:
         sources.append(proj_path / "bus_ram.sv")
 
     runner = get_runner(sim)
@@ -28,14 +47,15 @@ def test_runner(test):
     build_dir = proj_path.parent / "sim_build" / test
     runner.build(
         sources=sources,
-        hdl_toplevel=test,
+        hdl_toplevel=toplevel,
         includes=[proj_path / "../rtl/"],
         build_dir=build_dir,
         always=True,
         waves=waves,
-        build_args=build_args
+        build_args=build_args,
+        parameters=parameters
     )
 
     testcase = os.getenv("TESTCASE", None)
     print(testcase)
-    runner.test(hdl_toplevel=test, test_module=test, testcase=testcase)
\ No newline at end of file
+    runner.test(hdl_toplevel=toplevel, test_module=test, testcase=testcase)
\ No newline at end of file
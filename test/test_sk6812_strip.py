@@ -0,0 +1,189 @@
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles, RisingEdge
+import cocotb
+
+from utils import (
+    LDA_ABS, STA_ABS, AND_IMM, INC_ABS, BEQ, BNE, CLI, RTI,
+    RESULT, lo, hi, store, finish, run, wait_done, count_until_done,
+)
+
+# SK6812 strip engine registers at $A018
+STRIP_CTRL = 0xA018
+STRIP_STATUS = 0xA019
+STRIP_COUNT = 0xA01A
+STRIP_BUF0_LO = 0xA01C
+
+CTRL_START = 0x01
+CTRL_LOOP = 0x02
+CTRL_IRQ_EN = 0x04
+CTRL_FLIP = 0x08
+
+STATUS_BUSY = 0x01
+STATUS_DONE = 0x02
+STATUS_FRONT = 0x04
+
+DMA_CTRL = 0xA070
+DMA_SRC_LO = 0xA072
+DMA_START_COPY = 0x0B   # START, SRC increment, DST increment
+
+# sk6812rgbw states
+STATE_RESET = 0
+STATE_DATA = 1
+
+IRQ_HANDLER = 0x0500
+FRAMES = 0x0301
+BUF0 = 0x0600
+BUF1 = 0x0680
+
+
+def rel(target, next_pc):
+    """Branch offset from the instruction ending at next_pc to target (program indexes)."""
+    return (target - next_pc) & 0xFF
+
+
+def strip_setup(count, buf0, buf1=0):
+    program = []
+    for offset, value in enumerate((lo(buf0), hi(buf0), lo(buf1), hi(buf1))):
+        program += store(value, STRIP_BUF0_LO + offset)
+    return program + store(count, STRIP_COUNT)
+
+
+def wait_status(start, mask, value):
+    """Loop at program index start until STRIP_STATUS & mask == value."""
+    return [LDA_ABS, lo(STRIP_STATUS), hi(STRIP_STATUS), AND_IMM, mask,
+            BEQ if value else BNE, rel(start, start + 7)]
+
+
+def pixels(colors):
+    """Frame buffer bytes: RED, GREEN, BLUE, WHITE per pixel."""
+    return [byte for color in colors for byte in color]
+
+
+def driver_color(color):
+    """The driver shifts GREEN, RED, BLUE, WHITE from bit 31 down."""
+    r, g, b, w = color
+    return g << 24 | r << 16 | b << 8 | w
+
+
+async def run_strip(dut, program, memory):
+    """Run the program with RESULT and FRAMES cleared."""
+    await run(dut, program, {**memory, RESULT: 0, FRAMES: 0})
+
+
+class DriverMonitor:
+    """Records what the LED driver sends: ("pixel", color) or ("reset",)."""
+
+    def __init__(self, dut):
+        self.driver = dut.mcu.sk6812_gen_on.sk6812.sk6812rgbw
+        self.dut = dut
+        self.sent = []
+        cocotb.start_soon(self.run())
+
+    async def run(self):
+        while True:
+            await RisingEdge(self.driver.o_busy)
+            await RisingEdge(self.dut.i_clk)
+            if int(self.driver.state.value) == STATE_DATA:
+                self.sent.append(("pixel", int(self.driver.color.value)))
+            else:
+                self.sent.append(("reset",))
+
+    def frames(self):
+        """Pixel colors of each frame that ended with a reset gap."""
+        frames, frame = [], []
+        for entry in self.sent:
+            if entry[0] == "pixel":
+                frame.append(entry[1])
+            elif frame:     # the driver also sends a reset gap after power-on
+                frames.append(frame)
+                frame = []
+        return frames
+
+
+@cocotb.test()
+async def test_strip_frame_irq(dut):
+    """One frame streams from memory, ends with the reset gap and raises the frame-done IRQ."""
+    colors = [(0x10, 0x20, 0x30, 0x40), (0x11, 0x21, 0x31, 0x41), (0x12, 0x22, 0x32, 0x42),
+              (0x13, 0x23, 0x33, 0x43), (0x14, 0x24, 0x34, 0x44)]
+    program = strip_setup(len(colors), BUF0) + [CLI] + store(CTRL_START | CTRL_IRQ_EN, STRIP_CTRL)
+    loop = len(program)
+    program += [LDA_ABS, lo(FRAMES), hi(FRAMES), BEQ, rel(loop, loop + 5)]
+    # IRQ handler: count the frame, clear FRAME_DONE
+    handler = [INC_ABS, lo(FRAMES), hi(FRAMES)] + store(STATUS_DONE, STRIP_STATUS) + [RTI]
+
+    memory = {BUF0 + i: byte for i, byte in enumerate(pixels(colors))}
+    memory.update({IRQ_HANDLER + i: byte for i, byte in enumerate(handler)})
+    memory.update({0xFFFE: lo(IRQ_HANDLER), 0xFFFF: hi(IRQ_HANDLER)})
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    monitor = DriverMonitor(dut)
+    await run_strip(dut, finish(program), memory)
+    _, led_cycles = await count_until_done(dut, dut.mcu.led_bus, limit=200000)
+    await ClockCycles(dut.phi2, 10)
+
+    assert monitor.frames() == [[driver_color(color) for color in colors]]
+    assert led_cycles == 4 * len(colors), "each pixel should cost the CPU four bus cycles"
+    assert int(dut.bram.memory[FRAMES].value) == 1
+    assert int(dut.mcu.led_irq.value) == 0
+
+
+@cocotb.test()
+async def test_strip_double_buffer(dut):
+    """LOOP repeats frames without the CPU, FLIP switches buffers at a frame boundary."""
+    front = [(0x01, 0x02, 0x03, 0x04), (0x05, 0x06, 0x07, 0x08)]
+    back = [(0xA1, 0xA2, 0xA3, 0xA4), (0xA5, 0xA6, 0xA7, 0xA8)]
+    running = CTRL_START | CTRL_LOOP
+
+    program = strip_setup(len(front), BUF0, BUF1) + store(running, STRIP_CTRL)
+    # frame 0 done -> FLIP while frame 1 is sent
+    program += wait_status(len(program), STATUS_DONE, STATUS_DONE)
+    program += store(STATUS_DONE, STRIP_STATUS) + store(running | CTRL_FLIP, STRIP_CTRL)
+    # frame 1 done, frame 2 comes from buffer 1
+    program += wait_status(len(program), STATUS_DONE, STATUS_DONE)
+    program += store(STATUS_DONE, STRIP_STATUS)
+    program += [LDA_ABS, lo(STRIP_STATUS), hi(STRIP_STATUS), STA_ABS, lo(RESULT), hi(RESULT)]
+    # frame 2 done, stop after frame 3
+    program += wait_status(len(program), STATUS_DONE, STATUS_DONE)
+    program += store(CTRL_LOOP, STRIP_CTRL)
+    program += wait_status(len(program), STATUS_BUSY, 0)
+
+    memory = {BUF0 + i: byte for i, byte in enumerate(pixels(front))}
+    memory.update({BUF1 + i: byte for i, byte in enumerate(pixels(back))})
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    monitor = DriverMonitor(dut)
+    await run_strip(dut, finish(program), memory)
+    await wait_done(dut, limit=200000)
+    await ClockCycles(dut.i_clk, 2000)
+
+    shown, drawn = [driver_color(color) for color in front], [driver_color(color) for color in back]
+    assert monitor.frames() == [shown, shown, drawn, drawn]
+    assert int(dut.bram.memory[RESULT].value) & STATUS_FRONT, "FRONT should be buffer 1 after the flip"
+    assert monitor.sent[-1] == ("reset",), "stopped mid-frame"
+
+
+@cocotb.test()
+async def test_strip_with_dma_burst(dut):
+    """The strip engine gets the bus between bytes of an unpaced DMA copy."""
+    colors = [(i, 0x40 + i, 0x80 + i, 0xC0 + i) for i in range(8)]
+    length = 0x200
+    src, dst = 0x1000, 0x2000
+
+    program = strip_setup(len(colors), BUF0) + store(CTRL_START, STRIP_CTRL)
+    for offset, value in enumerate((lo(src), hi(src), lo(dst), hi(dst), lo(length), hi(length))):
+        program += store(value, DMA_SRC_LO + offset)
+    program += store(DMA_START_COPY, DMA_CTRL)
+    program += wait_status(len(program), STATUS_BUSY, 0)
+
+    memory = {BUF0 + i: byte for i, byte in enumerate(pixels(colors))}
+    memory.update({src + i: (i * 13) & 0xFF for i in range(length)})
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    monitor = DriverMonitor(dut)
+    await run_strip(dut, finish(program), memory)
+    _, led_cycles = await count_until_done(dut, dut.mcu.led_bus, limit=200000)
+
+    assert monitor.frames() == [[driver_color(color) for color in colors]]
+    assert led_cycles == 4 * len(colors)
+    for i in range(length):
+        assert int(dut.bram.memory[dst + i].value) == (i * 13) & 0xFF
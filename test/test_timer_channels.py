@@ -0,0 +1,125 @@
+from cocotb.clock import Clock
+from cocotb.triggers import FallingEdge, ReadOnly, RisingEdge
+import cocotb
+
+from utils import (
+    LDA_ABS, AND_IMM, BEQ,
+    RESULT, lo, hi, store, copy, finish, run, wait_done,
+)
+
+GPIOA_MODE_PIN0 = 0xA004
+GPIOA_MODE_PIN3 = 0xA007
+
+# TIMER0 registers at $A020
+TIMER_CTRL = 0xA020
+TIMER_STATUS = 0xA021
+TIMER_RELOAD_LO = 0xA024
+TIMER_RELOAD_HI = 0xA025
+TIMER_CH0_CTRL = 0xA028
+TIMER_CH0_LO = 0xA029
+TIMER_CH0_HI = 0xA02A
+TIMER_CH1_CTRL = 0xA02C
+TIMER_CH1_LO = 0xA02D
+TIMER_CH1_HI = 0xA02E
+
+CTRL_ENABLE = 0x01
+CTRL_AUTO_RELOAD = 0x02
+CTRL_LOAD = 0x08
+
+STATUS_CH0 = 0x02
+STATUS_CH1 = 0x04
+
+CH_COMPARE = 0x01
+CH_RISING = 0x02
+CH_IRQ_ENABLE = 0x04
+
+MODE_TIMER0_CH0 = 0x04
+MODE_TIMER0_CAPTURE = 0x06
+
+
+def poll(addr, mask):
+    """Loop until a bit in mask is set at addr."""
+    return [LDA_ABS, lo(addr), hi(addr), AND_IMM, mask, BEQ, 0xF9]
+
+
+@cocotb.test()
+async def test_pwm(dut):
+    """Channel 0 in COMPARE mode drives pin 0 high for COMPARE - RELOAD of every period."""
+    reload, compare = 0xFF00, 0xFF40
+    program = store(MODE_TIMER0_CH0, GPIOA_MODE_PIN0)
+    program += store(lo(reload), TIMER_RELOAD_LO) + store(hi(reload), TIMER_RELOAD_HI)
+    program += store(lo(compare), TIMER_CH0_LO) + store(hi(compare), TIMER_CH0_HI)
+    program += store(CH_COMPARE, TIMER_CH0_CTRL)
+    program += store(CTRL_LOAD, TIMER_CTRL) + store(CTRL_ENABLE | CTRL_AUTO_RELOAD, TIMER_CTRL)
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    await run(dut, finish(program))
+    await wait_done(dut)
+
+    await FallingEdge(dut.i_clk)
+    assert int(dut.o_gpioa_oe.value) & 0x01, "Pin 0 should be an output"
+
+    # The prescaler is 0, so the count steps every i_clk cycle
+    period = 0x10000 - reload
+    high = 0
+    for _ in range(4 * period):
+        await RisingEdge(dut.i_clk)
+        await ReadOnly()
+        high += int(dut.o_gpioa_output.value) & 0x01
+    dut._log.info(f"PWM high {high} of {4 * period} cycles")
+    assert high == 4 * (compare - reload)
+
+
+@cocotb.test()
+async def test_compare_irq(dut):
+    """A compare match sets the channel flag and the IRQ, and writing 1 to the flag clears both."""
+    compare = 0x0100
+    program = store(lo(compare), TIMER_CH0_LO) + store(hi(compare), TIMER_CH0_HI)
+    program += store(CH_COMPARE | CH_IRQ_ENABLE, TIMER_CH0_CTRL)
+    program += store(CTRL_ENABLE, TIMER_CTRL)
+    program += poll(TIMER_STATUS, STATUS_CH0)
+    program += copy(TIMER_STATUS, RESULT)
+    program += store(STATUS_CH0, TIMER_STATUS)
+    program += copy(TIMER_STATUS, RESULT + 1)
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    await run(dut, finish(program))
+
+    timer = dut.mcu.timer0
+    await RisingEdge(dut.mcu.timer_irq)
+    assert int(timer.timer_count.value) == compare + 1, "IRQ should follow the tick that matched"
+    await wait_done(dut)
+
+    assert int(dut.bram.memory[RESULT].value) == STATUS_CH0
+    assert int(dut.bram.memory[RESULT + 1].value) == 0, "STATUS should clear on write 1"
+    assert dut.mcu.timer_irq.value == 0
+
+
+@cocotb.test()
+async def test_capture(dut):
+    """A rising edge on a capture pin latches the count into channel 1."""
+    program = store(MODE_TIMER0_CAPTURE, GPIOA_MODE_PIN3)
+    program += store(CH_RISING | CH_IRQ_ENABLE, TIMER_CH1_CTRL)
+    program += store(CTRL_ENABLE, TIMER_CTRL)
+    program += poll(TIMER_STATUS, STATUS_CH1)
+    program += copy(TIMER_CH1_LO, RESULT) + copy(TIMER_CH1_HI, RESULT + 1)
+    program += copy(TIMER_STATUS, RESULT + 2)
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    await run(dut, finish(program))
+
+    timer = dut.mcu.timer0
+    for _ in range(500):
+        await FallingEdge(dut.i_clk)
+    count = int(timer.timer_count.value)
+    dut.i_gpioa_input.value = 0x08
+    for _ in range(100):
+        await FallingEdge(dut.i_clk)
+    assert dut.mcu.timer_irq.value == 1
+    await wait_done(dut)
+
+    captured = int(dut.bram.memory[RESULT].value) | int(dut.bram.memory[RESULT + 1].value) << 8
+    dut._log.info(f"count {count:#06x} at the edge, captured {captured:#06x}")
+    # Two synchronizer stages and the edge detect
+    assert captured == count + 2
+    assert int(dut.bram.memory[RESULT + 2].value) == STATUS_CH1
@@ -0,0 +1,195 @@
+import sys
+from pathlib import Path
+
+from cocotb.clock import Clock
+from cocotb.triggers import RisingEdge
+import cocotb
+
+from utils import (
+    LDA_ABS, STA_ABS, LDX_IMM, DEX, BNE, JSR, RTS, RTI, NOP, SEI, CLI, CLC,
+    ASL_A, ADC_ABS,
+    START_PC, RESULT, lo, hi, store, finish, run, wait_done,
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+import trace_decode  # noqa: E402
+
+# Trace buffer registers at $A0A0
+TRACE_CTRL = 0xA0A0
+TRACE_STATUS = 0xA0A1
+TRACE_COUNT_LO = 0xA0A2
+TRACE_TRIG_LO = 0xA0A4
+TRACE_TRIG_HI = 0xA0A5
+TRACE_DATA = 0xA0A6
+
+CTRL_ENABLE = 0x01
+CTRL_TRIG_START = 0x02
+CTRL_TRIG_STOP = 0x04
+CTRL_REWIND = 0x10
+
+STATUS_RECORDING = 0x01
+STATUS_ARMED = 0x02
+STATUS_TRIGGERED = 0x04
+STATUS_WRAPPED = 0x08
+
+DEPTH = 16          # TRACE_DEPTH in test_runner.py
+
+# DMA registers at $A070
+DMA_CTRL = 0xA070
+DMA_SRC_LO = 0xA072
+DMA_DST_LO = 0xA074
+DMA_LEN_LO = 0xA076
+DMA_COPY_FROM_FIXED = 0x09  # START, SRC fixed, DST increment
+
+SUBROUTINE = 0x0500
+IRQ_HANDLER = 0x0580
+DUMP = 0x0600
+
+
+def call_loop(program, count):
+    """Append a loop calling SUBROUTINE count times; return the loop address."""
+    program += [LDX_IMM, count]
+    loop = START_PC + len(program)
+    program += [JSR, lo(SUBROUTINE), hi(SUBROUTINE), DEX, BNE]
+    program.append((loop - (START_PC + len(program) + 1)) & 0xFF)
+    return loop
+
+
+def readout(program):
+    """Save COUNT and STATUS, then DMA the entry stream to DUMP."""
+    program += store(CTRL_REWIND, TRACE_CTRL)
+    program += [LDA_ABS, lo(TRACE_COUNT_LO), hi(TRACE_COUNT_LO), STA_ABS, lo(RESULT), hi(RESULT)]
+    program += [LDA_ABS, lo(TRACE_STATUS), hi(TRACE_STATUS), STA_ABS, lo(RESULT + 1), hi(RESULT + 1)]
+    # LEN = 5 x COUNT
+    program += [LDA_ABS, lo(RESULT), hi(RESULT), ASL_A, ASL_A, CLC, ADC_ABS, lo(RESULT), hi(RESULT)]
+    program += [STA_ABS, lo(DMA_LEN_LO), hi(DMA_LEN_LO)]
+    program += store(lo(TRACE_DATA), DMA_SRC_LO) + store(hi(TRACE_DATA), DMA_SRC_LO + 1)
+    program += store(lo(DUMP), DMA_DST_LO) + store(hi(DUMP), DMA_DST_LO + 1)
+    program += store(DMA_COPY_FROM_FIXED, DMA_CTRL)
+
+
+async def run_traced(dut, program, memory):
+    """Reset, load the program and start the CPU; return the image for the decoder."""
+    memory = dict(memory)
+    memory.update({SUBROUTINE: NOP, SUBROUTINE + 1: RTS})
+    await run(dut, program, memory)
+    memory.update({START_PC + i: byte for i, byte in enumerate(program)})
+
+    image = bytearray(0x10000)
+    for addr, value in memory.items():
+        image[addr] = value
+    return image
+
+
+async def monitor_fetches(dut, fetches):
+    """Append the address of each opcode the CPU fetches."""
+    last_addr = None
+    while True:
+        await RisingEdge(dut.phi2)
+        rdy = int(dut.mcu.cpu_rdy.value)
+        if rdy and int(dut.o_sync.value):
+            fetches.append(last_addr)
+        if rdy:
+            last_addr = int(dut.mcu.cpu_addr.value)
+
+
+def dump(dut):
+    """Return (COUNT, STATUS, entries) saved by readout()."""
+    count = int(dut.bram.memory[RESULT].value)
+    status = int(dut.bram.memory[RESULT + 1].value)
+    data = bytes(int(dut.bram.memory[DUMP + i].value) for i in range(count * trace_decode.ENTRY_BYTES))
+    return count, status, trace_decode.parse_entries(data)
+
+
+@cocotb.test()
+async def test_rebuild_trace(dut):
+    """The decoder rebuilds every instruction fetched between ENABLE and the write that stops recording."""
+    program = store(CTRL_ENABLE, TRACE_CTRL)
+    first = START_PC + len(program)
+    call_loop(program, 3)
+    last = START_PC + len(program) + 2
+    program += store(0x00, TRACE_CTRL)
+    readout(program)
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    image = await run_traced(dut, finish(program), {})
+    fetches = []
+    cocotb.start_soon(monitor_fetches(dut, fetches))
+    await wait_done(dut)
+
+    count, status, entries = dump(dut)
+    # START, JSR and RTS per call, two taken branches, END
+    assert count == 1 + 3 * 2 + 2 + 1
+    assert status == 0
+    assert entries[0] == (trace_decode.FLAG_START, first, first)
+    assert entries[-1].flags == trace_decode.FLAG_END
+
+    steps = list(trace_decode.rebuild(entries, image))
+    begin = fetches.index(first)
+    expected = fetches[begin:fetches.index(last, begin) + 1]
+    assert [step.address for step in steps] == expected
+    assert not any(step.irq for step in steps)
+
+
+@cocotb.test()
+async def test_trigger_window(dut):
+    """TRIG_START and TRIG_STOP record one pass from TRIG back to TRIG."""
+    program = store(lo(SUBROUTINE), TRACE_TRIG_LO) + store(hi(SUBROUTINE), TRACE_TRIG_HI)
+    program += store(CTRL_ENABLE | CTRL_TRIG_START | CTRL_TRIG_STOP, TRACE_CTRL)
+    call_loop(program, 3)
+    readout(program)
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    image = await run_traced(dut, finish(program), {})
+    fetches = []
+    cocotb.start_soon(monitor_fetches(dut, fetches))
+    await wait_done(dut)
+
+    count, status, entries = dump(dut)
+    # START at the subroutine, RTS, BNE, END at the next JSR
+    assert count == 4
+    assert status == STATUS_TRIGGERED
+    assert entries[0] == (trace_decode.FLAG_START, SUBROUTINE, SUBROUTINE)
+    assert entries[-1].flags == trace_decode.FLAG_END
+    assert entries[-1].target == SUBROUTINE
+
+    steps = list(trace_decode.rebuild(entries, image))
+    begin = fetches.index(SUBROUTINE)
+    assert [step.address for step in steps] == fetches[begin:fetches.index(SUBROUTINE, begin + 1)]
+
+
+@cocotb.test()
+async def test_wrap_and_irq(dut):
+    """A wrapped buffer keeps the newest DEPTH entries, and IRQ entries are flagged."""
+    program = [SEI] + store(CTRL_ENABLE, TRACE_CTRL)
+    loop = call_loop(program, 20)
+    program += [CLI, NOP, NOP]
+    last = START_PC + len(program) + 2
+    program += store(0x00, TRACE_CTRL)
+    readout(program)
+    memory = {IRQ_HANDLER: RTI, 0xFFFE: lo(IRQ_HANDLER), 0xFFFF: hi(IRQ_HANDLER)}
+
+    Clock(dut.i_clk, 20, unit="ns").start()
+    image = await run_traced(dut, finish(program), memory)
+    fetches = []
+    cocotb.start_soon(monitor_fetches(dut, fetches))
+
+    # Pending behind SEI until the CLI after the loop
+    while loop not in fetches:
+        await RisingEdge(dut.phi2)
+    dut.i_irq_n_ext.value = 0
+    while int(dut.bus_addr.value) != IRQ_HANDLER:
+        await RisingEdge(dut.phi2)
+    dut.i_irq_n_ext.value = 1
+    await wait_done(dut)
+
+    count, status, entries = dump(dut)
+    assert count == DEPTH
+    assert status == STATUS_WRAPPED
+    assert not entries[0].flags & trace_decode.FLAG_START
+    assert [entry.flags & trace_decode.FLAG_IRQ for entry in entries].count(trace_decode.FLAG_IRQ) == 1
+
+    steps = list(trace_decode.rebuild(entries, image))
+    end = fetches.index(last) + 1
+    assert [step.address for step in steps] == fetches[end - len(steps):end]
+    assert [step.address for step in steps if step.irq] == [IRQ_HANDLER]
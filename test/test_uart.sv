@@ -16,6 +16,7 @@ wire o_tx;
 reg i_rx;
 wire o_tx_irq;
 wire o_rx_irq;
+wire o_tx_ready;
 
 // Instantiate UART module
 uart uart0 (
@@ -30,7 +31,8 @@ uart uart0 (
     .i_rx(i_rx),
     .o_tx(o_tx),
     .o_tx_irq(o_tx_irq),
-    .o_rx_irq(o_rx_irq)
+    .o_rx_irq(o_rx_irq),
+    .o_tx_ready(o_tx_ready)
 );
 
 endmodule
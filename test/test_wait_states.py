@@ -0,0 +1,91 @@
+from cocotb.clock import Clock
+from cocotb.triggers import ClockCycles
+import cocotb
+
+from utils import (
+    LDA_IMM, LDA_ABS, LDX_IMM, STA_ABS, DEX, BNE, JMP_ABS,
+    RESULT, DONE, lo, hi, run, count_until_done,
+)
+
+UART_DATA = 0xA042
+
+# Wait-state controller registers at $A060
+WAIT_BLOCKS_23 = 0xA061
+WAIT_IO = 0xA068
+
+SLOW = 0x3000       # block 3, 3 waits in test_runner.py
+SLOW_WAITS = 3
+IO_WAITS = 2
+
+READS = 16
+
+
+async def count_stalls(dut):
+    """Return (CPU cycles, cycles with RDY low) until the program stores $AA to DONE."""
+    cycles, ready = await count_until_done(dut, dut.mcu.cpu_rdy)
+    return cycles, cycles - ready
+
+
+def read_loop(blocks_23):
+    """Write blocks_23 to WAIT_BLOCKS_23, read SLOW READS times, store $AA to DONE."""
+    return [
+        LDA_IMM, blocks_23,                                 # $0400
+        STA_ABS, lo(WAIT_BLOCKS_23), hi(WAIT_BLOCKS_23),    # $0402
+        LDX_IMM, READS,                                     # $0405
+        LDA_ABS, lo(SLOW), hi(SLOW),                        # $0407 loop:
+        DEX,                                                # $040A
+        BNE, 0xFA,                                          # $040B -> loop
+        LDA_IMM, 0xAA,                                      # $040D
+        STA_ABS, lo(DONE), hi(DONE),                        # $040F
+        JMP_ABS, 0x12, 0x04,                                # $0412
+    ]
+
+
+@cocotb.test()
+async def test_block_waits(dut):
+    """Each access to a slow block takes its wait count in extra cycles, and the count is programmable."""
+    Clock(dut.i_clk, 20, unit="ns").start()
+
+    await run(dut, read_loop(SLOW_WAITS << 4))
+    slow, slow_stalls = await count_stalls(dut)
+
+    await run(dut, read_loop(0x00))
+    fast, fast_stalls = await count_stalls(dut)
+
+    dut._log.info(f"{READS} reads from block 3: {slow} cycles with {SLOW_WAITS} waits, {fast} with none")
+    # The store to WAIT_BLOCKS_23 waits for the I/O page in both runs
+    assert fast_stalls == IO_WAITS
+    assert slow_stalls == IO_WAITS + READS * SLOW_WAITS
+    assert slow - fast == READS * SLOW_WAITS
+
+
+@cocotb.test()
+async def test_io_waits_access_once(dut):
+    """A peripheral access that waits reads or writes its register once."""
+    # Program:
+    #   LDA #$11 / STA UART_DATA    ; TX disabled, bytes stay in the FIFO
+    #   LDA #$22 / STA UART_DATA
+    #   LDA #$33 / STA UART_DATA
+    #   LDA WAIT_IO / STA RESULT
+    #   LDA #$AA / STA DONE
+    program = [
+        LDA_IMM, 0x11,
+        STA_ABS, lo(UART_DATA), hi(UART_DATA),
+        LDA_IMM, 0x22,
+        STA_ABS, lo(UART_DATA), hi(UART_DATA),
+        LDA_IMM, 0x33,
+        STA_ABS, lo(UART_DATA), hi(UART_DATA),
+        LDA_ABS, lo(WAIT_IO), hi(WAIT_IO),
+        STA_ABS, lo(RESULT), hi(RESULT),
+        LDA_IMM, 0xAA,
+        STA_ABS, lo(DONE), hi(DONE),
+        JMP_ABS, 0x1A, 0x04,
+    ]
+    Clock(dut.i_clk, 20, unit="ns").start()
+    await run(dut, program)
+    _, stalls = await count_stalls(dut)
+    await ClockCycles(dut.i_clk, 10)
+
+    assert stalls == 4 * IO_WAITS
+    assert int(dut.bram.memory[RESULT].value) == IO_WAITS
+    assert int(dut.mcu.uart0.uart_tx_inst.tx_fifo.count.value) == 3, "each UART write must push one byte"
@@ -1,9 +1,171 @@
+from functools import cache
+from typing import NamedTuple
+
 from cocotb.clock import Clock
-from cocotb.triggers import ClockCycles
+from cocotb.triggers import ClockCycles, RisingEdge
+
+# 6502 opcodes for the mcu test programs
+LDA_IMM = 0xA9
+LDA_ABS = 0xAD
+LDA_ABS_X = 0xBD
+LDX_IMM = 0xA2
+LDY_IMM = 0xA0
+STA_ABS = 0x8D
+STA_ABS_X = 0x9D
+AND_IMM = 0x29
+ADC_ABS = 0x6D
+ASL_A = 0x0A
+LSR_A = 0x4A
+CPX_IMM = 0xE0
+INC_ABS = 0xEE
+INX = 0xE8
+DEX = 0xCA
+DEY = 0x88
+BNE = 0xD0
+BEQ = 0xF0
+BPL = 0x10
+BCS = 0xB0
+CLC = 0x18
+SEI = 0x78
+CLI = 0x58
+NOP = 0xEA
+BRK = 0x00
+JSR = 0x20
+RTS = 0x60
+RTI = 0x40
+JMP_ABS = 0x4C
+
+# BRAM layout of the mcu tests (mcu_harness.sv)
+START_PC = 0x0400
+RESULT = 0x0300
+DONE = 0x0310
+COUNTER = 0x0320
 
 async def start_clock_and_reset(dut):
     dut.i_reset_n.value = 0
     clk = Clock(dut.i_clk, 100, "ns").start()
     await ClockCycles(dut.i_clk, 2)
     dut.i_reset_n.value = 1
-    await ClockCycles(dut.i_clk, 1)
\ No newline at end of file
+    await ClockCycles(dut.i_clk, 1)
+
+
+class ArchState(NamedTuple):
+    """Decoded cpu_6502 sim_arch_state vector."""
+    acc: int
+    x: int
+    y: int
+    sp: int
+    pc: int
+    sr: int
+    opcode: int
+    microinstruction: int
+
+
+@cache
+def _arch_state_handle(cpu):
+    return cpu.sim_arch_state
+
+
+def read_arch_state(cpu):
+    """Read A, X, Y, SP, PC, P, opcode and microinstruction in one access.
+
+    `cpu` is the cpu_6502 instance handle, e.g. `dut.cpu_6502`.
+    """
+    state = int(_arch_state_handle(cpu).value)
+    return ArchState(
+        acc=state & 0xFF,
+        x=(state >> 8) & 0xFF,
+        y=(state >> 16) & 0xFF,
+        sp=(state >> 24) & 0xFF,
+        pc=(state >> 32) & 0xFFFF,
+        sr=(state >> 48) & 0xFF,
+        opcode=(state >> 56) & 0xFF,
+        microinstruction=(state >> 64) & 0x3F,
+    )
+
+
+def lo(addr):
+    return addr & 0xFF
+
+def hi(addr):
+    return (addr >> 8) & 0xFF
+
+
+def store(value, addr):
+    return [LDA_IMM, value, STA_ABS, lo(addr), hi(addr)]
+
+
+def copy(src, dst):
+    return [LDA_ABS, lo(src), hi(src), STA_ABS, lo(dst), hi(dst)]
+
+
+def finish(program, start=START_PC):
+    """Store $AA to DONE and loop."""
+    end = start + len(program) + 5
+    return program + [LDA_IMM, 0xAA, STA_ABS, lo(DONE), hi(DONE), JMP_ABS, lo(end), hi(end)]
+
+
+# Performance counter registers (ENABLE_PERF_COUNTERS) at $A090
+PERF_CTRL = 0xA090
+PERF_SELECT = 0xA091
+PERF_DATA_0 = 0xA094
+
+PERF_SNAPSHOT = 0x01
+PERF_CLEAR = 0x02
+
+PERF_CYCLES = 0
+PERF_INSTRUCTIONS = 1
+PERF_STALLS = 2
+PERF_IRQS = 3
+PERF_IRQ_LATENCY = 4
+
+
+def read_counter(counter, addr):
+    """Select a performance counter and copy its snapshot to addr..addr+3."""
+    program = store(counter, PERF_SELECT)
+    for i in range(4):
+        program += copy(PERF_DATA_0 + i, addr + i)
+    return program
+
+
+def read_result(dut, index):
+    """Counter read index, 4 bytes each from RESULT."""
+    return sum(int(dut.bram.memory[RESULT + 4 * index + i].value) << (8 * i) for i in range(4))
+
+
+async def run(dut, program, memory=None):
+    """Reset, load memory and the program at START_PC and start the CPU.
+
+    DONE and COUNTER are cleared first, the GPIO inputs are 0 and the
+    external IRQ is released.
+    """
+    dut.i_reset_n.value = 0
+    dut.i_gpioa_input.value = 0
+    dut.i_irq_n_ext.value = 1
+    await ClockCycles(dut.i_clk, 5)
+    dut.bram.memory[DONE].value = 0
+    dut.bram.memory[COUNTER].value = 0
+    for addr, value in (memory or {}).items():
+        dut.bram.memory[addr].value = value
+    for i, byte in enumerate(program):
+        dut.bram.memory[START_PC + i].value = byte
+    await ClockCycles(dut.i_clk, 1)
+    dut.i_reset_n.value = 1
+
+
+async def count_until_done(dut, signal=None, limit=20000):
+    """Return (CPU cycles, cycles with signal high) until the program writes DONE."""
+    cycles = high = 0
+    while int(dut.bram.memory[DONE].value) == 0:
+        await RisingEdge(dut.phi2)
+        cycles += 1
+        if signal is not None:
+            high += int(signal.value)
+        assert cycles < limit, "program did not finish"
+    return cycles, high
+
+
+async def wait_done(dut, limit=20000):
+    """Return the CPU cycles until the program writes DONE."""
+    cycles, _ = await count_until_done(dut, limit=limit)
+    return cycles
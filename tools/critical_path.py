@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = []
+# ///
+"""
+m6502 Critical Path Report
+
+Maps the critical paths of one or more nextpnr --report JSON files back to
+RTL source lines and modules, and prints them worst first. nextpnr reports
+the worst path of each clock pair; passing the reports of several seeds
+(tools/pnr_sweep.py leaves them in the sweep build directory) shows how
+stable those paths are.
+
+Each step of a path is located through the yosys JSON netlist it was placed
+from: the src attribute of the cell it ends on, else that of the net, else
+the RTL signal the net name was derived from (yosys names the nets it
+creates after a nearby signal, e.g. mcu.cpu_6502.status_carry_SB_LUT4_O).
+Steps without a source line are attributed to the module of their
+instance path (mcu.cpu_6502 -> cpu_6502) when the name has one. Otherwise,
+as for LUTs that abc merged in ECP5 builds, they go to the module of the
+step before them and are marked with "~".
+
+Paths are ranked by the clock frequency they allow. A path launched on one
+edge and captured on the other edge of the same clock (the CPU runs on both
+edges of bus_phi2) has half a period.
+
+The summary adds up the delay each module contributes to the listed paths,
+which points at where retiming would raise Fmax.
+
+Usage:
+  python3 tools/critical_path.py targets/fomu/build/top-report.json
+  python3 tools/critical_path.py targets/fomu/build-sweep/seed-*-report.json --top 8
+  python3 tools/critical_path.py targets/ulx3s/bin-sweep/seed-1-report.json --steps
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import defaultdict
+from functools import cache
+from pathlib import Path
+from typing import NamedTuple
+
+import pnr_report
+import pnr_sweep
+
+ROOT = Path(__file__).resolve().parent.parent
+
+_RTL_SRC = re.compile(r"(?:^|/)(rtl/[\w/]+\.sv):(\d+)")
+# Suffixes yosys and nextpnr append to the signal a net or cell is named after
+_DERIVED = re.compile(r"_(?:SB_|LUT4_|TRELLIS_|CCU2C_|PFUMX_|L6MUX21_|DP16KD_)|\$|_LC$")
+# Suffixes nextpnr appends to the names of the cells it packs
+_NEXTPNR_SUFFIXES = ("_LC", "_RAM", "_DSP")
+
+
+class Step(NamedTuple):
+    kind: str         # clk-to-q, routing, logic or setup
+    delay: float      # ns
+    signal: str       # RTL signal the net or cell is named after
+    source: str       # rtl/file.sv:line, "" if unknown
+    module: str       # module the delay is attributed to
+    inherited: bool   # module taken from the previous step
+
+
+class CriticalPath(NamedTuple):
+    report: Path
+    from_clock: str   # "posedge sysclk", "<async>"
+    to_clock: str
+    delay: float
+    steps: list
+
+    @property
+    def period(self):
+        """Clock period this path needs, in ns."""
+        from_edge, _, from_name = self.from_clock.partition(" ")
+        to_edge, _, to_name = self.to_clock.partition(" ")
+        return self.delay * 2 if from_name == to_name and from_edge != to_edge else self.delay
+
+    @property
+    def fmax(self):
+        """MHz allowed by the path, None between different clocks."""
+        same_clock = self.from_clock.partition(" ")[2] == self.to_clock.partition(" ")[2] != ""
+        return 1000 / self.period if same_clock else None
+
+
+def base_signal(name):
+    """Signal a net or cell name was derived from (led_strb_SB_LUT4_I1_O -> led_strb)."""
+    return _DERIVED.split(name, 1)[0] or name
+
+
+def rtl_location(src):
+    """First rtl/ location in a yosys src attribute, as (file, line)."""
+    for part in src.split("|"):
+        match = _RTL_SRC.search(part)
+        if match:
+            return match.group(1), int(match.group(2))
+    return None
+
+
+@cache
+def module_at(file, line):
+    """Module whose body contains the line."""
+    name = Path(file).stem
+    for number, text in enumerate((ROOT / file).read_text().splitlines(), 1):
+        if number > line:
+            break
+        match = re.match(r"\s*module\s+(\w+)", text)
+        if match:
+            name = match.group(1)
+    return name
+
+
+def load_netlist(path):
+    """Return (cells, netnames) of the top module of a yosys JSON netlist."""
+    modules = json.loads(path.read_text())["modules"]
+    top = next(module for module in modules.values() if module.get("attributes", {}).get("top"))
+    return top.get("cells", {}), top.get("netnames", {})
+
+
+def instance_modules(netnames):
+    """Map instance paths of a flattened netlist to modules (mcu.cpu_6502 -> cpu_6502)."""
+    modules = {}
+    for net in netnames.values():
+        attributes = net.get("attributes", {})
+        location = rtl_location(attributes.get("src", ""))
+        hierarchy = attributes.get("hdlname", "").split(" ")
+        if location and len(hierarchy) > 1:
+            modules.setdefault(".".join(hierarchy[:-1]), module_at(*location))
+    return modules
+
+
+def instance_of(signal, instances):
+    """Longest known instance path a signal name starts with, or None."""
+    parts = signal.split(".")
+    for length in range(len(parts) - 1, 0, -1):
+        instance = ".".join(parts[:length])
+        if instance in instances:
+            return instance
+    return None
+
+
+def locate(step, cells, netnames):
+    """Return (signal, rtl location or None) for one step of a nextpnr path."""
+    end = step["from"] if step["type"] == "clk-to-q" else step["to"]
+    cell = end["cell"]
+    names = [cell, cell.split("$")[0]] + [cell.removesuffix(suffix) for suffix in _NEXTPNR_SUFFIXES]
+    for name in names:
+        if name in cells:
+            location = rtl_location(cells[name].get("attributes", {}).get("src", ""))
+            if location:
+                return base_signal(step.get("net", cell)), location
+
+    net = step.get("net")
+    if net is None:
+        return base_signal(cell), None
+    signal = base_signal(net)
+    location = rtl_location("|".join(step.get("sources", [])))
+    for name in (net, signal):
+        if location is None and name in netnames:
+            location = rtl_location(netnames[name].get("attributes", {}).get("src", ""))
+    return signal, location
+
+
+def infer_target(report_path):
+    """Target a report was built for, from its path under targets/."""
+    for parent in report_path.resolve().parents:
+        if parent.parent == ROOT / "targets" and parent.name in pnr_sweep.TARGETS:
+            return pnr_sweep.TARGETS[parent.name]
+    return None
+
+
+def find_netlist(report_path, target):
+    netlist = report_path.with_name(report_path.name.removesuffix("-report.json") + ".json")
+    if not netlist.exists() and target is not None:
+        netlist = report_path.with_name(target.netlist)
+    return netlist
+
+
+def critical_paths(report_path, netlist_path=None, target=None):
+    """Return the critical paths of one nextpnr report, mapped to the RTL."""
+    report = json.loads(report_path.read_text())
+    target = target or infer_target(report_path)
+    netlist_path = netlist_path or find_netlist(report_path, target)
+    cells, netnames = load_netlist(netlist_path) if netlist_path.exists() else ({}, {})
+    instances = instance_modules(netnames)
+
+    clocks = [pnr_report.clock_name(net) for net in report.get("fmax", {})]
+    labels = pnr_sweep.clock_labels(target, clocks) if target else {}
+
+    def clock(edge):
+        if " " not in edge:
+            return edge
+        edge, net = edge.split(" ", 1)
+        name = pnr_report.clock_name(net)
+        return f"{edge} {labels.get(name, name)}"
+
+    paths = []
+    for entry in report.get("critical_paths", []):
+        steps, module = [], "?"
+        for step in entry["path"]:
+            signal, location = locate(step, cells, netnames)
+            instance = instance_of(signal, instances)
+            inherited = location is None and instance is None
+            if location:
+                module = module_at(*location)
+            elif not inherited:
+                module = instances[instance]
+            steps.append(Step(step["type"], step["delay"], signal,
+                              f"{location[0]}:{location[1]}" if location else "", module, inherited))
+        paths.append(CriticalPath(report_path, clock(entry["from"]), clock(entry["to"]),
+                                  sum(step.delay for step in steps), steps))
+    return paths
+
+
+def module_delays(steps):
+    delays = defaultdict(float)
+    for step in steps:
+        delays[step.module] += step.delay
+    return sorted(delays.items(), key=lambda item: -item[1])
+
+
+def format_path(rank, path, show_steps):
+    limit = f" ({path.fmax:.2f} MHz)" if path.fmax else ""
+    lines = [f"#{rank}  {path.from_clock} -> {path.to_clock}  {path.delay:.2f} ns{limit}  {path.report}"]
+    start, end = path.steps[0], path.steps[-1]
+    lines.append(f"    from  {start.signal}  {start.source or start.module}")
+    lines.append(f"    to    {end.signal}  {end.source or end.module}")
+    lines.append("    by module: " + ", ".join(f"{module} {delay:.2f} ns ({100 * delay / path.delay:.0f}%)"
+                                             for module, delay in module_delays(path.steps)))
+    if show_steps:
+        total = 0.0
+        lines.append(f"    {'delay':>6} {'total':>6}  {'step':<9} {'module':<22} source / signal")
+        for step in path.steps:
+            total += step.delay
+            module = ("~" if step.inherited else " ") + step.module
+            lines.append(f"    {step.delay:6.2f} {total:6.2f}  {step.kind:<9} {module:<22} "
+                         f"{step.source or '-'}  {step.signal}")
+    return "\n".join(lines)
+
+
+def format_summary(paths):
+    delays, counts = defaultdict(float), defaultdict(int)
+    for path in paths:
+        for module, delay in module_delays(path.steps):
+            delays[module] += delay
+            counts[module] += 1
+    total = sum(delays.values())
+    lines = [f"Delay by module over these {len(paths)} paths:"]
+    for module, delay in sorted(delays.items(), key=lambda item: -item[1]):
+        lines.append(f"  {module:<24} {delay:8.2f} ns  {100 * delay / total:5.1f}%  on {counts[module]} path(s)")
+
+    sources = defaultdict(float)
+    for path in paths:
+        for step in path.steps:
+            if step.source:
+                sources[step.source] += step.delay
+    lines.append("Source lines with the most delay:")
+    for source, delay in sorted(sources.items(), key=lambda item: -item[1])[:10]:
+        lines.append(f"  {source:<40} {delay:8.2f} ns")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Map nextpnr critical paths back to RTL modules and lines")
+    parser.add_argument("reports", nargs="+", type=Path, help="nextpnr --report JSON files")
+    parser.add_argument("--netlist", type=Path,
+                        help="yosys JSON netlist (default: next to the report, top-report.json -> top.json)")
+    parser.add_argument("--target", choices=pnr_sweep.TARGETS,
+                        help="Target, for clock names (default: from the report path)")
+    parser.add_argument("--top", type=int, default=5, help="Number of paths to list (default: 5)")
+    parser.add_argument("--steps", action="store_true", help="List every step of each path")
+    args = parser.parse_args()
+
+    missing = [str(path) for path in args.reports if not path.exists()]
+    if missing:
+        print(f"missing report: {', '.join(missing)}", file=sys.stderr)
+        return 1
+
+    target = pnr_sweep.TARGETS[args.target] if args.target else None
+    paths = [path for report in args.reports for path in critical_paths(report, args.netlist, target)]
+    paths = sorted(paths, key=lambda path: -path.period)[:args.top]
+    if not paths:
+        print("no critical paths in the report", file=sys.stderr)
+        return 1
+
+    print("\n\n".join(format_path(rank, path, args.steps) for rank, path in enumerate(paths, 1)))
+    print()
+    print(format_summary(paths))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = []
+# ///
+"""
+m6502 Cycle Table
+
+Computes the cycle count of all 256 opcodes without simulating. Each opcode
+is matched against the microcode table in tools/microcode.py, its
+addressing mode is decoded by tools/ir_decoder.py, and the
+microinstructions between START and MICRO_EXECUTE are costed one cycle
+each, except for:
+
+  LOAD/STORE    operand fetch and address calculation, by addressing mode,
+                plus one cycle on a page cross for indexed reads. Indexed
+                stores and read-modify-write absolute,X always take it.
+  MAYBE_BRANCH  one cycle, plus one if taken, plus one more if the target
+                is on another page.
+
+With --turbo the table is for a core built with TURBO: the microcode
+groups' turbo sequences, no zero page indexing dummy read, indexed stores
+and read-modify-write absolute,X only take the page cross cycle when the
+index carries, and branches end without MICRO_EXECUTE.
+
+The result can be checked against the NMOS 6502 timings built into this
+file. Undocumented opcodes are listed with the timing this core gives
+them but are not checked, since the core does not emulate them. With
+--65c02 the table is for a core built with ENABLE_65C02, and its 65C02
+opcodes are checked against the WDC 65C02 timings too.
+
+Notation follows the datasheets: "4*" adds a cycle on a page cross, "2**"
+adds one cycle if the branch is taken and two if it crosses a page.
+
+Usage:
+  python3 tools/cycle_table.py
+  python3 tools/cycle_table.py --format grid
+  python3 tools/cycle_table.py --format json > cycles.json
+  python3 tools/cycle_table.py --check
+  python3 tools/cycle_table.py --65c02 --check
+  python3 tools/cycle_table.py --turbo --format grid
+"""
+
+import argparse
+import json
+import sys
+from typing import NamedTuple
+
+import ir_decoder
+import microcode
+import opcodes
+
+
+class Cycles(NamedTuple):
+    base: int          # cycles without page cross, branch not taken
+    page_cross: bool   # +1 when indexing crosses a page
+    branch: bool       # +1 when taken, +2 when taken to another page
+
+    def __str__(self):
+        return f"{self.base}{'**' if self.branch else '*' if self.page_cross else ''}"
+
+
+# ── Cost model, from the LOAD/STORE operations in cpu_6502.sv ──────
+def access_cycles(mode, kind, turbo=False):
+    """Return (cycles, page_cross) for a LOAD or STORE microinstruction.
+
+    kind is "load", "store" or "rmw" (a LOAD followed by ALU_MODIFY).
+    """
+    if turbo and kind != "load":
+        return access_cycles(mode, "load", turbo)
+    forced = kind == "store"
+    if mode == "IMMEDIATE":
+        return 1, False
+    if mode in ("ZP", "ZP_RELATIVE"):
+        return 2, False
+    if mode in ("ZP_X", "ZP_Y"):
+        return (2 if turbo else 3), False
+    if mode == "INDEX_X_INDIRECT":
+        return (4 if turbo else 5), False
+    if mode == "ZP_INDIRECT":
+        return 4, False
+    if mode == "INDEX_Y_INDIRECT":
+        return (5, False) if forced else (4, True)
+    if mode == "ABSOLUTE":
+        return 3, False
+    if mode == "ABSOLUTE_X":
+        return (4, False) if forced or kind == "rmw" else (3, True)
+    if mode == "ABSOLUTE_Y":
+        return (4, False) if forced else (3, True)
+    # No operand (undocumented opcode): ends on the fetch cycle
+    return 1, False
+
+
+def opcode_cycles(opcode, opcode_patterns, cmos=False, turbo=False):
+    group = microcode.opcode_group(opcode, opcode_patterns, cmos)
+    mode = ir_decoder.addressing_mode(opcode, opcode_patterns, cmos)
+    kind = "rmw" if "ALU_MODIFY" in group.sequence else "load"
+
+    base = 0
+    page_cross = branch = False
+    for microinstruction, _ in microcode.transitions(group, turbo):
+        if microinstruction == "START":
+            continue
+        if microinstruction in ("LOAD", "STORE"):
+            cycles, crosses = access_cycles(mode, "store" if microinstruction == "STORE" else kind, turbo)
+            base += cycles
+            page_cross |= crosses
+        elif microinstruction == "MAYBE_BRANCH":
+            base += 1
+            branch = True
+        elif microinstruction == "MICRO_EXECUTE" and branch and turbo:
+            continue
+        else:
+            base += 1
+    return Cycles(base, page_cross, branch)
+
+
+def cycle_table(cmos=False, turbo=False):
+    """Return [(opcode, name, mode, Cycles)] for all 256 opcodes, on the 65C02 if cmos, with TURBO if turbo."""
+    opcode_patterns = opcodes.load_opcodes()
+    excluded = () if cmos else opcodes.load_cmos_opcodes()
+    names = {int(pattern, 2): name.removeprefix("OPCODE_")
+             for name, pattern in opcode_patterns.items() if "?" not in pattern and name not in excluded}
+    return [(opcode, names.get(opcode, ""), ir_decoder.addressing_mode(opcode, opcode_patterns, cmos),
+             opcode_cycles(opcode, opcode_patterns, cmos, turbo))
+            for opcode in range(256)]
+
+
+# ── NMOS 6502 reference timings (documented opcodes) ───────────────
+NMOS_TIMINGS = """
+00 7   01 6   05 3   06 5   08 3   09 2   0A 2   0D 4   0E 6
+10 2** 11 5*  15 4   16 6   18 2   19 4*  1D 4*  1E 7
+20 6   21 6   24 3   25 3   26 5   28 4   29 2   2A 2   2C 4   2D 4   2E 6
+30 2** 31 5*  35 4   36 6   38 2   39 4*  3D 4*  3E 7
+40 6   41 6   45 3   46 5   48 3   49 2   4A 2   4C 3   4D 4   4E 6
+50 2** 51 5*  55 4   56 6   58 2   59 4*  5D 4*  5E 7
+60 6   61 6   65 3   66 5   68 4   69 2   6A 2   6C 5   6D 4   6E 6
+70 2** 71 5*  75 4   76 6   78 2   79 4*  7D 4*  7E 7
+81 6   84 3   85 3   86 3   88 2   8A 2   8C 4   8D 4   8E 4
+90 2** 91 6   94 4   95 4   96 4   98 2   99 5   9A 2   9D 5
+A0 2   A1 6   A2 2   A4 3   A5 3   A6 3   A8 2   A9 2   AA 2   AC 4   AD 4   AE 4
+B0 2** B1 5*  B4 4   B5 4   B6 4   B8 2   B9 4*  BA 2   BC 4*  BD 4*  BE 4*
+C0 2   C1 6   C4 3   C5 3   C6 5   C8 2   C9 2   CA 2   CC 4   CD 4   CE 6
+D0 2** D1 5*  D5 4   D6 6   D8 2   D9 4*  DD 4*  DE 7
+E0 2   E1 6   E4 3   E5 3   E6 5   E8 2   E9 2   EA 2   EC 4   ED 4   EE 6
+F0 2** F1 5*  F5 4   F6 6   F8 2   F9 4*  FD 4*  FE 7
+"""
+
+
+# ── WDC 65C02 timings of the ENABLE_65C02 opcodes ──────────────────
+# BRA is always taken: 3 cycles, 4 to another page. The NOPs that skip an
+# operand are left out: the WDC part takes 8 cycles for $5C, this core 4.
+CMOS_TIMINGS = """
+04 5   07 5   0C 6   0F 5** 12 5   14 5   17 5   1A 2   1C 6   1F 5**
+27 5   2F 5** 32 5   34 4   37 5   3A 2   3C 4*  3F 5**
+47 5   4F 5** 52 5   57 5   5A 3   5F 5**
+64 3   67 5   6F 5** 72 5   74 4   77 5   7A 4   7C 6   7F 5**
+80 2** 87 5   89 2   8F 5** 92 5   97 5   9C 4   9E 5   9F 5**
+A7 5   AF 5** B2 5   B7 5   BF 5**
+C7 5   CB 3   CF 5** D2 5   D7 5   DA 3   DB 3   DF 5**
+E7 5   EF 5** F2 5   F7 5   FA 4   FF 5**
+"""
+
+
+def parse_timings(text):
+    timings = {}
+    tokens = text.split()
+    for opcode, cycles in zip(tokens[::2], tokens[1::2]):
+        timings[int(opcode, 16)] = Cycles(int(cycles.rstrip("*")), cycles.endswith("*") and not
+                                          cycles.endswith("**"), cycles.endswith("**"))
+    return timings
+
+
+def reference_timings(cmos=False):
+    """Return {opcode: Cycles} for the documented opcodes, NMOS plus 65C02 if cmos."""
+    timings = parse_timings(NMOS_TIMINGS)
+    if cmos:
+        timings.update(parse_timings(CMOS_TIMINGS))
+    return timings
+
+
+def check(table, cmos=False):
+    """Compare documented opcodes with the reference timings, return the mismatches."""
+    reference = reference_timings(cmos)
+    return [(opcode, name, cycles, reference[opcode])
+            for opcode, name, _, cycles in table
+            if opcode in reference and cycles != reference[opcode]]
+
+
+# ── Output ─────────────────────────────────────────────────────────
+def format_list(table, cmos=False):
+    reference = reference_timings(cmos)
+    lines = []
+    for opcode, name, mode, cycles in table:
+        note = "" if opcode in reference else "  (undocumented)"
+        lines.append(f"${opcode:02X}  {name or '-':<12} {mode:<19} {cycles!s:>3}{note}")
+    return "\n".join(lines)
+
+
+def format_grid(table, cmos=False):
+    lines = ["     " + " ".join(f"x{low:X} " for low in range(16))]
+    for high in range(16):
+        row = [f"{table[high << 4 | low][3]!s:<3}" for low in range(16)]
+        lines.append(f"{high:X}x   " + " ".join(row))
+    return "\n".join(lines)
+
+
+def format_json(table, cmos=False):
+    return json.dumps({
+        f"{opcode:02X}": {
+            "name": name or None,
+            "mode": mode,
+            "cycles": cycles.base,
+            "page_cross": cycles.page_cross,
+            "branch": cycles.branch,
+        } for opcode, name, mode, cycles in table
+    }, indent=2)
+
+
+FORMATS = {
+    "list": format_list,
+    "grid": format_grid,
+    "json": format_json,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-opcode cycle counts from the microcode table")
+    parser.add_argument("--format", choices=FORMATS, default="list", help="Output format (default: list)")
+    parser.add_argument("--check", action="store_true",
+                        help="Compare documented opcodes with NMOS 6502 timings instead of printing the table")
+    parser.add_argument("--65c02", dest="cmos", action="store_true",
+                        help="Table for a core built with ENABLE_65C02, checked against 65C02 timings too")
+    parser.add_argument("--turbo", action="store_true",
+                        help="Table for a core built with TURBO, which is not cycle-accurate")
+    args = parser.parse_args()
+    if args.turbo and args.check:
+        parser.error("--check compares with NMOS timing, which TURBO does not keep")
+
+    table = cycle_table(args.cmos, args.turbo)
+    cpu = "NMOS and 65C02" if args.cmos else "NMOS"
+
+    if args.check:
+        mismatches = check(table, args.cmos)
+        for opcode, name, cycles, expected in mismatches:
+            print(f"${opcode:02X} {name}: {cycles}, reference {expected}", file=sys.stderr)
+        if mismatches:
+            print(f"{len(mismatches)} opcodes differ from {cpu} timing", file=sys.stderr)
+            return 1
+        print(f"{len(reference_timings(args.cmos))} documented opcodes match {cpu} timing")
+        return 0
+
+    print(FORMATS[args.format](table, args.cmos))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = []
+# ///
+"""
+m6502 IPC Benchmark
+
+Runs firmware images on the MCU under Verilator (test/Makefile.mcu_bench)
+with the cycle-accurate core and with TURBO=1, for the same number of CPU
+cycles, and reports the instructions per cycle of each and the gain.
+
+The default programs are the example images in examples/build (built by
+make -C examples, which needs cc65) and the Klaus functional test as a
+reference workload. Images of 8 KB are taken as mini_link.cfg builds and
+start at $1000 like the Fomu; larger ones start from the reset vector.
+
+Usage:
+  python3 tools/ipc_bench.py
+  python3 tools/ipc_bench.py --cycles 5000000 examples/build/blinky.hex
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+ROOT = Path(__file__).resolve().parent.parent
+TEST_DIR = ROOT / "test"
+
+MINI_SIZE = 8192
+
+
+class Program(NamedTuple):
+    name: str
+    path: Path
+    make_args: tuple
+
+
+def default_programs():
+    programs = [program(path) for path in sorted((ROOT / "examples" / "build").glob("*.hex"))]
+    klaus = TEST_DIR / "6502_functional_test.hex"
+    return programs + [Program("klaus", klaus, ("START_PC=1024",))]
+
+
+def program(path):
+    """A firmware image, mini if it is no larger than the Fomu's 8 KB BRAM."""
+    with open(path) as f:
+        size = sum(1 for line in f if line.strip())
+    return Program(path.stem, path.resolve(), ("MINI=1",) if size <= MINI_SIZE else ())
+
+
+def run(program, turbo, cycles):
+    """Return the instruction count of one run."""
+    command = ["make", "-s", "-f", "Makefile.mcu_bench", "run", f"PROGRAM={program.path}",
+               f"TURBO={int(turbo)}", f"CYCLES={cycles}", *program.make_args]
+    result = subprocess.run(command, cwd=TEST_DIR, capture_output=True, text=True)
+    match = re.search(r"^Instructions: (\d+)$", result.stdout, re.M)
+    if result.returncode or not match:
+        sys.exit(f"{program.name}: benchmark failed\n{result.stdout}{result.stderr}")
+    return int(match.group(1))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IPC of the cycle-accurate and TURBO cores")
+    parser.add_argument("programs", nargs="*", type=Path,
+                        help="firmware .hex images (default: examples/build/*.hex and Klaus)")
+    parser.add_argument("--cycles", type=int, default=1000000, help="CPU cycles per run")
+    args = parser.parse_args()
+
+    programs = [program(path) for path in args.programs] or default_programs()
+
+    print(f"{'program':<24} {'IPC':>7} {'TURBO':>7} {'gain':>7}")
+    for p in programs:
+        base = run(p, False, args.cycles) / args.cycles
+        turbo = run(p, True, args.cycles) / args.cycles
+        print(f"{p.name:<24} {base:>7.3f} {turbo:>7.3f} {(turbo / base - 1) * 100:>+6.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = []
+# ///
+"""
+m6502 Instruction Decoder ROM Generator
+
+Generates rtl/cpu_6502_ir_decoder_rom.sv, a 256-entry operand type ROM
+with the same ports as cpu_6502_ir_decoder. cpu_6502 uses it instead of
+the priority casez decoder when built with IR_DECODER_ROM=1.
+
+The table below mirrors the casez in cpu_6502_ir_decoder.sv, using the
+opcode patterns and operand_type_t from rtl/cpu_6502_instructions.vh
+(read through tools/opcodes.py). test_cpu_6502_ir_decoder checks both
+modules agree on all 256 opcodes, with and without ENABLE_65C02.
+
+The ROM is read combinationally: the opcode is decoded straight off the
+data bus in the fetch cycle, so it is built from LUTs. iCE40 EBR and ECP5
+block RAM only support registered reads.
+
+Usage:
+  python3 tools/ir_decoder.py -o rtl/cpu_6502_ir_decoder_rom.sv
+  python3 tools/ir_decoder.py --check
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import opcodes
+
+IR_DECODER_ROM_SV = Path(__file__).resolve().parent.parent / "rtl" / "cpu_6502_ir_decoder_rom.sv"
+
+
+# ── Decoder table, mirrors cpu_6502_ir_decoder.sv ──────────────────
+# cc=01 group and the per-type bbb tables of the other groups
+ALU_MODES = {0: "INDEX_X_INDIRECT", 1: "ZP", 2: "IMMEDIATE", 3: "ABSOLUTE",
+             4: "INDEX_Y_INDIRECT", 5: "ZP_X", 6: "ABSOLUTE_Y", 7: "ABSOLUTE_X"}
+SHIFT_MODES = {1: "ZP", 2: "ACCUMULATOR", 3: "ABSOLUTE", 5: "ZP_X", 7: "ABSOLUTE_X"}
+INC_DEC_MODES = {1: "ZP", 3: "ABSOLUTE", 5: "ZP_X", 7: "ABSOLUTE_X"}
+STX_MODES = {1: "ZP", 3: "ABSOLUTE", 5: "ZP_Y"}
+LDX_MODES = {0: "IMMEDIATE", 1: "ZP", 3: "ABSOLUTE", 5: "ZP_Y", 7: "ABSOLUTE_Y"}
+BIT_MODES = {1: "ZP", 3: "ABSOLUTE"}
+STY_MODES = {1: "ZP", 3: "ABSOLUTE", 5: "ZP_X"}
+LDY_MODES = {0: "IMMEDIATE", 1: "ZP", 3: "ABSOLUTE", 5: "ZP_X", 7: "ABSOLUTE_X"}
+COMPARE_MODES = {0: "IMMEDIATE", 1: "ZP", 3: "ABSOLUTE"}
+
+# Matched in order, like the priority casez in the decoder
+DECODER = (
+    (("OPCODE_BRK", "OPCODE_RTI", "OPCODE_RTS", "OPCODE_NOP",
+      "OPCODE_PHP", "OPCODE_PLP", "OPCODE_PHA", "OPCODE_PLA",
+      "OPCODE_DEY", "OPCODE_TAY", "OPCODE_INY", "OPCODE_INX",
+      "OPCODE_CLC", "OPCODE_SEC", "OPCODE_CLI", "OPCODE_SEI",
+      "OPCODE_TYA", "OPCODE_CLV", "OPCODE_CLD", "OPCODE_SED",
+      "OPCODE_TXA", "OPCODE_TXS", "OPCODE_TAX", "OPCODE_TSX",
+      "OPCODE_DEX"), "IMPLIED"),
+    (("OPCODE_TYPE_BRANCH",), "RELATIVE"),
+    (("OPCODE_JMP_ABS", "OPCODE_JSR"), "ABSOLUTE"),
+    (("OPCODE_JMP_IND",), "INDIRECT"),
+    (("OPCODE_TYPE_ORA", "OPCODE_TYPE_AND", "OPCODE_TYPE_EOR", "OPCODE_TYPE_ADC",
+      "OPCODE_TYPE_STA", "OPCODE_TYPE_LDA", "OPCODE_TYPE_CMP", "OPCODE_TYPE_SBC"), ALU_MODES),
+    (("OPCODE_TYPE_ASL", "OPCODE_TYPE_ROL", "OPCODE_TYPE_LSR", "OPCODE_TYPE_ROR"), SHIFT_MODES),
+    (("OPCODE_TYPE_DEC", "OPCODE_TYPE_INC"), INC_DEC_MODES),
+    (("OPCODE_TYPE_STX",), STX_MODES),
+    (("OPCODE_TYPE_LDX",), LDX_MODES),
+    (("OPCODE_TYPE_BIT",), BIT_MODES),
+    (("OPCODE_TYPE_STY",), STY_MODES),
+    (("OPCODE_TYPE_LDY",), LDY_MODES),
+    (("OPCODE_TYPE_CPY", "OPCODE_TYPE_CPX"), COMPARE_MODES),
+)
+
+# 65C02 opcodes, matched before DECODER when ENABLE_65C02 is set
+CMOS_DECODER = (
+    (("OPCODE_TYPE_ZP_IND",), "ZP_INDIRECT"),
+    (("OPCODE_BIT_IMM", "OPCODE_NOP_IMM_02", "OPCODE_NOP_IMM_22", "OPCODE_NOP_IMM_42",
+      "OPCODE_NOP_IMM_62", "OPCODE_NOP_IMM_82", "OPCODE_NOP_IMM_C2", "OPCODE_NOP_IMM_E2"), "IMMEDIATE"),
+    (("OPCODE_STZ_ZP", "OPCODE_TSB_ZP", "OPCODE_TRB_ZP", "OPCODE_TYPE_RMB", "OPCODE_TYPE_SMB",
+      "OPCODE_NOP_ZP_44"), "ZP"),
+    (("OPCODE_STZ_ZP_X", "OPCODE_BIT_ZP_X", "OPCODE_NOP_ZP_X_54", "OPCODE_NOP_ZP_X_D4",
+      "OPCODE_NOP_ZP_X_F4"), "ZP_X"),
+    (("OPCODE_STZ_ABS", "OPCODE_TSB_ABS", "OPCODE_TRB_ABS", "OPCODE_NOP_ABS_5C",
+      "OPCODE_NOP_ABS_DC", "OPCODE_NOP_ABS_FC"), "ABSOLUTE"),
+    (("OPCODE_STZ_ABS_X", "OPCODE_BIT_ABS_X"), "ABSOLUTE_X"),
+    (("OPCODE_JMP_IND_X",), "ABSOLUTE_X_INDIRECT"),
+    (("OPCODE_TYPE_BBR", "OPCODE_TYPE_BBS"), "ZP_RELATIVE"),
+    (("OPCODE_BRA",), "RELATIVE"),
+    (("OPCODE_INC_ACC", "OPCODE_DEC_ACC", "OPCODE_PHX", "OPCODE_PLX",
+      "OPCODE_PHY", "OPCODE_PLY", "OPCODE_WAI", "OPCODE_STP"), "IMPLIED"),
+)
+
+
+def addressing_mode(opcode, opcode_patterns, cmos=False):
+    """Return the operand_type_t name for an opcode, on the 65C02 if cmos."""
+    for names, modes in (CMOS_DECODER if cmos else ()) + DECODER:
+        if any(opcodes.matches(opcode_patterns[name], opcode) for name in names):
+            if isinstance(modes, str):
+                return modes
+            return modes.get((opcode >> 2) & 0b111, "IMPLIED")
+    return "IMPLIED"
+
+
+# ── SystemVerilog output ───────────────────────────────────────────
+HEADER = """\
+`include "cpu_6502_instructions.vh"
+
+// Generated by tools/ir_decoder.py from the opcode tables in
+// cpu_6502_instructions.vh. Do not edit by hand: run `make ir-decoder-rom`.
+//
+// Drop-in replacement for cpu_6502_ir_decoder, selected with the
+// IR_DECODER_ROM parameter of cpu_6502.
+module cpu_6502_ir_decoder_rom #(
+    parameter ENABLE_65C02 = 0
+) (
+    input [7:0] i_opcode,
+    output operand_type_t o_operand_type
+);
+"""
+
+
+def generate():
+    opcode_patterns = opcodes.load_opcodes()
+    operand_types = opcodes.load_enum("operand_type_t")
+    width = opcodes.load_enum_width("operand_type_t")
+    cmos_patterns = opcodes.load_cmos_opcodes()
+    # Each section is labelled with the opcode names of its own ISA
+    names = {int(pattern, 2): name.removeprefix("OPCODE_")
+             for name, pattern in opcode_patterns.items()
+             if "?" not in pattern and name not in cmos_patterns}
+
+    out = [HEADER,
+           "// Operand type ROM indexed by opcode. Combinational read: the opcode is",
+           "// decoded off the bus in the fetch cycle, so this is built from LUTs",
+           "// rather than EBR/block RAM.",
+           f"reg [{width - 1}:0] rom [0:255];",
+           "",
+           "initial begin"]
+    for opcode in range(256):
+        mode = addressing_mode(opcode, opcode_patterns)
+        if mode not in operand_types:
+            raise ValueError(f"${opcode:02X}: unknown operand type {mode}")
+        statement = f"rom[8'h{opcode:02X}] = {mode};"
+        name = names.get(opcode)
+        out.append(f"    {statement:<34}// {name}" if name else f"    {statement}")
+
+    # 65C02 opcodes override their NMOS entries
+    cmos_names = {int(pattern, 2): name.removeprefix("OPCODE_")
+                  for name, pattern in cmos_patterns.items() if "?" not in pattern}
+    out += ["",
+            "    if (ENABLE_65C02) begin"]
+    for opcode in sorted(cmos_names):
+        mode = addressing_mode(opcode, opcode_patterns, cmos=True)
+        statement = f"rom[8'h{opcode:02X}] = {mode};"
+        out.append(f"        {statement:<34}// {cmos_names[opcode]}")
+    out += ["    end",
+            "end",
+            "",
+            "assign o_operand_type = operand_type_t'(rom[i_opcode]);",
+            "",
+            "endmodule",
+            ""]
+    return "\n".join(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate cpu_6502_ir_decoder_rom.sv")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    parser.add_argument("--check", action="store_true",
+                        help=f"Fail if {IR_DECODER_ROM_SV.relative_to(IR_DECODER_ROM_SV.parent.parent)} "
+                             "is not up to date with the table")
+    args = parser.parse_args()
+
+    text = generate()
+
+    if args.check:
+        if IR_DECODER_ROM_SV.read_text() != text:
+            print(f"{IR_DECODER_ROM_SV} is out of date, run `make ir-decoder-rom`", file=sys.stderr)
+            return 1
+        print(f"{IR_DECODER_ROM_SV.name} is up to date")
+        return 0
+
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = []
+# ///
+"""
+m6502 MCU Memory Map Generator
+
+The MCU peripherals live in one 256-byte I/O page. mcu.sv selects it by
+comparing the high address byte only, and gives each peripheral a 16-byte
+slot selected by address bits 7:4, so the decoder never compares full
+16-bit ranges. A peripheral that decodes fewer address bits sees its
+registers repeat within its slot. Unassigned slots, the slots of optional
+peripherals that are not built, and everything outside the I/O page go to
+the external bus.
+
+The table below is the single description of that map. It generates:
+
+  rtl/mcu_memory_map.vh   page and slot constants used by the mcu.sv decoder
+  examples/m6502.inc      ca65 register definitions for firmware
+  docs/peripherals.md     the memory map table, between the memory-map markers
+
+To add a peripheral, give it a free slot here, regenerate, and add its
+case arm to the decoder in mcu.sv, under its build parameter if it is
+optional.
+
+Usage:
+  python3 tools/memory_map.py           # regenerate all outputs
+  python3 tools/memory_map.py --check
+  python3 tools/memory_map.py --print inc
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+ROOT = Path(__file__).resolve().parent.parent
+MEMORY_MAP_VH = ROOT / "rtl" / "mcu_memory_map.vh"
+FIRMWARE_INC = ROOT / "examples" / "m6502.inc"
+PERIPHERALS_MD = ROOT / "docs" / "peripherals.md"
+
+DOCS_BEGIN = "<!-- memory-map: generated by tools/memory_map.py -->"
+DOCS_END = "<!-- memory-map: end -->"
+
+
+class Peripheral(NamedTuple):
+    name: str          # firmware and macro prefix (GPIOA -> GPIOA_OE, `MCU_SLOT_GPIOA)
+    title: str         # name in the docs
+    slot: int          # 16-byte slot within the I/O page
+    description: str
+    registers: tuple   # register names by offset, None for reserved
+    optional: bool = False  # slot goes to the external bus when not built
+
+
+IO_PAGE = 0xA0     # 0xA000-0xA0FF
+SLOT_SIZE = 16
+SLOTS = 256 // SLOT_SIZE
+
+PERIPHERALS = (
+    Peripheral("GPIOA", "GPIO A", 0, "8-bit general-purpose I/O with pin mux",
+               ("OE", "OUT", "IN", None, "MODE_PIN0", "MODE_PIN1", "MODE_PIN2", "MODE_PIN3",
+                "MODE_PIN4", "MODE_PIN5", "MODE_PIN6", "MODE_PIN7")),
+    Peripheral("LED", "SK6812", 1, "RGBW LED controller and strip engine",
+               ("CONTROL", "CLKDIV", "RED", "GREEN", "BLUE", "WHITE", "STATUS", None,
+                "STRIP_CTRL", "STRIP_STATUS", "STRIP_COUNT", None,
+                "STRIP_BUF0_LO", "STRIP_BUF0_HI", "STRIP_BUF1_LO", "STRIP_BUF1_HI")),
+    Peripheral("TIMER", "TIMER0", 2, "16-bit timer with prescaler, interrupts and compare/capture channels",
+               ("CTRL", "STATUS", "COUNT_LO", "COUNT_HI", "RELOAD_LO", "RELOAD_HI", "PRESCALER", None,
+                "CH0_CTRL", "CH0_LO", "CH0_HI", None, "CH1_CTRL", "CH1_LO", "CH1_HI")),
+    Peripheral("CLKCTRL", "Clock Control", 3, "CPU clock divider",
+               ("CPU_DIV", None, "STATUS")),
+    Peripheral("UART", "UART0", 4, "Serial communication with FIFOs",
+               ("CTRL", "STATUS", "DATA", "BAUD_LO", "BAUD_HI")),
+    Peripheral("CACHE", "Read Cache", 5, "Read cache control and hit/miss counters",
+               ("CTRL", "CONFIG", None, None, "HITS_0", "HITS_1", "HITS_2", "HITS_3",
+                "MISSES_0", "MISSES_1", "MISSES_2", "MISSES_3"),
+               optional=True),
+    Peripheral("WAIT", "Wait States", 6, "Per-region wait states for slow memory",
+               ("BLOCKS_01", "BLOCKS_23", "BLOCKS_45", "BLOCKS_67", "BLOCKS_89", "BLOCKS_AB",
+                "BLOCKS_CD", "BLOCKS_EF", "IO"),
+               optional=True),
+    Peripheral("DMA", "DMA", 7, "Block copies and peripheral feeds as a bus master",
+               ("CTRL", "STATUS", "SRC_LO", "SRC_HI", "DST_LO", "DST_HI", "LEN_LO", "LEN_HI"),
+               optional=True),
+    Peripheral("INTC", "Interrupt Controller", 8, "Interrupt enable, priority and vectoring",
+               ("ENABLE", "PENDING", "SOURCE", "CTRL", "PRIO_LO", "PRIO_HI", "VECTOR_PAGE"),
+               optional=True),
+    Peripheral("PERF", "Performance Counters", 9, "Cycle, instruction, stall and IRQ counters",
+               ("CTRL", "SELECT", None, None, "DATA_0", "DATA_1", "DATA_2", "DATA_3"),
+               optional=True),
+    Peripheral("TRACE", "Trace Buffer", 10, "PC trace of jumps and interrupts with readout stream",
+               ("CTRL", "STATUS", "COUNT_LO", "COUNT_HI", "TRIG_LO", "TRIG_HI", "DATA"),
+               optional=True),
+    Peripheral("PROF", "PC Profiler", 11, "Instruction and cycle histogram over an address window",
+               ("CTRL", "STATUS", "SHIFT", "BASE_LO", "BASE_HI", "INDEX_LO", "INDEX_HI", "DATA"),
+               optional=True),
+    Peripheral("MATH", "Math Unit", 12, "16x16 multiply and 16/16 divide",
+               ("A_LO", "A_HI", "B_LO", "B_HI", "CTRL", "STATUS", None, None,
+                "PROD_0", "PROD_1", "PROD_2", "PROD_3", "QUOT_LO", "QUOT_HI", "REM_LO", "REM_HI"),
+               optional=True),
+)
+
+
+def validate(peripherals):
+    slots = {}
+    for peripheral in peripherals:
+        if not 0 <= peripheral.slot < SLOTS:
+            raise ValueError(f"{peripheral.name}: slot {peripheral.slot} outside the I/O page")
+        if peripheral.slot in slots:
+            raise ValueError(f"{peripheral.name}: slot {peripheral.slot} already used by {slots[peripheral.slot]}")
+        if len(peripheral.registers) > SLOT_SIZE:
+            raise ValueError(f"{peripheral.name}: {len(peripheral.registers)} registers do not fit a slot")
+        slots[peripheral.slot] = peripheral.name
+
+
+def base(peripheral):
+    return IO_PAGE << 8 | peripheral.slot * SLOT_SIZE
+
+
+# ── Outputs ────────────────────────────────────────────────────────
+def generate_vh(peripherals):
+    out = ["`ifndef MCU_MEMORY_MAP_VH",
+           "`define MCU_MEMORY_MAP_VH",
+           "",
+           "// Generated by tools/memory_map.py. Do not edit by hand: run `make memory-map`.",
+           "//",
+           f"// I/O page 0x{IO_PAGE:02X}00-0x{IO_PAGE:02X}FF, selected by address bits 15:8. Each",
+           f"// peripheral owns a {SLOT_SIZE}-byte slot selected by address bits 7:4.",
+           "",
+           f"{'`define MCU_IO_PAGE':<30}8'h{IO_PAGE:02X}",
+           ""]
+    for peripheral in sorted(peripherals, key=lambda peripheral: peripheral.slot):
+        macro = f"`define MCU_SLOT_{peripheral.name}"
+        out.append(f"{macro:<30}4'h{peripheral.slot:X}    // 0x{base(peripheral):04X} {peripheral.title}")
+    out += ["", "`endif", ""]
+    return "\n".join(out)
+
+
+def generate_inc(peripherals):
+    out = ["; Generated by tools/memory_map.py. Do not edit by hand: run `make memory-map`.",
+           ";",
+           "; m6502 MCU peripheral registers for ca65:",
+           ';   .include "m6502.inc"',
+           "",
+           f"IO_PAGE = ${IO_PAGE:02X}00"]
+    for peripheral in sorted(peripherals, key=lambda peripheral: peripheral.slot):
+        out += ["", f"; {peripheral.title}: {peripheral.description}",
+                f"{peripheral.name + '_BASE':<20}= ${base(peripheral):04X}"]
+        for offset, register in enumerate(peripheral.registers):
+            if register:
+                out.append(f"{peripheral.name + '_' + register:<20}= ${base(peripheral) + offset:04X}")
+    out.append("")
+    return "\n".join(out)
+
+
+def generate_docs(peripherals):
+    out = [DOCS_BEGIN,
+           "| Address Range | Peripheral | Registers | Description |",
+           "|--------------|------------|-----------|-------------|"]
+    for peripheral in sorted(peripherals, key=lambda peripheral: peripheral.slot):
+        start = base(peripheral)
+        out.append(f"| `0x{start:04X}-0x{start + SLOT_SIZE - 1:04X}` | {peripheral.title} | "
+                   f"`0x{start:04X}-0x{start + len(peripheral.registers) - 1:04X}` | {peripheral.description} |")
+    optional = [peripheral for peripheral in peripherals if peripheral.optional]
+    first = base(min(optional, key=lambda peripheral: peripheral.slot))
+    last = base(max(optional, key=lambda peripheral: peripheral.slot)) + SLOT_SIZE - 1
+    out += ["| All others | External | - | Routed to external bus |",
+            "",
+            f"The decoder compares address bits 15:8 with the I/O page (`0x{IO_PAGE:02X}`) and uses bits 7:4 "
+            f"to pick a {SLOT_SIZE}-byte slot. A peripheral that decodes fewer address bits than its slot "
+            "sees its registers repeat within the slot. Unassigned slots in the I/O page go to the external bus, "
+            f"and so do the slots of the optional peripherals in `0x{first:04X}-0x{last:04X}` when they are not built. "
+            "Firmware can `.include \"m6502.inc\"` from `examples/` for the register addresses.",
+            DOCS_END]
+    return "\n".join(out)
+
+
+def update_docs(text, table):
+    pattern = re.compile(re.escape(DOCS_BEGIN) + ".*?" + re.escape(DOCS_END), re.S)
+    if not pattern.search(text):
+        raise ValueError(f"memory map markers not found in {PERIPHERALS_MD}")
+    return pattern.sub(lambda _: table, text)
+
+
+def outputs():
+    """Return {path: expected contents} for all generated files."""
+    validate(PERIPHERALS)
+    return {
+        MEMORY_MAP_VH: generate_vh(PERIPHERALS),
+        FIRMWARE_INC: generate_inc(PERIPHERALS),
+        PERIPHERALS_MD: update_docs(PERIPHERALS_MD.read_text(), generate_docs(PERIPHERALS)),
+    }
+
+
+PRINTERS = {
+    "vh": generate_vh,
+    "inc": generate_inc,
+    "md": generate_docs,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the MCU memory map include files and docs")
+    parser.add_argument("--check", action="store_true", help="Fail if a generated file is out of date")
+    parser.add_argument("--print", choices=PRINTERS, help="Print one output instead of writing the files")
+    args = parser.parse_args()
+
+    if args.print:
+        validate(PERIPHERALS)
+        sys.stdout.write(PRINTERS[args.print](PERIPHERALS) + ("\n" if args.print == "md" else ""))
+        return 0
+
+    expected = outputs()
+
+    if args.check:
+        stale = [path for path, text in expected.items() if not path.exists() or path.read_text() != text]
+        for path in stale:
+            print(f"{path.relative_to(ROOT)} is out of date, run `make memory-map`", file=sys.stderr)
+        if stale:
+            return 1
+        print("memory map outputs are up to date")
+        return 0
+
+    for path, text in expected.items():
+        path.write_text(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = []
+# ///
+"""
+m6502 Microcode Generator
+
+Generates rtl/cpu_6502_microcode.sv from the microinstruction table below.
+The table is the source of truth: each opcode group lists the
+microinstructions it steps through between START and MICRO_EXECUTE, and
+the groups are matched in order, like the priority casez they become.
+The 65C02 groups are matched before all others, and only when the module's
+ENABLE_65C02 parameter is set. A group's turbo sequence replaces its
+sequence when the TURBO parameter is set; it drops the dummy reads and
+stalls that only keep NMOS cycle timing.
+
+Opcode patterns and the microinstruction_t encoding are read from
+rtl/cpu_6502_instructions.vh through tools/opcodes.py.
+
+Encodings (all produce the same module and ports):
+  casez   Binary microinstruction state, priority casez on the opcode and a
+          case on the current microinstruction. This is the checked-in RTL.
+  onehot  One-hot opcode group select and one-hot decoded microinstruction,
+          each next-microinstruction bit is a sum of products of the two.
+  rom     Opcode group index plus a next-microinstruction ROM indexed by
+          {group, microinstruction}, initialized in an initial block. The
+          ROM is read combinationally because cpu_6502 chains two lookups
+          per cycle, so it is built from LUTs: iCE40 EBR and ECP5 block RAM
+          only support registered reads.
+
+Usage:
+  python3 tools/microcode.py -o rtl/cpu_6502_microcode.sv
+  python3 tools/microcode.py --check
+  python3 tools/microcode.py --encoding onehot -o build/cpu_6502_microcode.sv
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+import opcodes
+
+MICROCODE_SV = Path(__file__).resolve().parent.parent / "rtl" / "cpu_6502_microcode.sv"
+
+ENCODINGS = ("casez", "onehot", "rom")
+
+
+class Group(NamedTuple):
+    name: str
+    opcodes: tuple   # OPCODE_* localparams from cpu_6502_instructions.vh
+    sequence: tuple  # microinstructions between START and MICRO_EXECUTE
+    turbo: tuple = None  # sequence with TURBO, if shorter
+
+
+# ── Microcode table ────────────────────────────────────────────────
+# Interrupt and reset entry, selected by i_handle_irq or i_init regardless
+# of the current instruction.
+INTERRUPT = Group("interrupt", (), (
+    "PUSH_PCH", "PUSH_PCL", "WRITE_SR", "LOAD_VECTOR", "READ_VECTOR_HI"))
+
+# Matched in order; the first group with a matching opcode wins.
+GROUPS = (
+    Group("implied", (
+        "OPCODE_SEC", "OPCODE_CLC", "OPCODE_SEI", "OPCODE_CLI", "OPCODE_TAX",
+        "OPCODE_TAY", "OPCODE_TXA", "OPCODE_TYA", "OPCODE_TSX", "OPCODE_TXS",
+        "OPCODE_INX", "OPCODE_INY", "OPCODE_DEY", "OPCODE_DEX", "OPCODE_CLD",
+        "OPCODE_CLV", "OPCODE_NOP", "OPCODE_SED"),
+        ("NOP",), ()),
+    Group("pull", ("OPCODE_PLA", "OPCODE_PLP"),
+        ("POP_STACK", "PULL_REGISTER", "STALL"), ("POP_STACK", "PULL_REGISTER")),
+    Group("push", ("OPCODE_PHA", "OPCODE_PHP"),
+        ("PUSH_STACK", "WRITE"), ("PUSH_STACK",)),
+    Group("shift_acc", ("OPCODE_ROL_ACC", "OPCODE_ROR_ACC", "OPCODE_ASL_ACC", "OPCODE_LSR_ACC"),
+        ("STALL",), ()),
+    Group("brk", ("OPCODE_BRK",),
+        ("READ_ADL", "PUSH_PCH", "PUSH_PCL", "WRITE_SR", "LOAD_VECTOR", "READ_VECTOR_HI")),
+    Group("jsr", ("OPCODE_JSR",),
+        ("READ_ADL", "BUFFER_ADL", "PUSH_PCH", "PUSH_PCL", "READ_ADH")),
+    Group("jmp_abs", ("OPCODE_JMP_ABS",),
+        ("READ_PCL", "READ_PCH")),
+    Group("jmp_ind", ("OPCODE_JMP_IND",),
+        ("READ_EFFECTIVE_LO", "READ_EFFECTIVE_HI", "LOAD_PC_EFFECTIVE_LO", "LOAD_PC_EFFECTIVE_HI")),
+    Group("rts", ("OPCODE_RTS",),
+        ("POP_STACK", "RESTORE_STACK", "RESTORE_STACK2", "PC_INC", "STALL"),
+        ("POP_STACK", "RESTORE_STACK", "RESTORE_STACK2", "PC_INC")),
+    Group("rti", ("OPCODE_RTI",),
+        ("POP_STACK", "PULL_REGISTER", "PULL_PCL", "PULL_PCH", "STALL")),
+    Group("branch", ("OPCODE_TYPE_BRANCH",),
+        ("MAYBE_BRANCH",)),
+    Group("load", (
+        "OPCODE_TYPE_LDA", "OPCODE_TYPE_LDX", "OPCODE_TYPE_LDY",
+        "OPCODE_TYPE_AND", "OPCODE_TYPE_ORA", "OPCODE_TYPE_EOR",
+        "OPCODE_TYPE_ADC", "OPCODE_TYPE_SBC", "OPCODE_TYPE_CMP",
+        "OPCODE_TYPE_CPX", "OPCODE_TYPE_CPY", "OPCODE_TYPE_BIT"),
+        ("LOAD",)),
+    Group("rmw", (
+        "OPCODE_TYPE_INC", "OPCODE_TYPE_DEC", "OPCODE_TYPE_ASL",
+        "OPCODE_TYPE_LSR", "OPCODE_TYPE_ROR", "OPCODE_TYPE_ROL"),
+        ("LOAD", "ALU_MODIFY", "STALL"), ("LOAD", "ALU_MODIFY")),
+    Group("store", ("OPCODE_TYPE_STA", "OPCODE_TYPE_STX", "OPCODE_TYPE_STY"),
+        ("STORE",)),
+)
+
+# Anything not matched above (illegal opcodes) runs as a 2-cycle NOP, or a
+# 1-cycle one with TURBO.
+DEFAULT = Group("default", (), ("NOP",), ())
+
+# 65C02 opcodes, matched before GROUPS when ENABLE_65C02 is set. Most reuse
+# an NMOS sequence; WAI holds in WAIT until an interrupt is requested.
+CMOS_GROUPS = (
+    Group("inc_dec_acc", ("OPCODE_INC_ACC", "OPCODE_DEC_ACC"),
+        ("STALL",), ()),
+    Group("pull_xy", ("OPCODE_PLX", "OPCODE_PLY"),
+        ("POP_STACK", "PULL_REGISTER", "STALL"), ("POP_STACK", "PULL_REGISTER")),
+    Group("push_xy", ("OPCODE_PHX", "OPCODE_PHY"),
+        ("PUSH_STACK", "WRITE"), ("PUSH_STACK",)),
+    Group("bra", ("OPCODE_BRA",),
+        ("MAYBE_BRANCH",)),
+    Group("wai_stp", ("OPCODE_WAI", "OPCODE_STP"),
+        ("STALL", "WAIT")),
+    Group("store_65c02", (
+        "OPCODE_STA_ZP_IND", "OPCODE_STZ_ZP", "OPCODE_STZ_ZP_X",
+        "OPCODE_STZ_ABS", "OPCODE_STZ_ABS_X"),
+        ("STORE",)),
+    Group("load_65c02", (
+        "OPCODE_TYPE_ZP_IND", "OPCODE_BIT_IMM",
+        "OPCODE_NOP_IMM_02", "OPCODE_NOP_IMM_22", "OPCODE_NOP_IMM_42", "OPCODE_NOP_IMM_62",
+        "OPCODE_NOP_IMM_82", "OPCODE_NOP_IMM_C2", "OPCODE_NOP_IMM_E2", "OPCODE_NOP_ZP_44",
+        "OPCODE_NOP_ZP_X_54", "OPCODE_NOP_ZP_X_D4", "OPCODE_NOP_ZP_X_F4",
+        "OPCODE_NOP_ABS_5C", "OPCODE_NOP_ABS_DC", "OPCODE_NOP_ABS_FC"),
+        ("LOAD",)),
+    Group("rmw_65c02", (
+        "OPCODE_TSB_ZP", "OPCODE_TSB_ABS", "OPCODE_TRB_ZP", "OPCODE_TRB_ABS",
+        "OPCODE_TYPE_RMB", "OPCODE_TYPE_SMB"),
+        ("LOAD", "ALU_MODIFY", "STALL"), ("LOAD", "ALU_MODIFY")),
+    # The zero page byte arrives in MAYBE_BRANCH's first cycle, the offset
+    # in the next
+    Group("bbr_bbs", ("OPCODE_TYPE_BBR", "OPCODE_TYPE_BBS"),
+        ("LOAD", "STALL", "MAYBE_BRANCH"), ("LOAD", "MAYBE_BRANCH")),
+    # READ_EFFECTIVE_HI adds X to the pointer, LOAD_PC_EFFECTIVE_LO its carry
+    Group("jmp_ind_x", ("OPCODE_JMP_IND_X",),
+        ("READ_EFFECTIVE_LO", "READ_EFFECTIVE_HI", "STALL", "LOAD_PC_EFFECTIVE_LO", "LOAD_PC_EFFECTIVE_HI"),
+        ("READ_EFFECTIVE_LO", "READ_EFFECTIVE_HI", "LOAD_PC_EFFECTIVE_LO", "LOAD_PC_EFFECTIVE_HI")),
+)
+
+
+def transitions(group, turbo=False):
+    """Return [(current, next)] for a group, START through MICRO_EXECUTE and back."""
+    sequence = group.turbo if turbo and group.turbo is not None else group.sequence
+    steps = ("START",) + sequence + ("MICRO_EXECUTE",)
+    pairs = list(zip(steps, steps[1:])) + [("MICRO_EXECUTE", "START")]
+    sources = [current for current, _ in pairs]
+    if len(set(sources)) != len(sources):
+        raise ValueError(f"{group.name}: a microinstruction appears twice in its sequence")
+    return pairs
+
+
+def turbo_overrides(group):
+    """Return {current: next} for the transitions TURBO changes.
+
+    With TURBO, these replace the group's transitions from the same
+    microinstructions; the rest are unreachable or unchanged.
+    """
+    if group.turbo is None:
+        return {}
+    normal = dict(transitions(group))
+    return {current: nxt for current, nxt in transitions(group, turbo=True) if normal.get(current) != nxt}
+
+
+def validate(opcode_patterns, microinstructions):
+    for group in (INTERRUPT,) + GROUPS + (DEFAULT,) + CMOS_GROUPS:
+        for name in group.opcodes:
+            if name not in opcode_patterns:
+                raise ValueError(f"{group.name}: unknown opcode {name}")
+        for current, nxt in transitions(group) + transitions(group, turbo=True):
+            for mi in (current, nxt):
+                if mi not in microinstructions:
+                    raise ValueError(f"{group.name}: unknown microinstruction {mi}")
+        if group.turbo is not None and not set(group.turbo) <= set(group.sequence):
+            raise ValueError(f"{group.name}: the turbo sequence adds microinstructions")
+
+
+# ── SystemVerilog output ───────────────────────────────────────────
+HEADER = """\
+`include "cpu_6502_instructions.vh"
+
+// Generated by tools/microcode.py{encoding} from its microcode table.
+// Do not edit by hand: change the table and run `make microcode`.
+//
+// Highly vertical microcode to save space. If the Microcode ROM was external it'd be better
+// to make it more horizontal, but for space savings this is chosen for now.
+module cpu_6502_microcode #(
+    parameter ENABLE_65C02 = 0,
+    parameter TURBO = 0
+) (
+    input [7:0] i_current_instruction,
+    input i_init,
+    input i_handle_irq,
+    input microinstruction_t i_current_microinstruction,
+    output microinstruction_t o_next_microinstruction
+);
+"""
+
+LINE_WIDTH = 72
+
+
+def case_labels(names, indent, suffix):
+    """Comma-separated case labels, wrapped at LINE_WIDTH columns."""
+    lines = []
+    line = ""
+    for name in names:
+        if line and len(indent) + len(line) + len(name) + 3 > LINE_WIDTH:
+            lines.append(line + ",")
+            line = name
+        else:
+            line = f"{line}, {name}" if line else name
+    lines.append(line + suffix)
+    return [indent + line for line in lines]
+
+
+def casez_transitions(group, indent):
+    """Case items for a group's transitions, TURBO overrides as conditionals."""
+    overrides = turbo_overrides(group)
+    lines = []
+    for current, nxt in transitions(group):
+        if current in overrides:
+            nxt = f"TURBO ? {overrides[current]} : {nxt}"
+        lines.append(f"{indent}{current}: o_next_microinstruction = {nxt};")
+    return lines
+
+
+def generate_casez(opcode_patterns, microinstructions):
+    out = [HEADER.format(encoding=""), "always_comb begin",
+           "    o_next_microinstruction = NOP;", "",
+           "    if (i_handle_irq || i_init) begin",
+           "        priority casez (i_current_microinstruction)"]
+    for current, nxt in transitions(INTERRUPT):
+        out.append(f"            {current}: o_next_microinstruction = {nxt};")
+    out += ["            default: o_next_microinstruction = NOP;",
+            "        endcase",
+            "    end",
+            "    else begin",
+            "        priority casez (i_current_instruction)"]
+
+    for group in GROUPS + (DEFAULT,):
+        if group is DEFAULT:
+            out.append("        default: begin")
+        else:
+            out += case_labels(group.opcodes, "        ", ": begin")
+        out.append("            case (i_current_microinstruction)")
+        out += casez_transitions(group, "            ")
+        out += ["            default: ;",
+                "            endcase",
+                "        end"]
+
+    out += ["        endcase",
+            "",
+            "        // 65C02 opcodes override the NMOS decode",
+            "        if (ENABLE_65C02) begin",
+            "            priority casez (i_current_instruction)"]
+    for group in CMOS_GROUPS:
+        out += case_labels(group.opcodes, "            ", ": begin")
+        out.append("                case (i_current_microinstruction)")
+        out += casez_transitions(group, "                ")
+        out += ["                default: o_next_microinstruction = NOP;",
+                "                endcase",
+                "            end"]
+    out += ["            default: ;",
+            "            endcase",
+            "        end",
+            "    end",
+            "end",
+            "",
+            "endmodule",
+            ""]
+    return "\n".join(out)
+
+
+def matched_groups():
+    """Groups selected by opcode, in priority order: 65C02 groups, then table groups."""
+    return CMOS_GROUPS + GROUPS
+
+
+def group_table():
+    """All groups in index order: matched groups, then default, then interrupt."""
+    return matched_groups() + (DEFAULT, INTERRUPT)
+
+
+def opcode_group(opcode, opcode_patterns, cmos=False):
+    """The group an opcode decodes to, on the 65C02 if cmos."""
+    for group in (CMOS_GROUPS if cmos else ()) + GROUPS:
+        if any(opcodes.matches(opcode_patterns[name], opcode) for name in group.opcodes):
+            return group
+    return DEFAULT
+
+
+def generate_onehot(opcode_patterns, microinstructions):
+    width = opcodes.load_enum_width("microinstruction_t")
+    groups = group_table()
+    matched = matched_groups()
+    n_match = len(matched)
+    default_index = n_match
+    irq_index = n_match + 1
+
+    out = [HEADER.format(encoding=" --encoding onehot")]
+
+    out += ["// Opcode matches, one bit per group in priority order. The 65C02",
+            "// groups come first and only match with ENABLE_65C02.",
+            f"wire [{n_match - 1}:0] group_match;", ""]
+    for index, group in enumerate(matched):
+        terms = []
+        for name in group.opcodes:
+            mask, value = opcodes.mask_value(opcode_patterns[name])
+            terms.append(f"(i_current_instruction & 8'h{mask:02X}) == 8'h{value:02X}")
+        if group in CMOS_GROUPS:
+            out.append(f"assign group_match[{index}] = ENABLE_65C02 != 0 && (  // {group.name}")
+            terms[-1] += ")"
+        else:
+            out.append(f"assign group_match[{index}] =  // {group.name}")
+        for i, (term, name) in enumerate(zip(terms, group.opcodes)):
+            end = ";" if i == len(terms) - 1 else " ||"
+            out.append(f"    {term}{end}  // {name}")
+    out.append("")
+
+    out += ["// One-hot group select: interrupt/init overrides, otherwise the first",
+            "// matching group, otherwise the default group",
+            "wire irq_or_init;",
+            "assign irq_or_init = i_handle_irq || i_init;",
+            "",
+            f"wire [{len(groups) - 1}:0] group_sel;",
+            f"assign group_sel[0] = !irq_or_init && group_match[0];  // {matched[0].name}"]
+    for index in range(1, n_match):
+        out.append(f"assign group_sel[{index}] = !irq_or_init && group_match[{index}] && "
+                   f"!(|group_match[{index - 1}:0]);  // {matched[index].name}")
+    out.append(f"assign group_sel[{default_index}] = !irq_or_init && !(|group_match);  // default")
+    out.append(f"assign group_sel[{irq_index}] = irq_or_init;  // interrupt")
+    out.append("")
+
+    sources = sorted({current for group in groups for current, _ in transitions(group)},
+                     key=lambda name: microinstructions[name])
+    out.append("// One-hot decode of the current microinstruction")
+    for name in sources:
+        out.append(f"wire mi_{name};")
+    for name in sources:
+        out.append(f"assign mi_{name} = i_current_microinstruction == {name};")
+    out.append("")
+
+    out += ["// Each next-microinstruction bit is the OR of the (group, microinstruction)",
+            "// pairs whose successor has that bit set; TURBO selects between the",
+            "// pairs its sequences change",
+            f"wire [{width - 1}:0] next_microinstruction;"]
+    for bit in range(width):
+        terms = []
+        for index, group in enumerate(groups):
+            overrides = turbo_overrides(group)
+            for current, nxt in transitions(group):
+                term = f"group_sel[{index}] && mi_{current}"
+                if current in overrides:
+                    if microinstructions[overrides[current]] >> bit & 1:
+                        terms.append(f"(TURBO != 0 && {term})")
+                    term = f"TURBO == 0 && {term}"
+                if microinstructions[nxt] >> bit & 1:
+                    terms.append(f"({term})")
+        out.append(f"assign next_microinstruction[{bit}] =")
+        if not terms:
+            out[-1] += " 1'b0;"
+        for i, term in enumerate(terms):
+            end = ";" if i == len(terms) - 1 else " ||"
+            out.append(f"    {term}{end}")
+    out += ["",
+            "assign o_next_microinstruction = microinstruction_t'(next_microinstruction);",
+            "",
+            "endmodule",
+            ""]
+    return "\n".join(out)
+
+
+def generate_rom(opcode_patterns, microinstructions):
+    width = opcodes.load_enum_width("microinstruction_t")
+    groups = group_table()
+    group_width = max(1, (len(groups) - 1).bit_length())
+    depth = len(groups) << width
+    default_index = len(matched_groups())
+    irq_index = default_index + 1
+
+    out = [HEADER.format(encoding=" --encoding rom")]
+    out += ["// Opcode group index in priority order; interrupt/init overrides",
+            f"reg [{group_width - 1}:0] group;",
+            "",
+            "always_comb begin",
+            "    if (i_handle_irq || i_init)",
+            f"        group = {group_width}'d{irq_index};",
+            "    else begin",
+            "        priority casez (i_current_instruction)"]
+    for index, group in enumerate(matched_groups()):
+        if group in GROUPS:
+            out += case_labels(group.opcodes, "        ", f": group = {group_width}'d{index};")
+    out += [f"        default: group = {group_width}'d{default_index};",
+            "        endcase",
+            "",
+            "        // 65C02 opcodes override the NMOS decode",
+            "        if (ENABLE_65C02) begin",
+            "            priority casez (i_current_instruction)"]
+    for index, group in enumerate(matched_groups()):
+        if group in CMOS_GROUPS:
+            out += case_labels(group.opcodes, "            ", f": group = {group_width}'d{index};")
+    out += ["            default: ;",
+            "            endcase",
+            "        end",
+            "    end",
+            "end",
+            "",
+            "// Next-microinstruction ROM indexed by {group, current microinstruction}.",
+            "// Combinational read: cpu_6502 chains two lookups per cycle, so this is",
+            "// built from LUTs rather than EBR/block RAM.",
+            f"reg [{width - 1}:0] rom [0:{depth - 1}];",
+            "",
+            "integer i;",
+            "initial begin",
+            f"    for (i = 0; i < {depth}; i = i + 1)",
+            f"        rom[i] = {width}'d0;"]
+    address_width = group_width + width
+    for index, group in enumerate(groups):
+        for current, nxt in transitions(group):
+            address = index << width | microinstructions[current]
+            if microinstructions[nxt] == 0:
+                continue
+            out.append(f"    rom[{address_width}'h{address:0{(address_width + 3) // 4}X}] = "
+                       f"{width}'d{microinstructions[nxt]};  // {group.name}: {current} -> {nxt}")
+    out += ["",
+            "    // TURBO sequences replace these transitions",
+            "    if (TURBO) begin"]
+    for index, group in enumerate(groups):
+        for current, nxt in turbo_overrides(group).items():
+            address = index << width | microinstructions[current]
+            out.append(f"        rom[{address_width}'h{address:0{(address_width + 3) // 4}X}] = "
+                       f"{width}'d{microinstructions[nxt]};  // {group.name}: {current} -> {nxt}")
+    out += ["    end",
+            "end",
+            "",
+            "assign o_next_microinstruction = microinstruction_t'(rom[{group, i_current_microinstruction}]);",
+            "",
+            "endmodule",
+            ""]
+    return "\n".join(out)
+
+
+GENERATORS = {
+    "casez": generate_casez,
+    "onehot": generate_onehot,
+    "rom": generate_rom,
+}
+
+
+def generate(encoding="casez"):
+    opcode_patterns = opcodes.load_opcodes()
+    microinstructions = opcodes.load_microinstructions()
+    validate(opcode_patterns, microinstructions)
+    return GENERATORS[encoding](opcode_patterns, microinstructions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate cpu_6502_microcode.sv")
+    parser.add_argument("--encoding", choices=ENCODINGS, default="casez",
+                        help="Next-microinstruction logic encoding (default: casez)")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    parser.add_argument("--check", action="store_true",
+                        help=f"Fail if {MICROCODE_SV.relative_to(MICROCODE_SV.parent.parent)} "
+                             "is not up to date with the table")
+    args = parser.parse_args()
+
+    text = generate(args.encoding)
+
+    if args.check:
+        if args.encoding != "casez":
+            parser.error("--check compares the checked-in casez encoding")
+        if MICROCODE_SV.read_text() != text:
+            print(f"{MICROCODE_SV} is out of date, run `make microcode`", file=sys.stderr)
+            return 1
+        print(f"{MICROCODE_SV.name} is up to date")
+        return 0
+
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = []
+# ///
+"""
+m6502 Per-Module Resource Breakdown
+
+Synthesizes every module in rtl/ and rtl/peripherals/ on its own, as the
+top level with default parameters, for iCE40 (synth_ice40) and ECP5
+(synth_ecp5), running the yosys processes in parallel. Hierarchy is kept
+(-noflatten) so each module's cost is split into:
+
+  self   cells in the module itself (for mcu: the address decoder and glue)
+  total  self plus every submodule instance, recursively
+
+Counts are LUTs, flip-flops, carry cells (SB_CARRY, CCU2C), block RAM and
+DSPs (SB_MAC16 with synth_ice40 -dsp, as the UP5K build uses; MULT18X18D).
+Because hierarchy is kept, totals are slightly above a flattened build,
+where yosys can optimize across module boundaries.
+
+Results are cached in sim_build/module_resources/, keyed by a hash of the
+module's source file, the files of the modules it instantiates and the
+.vh includes, so only modules whose sources changed are resynthesized.
+
+Modules whose cost differs from tools/module_resources_baseline.json are
+flagged. Use --update-baseline to record the current numbers.
+
+Usage:
+  python3 tools/module_resources.py
+  python3 tools/module_resources.py --arch ice40 --check
+  python3 tools/module_resources.py --update-baseline
+  YOSYS=yowasp-yosys python3 tools/module_resources.py
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+RTL_DIRS = ("rtl", "rtl/peripherals")
+CACHE_DIR = ROOT / "sim_build" / "module_resources"
+BASELINE = Path(__file__).resolve().parent / "module_resources_baseline.json"
+
+ARCHES = ("ice40", "ecp5")
+
+# Extra synth_<arch> options
+SYNTH_OPTIONS = {"ice40": "-dsp", "ecp5": ""}
+
+# Primitive cell types counted per column, by architecture
+CELLS = {
+    "ice40": {
+        "LUT": ("SB_LUT4",),
+        "FF": ("SB_DFF",),           # prefix: SB_DFF, SB_DFFE, SB_DFFSR, ...
+        "carry": ("SB_CARRY",),
+        "RAM": ("SB_RAM40_4K", "SB_SPRAM256KA"),
+        "DSP": ("SB_MAC16",),
+    },
+    "ecp5": {
+        "LUT": ("LUT4",),
+        "FF": ("TRELLIS_FF",),
+        "carry": ("CCU2C",),
+        "RAM": ("DP16KD", "TRELLIS_DPR16X4"),
+        "DSP": ("MULT18X18D", "ALU54B"),
+    },
+}
+COLUMNS = ("LUT", "FF", "carry", "RAM", "DSP")
+
+_MODULE_RE = re.compile(r"^\s*module\s+(\w+)", re.M)
+
+
+def find_modules():
+    """Return {module: source file} for every module in the RTL directories."""
+    modules = {}
+    for directory in RTL_DIRS:
+        for path in sorted((ROOT / directory).glob("*.sv")):
+            for name in _MODULE_RE.findall(path.read_text()):
+                modules[name] = path
+    return modules
+
+
+def dependencies(modules):
+    """Return {module: set of modules it instantiates}, by scanning its file."""
+    deps = {}
+    for name, path in modules.items():
+        text = path.read_text()
+        deps[name] = {other for other in modules
+                      if other != name and re.search(rf"^\s*{other}\s*(#\s*\(|\w+\s*\()", text, re.M)}
+    return deps
+
+
+def source_files(module, modules, deps):
+    """Files the module needs, those of its submodules first.
+
+    yosys is given only these, in this order: reading cpu_6502.sv before
+    the modules it instantiates trips an assertion in its parser.
+    """
+    files = []
+
+    def visit(name):
+        for dependency in sorted(deps[name]):
+            visit(dependency)
+        if modules[name] not in files:
+            files.append(modules[name])
+
+    visit(module)
+    return files
+
+
+def source_hash(files, yosys):
+    """Hash of everything a module's synthesis depends on."""
+    includes = sorted(path for directory in RTL_DIRS for path in (ROOT / directory).glob("*.vh"))
+    digest = hashlib.sha256(yosys.encode())
+    digest.update(Path(__file__).read_bytes())
+    for path in files + includes:
+        digest.update(str(path.relative_to(ROOT)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def synthesize(module, arch, sources, yosys, netlist):
+    """Run yosys with the module as top level, write its JSON netlist."""
+    netlist.parent.mkdir(parents=True, exist_ok=True)
+    script = (f"read_verilog -sv -Irtl {' '.join(sources)}; "
+              f"synth_{arch} -top {module} -noflatten {SYNTH_OPTIONS[arch]}; "
+              f"write_json {netlist.relative_to(ROOT)}")
+    result = subprocess.run([yosys, "-q", "-p", script], cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"yosys failed for {module} ({arch}):\n{result.stdout}{result.stderr}")
+
+
+def module_name(netlist_name):
+    """Base module name of a yosys module ($paramod\\fifo\\DEPTH=8 -> fifo)."""
+    if netlist_name.startswith("$paramod"):
+        return netlist_name.split("\\")[1]
+    return netlist_name
+
+
+def count_cells(netlist, top, arch):
+    """Return {"self": counts, "total": counts} for the top module of a netlist."""
+    modules = json.loads(netlist.read_text())["modules"]
+
+    def own(cells):
+        counts = dict.fromkeys(COLUMNS, 0)
+        for cell in cells.values():
+            for column, prefixes in CELLS[arch].items():
+                if cell["type"].startswith(prefixes):
+                    counts[column] += 1
+        return counts
+
+    totals = {}
+
+    def total(name):
+        if name not in totals:
+            cells = modules[name].get("cells", {})
+            counts = own(cells)
+            for cell in cells.values():
+                if cell["type"] in modules:
+                    for column, value in total(cell["type"]).items():
+                        counts[column] += value
+            totals[name] = counts
+        return totals[name]
+
+    top_name = next(name for name, module in modules.items()
+                    if module.get("attributes", {}).get("top") and module_name(name) == top)
+    return {"self": own(modules[top_name].get("cells", {})), "total": total(top_name)}
+
+
+def measure(module, arch, modules, deps, yosys):
+    files = source_files(module, modules, deps)
+    key = source_hash(files, yosys)
+    cached = CACHE_DIR / arch / f"{module}-{key}.counts.json"
+    if cached.exists():
+        return json.loads(cached.read_text())
+    sources = [str(path.relative_to(ROOT)) for path in files]
+    netlist = CACHE_DIR / arch / f"{module}-{key}.json"
+    synthesize(module, arch, sources, yosys, netlist)
+    counts = count_cells(netlist, module, arch)
+    cached.write_text(json.dumps(counts))
+    netlist.unlink()
+    return counts
+
+
+def changes(results, baseline):
+    """Return {(arch, module): {column: (before, after)}} for changed totals."""
+    changed = {}
+    for arch, modules in results.items():
+        for module, counts in modules.items():
+            before = baseline.get(arch, {}).get(module)
+            if before is None:
+                changed[(arch, module)] = {"new": (None, None)}
+                continue
+            diff = {column: (before["total"].get(column, 0), counts["total"][column])
+                    for column in COLUMNS if before["total"].get(column, 0) != counts["total"][column]}
+            if diff:
+                changed[(arch, module)] = diff
+    return changed
+
+
+def format_table(arch, results, changed):
+    header = ["module", "LUT", "self", "FF", "carry", "RAM", "DSP", "change"]
+    rows = [header]
+    for module, counts in sorted(results.items(), key=lambda item: (-item[1]["total"]["LUT"], item[0])):
+        diff = changed.get((arch, module), {})
+        if "new" in diff:
+            note = "new"
+        else:
+            note = ", ".join(f"{column} {before}->{after}" for column, (before, after) in diff.items())
+        rows.append([module, str(counts["total"]["LUT"]), str(counts["self"]["LUT"]),
+                     str(counts["total"]["FF"]), str(counts["total"]["carry"]),
+                     str(counts["total"]["RAM"]), str(counts["total"]["DSP"]), note])
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    lines = [f"{arch} (totals include submodules; self = the module's own LUTs)"]
+    for row in rows:
+        lines.append("  ".join([row[0].ljust(widths[0])] +
+                               [cell.rjust(width) for cell, width in zip(row[1:-1], widths[1:-1])] +
+                               [row[-1]]).rstrip())
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-module LUT/FF/carry breakdown of the RTL")
+    parser.add_argument("--arch", action="append", choices=ARCHES, help="Architecture, may be repeated (default: all)")
+    parser.add_argument("--module", action="append", help="Only these modules (default: all)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Parallel yosys processes")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any module differs from the baseline")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help=f"Write the results to {BASELINE.relative_to(ROOT)}")
+    args = parser.parse_args()
+
+    yosys = os.environ.get("YOSYS", "yosys")
+    modules = find_modules()
+    selected = args.module or sorted(modules)
+    unknown = [name for name in selected if name not in modules]
+    if unknown:
+        parser.error(f"unknown module: {', '.join(unknown)}")
+    deps = dependencies(modules)
+    arches = args.arch or list(ARCHES)
+
+    jobs = [(module, arch) for arch in arches for module in selected]
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        counts = list(pool.map(lambda job: measure(*job, modules, deps, yosys), jobs))
+    results = {arch: {} for arch in arches}
+    for (module, arch), result in zip(jobs, counts):
+        results[arch][module] = result
+
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    changed = changes(results, baseline) if baseline else {}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print("\n\n".join(format_table(arch, results[arch], changed) for arch in arches))
+
+    if args.update_baseline:
+        for arch in arches:
+            baseline.setdefault(arch, {}).update(results[arch])
+        BASELINE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"\nUpdated {BASELINE.relative_to(ROOT)}")
+        return 0
+
+    if changed:
+        print(f"\n{len(changed)} module(s) differ from {BASELINE.relative_to(ROOT)}", file=sys.stderr)
+        if args.check:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
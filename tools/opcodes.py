@@ -0,0 +1,95 @@
+"""
+Opcode and microinstruction definitions parsed from cpu_6502_instructions.vh
+
+The .vh file is the single source of truth for opcode patterns and the
+microinstruction_t encoding. The tools in this directory read it through
+this module instead of keeping their own copies.
+
+Opcode patterns are the localparam values, e.g. OPCODE_TYPE_LDA is
+"101???01" and OPCODE_NOP is "11101010". '?' bits match anything.
+The localparams below the "65C02 opcodes" banner are the opcodes
+cpu_6502 decodes only with ENABLE_65C02; load_cmos_opcodes() returns them.
+"""
+
+import re
+from pathlib import Path
+
+INSTRUCTIONS_VH = Path(__file__).resolve().parent.parent / "rtl" / "cpu_6502_instructions.vh"
+
+_LOCALPARAM_RE = re.compile(r"localparam\s+(OPCODE_\w+)\s*=\s*8'([bh])([0-9A-Fa-f?_]+)\s*;")
+_CMOS_BANNER_RE = re.compile(r"^// 65C02 opcodes$", re.M)
+_ENUM_RE = re.compile(r"typedef\s+enum\s+logic\s*\[\d+:0\]\s*\{(.*?)\}\s*(\w+)\s*;", re.S)
+_ENUM_ITEM_RE = re.compile(r"(\w+)\s*(?:=\s*(\d+))?")
+
+
+def _strip_comments(text):
+    return re.sub(r"//.*", "", text)
+
+
+def load_opcodes(path=INSTRUCTIONS_VH):
+    """Return {name: 8-character pattern} for every OPCODE_* localparam, in file order."""
+    opcodes = {}
+    for name, base, value in _LOCALPARAM_RE.findall(_strip_comments(Path(path).read_text())):
+        value = value.replace("_", "")
+        if base == "h":
+            value = f"{int(value, 16):08b}"
+        if len(value) != 8:
+            raise ValueError(f"{name}: expected 8 bits, got {value!r}")
+        opcodes[name] = value
+    return opcodes
+
+
+def load_cmos_opcodes(path=INSTRUCTIONS_VH):
+    """Return {name: pattern} for the 65C02 opcodes, a subset of load_opcodes()."""
+    text = Path(path).read_text()
+    banner = _CMOS_BANNER_RE.search(text)
+    if not banner:
+        raise KeyError(f"65C02 opcodes banner not found in {path}")
+    cmos = {name for name, _, _ in _LOCALPARAM_RE.findall(_strip_comments(text[banner.end():]))}
+    return {name: pattern for name, pattern in load_opcodes(path).items() if name in cmos}
+
+
+def load_enum(type_name, path=INSTRUCTIONS_VH):
+    """Return {name: value} for a typedef enum in the .vh file, in declaration order."""
+    for body, name in _ENUM_RE.findall(_strip_comments(Path(path).read_text())):
+        if name != type_name:
+            continue
+        items = {}
+        next_value = 0
+        for item in body.split(","):
+            match = _ENUM_ITEM_RE.fullmatch(item.strip())
+            if not match:
+                raise ValueError(f"{type_name}: cannot parse enum item {item.strip()!r}")
+            if match.group(2) is not None:
+                next_value = int(match.group(2))
+            items[match.group(1)] = next_value
+            next_value += 1
+        return items
+    raise KeyError(f"enum {type_name} not found in {path}")
+
+
+def load_enum_width(type_name, path=INSTRUCTIONS_VH):
+    """Return the bit width of a typedef enum in the .vh file."""
+    text = _strip_comments(Path(path).read_text())
+    match = re.search(r"typedef\s+enum\s+logic\s*\[(\d+):0\]\s*\{[^}]*\}\s*" + type_name + r"\s*;", text)
+    if not match:
+        raise KeyError(f"enum {type_name} not found in {path}")
+    return int(match.group(1)) + 1
+
+
+def load_microinstructions(path=INSTRUCTIONS_VH):
+    """Return {name: value} for microinstruction_t."""
+    return load_enum("microinstruction_t", path)
+
+
+def mask_value(pattern):
+    """Return (mask, value) so that an opcode matches when opcode & mask == value."""
+    mask = int("".join("0" if bit == "?" else "1" for bit in pattern), 2)
+    value = int(pattern.replace("?", "0"), 2)
+    return mask, value
+
+
+def matches(pattern, opcode):
+    """True if the 8-bit opcode matches a pattern from load_opcodes()."""
+    mask, value = mask_value(pattern)
+    return opcode & mask == value
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = []
+# ///
+"""
+m6502 Place and Route Report
+
+Summarizes one or more nextpnr --report JSON files as a table of resource
+usage and achieved Fmax per clock, one row per build. If the yosys netlist
+the report was placed from sits next to it (build/top-report.json and
+build/top.json), LUT and flip-flop counts are taken from the netlist.
+
+Usage:
+  python3 tools/pnr_report.py targets/fomu/build/top-report.json
+  python3 tools/pnr_report.py targets/fomu/build/top-report.json targets/fomu/build-ir-rom/top-report.json
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Logic cell, block RAM and DSP entries of the nextpnr utilization table
+UTILIZATION = {
+    "ICESTORM_LC": "LC",
+    "ICESTORM_RAM": "EBR",
+    "ICESTORM_DSP": "DSP",
+    "TRELLIS_COMB": "COMB",
+    "DP16KD": "DP16KD",
+    "MULT18X18D": "MULT18",
+}
+
+
+def netlist_cells(path):
+    """Return (LUTs, FFs) counted in a yosys JSON netlist."""
+    luts = ffs = 0
+    for module in json.loads(path.read_text())["modules"].values():
+        for cell in module.get("cells", {}).values():
+            cell_type = cell["type"]
+            if cell_type in ("SB_LUT4", "LUT4"):
+                luts += 1
+            elif cell_type.startswith("SB_DFF") or cell_type in ("TRELLIS_FF", "FD1S3AX"):
+                ffs += 1
+    return luts, ffs
+
+
+def clock_name(net):
+    """Shorten nextpnr clock net names.
+
+    Global buffer decorations are dropped (bus_phi2$glb_clk, $glbnet$clk_50).
+    Nets without a name of their own are named after the cells along their
+    driver (x_RDATA_1_SB_LUT4_I3_O_SB_...); those are cut at the first cell.
+    """
+    name = net.removeprefix("$glbnet$").split("$")[0]
+    return name.split("_SB_")[0]
+
+
+def summarize(report_path, netlist=None):
+    """Return ({resource: count}, {clock: Fmax MHz}) for one nextpnr report."""
+    report = json.loads(report_path.read_text())
+    row = {"build": str(report_path.parent)}
+    if netlist is None:
+        netlist = report_path.with_name(report_path.name.removesuffix("-report.json") + ".json")
+    if netlist.exists():
+        row["LUT"], row["DFF"] = netlist_cells(netlist)
+    for cell, label in UTILIZATION.items():
+        if report["utilization"].get(cell, {}).get("used"):
+            row[label] = report["utilization"][cell]["used"]
+    fmax = {clock_name(net): timing["achieved"] for net, timing in report.get("fmax", {}).items()}
+    return row, fmax
+
+
+def format_table(rows):
+    resources = [key for key in ("LUT", "DFF", *UTILIZATION.values()) if any(key in row for row, _ in rows)]
+    header = ["build"] + resources + ["Fmax (MHz)"]
+    table = [header]
+    for row, fmax in rows:
+        clocks = ", ".join(f"{clock} {mhz:.2f}" for clock, mhz in sorted(fmax.items()))
+        table.append([row["build"]] + [str(row.get(key, "-")) for key in resources] + [clocks])
+    widths = [max(len(line[i]) for line in table) for i in range(len(header) - 1)]
+    return "\n".join("  ".join([line[0].ljust(widths[0])] +
+                               [cell.rjust(width) for cell, width in zip(line[1:-1], widths[1:])] +
+                               [line[-1]])
+                     for line in table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize nextpnr report JSON files")
+    parser.add_argument("reports", nargs="+", type=Path, help="nextpnr --report JSON files")
+    args = parser.parse_args()
+
+    missing = [str(path) for path in args.reports if not path.exists()]
+    if missing:
+        print(f"missing report: {', '.join(missing)}", file=sys.stderr)
+        return 1
+
+    print(format_table([summarize(path) for path in args.reports]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = []
+# ///
+"""
+m6502 Place and Route Seed Sweep
+
+Synthesizes a target once with its own Makefile, then places and routes
+the netlist with nextpnr across several seeds in parallel. Reports LUT,
+FF and block RAM usage and the achieved Fmax of each clock over the seeds
+(min/median/max), and appends the result to the target's history file
+(targets/<target>/pnr_history.jsonl), one line per run, tagged with the
+commit.
+
+Before appending, the run is compared with the last history entry for the
+same target, make arguments and clock constraints. It fails, without
+appending, if the median Fmax of a clock dropped or the LUT count grew by
+more than the tolerance. Use --accept to record an intended regression as
+the new baseline.
+
+Clocks are reported as sysclk (the board clock) and bus_phi2 (the CPU
+clock from clock_control, constrained in targets/fomu/clocks.py). When
+synthesis has renamed the CPU clock net, it is matched as the remaining
+clock.
+
+Usage:
+  python3 tools/pnr_sweep.py --target fomu --seeds 8
+  python3 tools/pnr_sweep.py --target fomu --target ulx3s --no-history
+  python3 tools/pnr_sweep.py --target fomu --make-arg MICROCODE=onehot
+  YOSYS=yowasp-yosys NEXTPNR_ICE40=yowasp-nextpnr-ice40 python3 tools/pnr_sweep.py --no-clock-constraints
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import NamedTuple
+
+import pnr_report
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+class Target(NamedTuple):
+    directory: Path
+    make_args: tuple       # always passed to make
+    builddir: str          # BUILDDIR for the sweep, removed by make clean
+    netlist: str           # yosys JSON netlist name inside builddir
+    nextpnr: tuple         # (environment variable, default executable)
+    nextpnr_args: tuple
+    clock_constraints: tuple  # nextpnr arguments dropped by --no-clock-constraints
+    sysclk: str            # board clock net
+
+
+TARGETS = {
+    "fomu": Target(
+        ROOT / "targets" / "fomu", ("FOMU_REV=pvt",), "build-sweep", "top.json",
+        ("NEXTPNR_ICE40", "nextpnr-ice40"),
+        ("--up5k", "--package", "uwg30", "--pcf", "fomu-pvt.pcf"),
+        ("--pre-pack", "clocks.py"),
+        "clki"),
+    "ulx3s": Target(
+        ROOT / "targets" / "ulx3s", (), "bin-sweep", "toplevel.json",
+        ("NEXTPNR_ECP5", "nextpnr-ecp5"),
+        ("--85k", "--package", "CABGA381", "--freq", "50", "--lpf", "ulx3s_v20.lpf", "--top", "top"),
+        (),
+        "clk_50"),
+}
+
+CPU_CLOCK = "bus_phi2"
+
+
+def executable(variable, default):
+    return os.environ.get(variable, default)
+
+
+def git(*args):
+    return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+
+
+def synthesize(target, make_args):
+    """Run the target's yosys rule once, return the netlist path.
+
+    The sweep builddir is shared by all make arguments, so it is removed
+    first: otherwise a generated source left by another sweep, such as a
+    microcode encoding, would be reused.
+    """
+    netlist = target.directory / target.builddir / target.netlist
+    shutil.rmtree(netlist.parent, ignore_errors=True)
+    command = ["make", "-C", str(target.directory), *target.make_args, *make_args,
+               f"BUILDDIR={target.builddir}", f"YOSYS={executable('YOSYS', 'yosys')}",
+               f"{target.builddir}/{target.netlist}"]
+    subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+    return netlist
+
+
+def place_and_route(target, netlist, seed, clock_constraints):
+    """Run nextpnr with one seed, return the path of its report JSON."""
+    report = netlist.with_name(f"seed-{seed}-report.json")
+    command = [executable(*target.nextpnr), *target.nextpnr_args,
+               *(target.clock_constraints if clock_constraints else ()),
+               "--json", str(netlist), "--seed", str(seed), "--report", str(report),
+               "--timing-allow-fail"]
+    log = netlist.with_name(f"seed-{seed}.log")
+    with log.open("w") as out:
+        result = subprocess.run(command, cwd=target.directory, stdout=out, stderr=subprocess.STDOUT)
+    if result.returncode != 0:
+        raise RuntimeError(f"nextpnr seed {seed} failed, see {log}")
+    return report
+
+
+def clock_labels(target, clocks):
+    """Map nextpnr clock names to sysclk/bus_phi2 where they can be told apart."""
+    labels = {}
+    for clock in clocks:
+        if clock == target.sysclk:
+            labels[clock] = "sysclk"
+        elif clock == CPU_CLOCK:
+            labels[clock] = CPU_CLOCK
+    others = [clock for clock in clocks if clock not in labels]
+    if len(others) == 1 and CPU_CLOCK not in labels.values():
+        labels[others[0]] = CPU_CLOCK
+    return {clock: labels.get(clock, clock) for clock in clocks}
+
+
+def sweep(target_name, seeds, jobs, make_args, clock_constraints):
+    target = TARGETS[target_name]
+    netlist = synthesize(target, make_args)
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        reports = list(pool.map(lambda seed: place_and_route(target, netlist, seed, clock_constraints), seeds))
+
+    resources, _ = pnr_report.summarize(reports[0], netlist)
+    resources = {key: value for key, value in resources.items() if key != "build"}
+    achieved = {}
+    for report in reports:
+        _, fmax = pnr_report.summarize(report)
+        labels = clock_labels(target, fmax)
+        for clock, mhz in fmax.items():
+            achieved.setdefault(labels[clock], []).append(mhz)
+
+    return {
+        "commit": git("rev-parse", "--short", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "target": target_name,
+        "make_args": list(make_args),
+        "clock_constraints": clock_constraints,
+        "seeds": list(seeds),
+        "resources": resources,
+        "fmax": {clock: {"min": round(min(values), 2),
+                         "median": round(statistics.median(values), 2),
+                         "max": round(max(values), 2)}
+                 for clock, values in sorted(achieved.items())},
+    }
+
+
+def history_path(target_name):
+    return TARGETS[target_name].directory / "pnr_history.jsonl"
+
+
+def baseline(record):
+    """Last history entry for the same target, make arguments and constraints."""
+    path = history_path(record["target"])
+    if not path.exists():
+        return None
+    previous = None
+    for line in path.read_text().splitlines():
+        if line.strip():
+            entry = json.loads(line)
+            if (entry["make_args"], entry["clock_constraints"]) == \
+                    (record["make_args"], record["clock_constraints"]):
+                previous = entry
+    return previous
+
+
+def regressions(record, previous, fmax_tolerance, lut_tolerance):
+    problems = []
+    for clock, fmax in record["fmax"].items():
+        before = previous["fmax"].get(clock)
+        if before and fmax["median"] < before["median"] * (1 - fmax_tolerance / 100):
+            problems.append(f"{clock} median Fmax {before['median']:.2f} -> {fmax['median']:.2f} MHz "
+                            f"(tolerance {fmax_tolerance}%)")
+    luts, before = record["resources"].get("LUT"), previous["resources"].get("LUT")
+    if luts and before and luts > before * (1 + lut_tolerance / 100):
+        problems.append(f"LUT {before} -> {luts} (tolerance {lut_tolerance}%)")
+    return problems
+
+
+def format_record(record, previous):
+    lines = [f"{record['target']} @ {record['commit']}{' (dirty)' if record['dirty'] else ''}, "
+             f"{len(record['seeds'])} seeds"
+             + (f", make {' '.join(record['make_args'])}" if record["make_args"] else "")]
+    for key, value in record["resources"].items():
+        before = previous["resources"].get(key) if previous else None
+        delta = f"  ({value - before:+d} vs {previous['commit']})" if before is not None else ""
+        lines.append(f"  {key:<10} {value:>8}{delta}")
+    for clock, fmax in record["fmax"].items():
+        before = previous["fmax"].get(clock) if previous else None
+        delta = f"  ({fmax['median'] - before['median']:+.2f} vs {previous['commit']})" if before else ""
+        lines.append(f"  {clock:<10} {fmax['median']:>8.2f} MHz median, "
+                     f"{fmax['min']:.2f}-{fmax['max']:.2f}{delta}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-seed nextpnr sweep with resource/Fmax history")
+    parser.add_argument("--target", action="append", choices=TARGETS,
+                        help="Target to sweep, may be repeated (default: all)")
+    parser.add_argument("--seeds", type=int, default=8, help="Number of nextpnr seeds (default: 8)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Parallel nextpnr runs")
+    parser.add_argument("--make-arg", action="append", default=[], metavar="VAR=VALUE",
+                        help="Extra make variable for synthesis, e.g. MICROCODE=onehot")
+    parser.add_argument("--fmax-tolerance", type=float, default=5.0,
+                        help="Allowed drop of median Fmax per clock, in percent (default: 5)")
+    parser.add_argument("--lut-tolerance", type=float, default=2.0,
+                        help="Allowed growth of LUT count, in percent (default: 2)")
+    parser.add_argument("--no-history", action="store_true",
+                        help="Report only, do not compare with or append to the history")
+    parser.add_argument("--accept", action="store_true",
+                        help="Append to the history even if the run regressed")
+    parser.add_argument("--no-clock-constraints", action="store_true",
+                        help="Skip clocks.py, for nextpnr builds without Python support")
+    args = parser.parse_args()
+
+    failed = False
+    for target_name in args.target or TARGETS:
+        record = sweep(target_name, range(1, args.seeds + 1), args.jobs, args.make_arg,
+                       not args.no_clock_constraints)
+        if args.no_history:
+            print(format_record(record, None))
+            continue
+
+        previous = baseline(record)
+        print(format_record(record, previous))
+        problems = regressions(record, previous, args.fmax_tolerance, args.lut_tolerance) if previous else []
+        for problem in problems:
+            print(f"  REGRESSION: {problem}", file=sys.stderr)
+        if problems and not args.accept:
+            failed = True
+            continue
+        with history_path(target_name).open("a") as history:
+            history.write(json.dumps(record) + "\n")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
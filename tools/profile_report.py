@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = ["pyserial"]
+# ///
+"""
+m6502 PC Profile Report
+
+Turns the counters of the PC profiler (rtl/peripherals/pc_profiler.sv) into
+a ranked hot-spot report. The counter dump is what firmware sends from
+PROF_DATA after setting INDEX to 0: 4 bytes per bucket, low byte first. It
+is read from a file, or captured from a serial port until it goes quiet.
+
+--base and --shift must match the BASE and SHIFT the firmware profiled
+with. Symbols come from the ld65 map file (-m, exported symbols) or a VICE
+label file (-Ln, every label when assembled with -g); the examples Makefile
+writes both to examples/build/. Each bucket is charged to the symbol at or
+below its start address, so a SHIFT of 0-2 charges code exactly and a
+coarse SHIFT can spill a hot loop into the routine before it.
+
+Usage:
+  python3 tools/profile_report.py profile.bin --base 0xE000 --shift 2 --symbols examples/build/blinky.lbl
+  python3 tools/profile_report.py --port /dev/ttyUSB0 - --base 0xE000 --symbols examples/build/blinky.map
+"""
+
+import argparse
+import bisect
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+from trace_decode import read_serial
+
+COUNTER_BYTES = 4
+
+_MAP_EXPORT_RE = re.compile(r"(\S+)\s+([0-9A-Fa-f]{6})\s+[A-Z]{3}")
+_LABEL_RE = re.compile(r"al\s+([0-9A-Fa-f]+)\s+\.(\S+)")
+
+
+class ReportError(Exception):
+    pass
+
+
+def parse_counters(data):
+    """Split the PROF_DATA stream into counters, ignoring a trailing partial one."""
+    return [int.from_bytes(data[i:i + COUNTER_BYTES], "little")
+            for i in range(0, len(data) - COUNTER_BYTES + 1, COUNTER_BYTES)]
+
+
+def load_symbols(path):
+    """Return [(address, name)] sorted by address, from an ld65 map or a VICE label file."""
+    text = Path(path).read_text()
+    symbols = {}
+    if "Exports list by value:" in text:
+        # Two symbols per line after the dashes, up to the next blank line
+        lines = text.split("Exports list by value:", 1)[1].splitlines()[2:]
+        for line in lines[:lines.index("")] if "" in lines else lines:
+            for name, value in _MAP_EXPORT_RE.findall(line):
+                symbols.setdefault(int(value, 16), name)
+    else:
+        for value, name in _LABEL_RE.findall(text):
+            symbols.setdefault(int(value, 16), name)
+    if not symbols:
+        raise ReportError(f"{path}: no symbols found")
+    return sorted(symbols.items())
+
+
+def find_symbol(symbols, address):
+    """Return the (address, name) at or below address, or None."""
+    i = bisect.bisect_right(symbols, address, key=lambda symbol: symbol[0])
+    return symbols[i - 1] if i else None
+
+
+def symbol_at(symbols, address):
+    """Return 'name+$offset' for the symbol at or below address, or the address itself."""
+    symbol = find_symbol(symbols, address)
+    if symbol is None:
+        return f"${address:04X}"
+    start, name = symbol
+    return name if start == address else f"{name}+${address - start:X}"
+
+
+def report(counters, base, shift, symbols=None, top=20):
+    """Return the report as a list of lines."""
+    size = 1 << shift
+    hot = [(count, (base + i * size) & 0xFFFF) for i, count in enumerate(counters) if count]
+    total = sum(count for count, _ in hot)
+    if not total:
+        raise ReportError("all counters are 0")
+    hot.sort(key=lambda bucket: (-bucket[0], bucket[1]))
+    end = (base + len(counters) * size - 1) & 0xFFFF
+
+    lines = [f"{total} counts in {len(hot)} of {len(counters)} buckets, "
+             f"window ${base:04X}-${end:04X}, {size} bytes per bucket", ""]
+
+    if symbols:
+        by_symbol = Counter()
+        for count, start in hot:
+            symbol = find_symbol(symbols, start)
+            by_symbol[symbol[1] if symbol else "(no symbol)"] += count
+        lines.append(f"{'count':>10}  {'%':>6}  symbol")
+        for name, count in sorted(by_symbol.items(), key=lambda item: (-item[1], item[0]))[:top]:
+            lines.append(f"{count:>10}  {100 * count / total:>5.1f}%  {name}")
+        lines.append("")
+
+    lines.append(f"{'count':>10}  {'%':>6}  {'bucket':<11}  symbol" if symbols else
+                 f"{'count':>10}  {'%':>6}  bucket")
+    for count, start in hot[:top]:
+        bucket = f"${start:04X}" if size == 1 else f"${start:04X}-${(start + size - 1) & 0xFFFF:04X}"
+        line = f"{count:>10}  {100 * count / total:>5.1f}%  {bucket:<11}"
+        lines.append(f"{line}  {symbol_at(symbols, start)}" if symbols else line.rstrip())
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank the hot spots in a PC profiler dump")
+    parser.add_argument("counters", help="PROF_DATA stream, '-' with --port")
+    parser.add_argument("--base", type=lambda s: int(s, 0), required=True, help="BASE the firmware set")
+    parser.add_argument("--shift", type=int, default=0, help="SHIFT the firmware set")
+    parser.add_argument("--symbols", help="ld65 map (-m) or label file (-Ln)")
+    parser.add_argument("--top", type=int, default=20, help="lines per table (default 20)")
+    parser.add_argument("--port", help="capture the stream from this serial port")
+    parser.add_argument("--baud", type=int, default=115200)
+    parser.add_argument("--timeout", type=float, default=1.0, help="seconds of silence that end a capture")
+    args = parser.parse_args()
+
+    try:
+        data = read_serial(args.port, args.baud, args.timeout) if args.port else Path(args.counters).read_bytes()
+        symbols = load_symbols(args.symbols) if args.symbols else None
+        print("\n".join(report(parse_counters(data), args.base, args.shift, symbols, args.top)))
+    except (ReportError, OSError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# /// script
+# requires-python = ">=3.10"
+# dependencies = ["pyserial"]
+# ///
+"""
+m6502 PC Trace Decoder
+
+Rebuilds the instruction trace recorded by the trace buffer
+(rtl/peripherals/trace_buffer.sv) from its entry stream and the program
+image. The hardware stores only discontinuities, {flags, from, to}: between
+one entry's `to` and the next entry's `from` the CPU ran straight-line code,
+which is walked here using the instruction lengths from the opcode tables in
+rtl/cpu_6502_instructions.vh (read through tools/opcodes.py).
+
+The stream is what firmware sends from TRACE_DATA after a REWIND, five bytes
+per entry, oldest first: flags, from low, from high, to low, to high. It is
+read from a file, or captured from a serial port until it goes quiet. The
+image is the raw binary the firmware was built into (examples/build/*.bin,
+loaded at $0000 unless --base says otherwise).
+
+Output is one line per instruction: address, bytes and disassembly, with
+IRQ entries marked. A trace that wrapped starts at the oldest entry kept.
+Firmware for a core built with ENABLE_65C02 needs --65c02 to decode the
+65C02 opcodes.
+
+Usage:
+  python3 tools/trace_decode.py trace.bin examples/build/blinky.bin
+  python3 tools/trace_decode.py --port /dev/ttyUSB0 --baud 115200 - examples/build/blinky.bin
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import NamedTuple
+
+import ir_decoder
+import opcodes
+
+ENTRY_BYTES = 5
+
+FLAG_IRQ = 0x01
+FLAG_START = 0x02
+FLAG_END = 0x04
+
+# Always leave the sequential path, so straight-line code never runs past them
+JUMPS = {"BRK", "JMP", "JSR", "RTS", "RTI", "BRA"}
+
+LENGTHS = {"IMPLIED": 1, "ACCUMULATOR": 1, "ABSOLUTE": 3, "ABSOLUTE_X": 3,
+           "ABSOLUTE_Y": 3, "INDIRECT": 3, "ABSOLUTE_X_INDIRECT": 3, "ZP_RELATIVE": 3}
+
+OPERAND_FORMATS = {
+    "IMPLIED": "", "ACCUMULATOR": "A", "IMMEDIATE": "#${:02X}",
+    "ZP": "${:02X}", "ZP_X": "${:02X},X", "ZP_Y": "${:02X},Y",
+    "ABSOLUTE": "${:04X}", "ABSOLUTE_X": "${:04X},X", "ABSOLUTE_Y": "${:04X},Y",
+    "INDIRECT": "(${:04X})", "INDEX_X_INDIRECT": "(${:02X},X)",
+    "INDEX_Y_INDIRECT": "(${:02X}),Y", "ZP_INDIRECT": "(${:02X})", "RELATIVE": "${:04X}",
+    "ABSOLUTE_X_INDIRECT": "(${:04X},X)", "ZP_RELATIVE": "${:02X},${:04X}",
+}
+
+
+class TraceError(Exception):
+    pass
+
+
+class Entry(NamedTuple):
+    flags: int
+    source: int     # instruction that jumped
+    target: int     # next instruction fetched
+
+
+class Step(NamedTuple):
+    address: int
+    irq: bool       # first instruction of an IRQ handler
+
+
+def parse_entries(data):
+    """Split the TRACE_DATA stream into entries, ignoring a trailing partial one."""
+    return [Entry(data[i], data[i + 1] | data[i + 2] << 8, data[i + 3] | data[i + 4] << 8)
+            for i in range(0, len(data) - ENTRY_BYTES + 1, ENTRY_BYTES)]
+
+
+def instruction_table(cmos=False):
+    """Return (mnemonic, operand type) for each of the 256 opcodes, mnemonic None if undocumented.
+
+    With cmos the 65C02 opcodes are documented too.
+    """
+    patterns = opcodes.load_opcodes()
+    excluded = () if cmos else opcodes.load_cmos_opcodes()
+    names = {int(pattern, 2): name.removeprefix("OPCODE_")
+             for name, pattern in patterns.items() if "?" not in pattern and name not in excluded}
+    table = []
+    for opcode in range(256):
+        name, mode = names.get(opcode), ir_decoder.addressing_mode(opcode, patterns, cmos)
+        # INC A and DEC A decode as implied, but read like the shifts
+        if name and name.endswith("_ACC"):
+            mode = "ACCUMULATOR"
+        table.append((name.split("_")[0] if name else None, mode))
+    return table
+
+
+def rebuild(entries, memory, table=None):
+    """Yield a Step per instruction the CPU executed while recording.
+
+    memory is the 64 KB program image. Straight-line code is walked from one
+    entry's target to the next entry's source; an END entry stops the walk at
+    its source, the next instruction was not executed while recording.
+    """
+    table = table or instruction_table()
+    pc, irq = None, False
+    for entry in entries:
+        if entry.flags & FLAG_START:
+            pc, irq = None, False
+        if pc is not None:
+            while True:
+                yield Step(pc, irq)
+                irq = False
+                if pc == entry.source:
+                    break
+                mnemonic, mode = table[memory[pc]]
+                if mnemonic in JUMPS or mnemonic is None:
+                    raise TraceError(f"${pc:04X} is not on a straight path to ${entry.source:04X}, "
+                                     f"does the image match the firmware?")
+                pc = (pc + LENGTHS.get(mode, 2)) & 0xFFFF
+        pc, irq = entry.target, bool(entry.flags & FLAG_IRQ)
+        if entry.flags & FLAG_END:
+            pc = None
+    if pc is not None:
+        yield Step(pc, irq)
+
+
+def disassemble(memory, address, table):
+    opcode = memory[address]
+    mnemonic, mode = table[opcode]
+    length = LENGTHS.get(mode, 2)
+    operand_bytes = [memory[(address + i) & 0xFFFF] for i in range(1, length)]
+    raw = " ".join(f"{byte:02X}" for byte in [opcode] + operand_bytes)
+    if mnemonic is None:
+        return f"{raw:<8}  .byte ${opcode:02X}"
+    value = operand_bytes[0] | (operand_bytes[1] << 8 if length == 3 else 0) if operand_bytes else 0
+    if mode == "RELATIVE":
+        value = (address + 2 + (value - 256 if value & 0x80 else value)) & 0xFFFF
+    if mode == "ZP_RELATIVE":
+        offset = value >> 8
+        target = (address + 3 + (offset - 256 if offset & 0x80 else offset)) & 0xFFFF
+        operand = OPERAND_FORMATS[mode].format(value & 0xFF, target)
+    else:
+        operand = OPERAND_FORMATS[mode].format(value)
+    return f"{raw:<8}  {mnemonic} {operand}".rstrip()
+
+
+def read_serial(port, baud, timeout):
+    """Capture bytes from a serial port until nothing arrives for timeout seconds."""
+    import serial
+
+    data = bytearray()
+    with serial.Serial(port, baud, timeout=timeout) as link:
+        while chunk := link.read(4096):
+            data += chunk
+    return bytes(data)
+
+
+def load_image(path, base):
+    image = Path(path).read_bytes()
+    if base + len(image) > 0x10000:
+        raise TraceError(f"{path}: {len(image)} bytes at ${base:04X} do not fit in 64 KB")
+    memory = bytearray(0x10000)
+    memory[base:base + len(image)] = image
+    return memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the instruction trace from a trace buffer dump")
+    parser.add_argument("trace", help="TRACE_DATA stream, '-' with --port")
+    parser.add_argument("image", help="program image the firmware was built into")
+    parser.add_argument("--base", type=lambda s: int(s, 0), default=0, help="load address of the image (default 0)")
+    parser.add_argument("--port", help="capture the stream from this serial port")
+    parser.add_argument("--baud", type=int, default=115200)
+    parser.add_argument("--timeout", type=float, default=1.0, help="seconds of silence that end a capture")
+    parser.add_argument("--65c02", dest="cmos", action="store_true", help="decode the 65C02 opcodes (ENABLE_65C02)")
+    args = parser.parse_args()
+
+    try:
+        data = read_serial(args.port, args.baud, args.timeout) if args.port else Path(args.trace).read_bytes()
+        memory = load_image(args.image, args.base)
+        entries = parse_entries(data)
+        if not entries:
+            raise TraceError("no trace entries")
+        table = instruction_table(args.cmos)
+        if not entries[0].flags & FLAG_START:
+            print(f"; buffer wrapped, trace starts at ${entries[0].target:04X}")
+        for step in rebuild(entries, memory, table):
+            line = f"${step.address:04X}  {disassemble(memory, step.address, table)}"
+            print(f"{line:<34}; IRQ" if step.irq else line)
+    except (TraceError, OSError) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())